@@ -0,0 +1,660 @@
+### This file has PLUGGABLE storage-backends for the CACHE of AWS-SDK/boto3 responses (as used by `InvokeAWSApi` within ./aws_api_invoker.py)
+###
+### JsonFileCacheStore -- the original (default) backend.  One pretty-printed JSON-file per cache, like '/tmp/DEVINT-us-east-1-all-LambdaLayers.json'
+### SqliteCacheStore   -- stores each item (Lambda, Stack, IAM-Role, ..) as a ROW within a local SQLite-file.
+###                       Indexed by name, ARN, tags, and resource-type, so that scripts can QUERY the cache without loading everything into Python.
+###                       Example: "all Lambdas tagged tier=uat using layer X" ..
+###                           store.query( resource_type="lambda-function", tags={"tier": "uat"}, references_arn_like="%:layer:X%" )
+### NdjsonCacheStore   -- gzip- (or zstd-) compressed NDJSON-file per cache, with a small 1-line header (API, params, fetch-timestamp, item-count).
+###                       Can be read LAZILY via `iter_items()`, so scripts that filter early never materialize the full list.
+###                       Transparently falls back to the legacy '.json' file, if the compressed-file does NOT exist (yet).
+###
+### All backends use the `json_output_filepath` (the same path that the JSON-file backend uses) as the KEY for each cache.
+### So, switching backends requires NO changes to the scripts that use `InvokeAWSApi` or `GenericAWSCLIScript`.
+### All backends can ATOMICALLY `replace()` one cache with another.  Used by `InvokeAWSApi`'s stale-while-revalidate mode.
+### All file-based writes are crash-safe (temp-file + fsync + rename).  See `atomic_write()`.  So, an interrupted write never leaves a truncated cache.
+###
+### CacheRefreshLock -- advisory lock (fcntl.flock) on '<json_output_filepath>.lock', held by `InvokeAWSApi` while it REFRESHES a cache.
+###                       So, when multiple scripts share the same cache (example: '/tmp/all-stacks.json'), only ONE of them invokes the AWS-APIs;
+###                       the others wait for it, and then re-use the freshly-saved cache.
+###
+### NdjsonAppender / iter_ndjson_file() -- one-JSON-item-per-line files, that can be written-to and read-from INCREMENTALLY (page by page).
+###                       Used by `InvokeAWSApi.iter_aws_GenericAWSApi_items()`
+
+from typing import Optional, Iterator
+import os
+import io
+import gzip
+import pathlib
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import contextlib
+
+### OPTIONAL (POSIX-only).  Without it, `CacheRefreshLock` is a no-op.
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+### OPTIONAL dependency -- ONLY needed for `NdjsonCacheStore(compression="zstd")`
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+### ----------------------------------------------------------------------
+
+### Used to infer the "resource-type", "name" and "ARN" of each item within a boto3-response.
+### The 1st matching entry wins.  So, the order matters!
+### Format: ( attribute containing NAME,  attribute containing ARN,  resource-type )
+ITEM_IDENTITY_ATTRIBUTES :list[tuple[str, str, str]] = [
+    ( "FunctionName",   "FunctionArn",   "lambda-function" ),
+    ( "LayerName",      "LayerArn",      "lambda-layer" ),
+    ( "StackName",      "StackId",       "cloudformation-stack" ),
+    ( "RoleName",       "Arn",           "iam-role" ),
+    ( "PolicyName",     "Arn",           "iam-policy" ),
+    ( "logGroupName",   "arn",           "logs-log-group" ),
+    ( "repositoryName", "repositoryArn", "ecr-repository" ),
+]
+
+### Attributes (of an item) that REFERENCE other AWS-resources' ARNs.  Example: the Lambda-Layers used by a Lambda.
+### Value is either a string-ARN, or a list of dicts, each having an "Arn" attribute.
+ITEM_REFERENCE_ATTRIBUTES :list[str] = [ "Layers", "Role", "RoleARN" ]
+
+DEFAULT_SQLITE_FILEPATH = "/tmp/aws-api-cache.sqlite"
+
+### 1st line of every `NdjsonCacheStore` file is a JSON-object with this as its ONLY key.
+NDJSON_HEADER_KEY = "__aws_api_cache_header__"
+NDJSON_FORMAT_VERSION = 1
+
+### compression -> file-suffix (appended to the legacy-filename's stem)
+NDJSON_COMPRESSION_SUFFIXES :dict[str, str] = {
+    "gzip": ".ndjson.gz",
+    "zstd": ".ndjson.zst",
+    None:   ".ndjson",
+}
+
+### ----------------------------------------------------------------------
+
+class JsonFileCacheStore():
+    """ The original backend: One pretty-printed JSON-file per cache (indent=4).
+        The `json_output_filepath` is the actual file on disk.
+    """
+
+    def exists(self, json_output_filepath :pathlib.Path) -> bool:
+        return pathlib.Path(json_output_filepath).exists()
+
+    def last_modified(self, json_output_filepath :pathlib.Path) -> float:
+        """ Returns the time (secs since epoch) when the cache was last saved """
+        return pathlib.Path(json_output_filepath).stat().st_mtime
+
+    def load(self, json_output_filepath :pathlib.Path) -> any:
+        with open(str(json_output_filepath)) as f:
+            return json.load(f)
+
+    def iter_items(self, json_output_filepath :pathlib.Path) -> Iterator[any]:
+        """ NOT lazy.  The entire JSON-file has to be parsed, before the 1st item can be yielded. """
+        yield from self.load( json_output_filepath )
+
+    def save(self, json_output_filepath :pathlib.Path, inmemory_cache :any, header :Optional[dict] = None) -> None:
+        """ `header` is ignored.  The legacy JSON-format has NO place for it. """
+        with atomic_write( json_output_filepath ) as f:
+            json.dump(inmemory_cache, f, indent=4, default=str)
+
+    def replace(self, src_json_output_filepath :pathlib.Path, json_output_filepath :pathlib.Path) -> None:
+        """ Atomically swaps the 1st-param's cache INTO the 2nd-param's.  Readers see either the old or the new cache; never a mix. """
+        os.replace( str(src_json_output_filepath), str(json_output_filepath) )
+
+### ----------------------------------------------------------------------
+
+class SqliteCacheStore():
+    """ Stores each item of a cache as a ROW (and NOT the entire cache as one giant JSON-document).
+        The `json_output_filepath` is ONLY used as the cache's KEY.  Nothing is written to that path.
+        Non-list caches (like the dict returned by `load_role_associated_inline_policy_cache()`) are stored as a single JSON-document.
+        Safe to use from multiple threads, as every method opens its own SQLite-connection.
+    """
+
+    def __init__(self,
+        db_filepath :str = DEFAULT_SQLITE_FILEPATH,
+        debug :bool = False,
+    ) -> None:
+        self.db_filepath = str(db_filepath)
+        self.debug = debug
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS caches (
+                    cache_key   TEXT PRIMARY KEY,
+                    saved_at    REAL NOT NULL,
+                    item_count  INTEGER NOT NULL,
+                    raw_json    TEXT            -- ONLY for non-list caches
+                );
+                CREATE TABLE IF NOT EXISTS items (
+                    cache_key       TEXT NOT NULL,
+                    item_key        TEXT NOT NULL,
+                    seq             INTEGER NOT NULL,
+                    resource_type   TEXT,
+                    name            TEXT,
+                    arn             TEXT,
+                    body            TEXT NOT NULL,
+                    PRIMARY KEY ( cache_key, item_key )
+                );
+                CREATE INDEX IF NOT EXISTS idx_items_name ON items ( name );
+                CREATE INDEX IF NOT EXISTS idx_items_arn  ON items ( arn );
+                CREATE INDEX IF NOT EXISTS idx_items_type ON items ( resource_type, name );
+                CREATE TABLE IF NOT EXISTS item_tags (
+                    cache_key   TEXT NOT NULL,
+                    item_key    TEXT NOT NULL,
+                    tag_key     TEXT NOT NULL,
+                    tag_value   TEXT,
+                    PRIMARY KEY ( cache_key, item_key, tag_key )
+                );
+                CREATE INDEX IF NOT EXISTS idx_item_tags_kv ON item_tags ( tag_key, tag_value );
+                CREATE TABLE IF NOT EXISTS item_refs (
+                    cache_key   TEXT NOT NULL,
+                    item_key    TEXT NOT NULL,
+                    ref_arn     TEXT NOT NULL,
+                    PRIMARY KEY ( cache_key, item_key, ref_arn )
+                );
+                CREATE INDEX IF NOT EXISTS idx_item_refs_arn ON item_refs ( ref_arn );
+            """)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect( self.db_filepath, timeout=60 )
+        try:
+            with conn: ### commits (or rolls back) the transaction
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _cache_key(json_output_filepath :pathlib.Path) -> str:
+        return str(pathlib.Path(json_output_filepath))
+
+    ### ------------------------------------------------
+
+    def exists(self, json_output_filepath :pathlib.Path) -> bool:
+        with self._connect() as conn:
+            row = conn.execute( "SELECT 1 FROM caches WHERE cache_key = ?", (self._cache_key(json_output_filepath),) ).fetchone()
+        return row is not None
+
+    def last_modified(self, json_output_filepath :pathlib.Path) -> float:
+        """ Returns the time (secs since epoch) when the cache was last saved """
+        with self._connect() as conn:
+            row = conn.execute( "SELECT saved_at FROM caches WHERE cache_key = ?", (self._cache_key(json_output_filepath),) ).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"No cache named '{json_output_filepath}' within SQLite-file '{self.db_filepath}'")
+        return row[0]
+
+    def load(self, json_output_filepath :pathlib.Path) -> any:
+        cache_key = self._cache_key(json_output_filepath)
+        with self._connect() as conn:
+            row = conn.execute( "SELECT raw_json FROM caches WHERE cache_key = ?", (cache_key,) ).fetchone()
+            if row is None:
+                raise FileNotFoundError(f"No cache named '{json_output_filepath}' within SQLite-file '{self.db_filepath}'")
+            if row[0] is not None:
+                return json.loads(row[0])
+            rows = conn.execute( "SELECT body FROM items WHERE cache_key = ? ORDER BY seq", (cache_key,) ).fetchall()
+        return [ json.loads(r[0]) for r in rows ]
+
+    def iter_items(self, json_output_filepath :pathlib.Path) -> Iterator[any]:
+        """ Lazily yields one item (row) at a time. """
+        cache_key = self._cache_key(json_output_filepath)
+        with self._connect() as conn:
+            row = conn.execute( "SELECT raw_json FROM caches WHERE cache_key = ?", (cache_key,) ).fetchone()
+            if row is None:
+                raise FileNotFoundError(f"No cache named '{json_output_filepath}' within SQLite-file '{self.db_filepath}'")
+            if row[0] is not None:
+                yield from json.loads(row[0])
+                return
+            for r in conn.execute( "SELECT body FROM items WHERE cache_key = ? ORDER BY seq", (cache_key,) ):
+                yield json.loads(r[0])
+
+    def save(self, json_output_filepath :pathlib.Path, inmemory_cache :any, header :Optional[dict] = None) -> None:
+        """ Upserts every item.  Items that are NO longer in `inmemory_cache` are deleted from this cache.
+            `header` is ignored (the `caches` table already tracks when it was saved, and how many items).
+        """
+        cache_key = self._cache_key(json_output_filepath)
+        with self._connect() as conn:
+            if not isinstance(inmemory_cache, list):
+                self._delete_items( conn, cache_key, keep_item_keys=[] )
+                self._upsert_cache_row( conn, cache_key, item_count=len(inmemory_cache), raw_json=json.dumps(inmemory_cache, default=str) )
+                return
+            item_keys = []
+            for seq, item in enumerate(inmemory_cache):
+                item_keys.append( self._upsert_item( conn, cache_key, seq, item ) )
+            self._delete_items( conn, cache_key, keep_item_keys=item_keys )
+            self._upsert_cache_row( conn, cache_key, item_count=len(inmemory_cache), raw_json=None )
+        if self.debug: print(f"Saved {len(inmemory_cache)} items as cache '{cache_key}' within SQLite-file '{self.db_filepath}'")
+
+    def replace(self, src_json_output_filepath :pathlib.Path, json_output_filepath :pathlib.Path) -> None:
+        """ Atomically swaps the 1st-param's cache INTO the 2nd-param's (within ONE SQLite-transaction). """
+        src_cache_key = self._cache_key(src_json_output_filepath)
+        cache_key = self._cache_key(json_output_filepath)
+        with self._connect() as conn:
+            for tbl in [ "caches", "items", "item_tags", "item_refs" ]:
+                conn.execute( f"DELETE FROM {tbl} WHERE cache_key = ?", (cache_key,) )
+                conn.execute( f"UPDATE {tbl} SET cache_key = ? WHERE cache_key = ?", (cache_key, src_cache_key) )
+
+    def upsert_item(self, json_output_filepath :pathlib.Path, item :dict) -> str:
+        """ Inserts (or replaces) a SINGLE item within an existing cache, WITHOUT rewriting the rest of the cache.
+            Returns the item's key (its ARN, else its name).
+        """
+        cache_key = self._cache_key(json_output_filepath)
+        with self._connect() as conn:
+            row = conn.execute( "SELECT COALESCE(MAX(seq),-1)+1 FROM items WHERE cache_key = ?", (cache_key,) ).fetchone()
+            item_key = self._upsert_item( conn, cache_key, row[0], item )
+            cnt = conn.execute( "SELECT COUNT(*) FROM items WHERE cache_key = ?", (cache_key,) ).fetchone()[0]
+            self._upsert_cache_row( conn, cache_key, item_count=cnt, raw_json=None )
+        return item_key
+
+    ### ------------------------------------------------
+
+    def query(self,
+        resource_type :Optional[str] = None,
+        name :Optional[str] = None,
+        name_like :Optional[str] = None,
+        arn :Optional[str] = None,
+        tags :Optional[dict[str, str]] = None,
+        references_arn_like :Optional[str] = None,
+        json_output_filepath :Optional[pathlib.Path] = None,
+    ) -> list[dict]:
+        """ Returns the items matching ALL of the specified criteria (across ALL caches, unless `json_output_filepath` is specified).
+            `name_like` and `references_arn_like` use SQL-LIKE wildcards (% and _).
+            `resource_type` is one of the values within `ITEM_IDENTITY_ATTRIBUTES` (example: "lambda-function").
+            `tags` is a dict of tag-key -> tag-value (use None as tag-value, to match ANY value).
+        """
+        where = [ "1=1" ]
+        params = []
+        if json_output_filepath is not None:
+            where.append( "i.cache_key = ?" );  params.append( self._cache_key(json_output_filepath) )
+        if resource_type is not None:
+            where.append( "i.resource_type = ?" );  params.append( resource_type )
+        if name is not None:
+            where.append( "i.name = ?" );  params.append( name )
+        if name_like is not None:
+            where.append( "i.name LIKE ?" );  params.append( name_like )
+        if arn is not None:
+            where.append( "i.arn = ?" );  params.append( arn )
+        for tag_key, tag_value in (tags or {}).items():
+            if tag_value is None:
+                where.append( "EXISTS ( SELECT 1 FROM item_tags t WHERE t.cache_key = i.cache_key AND t.item_key = i.item_key AND t.tag_key = ? )" )
+                params.append( tag_key )
+            else:
+                where.append( "EXISTS ( SELECT 1 FROM item_tags t WHERE t.cache_key = i.cache_key AND t.item_key = i.item_key AND t.tag_key = ? AND t.tag_value = ? )" )
+                params.extend([ tag_key, tag_value ])
+        if references_arn_like is not None:
+            where.append( "EXISTS ( SELECT 1 FROM item_refs r WHERE r.cache_key = i.cache_key AND r.item_key = i.item_key AND r.ref_arn LIKE ? )" )
+            params.append( references_arn_like )
+
+        sql = f"SELECT i.body FROM items i WHERE {' AND '.join(where)} ORDER BY i.cache_key, i.seq"
+        if self.debug: print(f"SQL = {sql}\nparams = {params}")
+        with self._connect() as conn:
+            rows = conn.execute( sql, params ).fetchall()
+        return [ json.loads(r[0]) for r in rows ]
+
+    ### ------------------------------------------------
+
+    def _upsert_cache_row(self, conn, cache_key :str, item_count :int, raw_json :Optional[str]) -> None:
+        conn.execute("""
+            INSERT INTO caches ( cache_key, saved_at, item_count, raw_json ) VALUES ( ?, ?, ?, ? )
+            ON CONFLICT ( cache_key ) DO UPDATE SET saved_at = excluded.saved_at, item_count = excluded.item_count, raw_json = excluded.raw_json
+        """, ( cache_key, time.time(), item_count, raw_json ))
+
+    def _upsert_item(self, conn, cache_key :str, seq :int, item :dict) -> str:
+        resource_type, name, arn = identify_item( item )
+        body = json.dumps( item, default=str )
+        item_key = arn or name or hashlib.sha256( body.encode('utf-8') ).hexdigest()
+        conn.execute("""
+            INSERT INTO items ( cache_key, item_key, seq, resource_type, name, arn, body ) VALUES ( ?, ?, ?, ?, ?, ?, ? )
+            ON CONFLICT ( cache_key, item_key ) DO UPDATE SET
+                seq = excluded.seq, resource_type = excluded.resource_type, name = excluded.name, arn = excluded.arn, body = excluded.body
+        """, ( cache_key, item_key, seq, resource_type, name, arn, body ))
+
+        conn.execute( "DELETE FROM item_tags WHERE cache_key = ? AND item_key = ?", (cache_key, item_key) )
+        conn.executemany( "INSERT OR REPLACE INTO item_tags ( cache_key, item_key, tag_key, tag_value ) VALUES ( ?, ?, ?, ? )",
+            [ (cache_key, item_key, k, v) for k, v in get_item_tags( item ).items() ] )
+
+        conn.execute( "DELETE FROM item_refs WHERE cache_key = ? AND item_key = ?", (cache_key, item_key) )
+        conn.executemany( "INSERT OR IGNORE INTO item_refs ( cache_key, item_key, ref_arn ) VALUES ( ?, ?, ? )",
+            [ (cache_key, item_key, ref) for ref in get_item_references( item ) ] )
+        return item_key
+
+    def _delete_items(self, conn, cache_key :str, keep_item_keys :list[str]) -> None:
+        conn.execute( "CREATE TEMP TABLE IF NOT EXISTS keep_keys ( item_key TEXT PRIMARY KEY )" )
+        conn.execute( "DELETE FROM keep_keys" )
+        conn.executemany( "INSERT OR IGNORE INTO keep_keys ( item_key ) VALUES ( ? )", [ (k,) for k in keep_item_keys ] )
+        for tbl in [ "items", "item_tags", "item_refs" ]:
+            conn.execute( f"DELETE FROM {tbl} WHERE cache_key = ? AND item_key NOT IN ( SELECT item_key FROM keep_keys )", (cache_key,) )
+
+### ----------------------------------------------------------------------
+
+class NdjsonCacheStore():
+    """ One COMPRESSED NDJSON-file per cache: '/tmp/DEVINT-us-east-1-all-LambdaLayers.json' is stored as '/tmp/DEVINT-us-east-1-all-LambdaLayers.ndjson.gz'
+        1st line is a header like:  {"__aws_api_cache_header__": {"api": "lambda.list_layers", "params": {}, "fetched_at": .., "item_count": .., "kind": "list"}}
+        Every other line is ONE item.  Non-list caches (dicts) are stored as one `[key, value]` pair per line.
+        If the compressed-file does NOT exist, but the legacy '.json' file does, then the legacy file is used (read-only).
+    """
+
+    def __init__(self,
+        compression :Optional[str] = "gzip",
+        compresslevel :int = 6,
+        debug :bool = False,
+    ) -> None:
+        if compression not in NDJSON_COMPRESSION_SUFFIXES:
+            raise ValueError(f"!! ERROR !! Unknown compression '{compression}'. Must be one of: {list(NDJSON_COMPRESSION_SUFFIXES.keys())}")
+        if compression == "zstd" and zstandard is None:
+            raise ImportError("!! ERROR !! compression='zstd' requires the OPTIONAL package 'zstandard'.  Run: pip install zstandard")
+        self.compression = compression
+        self.compresslevel = compresslevel
+        self.debug = debug
+        self._legacy_store = JsonFileCacheStore()
+
+    def ndjson_filepath(self, json_output_filepath :pathlib.Path) -> pathlib.Path:
+        json_output_filepath = pathlib.Path(json_output_filepath)
+        return json_output_filepath.with_name( json_output_filepath.stem + NDJSON_COMPRESSION_SUFFIXES[self.compression] )
+
+    ### ------------------------------------------------
+
+    def exists(self, json_output_filepath :pathlib.Path) -> bool:
+        return self.ndjson_filepath(json_output_filepath).exists() or self._legacy_store.exists(json_output_filepath)
+
+    def last_modified(self, json_output_filepath :pathlib.Path) -> float:
+        """ Returns the time (secs since epoch) when the cache was last saved """
+        ndjson_filepath = self.ndjson_filepath(json_output_filepath)
+        if ndjson_filepath.exists():
+            return ndjson_filepath.stat().st_mtime
+        return self._legacy_store.last_modified(json_output_filepath)
+
+    def read_header(self, json_output_filepath :pathlib.Path) -> Optional[dict]:
+        """ Returns None, if falling back to the legacy '.json' file (which has NO header). """
+        ndjson_filepath = self.ndjson_filepath(json_output_filepath)
+        if not ndjson_filepath.exists():
+            return None
+        with open_ndjson_file( ndjson_filepath, "r" ) as f:
+            return _parse_ndjson_header( f.readline() )
+
+    def load(self, json_output_filepath :pathlib.Path) -> any:
+        ndjson_filepath = self.ndjson_filepath(json_output_filepath)
+        if not ndjson_filepath.exists():
+            if self.debug: print(f"'{ndjson_filepath}' is missing.  Falling back to legacy-file '{json_output_filepath}'")
+            return self._legacy_store.load(json_output_filepath)
+        header = self.read_header(json_output_filepath) or {}
+        items = list( iter_ndjson_file( ndjson_filepath ) )
+        if header.get("kind") == "dict":
+            return { k: v for k, v in items }
+        return items
+
+    def iter_items(self, json_output_filepath :pathlib.Path) -> Iterator[any]:
+        """ Lazily yields one item (line) at a time.  For dict-caches, yields `[key, value]` pairs. """
+        ndjson_filepath = self.ndjson_filepath(json_output_filepath)
+        if not ndjson_filepath.exists():
+            legacy_cache = self._legacy_store.load(json_output_filepath)
+            yield from ( legacy_cache.items() if isinstance(legacy_cache, dict) else legacy_cache )
+            return
+        yield from iter_ndjson_file( ndjson_filepath )
+
+    def save(self, json_output_filepath :pathlib.Path, inmemory_cache :any, header :Optional[dict] = None) -> None:
+        """ `header` is OPTIONAL info like `{"api": "lambda.list_functions", "params": {..}}`.
+            The fetch-timestamp, item-count and kind (list or dict) are always added automatically.
+        """
+        ndjson_filepath = self.ndjson_filepath(json_output_filepath)
+        is_dict = isinstance(inmemory_cache, dict)
+        header = {
+            **(header or {}),
+            "fetched_at": time.time(),
+            "item_count": len(inmemory_cache),
+            "kind": "dict" if is_dict else "list",
+            "format_version": NDJSON_FORMAT_VERSION,
+        }
+        with NdjsonAppender( ndjson_filepath, header=header, compression=self.compression, compresslevel=self.compresslevel ) as appender:
+            appender.append( [ [k, v] for k, v in inmemory_cache.items() ] if is_dict else inmemory_cache )
+            appender.commit()
+        if self.debug: print(f"Saved {len(inmemory_cache)} items into '{ndjson_filepath}'")
+
+    def replace(self, src_json_output_filepath :pathlib.Path, json_output_filepath :pathlib.Path) -> None:
+        """ Atomically swaps the 1st-param's cache INTO the 2nd-param's.  Readers see either the old or the new cache; never a mix. """
+        os.replace( self.ndjson_filepath(src_json_output_filepath), self.ndjson_filepath(json_output_filepath) )
+
+### ----------------------------------------------------------------------
+
+class NdjsonAppender():
+    """ Appends items (one JSON-document per line) to a NDJSON-file -- as they arrive, page by page.
+        The items are written into a (unique) "<file>.<pid>.<thread>.partial" file, which is fsync'd and renamed to the actual-file ONLY by `commit()`.
+        So, an incomplete/interrupted listing never looks like a complete cache.
+        Use as a context-manager.  If `commit()` was NOT invoked before exiting the context, the partial-file is deleted.
+        OPTIONAL `header` is written as the 1st line (see `NDJSON_HEADER_KEY`).
+        `compression` is one of the keys of `NDJSON_COMPRESSION_SUFFIXES`.
+    """
+
+    def __init__(self,
+        ndjson_filepath :pathlib.Path,
+        header :Optional[dict] = None,
+        compression :Optional[str] = None,
+        compresslevel :int = 6,
+    ) -> None:
+        self.ndjson_filepath = pathlib.Path(ndjson_filepath)
+        self.partial_filepath = self.ndjson_filepath.with_name( f"{self.ndjson_filepath.name}.{os.getpid()}.{threading.get_ident()}.partial" )
+        self.header = header
+        self.compression = compression
+        self.compresslevel = compresslevel
+        self.item_count = 0
+        self._f = None
+
+    def __enter__(self):
+        self._f = open_ndjson_file( self.partial_filepath, "w", compression=self.compression, compresslevel=self.compresslevel )
+        if self.header is not None:
+            self._f.write( json.dumps({ NDJSON_HEADER_KEY: self.header }, default=str) )
+            self._f.write( "\n" )
+        return self
+
+    def append(self, items :list) -> None:
+        for item in items:
+            self._f.write( json.dumps(item, default=str) )
+            self._f.write( "\n" )
+        self._f.flush()
+        self.item_count += len(items)
+
+    def commit(self) -> None:
+        self._f.close()
+        _fsync_path( self.partial_filepath )     ### The compressed-streams do NOT expose the underlying file-descriptor.
+        os.replace( self.partial_filepath, self.ndjson_filepath )
+        _fsync_path( self.ndjson_filepath.parent )
+
+    def __exit__(self, exc_type, exc_value, tb) -> None:
+        if not self._f.closed:
+            self._f.close()
+            self.partial_filepath.unlink( missing_ok=True )
+
+### ----------------------------------------------------------------------
+
+@contextlib.contextmanager
+def atomic_write( filepath :pathlib.Path, mode :str = "w" ) -> Iterator[io.IOBase]:
+    """ Crash-safe replacement for `open(filepath, "w")`.
+        Writes into a unique temp-file (in the SAME directory), fsync()s it, and only then renames it over `filepath`.
+        So, readers see either the old or the new file -- never a truncated one.  If the with-block raises, `filepath` is left untouched.
+    """
+    filepath = pathlib.Path(filepath)
+    tmp_filepath = filepath.with_name( f".{filepath.name}.{os.getpid()}.{threading.get_ident()}.tmp" )
+    try:
+        with open( str(tmp_filepath), mode ) as f:
+            yield f
+            f.flush()
+            os.fsync( f.fileno() )
+        os.replace( tmp_filepath, filepath )
+        _fsync_path( filepath.parent )   ### Persist the rename itself.
+    finally:
+        tmp_filepath.unlink( missing_ok=True )
+
+def _fsync_path( path :pathlib.Path ) -> None:
+    """ fsync()s a file or a directory, by its path.  Silently skipped, where NOT supported (example: directories on Windows). """
+    try:
+        fd = os.open( str(path), os.O_RDONLY )
+    except OSError:
+        return
+    try:
+        os.fsync( fd )
+    except OSError:
+        pass
+    finally:
+        os.close( fd )
+
+class CacheRefreshLock():
+    """ Advisory, inter-process lock (fcntl.flock) on the file '<json_output_filepath>.lock'.  Use as a context-manager, around a cache-REFRESH.
+        After entering, `waited` is True if ANOTHER process (or thread) was holding the lock.  In that case, the cache was very likely
+        just refreshed by that other holder -- so the caller should re-check the cache's age, before invoking any AWS-APIs.
+        Re-entrant within the same thread (example: `get_all_stacks_full_details()` -> `list_stacks()` on the same cache).
+        Only the OUTERMOST instance (the one that opened the lock-file) releases the lock; nested instances are no-ops.
+        With `reentrant=False` (for coroutines, which share ONE thread), every instance opens its OWN lock-file descriptor.
+        With `blocking=False`, it does NOT wait.  Instead, `acquired` is False if ANOTHER process (or thread) is holding the lock.
+        A no-op, on platforms without `fcntl`.
+    """
+    _held_by_thread = threading.local()
+
+    def __init__(self,
+        json_output_filepath :pathlib.Path,
+        CTX :str = "",
+        blocking :bool = True,
+        reentrant :bool = True,
+    ) -> None:
+        self.lock_filepath = str(json_output_filepath) + ".lock"
+        self.CTX = CTX
+        self.blocking = blocking
+        self.reentrant = reentrant
+        self.waited = False
+        self.acquired = False
+        self._f = None
+
+    def __enter__(self):
+        held :dict[str, CacheRefreshLock] = self._held_by_thread.__dict__.setdefault( "lock_owners", {} )
+        if self.reentrant and self.lock_filepath in held:
+            self.acquired = True    ### nested.  The owner (outer instance) holds the lock.
+            return self
+        if fcntl is not None:
+            self._f = open( self.lock_filepath, "a" )
+            try:
+                fcntl.flock( self._f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB )
+            except BlockingIOError:
+                if not self.blocking:
+                    self._f.close()
+                    self._f = None
+                    return self
+                print(f"⏳ Another process is refreshing the cache '{self.lock_filepath[:-len('.lock')]}'.  Waiting for it.. {self.CTX}")
+                fcntl.flock( self._f.fileno(), fcntl.LOCK_EX )
+                self.waited = True
+        if self.reentrant:
+            held[ self.lock_filepath ] = self
+        self.acquired = True
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb) -> None:
+        if not self.acquired:
+            return
+        self.acquired = False
+        held :dict[str, CacheRefreshLock] = self._held_by_thread.__dict__.setdefault( "lock_owners", {} )
+        if held.get( self.lock_filepath ) is self:
+            del held[ self.lock_filepath ]
+        if self._f is not None:     ### ONLY the owner has an open lock-file.
+            fcntl.flock( self._f.fileno(), fcntl.LOCK_UN )
+            self._f.close()
+            self._f = None
+
+### ----------------------------------------------------------------------
+
+def iter_ndjson_file( ndjson_filepath :pathlib.Path ) -> Iterator[dict]:
+    """ Lazily yields one item per line.  The entire file is NEVER loaded into memory.
+        Compression is inferred from the file-suffix.  The OPTIONAL header-line is skipped.
+    """
+    with open_ndjson_file( ndjson_filepath, "r" ) as f:
+        for lineno, line in enumerate(f):
+            if not line.strip():
+                continue
+            if lineno == 0 and _parse_ndjson_header( line ) is not None:
+                continue
+            yield json.loads(line)
+
+def open_ndjson_file(
+    ndjson_filepath :pathlib.Path,
+    mode :str,
+    compression :Optional[str] = None,
+    compresslevel :int = 6,
+) -> io.TextIOBase:
+    """ Opens a (possibly compressed) NDJSON-file in TEXT-mode.
+        `mode` is either "r" or "w".  When reading, `compression` is inferred from the file-suffix (.gz or .zst).
+    """
+    ndjson_filepath = pathlib.Path(ndjson_filepath)
+    if mode == "r":
+        suffix = ndjson_filepath.suffix
+        compression = "gzip" if suffix == ".gz" else "zstd" if suffix == ".zst" else None
+    match compression:
+        case None:
+            return open( str(ndjson_filepath), mode )
+        case "gzip":
+            return gzip.open( str(ndjson_filepath), mode+"t", compresslevel=compresslevel )
+        case "zstd":
+            if zstandard is None:
+                raise ImportError(f"!! ERROR !! Reading/writing '{ndjson_filepath}' requires the OPTIONAL package 'zstandard'.  Run: pip install zstandard")
+            if mode == "r":
+                return io.TextIOWrapper( zstandard.ZstdDecompressor().stream_reader( open(str(ndjson_filepath), "rb"), closefd=True ) )
+            return io.TextIOWrapper( zstandard.ZstdCompressor( level=compresslevel ).stream_writer( open(str(ndjson_filepath), "wb"), closefd=True ) )
+        case _:
+            raise ValueError(f"!! ERROR !! Unknown compression '{compression}'. Must be one of: {list(NDJSON_COMPRESSION_SUFFIXES.keys())}")
+
+def _parse_ndjson_header( line :str ) -> Optional[dict]:
+    """ Returns the header (if the line is the header-line), else None """
+    if not line.startswith( '{"' + NDJSON_HEADER_KEY + '"' ):
+        return None
+    return json.loads(line)[NDJSON_HEADER_KEY]
+
+### ----------------------------------------------------------------------
+
+def identify_item( item :dict ) -> tuple[Optional[str], Optional[str], Optional[str]]:
+    """ Returns a tuple: ( resource-type, name, ARN ) -- any of which can be None """
+    if isinstance(item, dict):
+        for name_attr, arn_attr, resource_type in ITEM_IDENTITY_ATTRIBUTES:
+            if name_attr in item:
+                return resource_type, item.get(name_attr), item.get(arn_attr)
+    return None, None, None
+
+def get_item_tags( item :dict ) -> dict[str, str]:
+    """ Lambdas have Tags as a dict.  Stacks (and most other AWS-APIs) have Tags as a list of { "Key": .., "Value": .. } """
+    tags = item.get("Tags") if isinstance(item, dict) else None
+    if isinstance(tags, dict):
+        return { str(k): str(v) for k, v in tags.items() }
+    if isinstance(tags, list):
+        return { str(t["Key"]): str(t.get("Value")) for t in tags if isinstance(t, dict) and "Key" in t }
+    return {}
+
+def get_item_references( item :dict ) -> list[str]:
+    refs = []
+    if not isinstance(item, dict):
+        return refs
+    for attr in ITEM_REFERENCE_ATTRIBUTES:
+        v = item.get(attr)
+        if isinstance(v, str):
+            refs.append(v)
+        elif isinstance(v, list):
+            refs.extend([ r["Arn"] for r in v if isinstance(r, dict) and "Arn" in r ])
+    return refs
+
+### ----------------------------------------------------------------------
+
+""" Returns a cache-store, given its simple-name ("json" or "sqlite").
+    2nd param is OPTIONAL; for "sqlite" it's the path to the SQLite-file.  Defaults to DEFAULT_SQLITE_FILEPATH
+"""
+def get_cache_store(
+    cache_backend :str = "json",
+    filepath :Optional[str] = None,
+    debug :bool = False,
+) -> any:
+    match cache_backend:
+        case "json":    return JsonFileCacheStore()
+        case "sqlite":  return SqliteCacheStore( db_filepath = filepath or DEFAULT_SQLITE_FILEPATH, debug = debug )
+        case "ndjson-gzip": return NdjsonCacheStore( compression = "gzip", debug = debug )
+        case "ndjson-zstd": return NdjsonCacheStore( compression = "zstd", debug = debug )
+        case _:         raise ValueError(f"!! ERROR !! Unknown cache-backend '{cache_backend}'. Must be one of: json, sqlite, ndjson-gzip, ndjson-zstd")
+
+### EoScript
@@ -1,7 +1,9 @@
 ### This file has a Utility class to make it easy to write COOKIE-CUTTER python-scripts that replace my complicated AWS-CLI.
 ### This file also has the wonderful ability to CACHE the responses from AWS-SDK/boto3, so that scripts are incredibly fast.
+### Where/how that cache is stored is pluggable.  See ./aws_api_cache_store.py
+### In `stale_while_revalidate` mode, an EXPIRED cache is served immediately, while a background-thread refreshes it (and then atomically swaps it in).
 
-from typing import Tuple, Sequence
+from typing import Tuple, Sequence, Optional, Iterator, Callable, Union
 import sys
 import boto3
 import os
@@ -10,7 +12,31 @@ import json
 import time
 import regex
 import traceback
+import hashlib
+import threading
+import concurrent.futures
+import atexit
 from datetime import datetime, timedelta
+from botocore.config import Config
+
+from .aws_api_cache_store import (
+    JsonFileCacheStore,
+    CacheRefreshLock,
+    NdjsonAppender,
+    atomic_write,
+    iter_ndjson_file,
+)
+from .aws_api_rate_limiter import (
+    ApiRateLimiter,
+)
+from .aws_api_metrics import (
+    ApiCallMetrics,
+)
+from .aws_iam_snapshot import (
+    IAM_SNAPSHOT_FILTERS,
+    new_authorization_snapshot,
+    normalize_authorization_details_page,
+)
 
 class MyException(Exception):
     pass
@@ -18,14 +44,63 @@ class MyException(Exception):
 class InvokeAWSApi():
     debug: bool = False
 
+    ### See `get_client()`
+    DEFAULT_MAX_POOL_CONNECTIONS = 10   ### botocore's own default
+    MAX_RETRY_ATTEMPTS = 10
+
+    ### Used by `delta_refresh` mode (see `merge_delta_refresh()`).
+    ### Key = the boto3 LIST-api's method-name.
+    ### Value = ( the item's attribute that UNIQUELY identifies it,  [ list of "change-markers" that tell us whether the item changed since it was cached ] )
+    DELTA_REFRESH_CHANGE_MARKERS :dict[str, Tuple[str, list[str]]] = {
+        "list_functions": ( "FunctionArn", [ "LastModified", "CodeSha256" ] ),
+        "list_stacks":    ( "StackId",     [ "LastUpdatedTime", "StackStatus" ] ),
+        "list_roles":     ( "Arn",         [ "CreateDate" ] ),
+    }
+
+    ### Per-resource TTLs of the caches.  Used by `stale_while_revalidate` mode (unless the constructor's `cache_ttl` param is specified).
+    ### Key = "<service>.<list-api>" or just "<service>".  The most-specific key wins.
+    ### Value = a TTL like "90s", "15m", "1h", "1d" (or a number of DAYS, just like `cache_no_older_than`).  See `cache_ttl_in_secs()`
+    ### These OVERRIDE whatever `cache_no_older_than` the scripts pass in.
+    RECOMMENDED_CACHE_TTL :dict[str, Union[str,int]] = {
+        "lambda.list_layers":         "1h",
+        "lambda.list_layer_versions": "1h",
+        "iam":                        "1d",
+        "cloudformation":             "15m",
+    }
+
     def __init__(self,
         aws_profile :str = None,
         aws_region :str = "us-east-1",
         session: boto3.Session = None,
-        debug: bool = False
+        debug: bool = False,
+        cache_store = None,  ### OPTIONAL; See ./aws_api_cache_store.py.  Defaults to the original one-JSON-file-per-cache.
+        api_metrics_report :bool = True,  ### At exit, print a per-AWS-API latency-report.  See ./aws_api_metrics.py
+        api_metrics_json_filepath :Optional[str] = None,  ### OPTIONAL; ALSO save that report as JSON.  Defaults to env-var AWS_API_METRICS_JSON
+        rate_limiting :bool = True,  ### Set to False, ONLY when NOT talking to AWS (example: replaying fixtures).  See `get_client()`
+        client_hooks :Optional[list] = None,  ### OPTIONAL; objects with a `register(client)` method.  Example: ./aws_api_record_replay.py
+        stale_while_revalidate :bool = False,  ### Serve an EXPIRED cache immediately, and refresh it in the background.  See `serve_stale_while_revalidating()`
+        cache_ttl :Optional[dict] = None,  ### OPTIONAL; per-resource TTLs.  Defaults to `RECOMMENDED_CACHE_TTL` in stale_while_revalidate mode (else, NONE).
     ) -> None:
 
         self.debug = debug
+        self.cache_store = cache_store if cache_store else JsonFileCacheStore()
+        self.rate_limiter = ApiRateLimiter( debug=debug ) if rate_limiting else None
+        self.client_hooks = client_hooks or []
+        self.api_metrics = ApiCallMetrics( debug=debug )
+        if api_metrics_report:
+            atexit.register( self.api_metrics.report, api_metrics_json_filepath or os.environ.get("AWS_API_METRICS_JSON") )
+        self._clients :dict[tuple, any] = {}
+        self._clients_lock = threading.Lock()
+
+        self.stale_while_revalidate = stale_while_revalidate
+        if cache_ttl is not None:
+            self.cache_ttl = cache_ttl
+        else:
+            self.cache_ttl = self.RECOMMENDED_CACHE_TTL if stale_while_revalidate else {}
+        self._revalidation = threading.local()  ### `.filepaths` = the cache(s) being refreshed by the CURRENT thread.
+        self._revalidation_lock = threading.Lock()
+        self._revalidation_futures :dict[str, concurrent.futures.Future] = {}
+        self._revalidation_executor :Optional[concurrent.futures.ThreadPoolExecutor] = None
 
         self.aws_profile = aws_profile
         self.session = session
@@ -58,7 +133,7 @@ class InvokeAWSApi():
             raise MyException("!!ERROR!! Session(AWS) is STILL undefined!! Context="+CTX)
 
         ### Section: AWS SDK initialization (for API/SDK calls)
-        client = self.session.client('sts')
+        client = self.get_client('sts')
         account_id = client.get_caller_identity()["Account"]
         default_region_in_awsprofile = self.session.region_name
         if self.debug: print(f"\nAWS Account ID: {account_id}")
@@ -69,43 +144,185 @@ class InvokeAWSApi():
         return self.session
     ### @@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@
 
+    """ The ONLY place that boto3-clients should be created (by this class, and by all the scripts that use it).
+        1st param is the boto3 service-name, like 'lambda' or 'logs'.
+        2nd-OPTIONAL-param is the AWS-Region.  Defaults to the session's region.
+        3rd-OPTIONAL-param is the # of threads that will SHARE this client.  The client's HTTP connection-pool is sized to fit.
+        4th-OPTIONAL-param is an additional botocore `Config` (example: a longer `read_timeout`), merged on top of the defaults.
+        Every client has:
+            (1) botocore's "adaptive" retry-mode (which retries throttled calls, with client-side rate-limiting)
+            (2) per-API token-buckets (SHARED across all clients of this object), that back off on throttling and ramp up again.  See ./aws_api_rate_limiter.py
+            (3) per-API instrumentation (call-count, latency, retries, throttles, bytes).  See ./aws_api_metrics.py
+            (4) whatever `client_hooks` were passed to the constructor.
+        Clients are cached & re-used (boto3-clients are thread-safe; boto3-SESSIONS are NOT).
+    """
+    def get_client( self,
+        aws_client_type :str,
+        region_name :Optional[str] = None,
+        max_workers :int = 1,
+        config :Optional[Config] = None,
+    ):
+        region_name = region_name if region_name else self.session.region_name
+        max_pool_connections = max( self.DEFAULT_MAX_POOL_CONNECTIONS, max_workers + 2 )
+        cache_key = ( aws_client_type, region_name, max_pool_connections, id(config) if config else None )
+        with self._clients_lock:
+            if cache_key not in self._clients:
+                client_config = Config(
+                    retries = { "mode": "adaptive", "max_attempts": self.MAX_RETRY_ATTEMPTS },
+                    max_pool_connections = max_pool_connections,
+                )
+                if config:
+                    client_config = client_config.merge( config )
+                client = self.session.client( aws_client_type, region_name=region_name, config=client_config )
+                if self.rate_limiter:
+                    self.rate_limiter.register( client )
+                self.api_metrics.register( client )     ### AFTER the rate-limiter, so that latency excludes the time waiting for a token.
+                for hook in self.client_hooks:          ### LAST, so that a replayed-response is still rate-limited & measured.
+                    hook.register( client )
+                self._clients[cache_key] = client
+            return self._clients[cache_key]
+
+    ### @@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@
+
+    """ Converts a TTL into seconds.
+        The only param is either a number of DAYS (the original meaning of `cache_no_older_than`), or a string like "90s", "15m", "1h", "1d"
+    """
+    @staticmethod
+    def cache_ttl_in_secs( cache_no_older_than :Union[int,float,str] ) -> float:
+        if isinstance(cache_no_older_than, (int, float)):
+            return cache_no_older_than * 24 * 60 * 60
+        ttl_match = regex.fullmatch( r"\s*(\d+(?:\.\d+)?)\s*([smhd])\s*", str(cache_no_older_than) )
+        if not ttl_match:
+            raise MyException(f"!! ERROR !! Invalid cache-TTL '{cache_no_older_than}'.  Must be a number of days, or a string like '90s', '15m', '1h', '1d'")
+        return float(ttl_match.group(1)) * { "s": 1, "m": 60, "h": 60*60, "d": 24*60*60 }[ ttl_match.group(2) ]
+
+    """ Returns the per-resource TTL (from `self.cache_ttl`) for the AWS-API named like "lambda.list_layers", if any.
+        Else, returns the 2nd-param as-is.
+    """
+    def get_cache_ttl( self,
+        api_name :Optional[str],
+        cache_no_older_than :Union[int,float,str],
+    ) -> Union[int,float,str]:
+        if api_name:
+            for key in [ api_name, api_name.split(".")[0] ]:
+                if key in self.cache_ttl:
+                    return self.cache_ttl[key]
+        return cache_no_older_than
+
     """ 1st param is a path like '/tmp/aws-cli-cmd-xyz.json'.
-        The 2nd-param is # of days (how old can the Cache-file be)
+        The 2nd-param is # of days (how old can the Cache-file be).  Or, a string like "15m" or "1h".  See `cache_ttl_in_secs()`
         The 2nd-param represents the maximum _ days old before invoking SDK-APIs to refresh the json_output_filepath
+        The 3rd-OPTIONAL-param overrides `self.cache_store` (example: to check a plain-file that is NOT managed by `self.cache_store`)
+        The 4th-OPTIONAL-param is the AWS-API (like "lambda.list_layers") whose per-resource TTL (if any, within `self.cache_ttl`) overrides the 2nd-param.
     """
     def is_cache_too_old(
         self,
         json_output_filepath: str,
-        cache_no_older_than: int,
+        cache_no_older_than: Union[int,float,str],
+        cache_store = None,
+        api_name :Optional[str] = None,
     ) -> bool:
-        if not json_output_filepath.exists():
+        cache_store = cache_store if cache_store else self.cache_store
+        cache_no_older_than = self.get_cache_ttl( api_name, cache_no_older_than )
+        if str(json_output_filepath) in getattr( self._revalidation, "filepaths", set() ):
+            if self.debug: print(f"Cache '{json_output_filepath}' is being refreshed in the background.  So, ignoring its age.")
+            re_run_aws_sdk_call = True
+        elif not cache_store.exists( json_output_filepath ):
             print(f"Cache is missing!! a.k.a. File '{json_output_filepath}' is missing!!")
             re_run_aws_sdk_call = True
         else:
             # Check if the file was last modified over a week ago
-            cache_no_older_than__in_secs = cache_no_older_than * 24 * 60 * 60  # 7 days
-            file_modified_time = json_output_filepath.stat().st_mtime
+            cache_no_older_than__in_secs = self.cache_ttl_in_secs( cache_no_older_than )
+            file_modified_time = cache_store.last_modified( json_output_filepath )
             current_time = time.time()
 
             if current_time - file_modified_time > cache_no_older_than__in_secs:
                 re_run_aws_sdk_call = True
-                print(f"The CACHE/file '{json_output_filepath}' is too old by at least {cache_no_older_than} days !!! ")
+                ttl_str = f"{cache_no_older_than} days" if isinstance(cache_no_older_than, (int, float)) else cache_no_older_than
+                print(f"The CACHE/file '{json_output_filepath}' is too old by at least {ttl_str} !!! ")
             else:
                 re_run_aws_sdk_call = False
                 print(f"The CACHE/file '{json_output_filepath}' is still fresh enough.\n", '_'*80,"\n\n")
         return re_run_aws_sdk_call
 
+    ### ----------------------------------------------------------
+    """ Stale-while-revalidate: invoked ONLY after `is_cache_too_old()` returned True.
+        If `self.stale_while_revalidate` is on -AND- an (expired) cache exists, this returns that STALE cache immediately,
+        and refreshes it on a background-thread.  Else, returns None (a.k.a. the caller must refresh the cache itself, as before).
+        1st param is a path like '/tmp/aws-cli-cmd-xyz.json'.
+        2nd param is a callable that re-creates the cache, given a path.  Example: `lambda fp: self.list_lambdas( json_output_filepath=fp, .. )`
+            It is invoked with a SHADOW-path (pre-loaded with the stale cache, so that `delta_refresh` still works).
+            Once it completes, the shadow-cache is atomically swapped into the 1st-param.  See `replace()` in ./aws_api_cache_store.py
+        At most ONE refresh per cache is in-flight.  The python-process will NOT exit until all background-refreshes are done.  See `wait_for_revalidation()`
+    """
+    def serve_stale_while_revalidating( self,
+        json_output_filepath :pathlib.Path,
+        refresh :Callable[[pathlib.Path], any],
+        CTX :str,
+    ) -> Optional[any]:
+        json_output_filepath = pathlib.Path(json_output_filepath)
+        if not self.stale_while_revalidate:
+            return None
+        if getattr( self._revalidation, "filepaths", None ):
+            return None   ### This thread IS a background-refresh.  So, do NOT spawn yet another one.
+        if not self.cache_store.exists( json_output_filepath ):
+            return None   ### Nothing stale to serve.
+        stale_results = self.cache_store.load( json_output_filepath )
+        with self._revalidation_lock:
+            if str(json_output_filepath) not in self._revalidation_futures:
+                if self._revalidation_executor is None:
+                    self._revalidation_executor = concurrent.futures.ThreadPoolExecutor( max_workers=1, thread_name_prefix="cache-revalidation" )
+                self._revalidation_futures[ str(json_output_filepath) ] = self._revalidation_executor.submit(
+                    self._revalidate_cache, json_output_filepath, stale_results, refresh, CTX )
+        print(f"⟳ Using {len(stale_results)} rows of the STALE cache '{json_output_filepath}', while refreshing it in the background.. {CTX}\n")
+        return stale_results
+
+    def _revalidate_cache( self,
+        json_output_filepath :pathlib.Path,
+        stale_results :any,
+        refresh :Callable[[pathlib.Path], any],
+        CTX :str,
+    ) -> None:
+        ### Unique per-process.  So, a crashed/concurrent process's shadow-cache is never clobbered (nor swapped in).
+        shadow_filepath = json_output_filepath.with_name( f"{json_output_filepath.stem}.revalidating.{os.getpid()}{json_output_filepath.suffix}" )
+        self._revalidation.filepaths = { str(shadow_filepath) }
+        try:
+            ### Held across the save, refresh AND replace.  If another process is already refreshing this cache, leave it to that process.
+            with CacheRefreshLock( json_output_filepath, CTX, blocking=False ) as refresh_lock:
+                if not refresh_lock.acquired:
+                    print(f"\n⏩ Another process is already refreshing the cache '{json_output_filepath}'.  Skipping the background-refresh. {CTX}")
+                    return
+                self.cache_store.save( shadow_filepath, stale_results )
+                refresh( shadow_filepath )
+                self.cache_store.replace( shadow_filepath, json_output_filepath )
+            print(f"\n⟳ Background-refresh of the cache '{json_output_filepath}' is done. {CTX}")
+        except (Exception, SystemExit) as e:    ### Some methods `sys.exit(71)` on failure.
+            print(f"\n!! ERROR !! Background-refresh of the cache '{json_output_filepath}' FAILED; the stale cache is left as-is. {CTX}: {str(e)}")
+            if self.debug: traceback.print_exc()
+        finally:
+            self._revalidation.filepaths = set()
+            with self._revalidation_lock:
+                self._revalidation_futures.pop( str(json_output_filepath), None )
+
+    """ Blocks until all the background-refreshes (if any) are done.  See `serve_stale_while_revalidating()` """
+    def wait_for_revalidation(self) -> None:
+        with self._revalidation_lock:
+            futures = list( self._revalidation_futures.values() )
+        concurrent.futures.wait( futures )
+
 
     ### @@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@
 
     """ 1st param is a path like '/tmp/aws-cli-cmd-xyz.json'.
         The 2nd-param is the AWS-Profile to use.
         The 3rd-OPTIONAL-param is # of days (how old can the Cache-file be).  Defaults to 7-days
+        The 4th-OPTIONAL-param (if True) re-uses the unchanged Lambdas from the stale cache. See `merge_delta_refresh()`
     """
     def list_lambdas( self,
         json_output_filepath: str, ## f"{TMPDIR}/all-iam-roles.json"
         # aws_profile: str,
         cache_no_older_than: int = 7,     ### maximum _ days old before invoking SDK-APIs to refresh the json_output_filepath
+        delta_refresh :bool = False,      ### See `merge_delta_refresh()`
     ) -> any:
         return self.invoke_aws_GenericAWSApi_for_complete_response(
             aws_client_type = 'lambda',
@@ -114,6 +331,7 @@ class InvokeAWSApi():
             response_key = 'Functions',
             json_output_filepath = json_output_filepath,
             cache_no_older_than = cache_no_older_than,
+            delta_refresh = delta_refresh,
         )
 
     ### ----------------------------------------------------------
@@ -121,11 +339,13 @@ class InvokeAWSApi():
     """ 1st param is a path like '/tmp/aws-cli-cmd-xyz.json'.
         The 2nd-param is the AWS-Profile to use.
         The 3rd-OPTIONAL-param is # of days (how old can the Cache-file be).  Defaults to 7-days
+        The 4th-OPTIONAL-param (if True) re-uses the unchanged Stacks from the stale cache. See `merge_delta_refresh()`
     """
     def list_stacks( self,
         json_output_filepath: str, ## f"{TMPDIR}/all-iam-roles.json"
         # aws_profile: str,
         cache_no_older_than: int = 7,     ### maximum _ days old before invoking SDK-APIs to refresh the json_output_filepath
+        delta_refresh :bool = False,      ### See `merge_delta_refresh()`
     ) -> any:
         return self.invoke_aws_GenericAWSApi_for_complete_response(
             aws_client_type = 'cloudformation',
@@ -137,6 +357,7 @@ class InvokeAWSApi():
             response_key = 'StackSummaries',
             json_output_filepath = json_output_filepath,
             cache_no_older_than = cache_no_older_than,
+            delta_refresh = delta_refresh,
         )
 
     ### ----------------------------------------------------------
@@ -146,9 +367,11 @@ class InvokeAWSApi():
     """
     def get_all_versions_of_lambda( self,
         lambda_name :str,
+        lambda_client = None, ### OPTIONAL; pass in a SHARED boto3-client (especially when invoked from multiple threads)
     ) -> Tuple[list,str]:
         try:
-            lambda_client = self.session.client('lambda')
+            if lambda_client is None:
+                lambda_client = self.get_client('lambda')
 
             all_versions = []
             marker = None
@@ -185,220 +408,402 @@ class InvokeAWSApi():
             return all_versions, latest_version_id
 
         except Exception as e:
+            ### Throttling is already retried (with backoff) by the client.  See `get_client()`.  So, NO more sleeping here.
             print(f"!! ERROR !! getting versions for {lambda_name}: {str(e)}")
-            traceback.print_exc()
-            time.sleep(30)
+            if self.debug: traceback.print_exc()
+            raise
 
     ### ----------------------------------------------------------
+    """ 1st param is a path like '/tmp/aws-cli-cmd-xyz.json'.
+        2nd-OPTIONAL-param is # of days (how old can the Cache-file be).  Defaults to 7-days
+        3rd-OPTIONAL-param is the # of threads, to invoke `get_function()` + `list_versions_by_function()` + `get_provisioned_concurrency_config()` CONCURRENTLY for many Lambdas.
+            Defaults to 1 (a.k.a. the original one-Lambda-at-a-time behaviour).
+            All threads share ONE boto3 Lambda-client (boto3-clients are thread-safe; boto3-SESSIONS are NOT).
+            The results are merged back into the list in the SAME order as `list_functions()` returned them.
+        4th-OPTIONAL-param (if True) -- once the cache is too old -- re-invokes ONLY the cheap `list_functions()` and then enriches ONLY the new/changed Lambdas.
+            See `merge_delta_refresh()`.  Defaults to False (a.k.a. everything is re-fetched).
+    """
     def get_all_lambdas_full_details( self,
         json_output_filepath: str, ## f"{TMPDIR}/all-iam-roles.json"
         # aws_profile: str,
         cache_no_older_than: int = 7,     ### maximum _ days old before invoking SDK-APIs to refresh the json_output_filepath
+        max_workers :int = 1,
+        delta_refresh :bool = False,
     ) -> any:
         CTX = f"get_all_lambdas_full_details('{json_output_filepath}'): "
-        ### Note: `aws-cli` command `list-function` and the corresponding `boto3 list_function()` on respond with SOME of the Lambda-attributes/configuration.
-        all_lambdas_w_props = self.list_lambdas(
-            json_output_filepath = json_output_filepath,
-            # aws_profile = aws_profile,
-            cache_no_older_than = cache_no_older_than,
-        )
-
-        if self.debug: print(f"\nInvoking `lambda_client.get_function()` and `lambda_client.get_concurrency()` for each Lambda within {CTX}\n")
-        ### Load additional details on each Lambda, like ProvisionedConcurrency, and merge that detail into the `all_lambdas_w_props`
-        lambda_client = self.session.client('lambda')
-        lambda_details :dict = None
-        for lambda_details in all_lambdas_w_props:
-            lambda_name = lambda_details['FunctionName']
-            # lambda_arn = lambda_details['FunctionArn']
+        ### Must check here (and NOT leave it to `list_lambdas()`), else the background-refresh would replace the ENRICHED cache with the plain listing.
+        if self.stale_while_revalidate and self.is_cache_too_old( json_output_filepath=json_output_filepath, cache_no_older_than=cache_no_older_than, api_name="lambda.list_functions" ):
+            stale_results = self.serve_stale_while_revalidating( json_output_filepath, CTX=CTX,
+                refresh = lambda fp: self.get_all_lambdas_full_details( fp, cache_no_older_than, max_workers, delta_refresh ) )
+            if stale_results is not None:
+                return stale_results
+        ### Held across BOTH the listing and the enrichment, as both write to the same cache.  `list_lambdas()` re-checks the cache's age.
+        with CacheRefreshLock( json_output_filepath, CTX ):
+            ### Note: `aws-cli` command `list-function` and the corresponding `boto3 list_function()` on respond with SOME of the Lambda-attributes/configuration.
+            all_lambdas_w_props = self.list_lambdas(
+                json_output_filepath = json_output_filepath,
+                # aws_profile = aws_profile,
+                cache_no_older_than = cache_no_older_than,
+                delta_refresh = delta_refresh,
+            )
+
+            if self.debug: print(f"\nInvoking `lambda_client.get_function()` and `lambda_client.get_concurrency()` for each Lambda (max_workers={max_workers}) within {CTX}\n")
+            ### Load additional details on each Lambda, like ProvisionedConcurrency, and merge that detail into the `all_lambdas_w_props`
+            lambda_client = self.get_client( 'lambda', max_workers=max_workers )
 
             ### Check whether .. the Cache has already invoked `lambda_client.get_function()` and `lambda_client.get_concurrency()`
-            # if "Tags" in lambda_details and "ProvisionedConcurrency" in lambda_details:
-            if 'ProvisionedConcurrency' in lambda_details:
-                if self.debug: print("⏩", end="", flush=True)
-                continue
+            pending_indexes :list[int] = []
+            for indx, lambda_details in enumerate(all_lambdas_w_props):
+                # if "Tags" in lambda_details and "ProvisionedConcurrency" in lambda_details:
+                if 'ProvisionedConcurrency' in lambda_details:
+                    if self.debug: print("⏩", end="", flush=True)
+                else:
+                    pending_indexes.append(indx)
+
+            failed_lambda_name = None
+            failed_exception :Exception = None
+            if max_workers <= 1:
+                for indx in pending_indexes:
+                    try:
+                        all_lambdas_w_props[indx] = self._fetch_lambda_full_details( lambda_client, all_lambdas_w_props[indx], CTX )
+                    except Exception as e:
+                        failed_lambda_name = all_lambdas_w_props[indx]['FunctionName']
+                        failed_exception = e
+                        break
             else:
-                lambda_details['ProvisionedConcurrency'] = None
-                ### Initialize any missing values, so repeated AWS-Boto3 invocations do Not happen (below)
+                with concurrent.futures.ThreadPoolExecutor( max_workers=max_workers ) as executor:
+                    futures = {
+                        indx: executor.submit( self._fetch_lambda_full_details, lambda_client, all_lambdas_w_props[indx], CTX )
+                        for indx in pending_indexes
+                    }
+                    ### Merge back in the ORIGINAL order (and NOT in the order of completion), so the cache-file is deterministic.
+                    for indx in pending_indexes:
+                        try:
+                            all_lambdas_w_props[indx] = futures[indx].result()
+                        except Exception as e:
+                            failed_lambda_name = all_lambdas_w_props[indx]['FunctionName']
+                            failed_exception = e
+                            executor.shutdown( wait=True, cancel_futures=True )
+                            break
+
+            if failed_lambda_name:
+                print(f"!! ERROR !! getting provisioned-concurrency for {failed_lambda_name}: {str(failed_exception)}")
+                traceback.print_exception(failed_exception, limit=None, file=sys.stderr)
+                ### Save whatever was enriched so far, so that a re-run will "⏩ skip" those Lambdas.
+                self.update_diskfile_cache(
+                    json_output_filepath = json_output_filepath,
+                    inmemory_cache = all_lambdas_w_props,
+                )
+                sys.exit(71)
+
+            self.update_diskfile_cache(
+                json_output_filepath = json_output_filepath,
+                inmemory_cache = all_lambdas_w_props,
+            )
+            return all_lambdas_w_props
+
+    ### ----------------------------------------------------------
+    """ Invokes `get_function()`, `list_versions_by_function()` and `get_provisioned_concurrency_config()` for ONE Lambda.
+        Works on a COPY of the 2nd-param, so that the caller decides when (and in what order) to merge it back.
+        Safe to invoke from multiple threads concurrently, as long as the 1st-param (boto3-client) is shared and NOT the boto3-session.
+        Raises an exception, if `get_function()` fails.
+    """
+    def _fetch_lambda_full_details( self,
+        lambda_client,
+        lambda_details :dict,
+        CTX :str,
+    ) -> dict:
+        lambda_details = dict(lambda_details)
+        lambda_name = lambda_details['FunctionName']
+        # lambda_arn = lambda_details['FunctionArn']
+
+        lambda_details['ProvisionedConcurrency'] = None
+        ### Initialize any missing values, so repeated AWS-Boto3 invocations do Not happen (below)
+
+        print("↓", end="", flush=True)
+        addl_details = lambda_client.get_function(
+            FunctionName=lambda_name,
+            # Qualifier='version#'
+        )
+        if self.debug > 4:
+            print("\n", '.'*80, "\n")
+            print(json.dumps(lambda_details, indent=4, default=str))
 
-            # print(lambda_details)
-            # print(lambda_name)
-            # time.sleep(15)
+        ### Now copy Tags, Code and other Configuration elements into the main-cache for Lambdas
+        lambda_details["Code"] = addl_details["Code"]
 
+        if "Tags" in addl_details:
+            lambda_details["Tags"] = addl_details["Tags"]
+        else:
+            if self.debug: print(f"\n\n!! WARNING !! {lambda_name} does NOT have a Tags !!\n")
+            print(f"\t! ⚠️{lambda_name}⚠️ ", end="", flush=True)
+
+        addl_details = addl_details['Configuration']
+        for k in addl_details.keys():
+            if self.debug > 1: print(f"Lambda-Configuration-KEY = {k} within {CTX}")
+            v = addl_details[k]
+            if self.debug > 1: print(v)
+            if not k in lambda_details:
+                lambda_details[k] = v
 
-            try:
+        try:
+            latest_versionid :str = None
+            ### Get the latest version of this lambda, by invoking lambda_client.list_versions_by_function()
+            lambda_versions, latest_versionid = self.get_all_versions_of_lambda( lambda_name=lambda_name, lambda_client=lambda_client )
+            lambda_details['Versions'] = lambda_versions
+
+            # print(lambda_versions)
+            if self.debug: print(f"\nLatest Version: {latest_versionid}]\tfor {lambda_name} ..", end="", flush=True)
+            if self.debug > 1: print(f"\nLatest Version: {latest_versionid} for {lambda_name} within {CTX}\n")
+            ### For this "lambda_name", get provisioned-concurrency information -- for latest version at least.
+            if latest_versionid:
                 print("↓", end="", flush=True)
-                addl_details = lambda_client.get_function(
+                lambda_provisioned_concurrency :dict = lambda_client.get_provisioned_concurrency_config(
                     FunctionName=lambda_name,
-                    # Qualifier='version#'
+                    Qualifier=latest_versionid,
+                    # Qualifier="$LATEST", ### will throw an error/exception. Need actual Numerical VersionId of Lambda!!!
                 )
-                if self.debug > 4:
-                    print("\n", '.'*80, "\n")
-                    print(json.dumps(lambda_details, indent=4, default=str))
+                lambda_provisioned_concurrency.pop('ResponseMetadata', None) ### delete this entry from JSON.
+                lambda_details['ProvisionedConcurrency'] = lambda_provisioned_concurrency
 
-                ### Now copy Tags, Code and other Configuration elements into the main-cache for Lambdas
-                lambda_details["Code"] = addl_details["Code"]
+        except Exception as e:
+            # print(f"!! ERROR !! getting provisioned-concurrency for {lambda_name}: {str(e)}")
+            if self.debug > 1: print(f" --NO-- provisioned-concurrency for {lambda_name} VersionId={latest_versionid}\n{str(e)}\n")
 
-                if "Tags" in addl_details:
-                    lambda_details["Tags"] = addl_details["Tags"]
-                else:
-                    if self.debug: print(f"\n\n!! WARNING !! {lambda_name} does NOT have a Tags !!\n")
-                    print(f"\t! ⚠️{lambda_name}⚠️ ", end="", flush=True)
-
-                addl_details = addl_details['Configuration']
-                for k in addl_details.keys():
-                    if self.debug > 1: print(f"Lambda-Configuration-KEY = {k} within {CTX}")
-                    v = addl_details[k]
-                    if self.debug > 1: print(v)
-                    if not k in lambda_details:
-                        lambda_details[k] = v
-
-                try:
-                    latest_versionid :str = None
-                    ### Get the latest version of this lambda, by invoking lambda_client.list_versions_by_function()
-                    lambda_versions, latest_versionid = self.get_all_versions_of_lambda( lambda_name=lambda_name )
-                    lambda_details['Versions'] = lambda_versions
-
-                    # print(lambda_versions)
-                    if self.debug: print(f"\nLatest Version: {latest_versionid}]\tfor {lambda_name} ..", end="", flush=True)
-                    if self.debug > 1: print(f"\nLatest Version: {latest_versionid} for {lambda_name} within {CTX}\n")
-                    ### For this "lambda_name", get provisioned-concurrency information -- for latest version at least.
-                    if latest_versionid:
-                        print("↓", end="", flush=True)
-                        lambda_provisioned_concurrency :dict = lambda_client.get_provisioned_concurrency_config(
-                            FunctionName=lambda_name,
-                            Qualifier=latest_versionid,
-                            # Qualifier="$LATEST", ### will throw an error/exception. Need actual Numerical VersionId of Lambda!!!
-                        )
-                        lambda_provisioned_concurrency.pop('ResponseMetadata', None) ### delete this entry from JSON.
-                        lambda_details['ProvisionedConcurrency'] = lambda_provisioned_concurrency
-
-                except Exception as e:
-                    # print(f"!! ERROR !! getting provisioned-concurrency for {lambda_name}: {str(e)}")
-                    if self.debug > 1: print(f" --NO-- provisioned-concurrency for {lambda_name} VersionId={latest_versionid}\n{str(e)}\n")
-
-                # time.sleep(1)
-
-                if self.debug > 2: print(json.dumps(lambda_details, indent=4, default=str))
-                print(".", end="", flush=True)
-
-            except Exception as e:
-                print(f"!! ERROR !! getting provisioned-concurrency for {lambda_name}: {str(e)}")
-                traceback.print_exc(limit=None, file=sys.stderr)
-                sys.exit(71)
+        # time.sleep(1)
 
-        self.update_diskfile_cache(
-            json_output_filepath = json_output_filepath,
-            inmemory_cache = all_lambdas_w_props,
-        )
-        return all_lambdas_w_props
+        if self.debug > 2: print(json.dumps(lambda_details, indent=4, default=str))
+        print(".", end="", flush=True)
+        return lambda_details
 
     ### ----------------------------------------------------------
+    """ 1st param is the app-name (ONLY stacks whose name starts with this prefix are enriched).
+        2nd param is a path like '/tmp/aws-cli-cmd-xyz.json'.
+        3rd-OPTIONAL-param is # of days (how old can the Cache-file be).  Defaults to 7-days
+        4th-OPTIONAL-param is the # of threads, to invoke `describe_stacks()` + `get_template()` CONCURRENTLY for many stacks.
+            Defaults to 1 (a.k.a. the original one-Stack-at-a-time behaviour).
+        5th-OPTIONAL-param is a folder, into which EACH stack's TemplateBody is saved as its own content-addressed file (named by its SHA-256).
+            If specified, the main-cache will -NOT- contain "TemplateBody".  Instead it'll contain "TemplateBodyRef" (the file's path) & "TemplateBodySha256".
+            Use `load_stack_template()` to read the TemplateBody back -- regardless of whether it was saved inline or not.
+            Defaults to None (a.k.a. TemplateBody is saved INLINE within the main-cache, as before).
+        6th-OPTIONAL-param (if True) -- once the cache is too old -- re-invokes ONLY the cheap `list_stacks()` and then enriches ONLY the new/changed Stacks.
+            See `merge_delta_refresh()`.  Defaults to False (a.k.a. everything is re-fetched).
+    """
     def get_all_stacks_full_details( self,
         app_name :str,
         json_output_filepath: str,
         # aws_profile: str,
         cache_no_older_than: int = 7,     ### maximum _ days old before invoking SDK-APIs to refresh the json_output_filepath
+        max_workers :int = 1,
+        templates_dir :Optional[pathlib.Path] = None,
+        delta_refresh :bool = False,
     ) -> any:
         CTX = f"get_all_stacks_full_details('{app_name}'): '{json_output_filepath}'"
-        if not self.is_cache_too_old( json_output_filepath=json_output_filepath, cache_no_older_than=cache_no_older_than ):
+        json_output_filepath = pathlib.Path(json_output_filepath) ### convert a string into a Path object.
+        if not self.is_cache_too_old( json_output_filepath=json_output_filepath, cache_no_older_than=cache_no_older_than, api_name="cloudformation.list_stacks" ):
             # Use the cached response (previously invoked perhaps a few days back)
-            with open(str(json_output_filepath)) as f:
-                complete_results = json.load(f)
+            complete_results = self.cache_store.load( json_output_filepath )
             cnt = len(complete_results)
             print(f"File {json_output_filepath} is present. Context={CTX}.\nSo .. using {cnt} rows of cached AWS-SDK complete_response.. ..\n")
             return complete_results
+        stale_results = self.serve_stale_while_revalidating( json_output_filepath, CTX=CTX,
+            refresh = lambda fp: self.get_all_stacks_full_details( app_name, fp, cache_no_older_than, max_workers, templates_dir, delta_refresh ) )
+        if stale_results is not None:
+            return stale_results
+
+        with CacheRefreshLock( json_output_filepath, CTX ) as refresh_lock:
+            if refresh_lock.waited and not self.is_cache_too_old( json_output_filepath=json_output_filepath, cache_no_older_than=cache_no_older_than, api_name="cloudformation.list_stacks" ):
+                return self.cache_store.load( json_output_filepath )   ### Refreshed by whoever held the lock.
+            CTX = f"get_all_STACKS_full_details('{json_output_filepath}'): "
+            ### Note: `aws-cli` command `list-function` and the corresponding `boto3 list_function()` on respond with SOME of the Lambda-attributes/configuration.
+            all_stk_list = self.list_stacks(
+                json_output_filepath = json_output_filepath,
+                # aws_profile = aws_profile,
+                cache_no_older_than = cache_no_older_than,
+                delta_refresh = delta_refresh,
+            )
+
+            if templates_dir:
+                templates_dir = pathlib.Path(templates_dir)
+                templates_dir.mkdir( parents=True, exist_ok=True )
+
+            if self.debug: print(f"\nInvoking `cloudFormation_client.get_stack()` for each Lambda (max_workers={max_workers}) within {CTX}\n")
+            ### Load additional details on each Lambda, like ProvisionedConcurrency, and merge that detail into the `all_lambdas_w_props`
+            cft_client = self.get_client( 'cloudformation', max_workers=max_workers )
+            pending_indexes :list[int] = []
+            for indx, stk_props in enumerate(all_stk_list):
+                stk_name :str = stk_props['StackName']
+                # stk_id :str = stk_props['StackId']
+                if not stk_name.startswith( app_name ):
+                    if self.debug: print(f"Skipping Stack {stk_name} as it does NOT start with {app_name} ..")
+                    print("⏩", end="", flush=True)
+                    continue
+                if delta_refresh and "Parameters" in stk_props:
+                    ### `merge_delta_refresh()` retained this UNCHANGED stack's details (from the stale cache).
+                    if self.debug: print("⏩", end="", flush=True)
+                    continue
+                pending_indexes.append(indx)
+
+            failed_stk_name = None
+            failed_exception :Exception = None
+            if max_workers <= 1:
+                for indx in pending_indexes:
+                    try:
+                        all_stk_list[indx] = self._fetch_stack_full_details( cft_client, all_stk_list[indx], templates_dir, CTX )
+                    except Exception as e:
+                        failed_stk_name = all_stk_list[indx]['StackName']
+                        failed_exception = e
+                        break
+            else:
+                ### Each worker holds at most ONE TemplateBody in memory at a time (when `templates_dir` is specified).
+                with concurrent.futures.ThreadPoolExecutor( max_workers=max_workers ) as executor:
+                    futures = {
+                        indx: executor.submit( self._fetch_stack_full_details, cft_client, all_stk_list[indx], templates_dir, CTX )
+                        for indx in pending_indexes
+                    }
+                    ### Merge back in the ORIGINAL order (and NOT in the order of completion), so the cache-file is deterministic.
+                    for indx in pending_indexes:
+                        try:
+                            all_stk_list[indx] = futures[indx].result()
+                        except Exception as e:
+                            failed_stk_name = all_stk_list[indx]['StackName']
+                            failed_exception = e
+                            executor.shutdown( wait=True, cancel_futures=True )
+                            break
+
+            if failed_stk_name:
+                print(f"!! ERROR !! getting additional-details for Stack '{failed_stk_name}': {str(failed_exception)}")
+                traceback.print_exception(failed_exception, limit=None, file=sys.stderr)
+                sys.exit(71)
 
-        CTX = f"get_all_STACKS_full_details('{json_output_filepath}'): "
-        ### Note: `aws-cli` command `list-function` and the corresponding `boto3 list_function()` on respond with SOME of the Lambda-attributes/configuration.
-        all_stk_list = self.list_stacks(
-            json_output_filepath = json_output_filepath,
-            # aws_profile = aws_profile,
-            cache_no_older_than = cache_no_older_than,
+            self.update_diskfile_cache(
+                json_output_filepath = json_output_filepath,
+                inmemory_cache = all_stk_list,
+            )
+            return all_stk_list
+
+    ### ----------------------------------------------------------
+    """ Invokes `describe_stacks()` and `get_template()` for ONE stack.
+        Works on a COPY of the 2nd-param, so that the caller decides when (and in what order) to merge it back.
+        Safe to invoke from multiple threads concurrently, as long as the 1st-param (boto3-client) is shared and NOT the boto3-session.
+    """
+    def _fetch_stack_full_details( self,
+        cft_client,
+        stk_props :dict,
+        templates_dir :Optional[pathlib.Path],
+        CTX :str,
+    ) -> dict:
+        stk_props = dict(stk_props)
+        stk_name :str = stk_props['StackName']
+
+        print("↓", end="", flush=True)
+        addl_details = cft_client.describe_stacks(
+            StackName = stk_name,
+            # Qualifier='version#'
+        )
+        if len(addl_details['Stacks']) > 1:
+            raise MyException(f"!! ERROR !! More than 1 Stack returned for '{stk_name}' !")
+        addl_details = addl_details['Stacks'][0]
+        if self.debug > 4:
+            print("\n", '.'*80, "\n")
+            print(json.dumps(stk_props, indent=4, default=str))
+
+        key = "Parameters"
+        stk_props[ key ] = addl_details[ key ]
+        key = "Outputs"
+        if key in addl_details:
+            stk_props[ key ] = addl_details[ key ]
+        key = "RoleARN"
+        if key in addl_details:
+            stk_props[ key ] = addl_details[ key ]
+
+        resp = cft_client.get_template(
+            ### https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/cloudformation/client/get_template.html
+            StackName = stk_name,
+            TemplateStage = 'Original' ### | 'Processed'
         )
+        key = "TemplateBody"
+        if templates_dir:
+            tmpl_path, tmpl_sha256 = self.save_stack_template( templates_dir=templates_dir, template_body=resp[ key ] )
+            stk_props.pop( key, None )
+            stk_props[ "TemplateBodyRef" ] = str(tmpl_path)
+            stk_props[ "TemplateBodySha256" ] = tmpl_sha256
+        else:
+            stk_props[ key ] = resp[ key ]
+        del resp ### Do NOT hold onto the TemplateBody any longer than necessary.
 
-        if self.debug: print(f"\nInvoking `cloudFormation_client.get_stack()` for each Lambda within {CTX}\n")
-        ### Load additional details on each Lambda, like ProvisionedConcurrency, and merge that detail into the `all_lambdas_w_props`
-        cft_client = self.session.client('cloudformation')
-        for stk_props in all_stk_list:
-            stk_name :str = stk_props['StackName']
-            # stk_id :str = stk_props['StackId']
-
-            # print(stk_props)
-            # print(stk_name)
-            # time.sleep(15)
-            if not stk_name.startswith( app_name ):
-                if self.debug: print(f"Skipping Stack {stk_name} as it does NOT start with {app_name} ..")
-                print("⏩", end="", flush=True)
-                continue
-
-            try:
-                print("↓", end="", flush=True)
-                addl_details = cft_client.describe_stacks(
-                    StackName = stk_name,
-                    # Qualifier='version#'
-                )
-                if len(addl_details['Stacks']) > 1:
-                    raise MyException(f"!! ERROR !! More than 1 Stack returned for '{stk_name}' !")
-                addl_details = addl_details['Stacks'][0]
-                if self.debug > 4:
-                    print("\n", '.'*80, "\n")
-                    print(json.dumps(stk_props, indent=4, default=str))
-
-                key = "Parameters"
-                stk_props[ key ] = addl_details[ key ]
-                key = "Outputs"
-                if key in addl_details:
-                    stk_props[ key ] = addl_details[ key ]
-                key = "RoleARN"
-                if key in addl_details:
-                    stk_props[ key ] = addl_details[ key ]
-
-                resp = cft_client.get_template(
-                    ### https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/cloudformation/client/get_template.html
-                    StackName = stk_name,
-                    TemplateStage = 'Original' ### | 'Processed'
-                )
-                key = "TemplateBody"
-                stk_props[ key ] = resp[ key ]
+        if "Tags" in addl_details:
+            stk_props["Tags"] = addl_details["Tags"]
+        else:
+            if self.debug: print(f"\n\n!! WARNING !! {stk_name} does NOT have a Tags !!\n")
+            print(f"\t! ⚠️{stk_name}⚠️ ", end="", flush=True)
 
-                if "Tags" in addl_details:
-                    stk_props["Tags"] = addl_details["Tags"]
-                else:
-                    if self.debug: print(f"\n\n!! WARNING !! {stk_name} does NOT have a Tags !!\n")
-                    print(f"\t! ⚠️{stk_name}⚠️ ", end="", flush=True)
-
-                # addl_details = addl_details['Parameters']
-                # for k in addl_details.keys():
-                #     if self.debug > 1: print(f"Stack-PARAMETER-KEY = {k} within {CTX}")
-                #     v = addl_details[k]
-                #     if self.debug > 1: print(v)
-                #     if not k in stk_props:
-                #         stk_props[k] = v
-
-                if self.debug > 2: print(json.dumps(stk_props, indent=4, default=str))
-                print(".", end="", flush=True)
-
-            except Exception as e:
-                print(f"!! ERROR !! getting additional-details for Stack '{stk_name}': {str(e)}")
-                traceback.print_exc(limit=None, file=sys.stderr)
-                sys.exit(71)
+        # addl_details = addl_details['Parameters']
+        # for k in addl_details.keys():
+        #     if self.debug > 1: print(f"Stack-PARAMETER-KEY = {k} within {CTX}")
+        #     v = addl_details[k]
+        #     if self.debug > 1: print(v)
+        #     if not k in stk_props:
+        #         stk_props[k] = v
 
-        self.update_diskfile_cache(
-            json_output_filepath = json_output_filepath,
-            inmemory_cache = all_stk_list,
-        )
-        return all_stk_list
+        if self.debug > 2: print(json.dumps(stk_props, indent=4, default=str))
+        print(".", end="", flush=True)
+        return stk_props
+
+    ### ----------------------------------------------------------
+    """ Saves a CloudFormation TemplateBody into the folder (1st param), as a file named by the SHA-256 of its contents.
+        boto3 returns the TemplateBody as a dict (JSON-templates) or as a str (YAML-templates).
+        Identical templates (across stacks, or across runs) are saved only ONCE.
+        Returns a tuple: (path-to-file, sha256-hex)
+    """
+    @staticmethod
+    def save_stack_template(
+        templates_dir :pathlib.Path,
+        template_body :any,
+    ) -> Tuple[pathlib.Path, str]:
+        if isinstance(template_body, str):
+            content = template_body.encode('utf-8')
+            file_ext = "yaml"
+        else:
+            content = json.dumps(template_body, indent=4, default=str).encode('utf-8')
+            file_ext = "json"
+        sha256_hex = hashlib.sha256(content).hexdigest()
+        tmpl_path = pathlib.Path(templates_dir) / f"{sha256_hex}.{file_ext}"
+        if not tmpl_path.exists():
+            ### Write to a unique temp-file + rename, so that 2 threads writing the SAME template never produce a half-written file.
+            with atomic_write( tmpl_path, "wb" ) as f:
+                f.write(content)
+        return tmpl_path, sha256_hex
+
+    ### ----------------------------------------------------------
+    """ Returns the TemplateBody of a stack (as cached by `get_all_stacks_full_details()`), whether saved INLINE or as a separate file.
+        JSON-templates are returned as a dict, YAML-templates as a str (same as boto3's `get_template()`).
+    """
+    @staticmethod
+    def load_stack_template( stk_props :dict ) -> any:
+        if "TemplateBody" in stk_props:
+            return stk_props["TemplateBody"]
+        tmpl_ref = stk_props.get("TemplateBodyRef")
+        if not tmpl_ref:
+            return None
+        with open(tmpl_ref) as f:
+            if tmpl_ref.endswith(".json"):
+                return json.load(f)
+            else:
+                return f.read()
 
     ### @@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@
 
     """ 1st param is a path like '/tmp/aws-cli-cmd-xyz.json'.
         The 2nd-param is the AWS-Profile to use.
         The 3rd-OPTIONAL-param is # of days (how old can the Cache-file be).  Defaults to 7-days
+        The 4th-OPTIONAL-param (if True) re-uses the unchanged Roles from the stale cache. See `merge_delta_refresh()`
     """
     def list_iam_roles( self,
         json_output_filepath: str, ## f"{TMPDIR}/all-iam-roles.json"
         # aws_profile: str,
         cache_no_older_than: int = 7,     ### maximum _ days old before invoking SDK-APIs to refresh the json_output_filepath
+        delta_refresh :bool = False,      ### See `merge_delta_refresh()`
     ) -> any:
 
         ### ----------------------------------------------------------------------
@@ -411,6 +816,7 @@ class InvokeAWSApi():
             response_key = 'Roles',
             json_output_filepath = json_output_filepath,
             cache_no_older_than = cache_no_older_than,
+            delta_refresh = delta_refresh,
         )
 
     ### @@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@
@@ -432,41 +838,86 @@ class InvokeAWSApi():
         ### Logic to --Cache-- the output of AWS-SDK API-calls (into temporary files)
         ### As necessary invoke AWS SDK API calls.
 
-        if self.is_cache_too_old( json_output_filepath=json_output_filepath, cache_no_older_than=cache_no_older_than ):
-            print(f"{CTX} Invoking the massive AWS-SDK API to update the file ${json_output_filepath}...")
-            client = self.session.client('iam')
-            all_iam_Policies = []
-            marker = None
-
-            while True:
-                if marker:
-                    response = client.list_policies(Marker=marker)
-                else:
-                    response = client.list_policies()
-
-                print("↓", end="", flush=True)
-                all_iam_Policies.extend(response.get('Policies'))
-                marker = response.get('Marker')
-                # print(f"nextToken='{marker}'")
-
-                if not marker:
-                    break
-
-            # Write the final complete-response as JSON to the file
-            with open(str(json_output_filepath), "w") as f:
-                json.dump(all_iam_Policies, f, indent=4, default=str)
-
-            print(f"{CTX} Retrieved {len(all_iam_Policies)} in total.")
+        if self.is_cache_too_old( json_output_filepath=json_output_filepath, cache_no_older_than=cache_no_older_than, api_name="iam.list_policies" ):
+            stale_results = self.serve_stale_while_revalidating( json_output_filepath, CTX=CTX,
+                refresh = lambda fp: self.list_iam_policies( json_output_filepath=fp, cache_no_older_than=cache_no_older_than ) )
+            if stale_results is not None:
+                return stale_results
+            with CacheRefreshLock( json_output_filepath, CTX ) as refresh_lock:
+                if refresh_lock.waited and not self.is_cache_too_old( json_output_filepath=json_output_filepath, cache_no_older_than=cache_no_older_than, api_name="iam.list_policies" ):
+                    return self.cache_store.load( json_output_filepath )   ### Refreshed by whoever held the lock.
+                print(f"{CTX} Invoking the massive AWS-SDK API to update the file ${json_output_filepath}...")
+                client = self.get_client('iam')
+                all_iam_Policies = []
+                marker = None
+
+                while True:
+                    if marker:
+                        response = client.list_policies(Marker=marker)
+                    else:
+                        response = client.list_policies()
+
+                    print("↓", end="", flush=True)
+                    all_iam_Policies.extend(response.get('Policies'))
+                    marker = response.get('Marker')
+                    # print(f"nextToken='{marker}'")
+
+                    if not marker:
+                        break
+
+                # Write the final complete-response as JSON to the file
+                self.cache_store.save( json_output_filepath, all_iam_Policies, header={ "api": "iam.list_policies", "params": {} } )
+
+                print(f"{CTX} Retrieved {len(all_iam_Policies)} in total.")
         else:
             # Use the cached complete-response
-            with open(str(json_output_filepath)) as f:
-                all_iam_Policies = json.load(f)
+            all_iam_Policies = self.cache_store.load( json_output_filepath )
             cnt = len(all_iam_Policies)
             print(f"File {json_output_filepath} is present. Context={CTX}.\nSo .. using {cnt} rows of cached AWS-SDK complete_response.. ..\n")
 
         return all_iam_Policies
 
+    ### ----------------------------------------------------------
+    """ ONE-SHOT snapshot of ALL the Roles (with their inline-policies & attached-policies) and ALL the managed-policies (with their DEFAULT-version's document).
+        Uses the paginated `get_account_authorization_details()`, a.k.a. a handful of API-calls -- instead of N+1 calls per Role (`list_role_policies()`, `get_role_policy()`, ..)
+        1st param is a path like '/tmp/aws-cli-cmd-xyz.json'.
+        2nd-OPTIONAL-param is # of days (how old can the Cache-file be).  Defaults to 7-days
+        3rd-OPTIONAL-param is the `Filter` for the AWS-API.  Defaults to `IAM_SNAPSHOT_FILTERS` (See ./aws_iam_snapshot.py)
+        Returns the normalized snapshot-dict.  For the lookup-maps, wrap it within `IamAuthorizationSnapshot` (See ./aws_iam_snapshot.py)
+    """
+    def get_iam_authorization_snapshot( self,
+        json_output_filepath: str,
+        cache_no_older_than: int = 7,     ### maximum _ days old before invoking SDK-APIs to refresh the json_output_filepath
+        filters :Optional[list[str]] = None,
+    ) -> dict:
+        CTX = f"get_iam_authorization_snapshot(): '{json_output_filepath}'"
+        json_output_filepath = pathlib.Path(json_output_filepath) ### convert a string into a Path object.
+        filters = filters if filters else IAM_SNAPSHOT_FILTERS
+        api_name = "iam.get_account_authorization_details"
+
+        if not self.is_cache_too_old( json_output_filepath=json_output_filepath, cache_no_older_than=cache_no_older_than, api_name=api_name ):
+            snapshot = self.cache_store.load( json_output_filepath )
+            print(f"File {json_output_filepath} is present. Context={CTX}.\nSo .. using {len(snapshot['Roles'])} Roles & {len(snapshot['Policies'])} Policies from the cache.. ..\n")
+            return snapshot
+        stale_results = self.serve_stale_while_revalidating( json_output_filepath, CTX=CTX,
+            refresh = lambda fp: self.get_iam_authorization_snapshot( fp, cache_no_older_than, filters ) )
+        if stale_results is not None:
+            return stale_results
+
+        with CacheRefreshLock( json_output_filepath, CTX ) as refresh_lock:
+            if refresh_lock.waited and not self.is_cache_too_old( json_output_filepath=json_output_filepath, cache_no_older_than=cache_no_older_than, api_name=api_name ):
+                return self.cache_store.load( json_output_filepath )   ### Refreshed by whoever held the lock.
+            print(f"Invoking the AWS-SDK API to update the CACHE-file... {CTX} ")
+            client = self.get_client('iam')
+            snapshot = new_authorization_snapshot()
+            for page in client.get_paginator('get_account_authorization_details').paginate( Filter=filters ):
+                print("↓", end="", flush=True)
+                normalize_authorization_details_page( snapshot, page )
+            self.cache_store.save( json_output_filepath, snapshot, header={ "api": api_name, "params": { "Filter": filters } } )
+        print(f"\nRetrieved {len(snapshot['Roles'])} Roles & {len(snapshot['Policies'])} Policies. {CTX}")
+        return snapshot
 
+    """ DEPRECATED: use `get_iam_authorization_snapshot()` instead (which has ALL the inline-policies of ALL the Roles, without per-Role API-calls). """
     def load_role_associated_inline_policy_cache(
         self,
         json_output_filepath: str,
@@ -474,8 +925,7 @@ class InvokeAWSApi():
         CTX = "LOAD_role_associated_inline_policy_cache(): "
         try:
             # Use the cached complete-response
-            with open(str(json_output_filepath)) as f:
-                inmemory_cache = json.load(f)
+            inmemory_cache = self.cache_store.load( json_output_filepath )
             cnt = len(inmemory_cache)
             print(f"File {json_output_filepath} is present. Context={CTX}.\nSo .. using {cnt} rows of cached AWS-SDK complete_response.. ..\n")
         except Exception as e:
@@ -485,6 +935,59 @@ class InvokeAWSApi():
 
     ### @@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@
 
+    """ Incremental-refresh of a STALE cache, so that -ONLY- the new/changed items need to be re-enriched (with expensive per-item API-calls).
+        1st param is the boto3 LIST-api's method-name (must be a key within `DELTA_REFRESH_CHANGE_MARKERS`).
+        2nd param is the STALE cache's content (possibly enriched with additional-details by methods like `get_all_lambdas_full_details()`).
+        3rd param is the FRESH response from the cheap LIST-api.
+        Returns the fresh list, in which every UNCHANGED item is replaced by its (possibly-enriched) stale-cache entry.
+        New/changed items are returned as-is (so, the caller will re-enrich them).  Deleted items are purged.
+    """
+    def merge_delta_refresh( self,
+        api_method_name :str,
+        stale_results :list,
+        fresh_results :list,
+    ) -> list:
+        CTX = f"merge_delta_refresh('{api_method_name}'): "
+        if api_method_name not in self.DELTA_REFRESH_CHANGE_MARKERS:
+            raise MyException(f"!! ERROR !! Do NOT know the change-markers for '{api_method_name}'. Please update `DELTA_REFRESH_CHANGE_MARKERS`. {CTX}")
+        key_attr, change_markers = self.DELTA_REFRESH_CHANGE_MARKERS[api_method_name]
+
+        ### Note: the cache-file was saved via `json.dump(default=str)`, so compare datetime-markers as strings.
+        def _markers(item :dict) -> list[str]:
+            return [ str(item.get(m)) for m in change_markers ]
+
+        stale_lkp :dict[str, dict] = { item[key_attr]: item for item in stale_results if key_attr in item }
+        merged_results = []
+        cnt_unchanged = cnt_changed = cnt_new = 0
+        for fresh_item in fresh_results:
+            stale_item = stale_lkp.pop( fresh_item.get(key_attr), None )
+            if stale_item is None:
+                cnt_new += 1
+                merged_results.append( fresh_item )
+            elif _markers(stale_item) == _markers(fresh_item):
+                cnt_unchanged += 1
+                merged_results.append( stale_item )
+            else:
+                cnt_changed += 1
+                merged_results.append( fresh_item )
+        cnt_deleted = len(stale_lkp) ### Whatever is left-over in the lookup, no longer exists in AWS.
+
+        print(f"Δ-refresh: {cnt_unchanged} unchanged, {cnt_changed} changed, {cnt_new} new, {cnt_deleted} deleted. {CTX}")
+        return merged_results
+
+    ### @@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@
+
+    """ LAZILY yields the items of an EXISTING cache (one at a time), so that scripts that filter early never materialize the full list.
+        Only truly lazy with `cache_backend="ndjson-gzip"|"ndjson-zstd"|"sqlite"`; the legacy JSON-file has to be parsed in full.
+        1st param is a path like '/tmp/aws-cli-cmd-xyz.json' (the same one passed to the method that created the cache).
+    """
+    def iter_cached_items( self,
+        json_output_filepath: str,
+    ) -> Iterator[any]:
+        yield from self.cache_store.iter_items( pathlib.Path(json_output_filepath) )
+
+    ### @@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@
+
     ### This is information that needs to be PAINFULLY gathered via INNUMERABLE API invocations!
     def update_diskfile_cache(self,
         json_output_filepath: str,
@@ -492,8 +995,7 @@ class InvokeAWSApi():
     ):
         CTX = "update_diskfile_cache(): "
         # Write the final complete-response as JSON to the file
-        with open(str(json_output_filepath), "w") as f:
-            json.dump(inmemory_cache, f, indent=4, default=str)
+        self.cache_store.save( json_output_filepath, inmemory_cache )
 
         cnt = len(inmemory_cache)
         if self.debug: print(f"\n\nFile {json_output_filepath} Saved with {cnt} rows of **DERIVED** data. Context={CTX}.\n\n")
@@ -514,6 +1016,7 @@ class InvokeAWSApi():
         4th param is the json-key in the boto3-call's response-dict that you are interested in.
         5th param is a path like '/tmp/aws-cli-cmd-xyz.json'.
         6th-OPTIONAL-param is # of days (how old can the Cache-file be).  Defaults to 7-days
+        7th-OPTIONAL-param (if True) -- once the cache is too old -- merges the fresh response with the stale cache.  See `merge_delta_refresh()`
     """
     def invoke_aws_GenericAWSApi_for_complete_response( self,
         aws_client_type :str,
@@ -522,6 +1025,7 @@ class InvokeAWSApi():
         response_key :str,
         json_output_filepath: str, ## f"{TMPDIR}/all-iam-roles.json"
         cache_no_older_than: int = 7,     ### maximum _ days old before invoking SDK-APIs to refresh the json_output_filepath
+        delta_refresh :bool = False,
     ) -> any:
 
         CTX = f"invoke_aws_GenericAWSApi_for_complete_response('{api_method_name}'): '{json_output_filepath}'"
@@ -531,95 +1035,172 @@ class InvokeAWSApi():
         ### generic-logic to --Cache-- the output of AWS-SDK API-calls (into temporary files)
         ### As necessary invoke AWS SDK API calls.
 
-        if self.is_cache_too_old( json_output_filepath=json_output_filepath, cache_no_older_than=cache_no_older_than ):
-
-            print(f"Invoking the massive AWS-SDK API to update the CACHE-file... {CTX} ")
-            client = self.session.client(aws_client_type)
-            if not hasattr(client, api_method_name):
-                raise MyException(f"Error: '{api_method_name}' is not a valid Method of AWS-API-SDK.")
-            api_call_ref = getattr(client, api_method_name)
-
-            complete_results = []
-            Marker = None
-            NextMarker = None
-            nextToken = None
-            NextToken = None
-            KeyMarker = None ### S3
-            ContinuationToken = None ### S3
-
-            awsapi_pagination_params = {}
-            # additional_params = {additional_param_name: additional_param_value}
-
-            while True:
-                print("↓", end="", flush=True)
-                awsapi_all_params = { **awsapi_pagination_params, **additional_params }
-                if self.debug > 2: print(f"\n\nawsapi_all_params={awsapi_all_params}\n")
-                if Marker or NextMarker or nextToken or NextToken or KeyMarker or ContinuationToken:
-                    response = api_call_ref(**awsapi_all_params)
-                else:
-                    response = api_call_ref(**additional_params)
-                # if Marker or NextMarker oe nextToken or NextToken or KeyMarker or ContinuationToken:
-                #     if additional_param_name:
-                #         response = api_call_ref(Marker=Marker, nextToken=nextToken, NextToken=NextToken, **{additional_param_name: additional_param_value})
-                #     else:
-                #         response = api_call_ref(Marker=Marker, nextToken=nextToken, NextToken=NextToken)
-                # else:
-                #     if additional_param_name:
-                #         response = api_call_ref(**{additional_param_name: additional_param_value})
-                #     else:
-                #         response = api_call_ref()
-                if self.debug > 2: print(json.dumps(response, indent=4, default=str))
-
-                if response.get(response_key) is not None:
-                    complete_results.extend(response.get(response_key))
-
-                ### Some AWS APIs use 'Marker' and some use 'nextToken'
-                Marker = response.get('Marker')
-                # if self.debug: print(f"Marker='{Marker}'")
-                NextMarker = response.get('NextMarker')
-                # if self.debug: print(f"NextMarker='{NextMarker}'")
-                nextToken = response.get('nextToken')
-                # if self.debug: print(f"nextToken='{nextToken}'")
-                NextToken = response.get('NextToken')
-                # if self.debug: print(f"NextToken='{NextToken}'")
-                KeyMarker = response.get('NextKeyMarker')
-                # if self.debug: print(f"KeyMarker='{KeyMarker}'")
-                ContinuationToken = response.get('NextContinuationToken')
-                # if self.debug: print(f"ContinuationToken='{ContinuationToken}'")
-
-                if Marker:
-                    awsapi_pagination_params = {"Marker": Marker}
-                if NextMarker:
-                    awsapi_pagination_params = {"Marker": NextMarker}
-                elif nextToken:
-                    awsapi_pagination_params = {"nextToken": nextToken}
-                elif NextToken:
-                    awsapi_pagination_params = {"NextToken": NextToken}
-                elif KeyMarker:
-                    awsapi_pagination_params = {"KeyMarker": KeyMarker}
-                elif ContinuationToken:
-                    awsapi_pagination_params = {"ContinuationToken": ContinuationToken}
-                # else:
-                #     break
-
-                if self.debug > 2: print(f"\n\nawsapi_all_params={awsapi_pagination_params}\n")
-
-                if Marker == None and NextMarker == None and nextToken == None and NextToken == None and KeyMarker == None and ContinuationToken == None:
-                    break ### duplicate of above 'break'
-
-            # Write the final complete-response as JSON to the file
-            with open(str(json_output_filepath), "w") as f:
-                json.dump(complete_results, f, indent=4, default=str)
-
-            if self.debug: print(f"Retrieved {len(complete_results)} in total. {CTX} ")
+        if self.is_cache_too_old( json_output_filepath=json_output_filepath, cache_no_older_than=cache_no_older_than, api_name=f"{aws_client_type}.{api_method_name}" ):
+
+            stale_results = self.serve_stale_while_revalidating( json_output_filepath, CTX=CTX,
+                refresh = lambda fp: self.invoke_aws_GenericAWSApi_for_complete_response(
+                    aws_client_type, api_method_name, additional_params, response_key, fp, cache_no_older_than, delta_refresh ) )
+            if stale_results is not None:
+                return stale_results
+
+            with CacheRefreshLock( json_output_filepath, CTX ) as refresh_lock:
+                if refresh_lock.waited and not self.is_cache_too_old( json_output_filepath=json_output_filepath, cache_no_older_than=cache_no_older_than, api_name=f"{aws_client_type}.{api_method_name}" ):
+                    return self.cache_store.load( json_output_filepath )   ### Refreshed by whoever held the lock.
+                print(f"Invoking the massive AWS-SDK API to update the CACHE-file... {CTX} ")
+                client = self.get_client(aws_client_type)
+                if not hasattr(client, api_method_name):
+                    raise MyException(f"Error: '{api_method_name}' is not a valid Method of AWS-API-SDK.")
+                api_call_ref = getattr(client, api_method_name)
+
+                complete_results = []
+                Marker = None
+                NextMarker = None
+                nextToken = None
+                NextToken = None
+                KeyMarker = None ### S3
+                ContinuationToken = None ### S3
+
+                awsapi_pagination_params = {}
+                # additional_params = {additional_param_name: additional_param_value}
+
+                while True:
+                    print("↓", end="", flush=True)
+                    awsapi_all_params = { **awsapi_pagination_params, **additional_params }
+                    if self.debug > 2: print(f"\n\nawsapi_all_params={awsapi_all_params}\n")
+                    if Marker or NextMarker or nextToken or NextToken or KeyMarker or ContinuationToken:
+                        response = api_call_ref(**awsapi_all_params)
+                    else:
+                        response = api_call_ref(**additional_params)
+                    # if Marker or NextMarker oe nextToken or NextToken or KeyMarker or ContinuationToken:
+                    #     if additional_param_name:
+                    #         response = api_call_ref(Marker=Marker, nextToken=nextToken, NextToken=NextToken, **{additional_param_name: additional_param_value})
+                    #     else:
+                    #         response = api_call_ref(Marker=Marker, nextToken=nextToken, NextToken=NextToken)
+                    # else:
+                    #     if additional_param_name:
+                    #         response = api_call_ref(**{additional_param_name: additional_param_value})
+                    #     else:
+                    #         response = api_call_ref()
+                    if self.debug > 2: print(json.dumps(response, indent=4, default=str))
+
+                    if response.get(response_key) is not None:
+                        complete_results.extend(response.get(response_key))
+
+                    ### Some AWS APIs use 'Marker' and some use 'nextToken'
+                    Marker = response.get('Marker')
+                    # if self.debug: print(f"Marker='{Marker}'")
+                    NextMarker = response.get('NextMarker')
+                    # if self.debug: print(f"NextMarker='{NextMarker}'")
+                    nextToken = response.get('nextToken')
+                    # if self.debug: print(f"nextToken='{nextToken}'")
+                    NextToken = response.get('NextToken')
+                    # if self.debug: print(f"NextToken='{NextToken}'")
+                    KeyMarker = response.get('NextKeyMarker')
+                    # if self.debug: print(f"KeyMarker='{KeyMarker}'")
+                    ContinuationToken = response.get('NextContinuationToken')
+                    # if self.debug: print(f"ContinuationToken='{ContinuationToken}'")
+
+                    if Marker:
+                        awsapi_pagination_params = {"Marker": Marker}
+                    if NextMarker:
+                        awsapi_pagination_params = {"Marker": NextMarker}
+                    elif nextToken:
+                        awsapi_pagination_params = {"nextToken": nextToken}
+                    elif NextToken:
+                        awsapi_pagination_params = {"NextToken": NextToken}
+                    elif KeyMarker:
+                        awsapi_pagination_params = {"KeyMarker": KeyMarker}
+                    elif ContinuationToken:
+                        awsapi_pagination_params = {"ContinuationToken": ContinuationToken}
+                    # else:
+                    #     break
+
+                    if self.debug > 2: print(f"\n\nawsapi_all_params={awsapi_pagination_params}\n")
+
+                    if Marker == None and NextMarker == None and nextToken == None and NextToken == None and KeyMarker == None and ContinuationToken == None:
+                        break ### duplicate of above 'break'
+
+                if delta_refresh and self.cache_store.exists( json_output_filepath ):
+                    stale_results = self.cache_store.load( json_output_filepath )
+                    complete_results = self.merge_delta_refresh(
+                        api_method_name = api_method_name,
+                        stale_results = stale_results,
+                        fresh_results = complete_results,
+                    )
+
+                # Write the final complete-response as JSON to the file
+                self.cache_store.save( json_output_filepath, complete_results,
+                    header={ "api": f"{aws_client_type}.{api_method_name}", "params": additional_params } )
+
+                if self.debug: print(f"Retrieved {len(complete_results)} in total. {CTX} ")
         else:
             # Use the cached response (previously invoked perhaps a few days back)
-            with open(str(json_output_filepath)) as f:
-                complete_results = json.load(f)
+            complete_results = self.cache_store.load( json_output_filepath )
             cnt = len(complete_results)
             print(f"File {json_output_filepath} is present. Context={CTX}.\nSo .. using {cnt} rows of cached AWS-SDK complete_response.. ..\n")
 
         return complete_results
 
+    ### @@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@
+
+    """ STREAMING variant of `invoke_aws_GenericAWSApi_for_complete_response()`.
+        This is a GENERATOR that yields each item (of `response_key`) as soon as its page arrives from AWS.
+        So, the caller can start acting on the 1st page immediately, and memory stays flat (even for 10s of 1000s of items).
+        Pagination is handled by botocore's native paginator-models (instead of hand-rolled detection of Marker/NextToken/..).
+
+        1st..5th params are the same as for `invoke_aws_GenericAWSApi_for_complete_response()`.
+        The cache is a NDJSON-file (one item per line) named like the 5th-param, but with a ".ndjson" suffix.  It is appended-to, page by page.
+        6th-OPTIONAL-param is # of days (how old can the Cache-file be).  Defaults to 7-days
+        7th-OPTIONAL-param is the # of items per page (botocore's `PaginationConfig.PageSize`).  Defaults to the AWS-API's own default.
+
+        If the AWS-API can NOT be paginated by botocore, this falls back to `invoke_aws_GenericAWSApi_for_complete_response()`.
+    """
+    def iter_aws_GenericAWSApi_items( self,
+        aws_client_type :str,
+        api_method_name: str,
+        additional_params :dict,
+        response_key :str,
+        json_output_filepath: str, ## f"{TMPDIR}/all-iam-roles.json"
+        cache_no_older_than: int = 7,     ### maximum _ days old before invoking SDK-APIs to refresh the json_output_filepath
+        page_size :Optional[int] = None,
+    ) -> Iterator[dict]:
+
+        CTX = f"iter_aws_GenericAWSApi_items('{api_method_name}'): '{json_output_filepath}'"
+        ndjson_output_filepath = pathlib.Path(json_output_filepath).with_suffix(".ndjson")
+
+        client = self.get_client(aws_client_type)
+        if not hasattr(client, api_method_name):
+            raise MyException(f"Error: '{api_method_name}' is not a valid Method of AWS-API-SDK.")
+        if not client.can_paginate(api_method_name):
+            if self.debug: print(f"botocore has NO paginator for '{api_method_name}'.  Falling back to invoke_aws_GenericAWSApi_for_complete_response() .. {CTX}")
+            yield from self.invoke_aws_GenericAWSApi_for_complete_response(
+                aws_client_type = aws_client_type,
+                api_method_name = api_method_name,
+                additional_params = additional_params,
+                response_key = response_key,
+                json_output_filepath = json_output_filepath,
+                cache_no_older_than = cache_no_older_than,
+            )
+            return
+
+        if not self.is_cache_too_old( json_output_filepath=ndjson_output_filepath, cache_no_older_than=cache_no_older_than, cache_store=JsonFileCacheStore(),
+                                      api_name=f"{aws_client_type}.{api_method_name}" ):
+            print(f"File {ndjson_output_filepath} is present. Context={CTX}.\nSo .. streaming the cached AWS-SDK response.. ..\n")
+            yield from iter_ndjson_file( ndjson_output_filepath )
+            return
+
+        print(f"Streaming the AWS-SDK API's pages into the CACHE-file... {CTX} ")
+        pagination_config = { "PageSize": page_size } if page_size else {}
+        paginator = client.get_paginator(api_method_name)
+        with NdjsonAppender( ndjson_output_filepath ) as appender:
+            for page in paginator.paginate( **additional_params, PaginationConfig=pagination_config ):
+                print("↓", end="", flush=True)
+                if self.debug > 2: print(json.dumps(page, indent=4, default=str))
+                items = page.get(response_key) or []
+                appender.append( items )
+                yield from items
+            appender.commit()   ### ONLY if ALL pages were consumed by the caller.
+        if self.debug: print(f"Retrieved {appender.item_count} in total. {CTX} ")
+
 
 ### EoScript
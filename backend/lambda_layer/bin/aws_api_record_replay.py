@@ -0,0 +1,539 @@
+### Offline RECORD / REPLAY of AWS-SDK/boto3 calls -- so that `InvokeAWSApi` (and the scripts built on `GenericAWSCLIScript`)
+### can be benchmarked & regression-tested on a laptop, WITHOUT any network or AWS-account.
+###
+### ApiRecorder        -- captures every (params, response) of a LIVE boto3-client into fixture-files (one NDJSON-file per AWS-API).
+###                       Paginated responses are recorded page by page (each page is keyed by its own Marker/NextToken).
+### ApiReplayer        -- serves those fixtures (via botocore's "before-call" event; NO HTTP-call is ever made),
+###                       with a configurable synthetic-latency per call.  Anything NOT recorded can be served by a `SyntheticAwsAccount`.
+### SyntheticAwsAccount -- generates a fake account at any SCALE (example: 5,000 Lambdas or 20,000 Log-Groups), paginated just like AWS.
+###
+### Both ApiRecorder & ApiReplayer are "client-hooks".  Example:
+###     invoker = InvokeAWSApi( client_hooks=[ ApiRecorder("/tmp/fixtures") ] )                           ### record against a LIVE account
+###     invoker = InvokeAWSApi( client_hooks=[ ApiReplayer("/tmp/fixtures", latency_ms=20) ], rate_limiting=False )   ### replay offline
+###     invoker = InvokeAWSApi( client_hooks=[ ApiReplayer( synthetic=SyntheticAwsAccount(num_lambdas=5000) ) ], rate_limiting=False )
+###
+### See ./benchmarks/ for the pytest-benchmark suite that is built on this, and ./tests/ for the (behavioral) tests.
+
+from typing import Optional, Callable
+import pathlib
+import json
+import threading
+import time
+import hashlib
+import datetime
+import urllib.parse
+
+from botocore.awsrequest import AWSResponse
+
+### ----------------------------------------------------------------------
+
+def _api_name(model) -> str:
+    return f"{model.service_model.service_name}.{model.name}"
+
+def _request_key( api_name :str, params :dict ) -> str:
+    """ Identifies a request by its AWS-API and ALL its params (incl. pagination-tokens, so each page has its own key) """
+    return api_name +" "+ json.dumps( params, sort_keys=True, default=str )
+
+### ----------------------------------------------------------------------
+
+class ApiRecorder():
+    """ Appends every response (of every boto3-client that `register()`s with this) into `<fixtures_dir>/<service>.<Operation>.ndjson`
+        Each line is: {"params": {..}, "response": {..}}.  Error-responses are recorded too.
+    """
+
+    def __init__(self, fixtures_dir :pathlib.Path) -> None:
+        self.fixtures_dir = pathlib.Path(fixtures_dir)
+        self.fixtures_dir.mkdir( parents=True, exist_ok=True )
+        self._lock = threading.Lock()
+
+    def register(self, client) -> None:
+        service_id = client.meta.service_model.service_id.hyphenize()
+        client.meta.events.register( f"before-parameter-build.{service_id}", self._before_parameter_build )
+        client.meta.events.register( f"after-call.{service_id}", self._after_call )
+
+    def _before_parameter_build(self, params :dict, context :dict, **kwargs) -> None:
+        context["_aws_api_recorded_params"] = dict(params)   ### The params AS PASSED by the caller (before serialization)
+
+    def _after_call(self, http_response, parsed :dict, model, context :dict, **kwargs) -> None:
+        response = { k: v for k, v in parsed.items() if k != "ResponseMetadata" }
+        if "Error" in parsed:
+            response["ResponseMetadata"] = { "HTTPStatusCode": http_response.status_code }
+        line = json.dumps({ "params": context.get("_aws_api_recorded_params", {}), "response": response }, default=str)
+        with self._lock:
+            with open( self.fixtures_dir / f"{_api_name(model)}.ndjson", "a" ) as f:
+                f.write( line + "\n" )
+
+### ----------------------------------------------------------------------
+
+class ApiReplayer():
+    """ Short-circuits EVERY call of every boto3-client that `register()`s with this.
+        1st-OPTIONAL-param is a folder of fixtures (as recorded by `ApiRecorder`).
+        2nd-OPTIONAL-param is the synthetic-latency (milliseconds) per call, to simulate network round-trips.
+        3rd-OPTIONAL-param serves the requests that are NOT within the fixtures.
+        If a request is NOT in the fixtures, and NOT served by the synthetic-account, a `KeyError` is raised.
+    """
+
+    def __init__(self,
+        fixtures_dir :Optional[pathlib.Path] = None,
+        latency_ms :float = 0.0,
+        synthetic :Optional["SyntheticAwsAccount"] = None,
+    ) -> None:
+        self.latency_ms = latency_ms
+        self.synthetic = synthetic
+        self.call_count = 0
+        self._fixtures :dict[str, dict] = {}
+        self._lock = threading.Lock()
+        if fixtures_dir:
+            for fixture_file in sorted( pathlib.Path(fixtures_dir).glob("*.ndjson") ):
+                api_name = fixture_file.stem
+                with open(fixture_file) as f:
+                    for line in f:
+                        if line.strip():
+                            rec = json.loads(line)
+                            self._fixtures[ _request_key( api_name, rec["params"] ) ] = rec["response"]
+
+    def register(self, client) -> None:
+        service_id = client.meta.service_model.service_id.hyphenize()
+        client.meta.events.register( f"before-parameter-build.{service_id}", self._before_parameter_build )
+        client.meta.events.register( f"before-call.{service_id}", self._before_call )
+
+    def _before_parameter_build(self, params :dict, context :dict, **kwargs) -> None:
+        context["_aws_api_replay_params"] = dict(params)
+
+    def _before_call(self, model, context :dict, **kwargs) -> tuple:
+        api_name = _api_name(model)
+        params = context.get("_aws_api_replay_params", {})
+        response = self._fixtures.get( _request_key( api_name, params ) )
+        if response is None and self.synthetic:
+            response = self.synthetic.respond( api_name, params )
+        if response is None:
+            raise KeyError(f"!! ERROR !! Nothing recorded for {api_name} with params {json.dumps(params, default=str)}")
+        with self._lock:
+            self.call_count += 1
+        if self.latency_ms:
+            time.sleep( self.latency_ms / 1000.0 )
+
+        status_code = response.get("ResponseMetadata", {}).get("HTTPStatusCode", 400 if "Error" in response else 200)
+        parsed = json.loads( json.dumps(response) )   ### a DEEP-copy, so callers can NOT corrupt the fixtures.
+        parsed["ResponseMetadata"] = { "HTTPStatusCode": status_code, "RetryAttempts": 0, "HTTPHeaders": {} }
+        http_response = AWSResponse( url="https://replay.invalid/", status_code=status_code, headers={}, raw=None )
+        return http_response, parsed   ### returning a response makes botocore SKIP the actual HTTP-call.
+
+### ----------------------------------------------------------------------
+
+class SyntheticAwsAccount():
+    """ A fake AWS-account, with as many Lambdas / Log-Groups / Stacks / IAM-Roles / ECR-images as needed.
+        Responses are deterministic, and paginated (via Marker / NextToken / nextToken) just like the real AWS-APIs.
+        `respond()` returns None, for any AWS-API that is NOT simulated.
+    """
+
+    ACCOUNT_ID = "123456789012"
+    REGION = "us-east-1"
+    NUM_MANAGED_POLICIES = 10   ### customer-managed policies; each Role has one of them attached (plus one AWS-managed policy)
+    LOG_EVENTS_EPOCH = int( datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc).timestamp() * 1000 )
+    OCI_IMAGE_INDEX_MEDIA_TYPE = "application/vnd.oci.image.index.v1+json"
+    DOCKER_MANIFEST_MEDIA_TYPE = "application/vnd.docker.distribution.manifest.v2+json"
+
+    def __init__(self,
+        num_lambdas :int = 100,
+        num_log_groups :int = 100,
+        num_stacks :int = 20,
+        num_roles :int = 100,
+        num_images :int = 0,
+        num_image_lambdas :int = 0,
+        num_log_streams :int = 0,
+        log_events_per_minute :int = 60,
+        app_name :str = "nccr",
+        page_size :int = 50,
+    ) -> None:
+        self.num_lambdas = num_lambdas
+        self.num_log_groups = num_log_groups
+        self.num_stacks = num_stacks
+        self.num_roles = num_roles
+        self.num_images = num_images                ### within the ONE ECR-repo (the CDK container-assets repo)
+        self.num_image_lambdas = num_image_lambdas  ### the 1st N Lambdas are `PackageType: Image`; Lambda `i` uses image `i % num_images`
+                                                    ### .. and its published version "1" (alias "live") still pins an OLDER image.
+        self.num_log_streams = num_log_streams      ### per log-group.  Stream `j` has events for 1 hour, starting `j * 30` minutes after LOG_EVENTS_EPOCH
+        self.log_events_per_minute = log_events_per_minute
+        self.app_name = app_name
+        self.page_size = page_size
+        self._queries :dict[str, dict] = {}         ### Logs-Insights query-id -> its params
+        self._queries_lock = threading.Lock()
+        self._responders :dict[str, Callable[[dict], Optional[dict]]] = {
+            "sts.GetCallerIdentity":                    self._get_caller_identity,
+            "lambda.ListFunctions":                     self._list_functions,
+            "lambda.GetFunction":                       self._get_function,
+            "lambda.ListVersionsByFunction":            self._list_versions_by_function,
+            "lambda.ListAliases":                       self._list_aliases,
+            "lambda.GetProvisionedConcurrencyConfig":   self._get_provisioned_concurrency_config,
+            "logs.DescribeLogGroups":                   self._describe_log_groups,
+            "logs.PutRetentionPolicy":                  lambda params: {},
+            "logs.DescribeSubscriptionFilters":         self._describe_subscription_filters,
+            "logs.DescribeLogStreams":                  self._describe_log_streams,
+            "logs.FilterLogEvents":                     self._filter_log_events,
+            "logs.StartQuery":                          self._start_query,
+            "logs.GetQueryResults":                     self._get_query_results,
+            "cloudwatch.GetMetricData":                 self._get_metric_data,
+            "cloudformation.ListStacks":                self._list_stacks,
+            "cloudformation.DescribeStacks":            self._describe_stacks,
+            "cloudformation.GetTemplate":               self._get_template,
+            "iam.ListRoles":                            self._list_roles,
+            "iam.GetAccountAuthorizationDetails":       self._get_account_authorization_details,
+            "ecr.DescribeRepositories":                 self._describe_repositories,
+            "ecr.DescribeImages":                       self._describe_images,
+            "ecr.BatchGetImage":                        self._batch_get_image,
+            "ecr.BatchDeleteImage":                     self._batch_delete_image,
+        }
+
+    def respond(self, api_name :str, params :dict) -> Optional[dict]:
+        responder = self._responders.get(api_name)
+        return responder(params) if responder else None
+
+    ### ------------------------------------------------
+
+    @staticmethod
+    def _error(code :str, message :str, status_code :int = 404) -> dict:
+        return { "Error": { "Code": code, "Message": message }, "ResponseMetadata": { "HTTPStatusCode": status_code } }
+
+    def _paginate(self, total :int, params :dict, token_param :str, limit_param :Optional[str], make_item :Callable[[int], dict]) -> tuple[list, Optional[str]]:
+        """ Returns ( items-of-this-page, next-token-or-None ).  The token is simply the offset of the next page. """
+        start = int( params.get(token_param) or 0 )
+        page_size = int( params.get(limit_param) or self.page_size ) if limit_param else self.page_size
+        end = min( total, start + page_size )
+        return [ make_item(i) for i in range(start, end) ], ( str(end) if end < total else None )
+
+    @staticmethod
+    def _policy_document(document :dict) -> str:
+        """ IAM returns policy-documents URL-encoded (botocore's own "after-call" handler decodes them).  So, the synthetic responses must do the same. """
+        return urllib.parse.quote( json.dumps(document) )
+
+    @staticmethod
+    def _timestamp(i :int) -> str:
+        return ( datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc) + datetime.timedelta(minutes=i) ).isoformat()
+
+    def _function_name(self, i :int) -> str:
+        return f"{self.app_name}-backend-dev-Stateless-fn{i:05d}"
+
+    def _function_config(self, i :int) -> dict:
+        name = self._function_name(i)
+        return {
+            "FunctionName": name,
+            "FunctionArn": f"arn:aws:lambda:{self.REGION}:{self.ACCOUNT_ID}:function:{name}",
+            "Runtime": "python3.12",
+            "Role": f"arn:aws:iam::{self.ACCOUNT_ID}:role/{self.app_name}-role-{i % max(1, self.num_roles):05d}",
+            "Handler": "index.handler",
+            "CodeSize": 1024 * (1 + i % 50),
+            "MemorySize": 256,
+            "LastModified": self._timestamp(i),
+            "CodeSha256": hashlib.sha256( name.encode() ).hexdigest(),
+            "Version": "$LATEST",
+            "PackageType": "Image" if i < self.num_image_lambdas else "Zip",
+            "Architectures": [ "arm64" if i % 2 else "x86_64" ],
+            "Layers": [ { "Arn": f"arn:aws:lambda:{self.REGION}:{self.ACCOUNT_ID}:layer:{self.app_name}_psycopg3:{1 + i % 3}", "CodeSize": 4096 } ],
+        }
+
+    def _get_caller_identity(self, params :dict) -> dict:
+        return { "Account": self.ACCOUNT_ID, "UserId": "AIDASYNTHETIC", "Arn": f"arn:aws:iam::{self.ACCOUNT_ID}:user/synthetic" }
+
+    def _list_functions(self, params :dict) -> dict:
+        items, next_marker = self._paginate( self.num_lambdas, params, "Marker", "MaxItems", self._function_config )
+        return { "Functions": items, **( { "NextMarker": next_marker } if next_marker else {} ) }
+
+    def _function_index(self, name :str) -> Optional[int]:
+        prefix = f"{self.app_name}-backend-dev-Stateless-fn"
+        name = name.split(":")[-1]
+        if not name.startswith(prefix) or not name[len(prefix):].isdigit():
+            return None
+        i = int( name[len(prefix):] )
+        return i if i < self.num_lambdas else None
+
+    def _get_function(self, params :dict) -> dict:
+        i = self._function_index( params["FunctionName"] )
+        if i is None:
+            return self._error( "ResourceNotFoundException", f"Function not found: {params['FunctionName']}" )
+        if i < self.num_image_lambdas:
+            j = i % max(1, self.num_images)
+            if params.get("Qualifier") not in [ None, "$LATEST" ]:
+                j = ( i + self.num_image_lambdas ) % max(1, self.num_images)
+            repository_uri = f"{self.ACCOUNT_ID}.dkr.ecr.{self.REGION}.amazonaws.com/{self._ecr_repository_name()}"
+            code = { "RepositoryType": "ECR", "ImageUri": f"{repository_uri}:{self._image_tag(j)}", "ResolvedImageUri": f"{repository_uri}@{self._image_digest(j)}" }
+            return { "Configuration": self._function_config(i), "Code": code, "Tags": { "tier": "dev", "application": self.app_name } }
+        return {
+            "Configuration": self._function_config(i),
+            "Code": { "RepositoryType": "S3", "Location": f"https://awslambda-{self.REGION}-tasks.s3.amazonaws.com/snapshots/{self.ACCOUNT_ID}/{self._function_name(i)}" },
+            "Tags": { "tier": "dev", "application": self.app_name },
+        }
+
+    def _list_versions_by_function(self, params :dict) -> dict:
+        i = self._function_index( params["FunctionName"] )
+        if i is None:
+            return self._error( "ResourceNotFoundException", f"Function not found: {params['FunctionName']}" )
+        latest = self._function_config(i)
+        published = { **latest, "Version": "1", "LastModified": self._timestamp(i - 1) }
+        return { "Versions": [ published, latest ] }
+
+    def _list_aliases(self, params :dict) -> dict:
+        i = self._function_index( params["FunctionName"] )
+        if i is None:
+            return self._error( "ResourceNotFoundException", f"Function not found: {params['FunctionName']}" )
+        if i >= self.num_image_lambdas:
+            return { "Aliases": [] }
+        return { "Aliases": [ { "AliasArn": f"{self._function_config(i)['FunctionArn']}:live", "Name": "live", "FunctionVersion": "1" } ] }
+
+    def _get_provisioned_concurrency_config(self, params :dict) -> dict:
+        return self._error( "ProvisionedConcurrencyConfigNotFoundException", "No Provisioned Concurrency Config found for this function" )
+
+    def _log_group_name(self, i :int) -> str:
+        if i < self.num_lambdas:
+            return f"/aws/lambda/{self._function_name(i)}"
+        match i % 10:
+            case 0: return f"/aws/lambda/{self.app_name}-meta-pipeline-dev-CustomS3AutoDeleteObjectsC-{i:06d}"
+            case 1: return f"API-Gateway-Execution-Logs_api{i:06d}/dev"
+            case 2: return f"/aws/codebuild/{self.app_name}-pipeline-dev-{i:06d}"    ### every other one is INFREQUENT_ACCESS
+            case _: return f"/aws/synthetic/log-group-{i:06d}"
+
+    def _describe_log_groups(self, params :dict) -> dict:
+        def _log_group(i :int) -> dict:
+            name = self._log_group_name(i)
+            return {
+                "logGroupName": name,
+                "creationTime": 1704067200000 + i,
+                "storedBytes": 1024 * 1024 * (i % 97),
+                "arn": f"arn:aws:logs:{self.REGION}:{self.ACCOUNT_ID}:log-group:{name}:*",
+                "logGroupClass": "INFREQUENT_ACCESS" if i % 20 == 12 else "STANDARD",
+                **( { "retentionInDays": 30 } if i % 3 else {} ),   ### every 3rd log-group has "Never Expire" retention
+            }
+        prefix, pattern = params.get("logGroupNamePrefix"), params.get("logGroupNamePattern")
+        if prefix or pattern:   ### server-side filtering
+            matching = [ i for i in range(self.num_log_groups) if self._log_group_name(i).startswith( prefix or "" ) and ( pattern or "" ) in self._log_group_name(i) ]
+            items, next_token = self._paginate( len(matching), params, "nextToken", "limit", lambda k: _log_group( matching[k] ) )
+        else:
+            items, next_token = self._paginate( self.num_log_groups, params, "nextToken", "limit", _log_group )
+        return { "logGroups": items, **( { "nextToken": next_token } if next_token else {} ) }
+
+    @staticmethod
+    def _name_hash(name :str) -> int:
+        return int( hashlib.sha256( name.encode() ).hexdigest()[:8], 16 )
+
+    def _describe_subscription_filters(self, params :dict) -> dict:
+        """ Every 4th log-group (by hash of its name) has ONE subscription-filter """
+        name = params["logGroupName"]
+        if self._name_hash(name) % 4:
+            return { "subscriptionFilters": [] }
+        return { "subscriptionFilters": [ { "filterName": "datadog", "logGroupName": name, "filterPattern": "",
+                    "destinationArn": f"arn:aws:lambda:{self.REGION}:{self.ACCOUNT_ID}:function:datadog-forwarder", "distribution": "ByLogStream" } ] }
+
+    def _get_metric_data(self, params :dict) -> dict:
+        """ ONE datapoint per query (deterministic, by hash of the metric's 1st dimension-value).  Every 5th has NO datapoints. """
+        results = []
+        for query in params.get("MetricDataQueries", []):
+            dimensions = query["MetricStat"]["Metric"].get("Dimensions") or [ { "Value": query["Id"] } ]
+            h = self._name_hash( dimensions[0]["Value"] )
+            values = [] if h % 5 == 0 else [ float( 1024 * 1024 * (h % 500) ) ]
+            results.append({ "Id": query["Id"], "Label": query["MetricStat"]["Metric"]["MetricName"], "StatusCode": "Complete",
+                             "Timestamps": [ self._timestamp(0) ] * len(values), "Values": values })
+        return { "MetricDataResults": results, "Messages": [] }
+
+    def _log_stream(self, j :int) -> dict:
+        first = self.LOG_EVENTS_EPOCH + j * 30 * 60 * 1000
+        last  = first + 60 * 60 * 1000 - 60000 // self.log_events_per_minute
+        return { "logStreamName": f"build-{j:05d}", "creationTime": first, "firstEventTimestamp": first, "lastEventTimestamp": last,
+                 "lastIngestionTime": last + 1000, "storedBytes": 0 }
+
+    def _log_events(self, stream_indexes :list[int], start_time :int, end_time :int) -> list[dict]:
+        """ ALL the events of those streams within [start_time, end_time] (both inclusive), sorted by timestamp """
+        interval = 60000 // self.log_events_per_minute
+        events = []
+        for j in stream_indexes:
+            stream = self._log_stream(j)
+            t = max( stream["firstEventTimestamp"], start_time + ( -( start_time - stream["firstEventTimestamp"] ) % interval ) )
+            while t <= min( stream["lastEventTimestamp"], end_time ):
+                events.append({ "logStreamName": stream["logStreamName"], "timestamp": t, "ingestionTime": t + 1000,
+                                "message": f"[Container] {t} Running command build-step in {stream['logStreamName']}\n", "eventId": f"{t}{j:05d}" })
+                t += interval
+        events.sort( key=lambda e: e["timestamp"] )
+        return events
+
+    def _describe_log_streams(self, params :dict) -> dict:
+        """ Always ordered by LastEventTime, descending """
+        items, next_token = self._paginate( self.num_log_streams, params, "nextToken", "limit", lambda k: self._log_stream( self.num_log_streams - 1 - k ) )
+        return { "logStreams": items, **( { "nextToken": next_token } if next_token else {} ) }
+
+    def _filter_log_events(self, params :dict) -> dict:
+        names = params.get("logStreamNames")
+        stream_indexes = [ int( n.split("-")[-1] ) for n in names ] if names else list( range(self.num_log_streams) )
+        events = self._log_events( stream_indexes, params.get("startTime", 0), params.get("endTime", 2**62) )
+        start = int( params.get("nextToken") or 0 )
+        end = min( len(events), start + int( params.get("limit") or 10000 ) )
+        return { "events": events[start:end], "searchedLogStreams": [], **( { "nextToken": str(end) } if end < len(events) else {} ) }
+
+    def _start_query(self, params :dict) -> dict:
+        with self._queries_lock:
+            query_id = f"query-{len(self._queries):08d}"
+            self._queries[query_id] = dict(params)
+        return { "queryId": query_id }
+
+    def _get_query_results(self, params :dict) -> dict:
+        """ Always "Complete" (the 1st time).  `@timestamp` is formatted just like the real Logs-Insights. """
+        query = self._queries.get( params["queryId"] )
+        if query is None:
+            return self._error( "ResourceNotFoundException", f"Query not found: {params['queryId']}", status_code=400 )
+        events = self._log_events( list( range(self.num_log_streams) ), query["startTime"] * 1000, query["endTime"] * 1000 + 999 )[ : query.get("limit", 1000) ]
+        def _row(e :dict) -> list[dict]:
+            ts = datetime.datetime.fromtimestamp( e["timestamp"] / 1000, tz=datetime.timezone.utc ).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+            return [ { "field": "@timestamp", "value": ts }, { "field": "@message", "value": e["message"] }, { "field": "@logStream", "value": e["logStreamName"] } ]
+        return { "status": "Complete", "results": [ _row(e) for e in events ],
+                 "statistics": { "recordsMatched": float(len(events)), "recordsScanned": float(len(events)), "bytesScanned": 0.0 } }
+
+    def _stack_name(self, i :int) -> str:
+        return f"{self.app_name}-backend-dev-Stack{i:04d}"
+
+    def _stack_summary(self, i :int) -> dict:
+        return {
+            "StackId": f"arn:aws:cloudformation:{self.REGION}:{self.ACCOUNT_ID}:stack/{self._stack_name(i)}/{i:08d}",
+            "StackName": self._stack_name(i),
+            "CreationTime": self._timestamp(i),
+            "LastUpdatedTime": self._timestamp(i + 1),
+            "StackStatus": "UPDATE_COMPLETE",
+        }
+
+    def _list_stacks(self, params :dict) -> dict:
+        items, next_token = self._paginate( self.num_stacks, params, "NextToken", None, self._stack_summary )
+        return { "StackSummaries": items, **( { "NextToken": next_token } if next_token else {} ) }
+
+    def _describe_stacks(self, params :dict) -> dict:
+        name = params.get("StackName", "")
+        i = next( ( i for i in range(self.num_stacks) if self._stack_name(i) == name ), None )
+        if i is None:
+            return self._error( "ValidationError", f"Stack with id {name} does not exist", 400 )
+        return { "Stacks": [ {
+            **self._stack_summary(i),
+            "Parameters": [ { "ParameterKey": "BootstrapVersion", "ParameterValue": "/cdk-bootstrap/hnb659fds/version" } ],
+            "Outputs": [ { "OutputKey": "Output1", "OutputValue": f"value-{i}" } ],
+            "Tags": [ { "Key": "tier", "Value": "dev" } ],
+        } ] }
+
+    def _get_template(self, params :dict) -> dict:
+        return { "TemplateBody": { "Resources": { f"Res{j}": { "Type": "AWS::SNS::Topic" } for j in range(20) } } }
+
+    def _role(self, i :int) -> dict:
+        name = f"{self.app_name}-role-{i:05d}"
+        return {
+            "RoleName": name,
+            "RoleId": f"AROASYNTHETIC{i:08d}",
+            "Arn": f"arn:aws:iam::{self.ACCOUNT_ID}:role/{name}",
+            "Path": "/",
+            "CreateDate": self._timestamp(i),
+            "AssumeRolePolicyDocument": self._policy_document({ "Version": "2012-10-17", "Statement": [ {
+                "Effect": "Allow", "Action": "sts:AssumeRole",
+                "Principal": { "Service": "codebuild.amazonaws.com" if i % 10 == 0 else "lambda.amazonaws.com" },
+            } ] }),
+        }
+
+    def _list_roles(self, params :dict) -> dict:
+        items, next_marker = self._paginate( self.num_roles, params, "Marker", "MaxItems", self._role )
+        return { "Roles": items, "IsTruncated": next_marker is not None, **( { "Marker": next_marker } if next_marker else {} ) }
+
+    def _managed_policy_arn(self, j :int) -> str:
+        return f"arn:aws:iam::{self.ACCOUNT_ID}:policy/{self.app_name}-policy-{j:03d}"
+
+    def _get_account_authorization_details(self, params :dict) -> dict:
+        """ Roles first, then the customer-managed policies, then ONE AWS-managed policy -- all paginated as ONE sequence (like the real AWS-API) """
+        aws_managed_policy_arn = "arn:aws:iam::aws:policy/service-role/AWSLambdaBasicExecutionRole"
+        def _policy(name :str, arn :str, document :dict) -> dict:
+            return {
+                "PolicyName": name, "Arn": arn, "Path": "/", "DefaultVersionId": "v1", "AttachmentCount": 1, "IsAttachable": True,
+                "PolicyVersionList": [ { "Document": self._policy_document(document), "VersionId": "v1", "IsDefaultVersion": True } ],
+            }
+        def _item(i :int) -> tuple[str, dict]:
+            if i < self.num_roles:
+                return "RoleDetailList", {
+                    **self._role(i),
+                    "RolePolicyList": [ { "PolicyName": "inline-logs", "PolicyDocument": self._policy_document({ "Version": "2012-10-17", "Statement": [
+                        { "Effect": "Allow", "Action": [ "logs:PutLogEvents" ], "Resource": f"arn:aws:logs:{self.REGION}:{self.ACCOUNT_ID}:log-group:/aws/lambda/{self._function_name(i)}:*" } ] }) } ],
+                    "AttachedManagedPolicies": [
+                        { "PolicyName": f"{self.app_name}-policy-{i % self.NUM_MANAGED_POLICIES:03d}", "PolicyArn": self._managed_policy_arn( i % self.NUM_MANAGED_POLICIES ) },
+                        { "PolicyName": "AWSLambdaBasicExecutionRole", "PolicyArn": aws_managed_policy_arn },
+                    ],
+                }
+            j = i - self.num_roles
+            if j < self.NUM_MANAGED_POLICIES:
+                return "Policies", _policy( f"{self.app_name}-policy-{j:03d}", self._managed_policy_arn(j), { "Version": "2012-10-17", "Statement": [
+                    { "Effect": "Allow", "Action": [ "s3:GetObject", "s3:PutObject" ], "Resource": f"arn:aws:s3:::{self.app_name}-bucket-{j:03d}/*" } ] } )
+            return "Policies", _policy( "AWSLambdaBasicExecutionRole", aws_managed_policy_arn, { "Version": "2012-10-17", "Statement": [
+                { "Effect": "Allow", "Action": [ "logs:CreateLogGroup", "logs:CreateLogStream", "logs:PutLogEvents" ], "Resource": "*" } ] } )
+        total = self.num_roles + self.NUM_MANAGED_POLICIES + 1
+        items, next_marker = self._paginate( total, params, "Marker", "MaxItems", _item )
+        response = { "RoleDetailList": [], "Policies": [], "UserDetailList": [], "GroupDetailList": [] }
+        for key, item in items:
+            response[key].append( item )
+        return { **response, "IsTruncated": next_marker is not None, **( { "Marker": next_marker } if next_marker else {} ) }
+
+    def _ecr_repository_name(self) -> str:
+        return f"cdk-hnb659fds-container-assets-{self.ACCOUNT_ID}-{self.REGION}"
+
+    @staticmethod
+    def _image_tag(j :int) -> str:
+        return hashlib.sha256( f"tag-{j}".encode() ).hexdigest()
+
+    @staticmethod
+    def _image_digest(j :int) -> str:
+        return "sha256:" + hashlib.sha256( f"image-{j}".encode() ).hexdigest()
+
+    def _describe_repositories(self, params :dict) -> dict:
+        name = self._ecr_repository_name()
+        return { "repositories": [ {
+            "repositoryArn": f"arn:aws:ecr:{self.REGION}:{self.ACCOUNT_ID}:repository/{name}",
+            "registryId": self.ACCOUNT_ID,
+            "repositoryName": name,
+            "repositoryUri": f"{self.ACCOUNT_ID}.dkr.ecr.{self.REGION}.amazonaws.com/{name}",
+        } ] }
+
+    def _describe_images(self, params :dict) -> dict:
+        if params.get("repositoryName") != self._ecr_repository_name():
+            return self._error( "RepositoryNotFoundException", f"The repository with name '{params.get('repositoryName')}' does not exist", status_code=400 )
+        def _image_detail(j :int) -> dict:
+            return {
+                "registryId": self.ACCOUNT_ID,
+                "repositoryName": self._ecr_repository_name(),
+                "imageDigest": self._image_digest(j),
+                **( { "imageTags": [ self._image_tag(j) ] } if j % 10 != 9 else {} ),   ### every 10th image is untagged
+                "imageSizeInBytes": 1024 * 1024 * (100 + j % 400),
+                "imagePushedAt": self._timestamp(j),
+                "imageManifestMediaType": self._image_manifest_media_type(j),
+            }
+        items, next_token = self._paginate( self.num_images, params, "nextToken", "maxResults", _image_detail )
+        return { "imageDetails": items, **( { "nextToken": next_token } if next_token else {} ) }
+
+    ### Image `j` (where j % 10 == 0) is an OCI image-index (multi-arch), whose ONLY child-manifest is the UNTAGGED image `j + 9`.
+    def _image_manifest_media_type(self, j :int) -> str:
+        return self.OCI_IMAGE_INDEX_MEDIA_TYPE if j % 10 == 0 and j + 9 < self.num_images else self.DOCKER_MANIFEST_MEDIA_TYPE
+
+    def _batch_get_image(self, params :dict) -> dict:
+        if params.get("repositoryName") != self._ecr_repository_name():
+            return self._error( "RepositoryNotFoundException", f"The repository with name '{params.get('repositoryName')}' does not exist", status_code=400 )
+        index_by_digest = { self._image_digest(j): j for j in range( self.num_images ) }
+        images, failures = [], []
+        for image_id in params.get("imageIds", []):
+            j = index_by_digest.get( image_id.get("imageDigest") )
+            if j is None:
+                failures.append({ "imageId": image_id, "failureCode": "ImageNotFound", "failureReason": "Requested image not found" })
+                continue
+            media_type = self._image_manifest_media_type(j)
+            if media_type == self.OCI_IMAGE_INDEX_MEDIA_TYPE:
+                manifest = { "schemaVersion": 2, "mediaType": media_type, "manifests": [
+                    { "mediaType": "application/vnd.oci.image.manifest.v1+json", "digest": self._image_digest(j + 9), "size": 1024,
+                      "platform": { "architecture": "arm64", "os": "linux" } } ] }
+            else:
+                manifest = { "schemaVersion": 2, "mediaType": media_type, "layers": [] }
+            images.append({ "registryId": self.ACCOUNT_ID, "repositoryName": self._ecr_repository_name(), "imageId": image_id,
+                            "imageManifest": json.dumps( manifest ), "imageManifestMediaType": media_type })
+        return { "images": images, "failures": failures }
+
+    def _batch_delete_image(self, params :dict) -> dict:
+        """ NOTHING is actually deleted (the synthetic-account is stateless).  Every requested image-ID is reported as deleted. """
+        if params.get("repositoryName") != self._ecr_repository_name():
+            return self._error( "RepositoryNotFoundException", f"The repository with name '{params.get('repositoryName')}' does not exist", status_code=400 )
+        return { "imageIds": params.get("imageIds", []), "failures": [] }
+
+### EoScript
@@ -0,0 +1,61 @@
+### pytest-benchmark suite for `InvokeAWSApi` -- runs 100% OFFLINE, via the record/replay harness in ../aws_api_record_replay.py
+###
+### Run from the ROOT of this git-repo (so that `backend.lambda_layer.bin` is importable):
+###     pip install pytest pytest-benchmark
+###     python -m pytest backend/lambda_layer/bin/benchmarks  --benchmark-sort=name
+### To compare a change:  --benchmark-save=before  (then, after the change)  --benchmark-compare
+
+import pathlib
+import pytest
+
+from backend.lambda_layer.bin.aws_api_invoker import (
+    InvokeAWSApi,
+)
+from backend.lambda_layer.bin.aws_api_cache_store import (
+    get_cache_store,
+)
+from backend.lambda_layer.bin.aws_api_record_replay import (
+    ApiReplayer,
+    SyntheticAwsAccount,
+)
+
+### Scale of the synthetic AWS-account.  Tests read these via the `synthetic_account` fixture (Example: `synthetic_account.num_lambdas`).
+NUM_LAMBDAS    = 5000
+NUM_LOG_GROUPS = 20000
+NUM_STACKS     = 200
+
+@pytest.fixture(scope="session")
+def synthetic_account() -> SyntheticAwsAccount:
+    return SyntheticAwsAccount(
+        num_lambdas = NUM_LAMBDAS,
+        num_log_groups = NUM_LOG_GROUPS,
+        num_stacks = NUM_STACKS,
+    )
+
+@pytest.fixture()
+def make_invoker( synthetic_account :SyntheticAwsAccount ):
+    """ Returns a factory: make_invoker( latency_ms=.., cache_backend=.. ) -> InvokeAWSApi, whose every AWS-API call is replayed. """
+    def _make_invoker(
+        latency_ms :float = 0.0,
+        cache_backend :str = "json",
+        cache_filepath :pathlib.Path = None,
+    ) -> InvokeAWSApi:
+        return InvokeAWSApi(
+            aws_region = SyntheticAwsAccount.REGION,
+            cache_store = get_cache_store( cache_backend=cache_backend, filepath=cache_filepath ),
+            api_metrics_report = False,
+            rate_limiting = False,    ### Measure OUR code; NOT the client-side throttling.
+            client_hooks = [ ApiReplayer( latency_ms=latency_ms, synthetic=synthetic_account ) ],
+        )
+    return _make_invoker
+
+@pytest.fixture()
+def delete_caches( tmp_path :pathlib.Path ):
+    """ Returns a function, that removes all cache-files (within `tmp_path`).  So that the next benchmark-round invokes the (replayed) AWS-APIs again. """
+    def _delete_caches() -> None:
+        for f in tmp_path.glob("*"):
+            if f.is_file():
+                f.unlink()
+    return _delete_caches
+
+### EoScript
@@ -0,0 +1,98 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from backend.lambda_layer.bin.aws_api_cache_store import (
+    get_cache_store,
+)
+from backend.lambda_layer.bin.aws_api_record_replay import (
+    SyntheticAwsAccount,
+)
+
+### The fixtures `make_invoker`, `synthetic_account` and `delete_caches` are in ./conftest.py
+
+### ----------------------------------------------------------------------
+### Pagination
+
+def test_bench_list_lambdas_pagination( benchmark, make_invoker, synthetic_account, delete_caches, tmp_path ):
+    invoker = make_invoker()
+    cache_file = tmp_path / "all-Lambdas.json"
+    result = benchmark.pedantic(
+        invoker.list_lambdas, kwargs={ "json_output_filepath": cache_file },
+        setup=delete_caches, rounds=3,
+    )
+    assert len(result) == synthetic_account.num_lambdas
+
+def test_bench_log_groups_streaming( benchmark, make_invoker, synthetic_account, delete_caches, tmp_path ):
+    invoker = make_invoker()
+    cache_file = tmp_path / "all-LogGroups.json"
+    def _stream_all() -> int:
+        return sum( 1 for _ in invoker.iter_aws_GenericAWSApi_items(
+            aws_client_type = 'logs',
+            api_method_name = "describe_log_groups",
+            additional_params = {},
+            response_key = 'logGroups',
+            json_output_filepath = cache_file,
+            page_size = 50,
+        ))
+    cnt = benchmark.pedantic( _stream_all, setup=delete_caches, rounds=3 )
+    assert cnt == synthetic_account.num_log_groups
+
+### ----------------------------------------------------------------------
+### Full-details enrichers (with a synthetic network round-trip per AWS-API call)
+
+@pytest.mark.parametrize( "max_workers", [ 1, 16 ] )
+def test_bench_lambdas_full_details( benchmark, make_invoker, synthetic_account, delete_caches, tmp_path, max_workers ):
+    invoker = make_invoker( latency_ms=2 )
+    cache_file = tmp_path / "all-Lambdas.json"
+    result = benchmark.pedantic(
+        invoker.get_all_lambdas_full_details, kwargs={ "json_output_filepath": cache_file, "max_workers": max_workers },
+        setup=delete_caches, rounds=1,
+    )
+    assert len(result) == synthetic_account.num_lambdas
+    assert all( "Versions" in item for item in result )
+
+@pytest.mark.parametrize( "max_workers", [ 1, 16 ] )
+@pytest.mark.parametrize( "templates_on_disk", [ False, True ] )
+def test_bench_stacks_full_details( benchmark, make_invoker, synthetic_account, delete_caches, tmp_path, max_workers, templates_on_disk ):
+    invoker = make_invoker( latency_ms=2 )
+    cache_file = tmp_path / "all-Stacks.json"
+    templates_dir = tmp_path / "templates" if templates_on_disk else None
+    result = benchmark.pedantic(
+        invoker.get_all_stacks_full_details,
+        kwargs={ "app_name": "nccr", "json_output_filepath": cache_file, "max_workers": max_workers, "templates_dir": templates_dir },
+        setup=delete_caches, rounds=1,
+    )
+    assert len(result) == synthetic_account.num_stacks
+
+### ----------------------------------------------------------------------
+### Cache load/save, per cache-backend
+
+CACHE_BACKENDS = [ "json", "ndjson-gzip", "sqlite" ]
+
+@pytest.fixture(scope="module")
+def lambdas_full_details( synthetic_account :SyntheticAwsAccount ) -> list[dict]:
+    acct = synthetic_account
+    return [ { **acct._function_config(i), **acct._get_function( { "FunctionName": acct._function_name(i) } ) } for i in range(acct.num_lambdas) ]
+
+@pytest.mark.parametrize( "cache_backend", CACHE_BACKENDS )
+def test_bench_cache_save( benchmark, tmp_path, lambdas_full_details, cache_backend ):
+    store = get_cache_store( cache_backend=cache_backend, filepath=tmp_path / "cache.sqlite" )
+    benchmark( store.save, tmp_path / "all-Lambdas.json", lambdas_full_details )
+
+@pytest.mark.parametrize( "cache_backend", CACHE_BACKENDS )
+def test_bench_cache_load( benchmark, tmp_path, lambdas_full_details, cache_backend ):
+    store = get_cache_store( cache_backend=cache_backend, filepath=tmp_path / "cache.sqlite" )
+    store.save( tmp_path / "all-Lambdas.json", lambdas_full_details )
+    result = benchmark( store.load, tmp_path / "all-Lambdas.json" )
+    assert len(result) == len(lambdas_full_details)
+
+@pytest.mark.parametrize( "cache_backend", CACHE_BACKENDS )
+def test_bench_cache_lazy_filter( benchmark, tmp_path, lambdas_full_details, cache_backend ):
+    """ Find the 1st arm64 Lambda -- lazy backends stop reading early """
+    store = get_cache_store( cache_backend=cache_backend, filepath=tmp_path / "cache.sqlite" )
+    store.save( tmp_path / "all-Lambdas.json", lambdas_full_details )
+    def _first_arm64() -> dict:
+        return next( item for item in store.iter_items( tmp_path / "all-Lambdas.json" ) if item["Architectures"] == ["arm64"] )
+    result = benchmark( _first_arm64 )
+    assert result["Architectures"] == ["arm64"]
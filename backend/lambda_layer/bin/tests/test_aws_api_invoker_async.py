@@ -0,0 +1,171 @@
+### Tests for `AsyncInvokeAWSApi` (See ../aws_api_invoker_async.py) -- 100% OFFLINE, via the record/replay harness in ../aws_api_record_replay.py
+###
+### Run from the ROOT of this git-repo:
+###     pip install pytest aiobotocore
+###     python -m pytest backend/lambda_layer/bin/tests
+
+import asyncio
+import fcntl
+import time
+import pytest
+
+pytest.importorskip("aiobotocore")
+
+from backend.lambda_layer.bin.aws_api_invoker import (
+    InvokeAWSApi,
+)
+from backend.lambda_layer.bin.aws_api_invoker_async import (
+    AsyncInvokeAWSApi,
+)
+from backend.lambda_layer.bin.aws_api_rate_limiter import (
+    ApiTokenBucket,
+)
+from backend.lambda_layer.bin.aws_api_record_replay import (
+    ApiReplayer,
+    SyntheticAwsAccount,
+)
+
+NUM_LAMBDAS = 100
+FAILING_LAMBDA_INDX = 7
+
+### ----------------------------------------------------------------------
+
+class _FailingVersionsAwsAccount(SyntheticAwsAccount):
+    """ `list_versions_by_function()` FAILS for ONE Lambda (with a NON-retryable error) """
+    def _list_versions_by_function(self, params :dict) -> dict:
+        if params.get("FunctionName") == self._function_name( FAILING_LAMBDA_INDX ):
+            return self._error( "ResourceNotFoundException", "Function not found (simulated)" )
+        return super()._list_versions_by_function( params )
+
+class _FailingGetFunctionAwsAccount(SyntheticAwsAccount):
+    """ `get_function()` FAILS for ONE Lambda (with a NON-retryable error) """
+    def _get_function(self, params :dict) -> dict:
+        if params.get("FunctionName") == self._function_name( FAILING_LAMBDA_INDX ):
+            return self._error( "ResourceNotFoundException", "Function not found (simulated)" )
+        return super()._get_function( params )
+
+@pytest.fixture()
+def make_async_invoker( monkeypatch ):
+    """ Returns a factory: make_async_invoker( synthetic, rate_limiting=False ) -> ( AsyncInvokeAWSApi, ApiReplayer ).  Closed at teardown. """
+    ### aiobotocore still needs (any) credentials, even though NO request ever leaves this process.
+    monkeypatch.setenv( "AWS_ACCESS_KEY_ID", "testing" )
+    monkeypatch.setenv( "AWS_SECRET_ACCESS_KEY", "testing" )
+    invokers :list[AsyncInvokeAWSApi] = []
+    def _make_async_invoker( synthetic :SyntheticAwsAccount, rate_limiting :bool = False ) -> tuple[AsyncInvokeAWSApi, ApiReplayer]:
+        replayer = ApiReplayer( synthetic=synthetic )
+        invoker = AsyncInvokeAWSApi(
+            aws_region = SyntheticAwsAccount.REGION,
+            endpoint_url = "http://127.0.0.1:9",    ### the "stub-endpoint".  Never connected to; every call is replayed.
+            api_metrics_report = False,
+            rate_limiting = rate_limiting,    ### Off by default:  test OUR code; NOT the client-side throttling.
+            client_hooks = [ replayer ],
+        )
+        invokers.append( invoker )
+        return invoker, replayer
+    yield _make_async_invoker
+    for invoker in invokers:
+        invoker.close()
+
+### ----------------------------------------------------------------------
+
+def test_async_lambdas_full_details_same_as_sync( make_async_invoker, tmp_path ):
+    synthetic = SyntheticAwsAccount( num_lambdas=NUM_LAMBDAS )
+    invoker, _ = make_async_invoker( synthetic )
+    result = invoker.get_all_lambdas_full_details( json_output_filepath = tmp_path / "async-Lambdas.json" )
+
+    sync_invoker = InvokeAWSApi( aws_region=SyntheticAwsAccount.REGION, api_metrics_report=False, rate_limiting=False,
+                                 client_hooks=[ ApiReplayer( synthetic=synthetic ) ] )
+    expected = sync_invoker.get_all_lambdas_full_details( json_output_filepath = tmp_path / "sync-Lambdas.json" )
+
+    assert len(result) == NUM_LAMBDAS
+    assert all( "Versions" in item for item in result )
+    assert { item["FunctionName"]: item for item in result } == { item["FunctionName"]: item for item in expected }
+
+def test_async_lambdas_full_details_uses_cache( make_async_invoker, tmp_path ):
+    invoker, replayer = make_async_invoker( SyntheticAwsAccount( num_lambdas=NUM_LAMBDAS ) )
+    cache_file = tmp_path / "all-Lambdas.json"
+    invoker.get_all_lambdas_full_details( json_output_filepath = cache_file )
+    calls = replayer.call_count
+    assert len( invoker.get_all_lambdas_full_details( json_output_filepath = cache_file ) ) == NUM_LAMBDAS
+    assert replayer.call_count == calls
+
+def test_async_lambdas_full_details_tolerates_versions_failure( make_async_invoker, tmp_path ):
+    """ Just like the SYNC path: a failed `list_versions_by_function()` leaves that Lambda WITHOUT versions (and provisioned-concurrency) .. and does NOT abort. """
+    invoker, _ = make_async_invoker( _FailingVersionsAwsAccount( num_lambdas=NUM_LAMBDAS ) )
+    result = invoker.get_all_lambdas_full_details( json_output_filepath = tmp_path / "all-Lambdas.json" )
+
+    assert len(result) == NUM_LAMBDAS
+    failed = result[ FAILING_LAMBDA_INDX ]
+    assert "Versions" not in failed
+    assert failed["ProvisionedConcurrency"] is None
+    assert "Code" in failed
+    assert all( "Versions" in item for indx, item in enumerate(result) if indx != FAILING_LAMBDA_INDX )
+
+def test_async_lambdas_full_details_get_function_failure_exits( make_async_invoker, tmp_path ):
+    """ A failed `get_function()` is fatal (just like the SYNC path) .. and the SYNC facade must NOT hang. """
+    invoker, _ = make_async_invoker( _FailingGetFunctionAwsAccount( num_lambdas=NUM_LAMBDAS ) )
+    with pytest.raises( SystemExit ) as exc_info:
+        invoker.get_all_lambdas_full_details( json_output_filepath = tmp_path / "all-Lambdas.json" )
+    assert exc_info.value.code == 71
+
+def test_async_rate_limiting_shares_token_buckets( make_async_invoker, tmp_path ):
+    """ The aiobotocore-clients are paced by the SAME per-API token-buckets as `get_client()` """
+    num_lambdas = 30    ### 10 (burst) + 20 more "lambda.GetFunction" calls at 10/sec.
+    invoker, _ = make_async_invoker( SyntheticAwsAccount( num_lambdas=num_lambdas ), rate_limiting=True )
+    start = time.monotonic()
+    result = invoker.get_all_lambdas_full_details( json_output_filepath = tmp_path / "all-Lambdas.json" )
+
+    assert len(result) == num_lambdas
+    assert "lambda.GetFunction" in invoker.rate_limiter.summary()
+    assert time.monotonic() - start >= 1.0
+
+def test_token_bucket_acquire_async_does_not_block_event_loop():
+    bucket = ApiTokenBucket( "lambda.GetFunction", initial_rate=1.0 )
+    bucket.acquire()    ### the ONLY token.  The next one is ~1 sec away.
+    finished :list[str] = []
+    async def _acquire() -> None:
+        await bucket.acquire_async()
+        finished.append( "acquire" )
+    async def _other_work() -> None:
+        for _ in range(5):
+            await asyncio.sleep( 0.01 )
+        finished.append( "other" )
+    async def _main() -> None:
+        await asyncio.gather( _acquire(), _other_work() )
+    asyncio.run( _main() )
+    assert finished == [ "other", "acquire" ]
+
+def _is_flock_free( json_output_filepath ) -> bool:
+    with open( str(json_output_filepath) + ".lock", "a" ) as f:
+        try:
+            fcntl.flock( f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB )
+        except BlockingIOError:
+            return False
+        fcntl.flock( f.fileno(), fcntl.LOCK_UN )
+        return True
+
+def test_cache_refresh_lock_async_one_coroutine_at_a_time( make_async_invoker, tmp_path ):
+    """ Coroutines (on the SAME event-loop thread) refreshing the SAME cache-file take turns .. and the `flock` is released, even when they exit out-of-order. """
+    invoker, _ = make_async_invoker( SyntheticAwsAccount( num_lambdas=1 ) )
+    cache_file = tmp_path / "all-Lambdas.json"
+    holders :list[int] = []
+    max_holders :list[int] = []
+    waited :dict[int, bool] = {}
+    async def _refresh( indx :int, secs :float ) -> None:
+        async with invoker.cache_refresh_lock_async( cache_file, CTX="test" ) as refresh_lock:
+            holders.append( indx )
+            max_holders.append( len(holders) )
+            waited[ indx ] = refresh_lock.waited
+            async with invoker.cache_refresh_lock_async( cache_file, CTX="test-nested" ) as nested_lock:    ### re-entrant within the same task
+                assert not nested_lock.waited
+            await asyncio.sleep( secs )
+            holders.remove( indx )
+    async def _main() -> None:
+        await asyncio.gather( _refresh( 1, 0.2 ), _refresh( 2, 0.01 ) )
+    invoker.run_sync( _main() )
+
+    assert max( max_holders ) == 1
+    assert waited == { 1: False, 2: True }
+    assert _is_flock_free( cache_file )
+
+### EoScript
@@ -54,7 +54,7 @@ class GetHashesForLambdaLayers(GenericAWSCLIScript):
             tier=tier,
             debug=debug,
         )
-        lambda_client = self.awsapi_invoker.session.client('lambda')
+        lambda_client = self.awsapi_invoker.get_client('lambda')
 
         lambdalayer_regex = regex.regex.Regex( aws_names.gen_awsresource_name_prefix( tier ) + '.*' )
         print( f"lambdalayer_regex: '{lambdalayer_regex}'" )
@@ -20,7 +20,7 @@ import common.cdk.constants_cdk as constants_cdk
 import common.cdk.aws_names as aws_names
 import common.FSUtils as FSUtils
 from common.cdk.standard_lambda import LambdaLayerOption
-from cdk_utils.CloudFormation_util import add_tags, get_cpu_arch_as_str
+from cdk_utils.CloudFormation_util import add_tags, get_cpu_arch_as_str, get_python_runtime_containerimage_uri
 from common.cdk.StandardLambdaLayer import LambdaLayerUtility, LambdaLayerProps
 
 from api import config
@@ -34,6 +34,28 @@ import backend.lambda_layer.lambda_layer_hashes
 ### ..............................................................................................
 ### ==============================================================================================
 
+def _gen_layer_fingerprint( layer :LambdaLayerProps, cpu_arch_str :str ) -> str:
+    """ Fingerprint over ALL the files in the layer-folder + the build-command + the Docker-image + the cpu-arch. """
+    return LambdaLayerUtility.gen_sha256_hash_for_layer(
+        layer_fldr_path = layer.lambda_layer_fldr,
+        builder_cmd = layer.builder_cmd or LambdaLayerUtility.gen_docker_bundling_cmd( layer_opt = layer.lambda_layer_sizing_option ),
+        docker_img_uri = None if layer.builder_cmd else get_python_runtime_containerimage_uri( cpu_arch_str ),  ### `builder_cmd` (example: Makefile) uses the Dockerfile within the layer-folder.
+        cpu_arch_str = cpu_arch_str,
+    )
+
+def _lookup_deployed_layer( tier :str, layer_id :str, cpu_arch_str :str ) -> Optional[dict[str, str]]:
+    """ Returns { "arn": .., "sha256_hex": .. } of the DEPLOYED layer (or None) """
+    lkp_str_key :str = aws_names.gen_lambdalayer_name( tier, layer_id, cpu_arch_str )
+    print( f"lkp_str_key = '{lkp_str_key}'" )
+    ### Since the file `backend/lambda_layer/lambda_layer_hashes.py` was updated -by- this CDK-synth-execution (happened within `cdk_lambda_layers_app.py`), we need to DYNAMICALLY reload it.
+    dyn_reloaded_module = importlib.reload(backend.lambda_layer.lambda_layer_hashes)
+    lkp_obj = dyn_reloaded_module.lambda_layer_hashes.get( tier )
+    return lkp_obj.get( lkp_str_key ) if lkp_obj else None
+
+### ==============================================================================================
+### ..............................................................................................
+### ==============================================================================================
+
 class LambdaLayersBuilderStacks(Stack):
     def __init__( self,
         scope: Construct,
@@ -67,6 +89,10 @@ class LambdaLayersBuilderStacks(Stack):
 
         self.tier = tier
 
+        ### -------- pre-synth build-phase: ALL the 𝜆-layers that need (re)building, are built CONCURRENTLY -------
+        ### So, the constructs below are simply handed the ready ZIP-files.
+        self._prebuilt_layer_zips :dict[tuple[str, str], pathlib.Path] = self._prebuild_pending_lambda_layers( tier, cpu_arch_list, layer_modules_list )
+
         ### -------- build the 𝜆-layers by CPU-ARCH -------
 
         for cpu_arch in cpu_arch_list:
@@ -90,6 +116,38 @@ class LambdaLayersBuilderStacks(Stack):
         add_tags(self, tier=tier, aws_env=aws_env, git_branch=git_branch)
 
 
+    ### ---------------------------------------------------------------------------------------------------------------------
+    def _prebuild_pending_lambda_layers(self,
+        tier :str,
+        cpu_arch_list :List[aws_lambda.Architecture],
+        layer_modules_list :list[LambdaLayerProps],
+    ) -> dict[tuple[str, str], pathlib.Path]:
+        """ A layer is pending, if its fingerprint differs from that of the DEPLOYED layer (and it's NOT already cached within `config.LambdaConfigs`).
+            Returns dict of ( layer_id, cpu_arch_str ) -> ready ZIP-file.  See `LambdaLayerUtility.prebuild_lambda_layer_zips()`
+        """
+        pending :list[tuple[LambdaLayerProps, str, str]] = []
+        for cpu_arch in cpu_arch_list:
+            cpu_arch_str: str = get_cpu_arch_as_str( cpu_arch )
+            for layer in layer_modules_list:
+                if not any( cpu_arch.name == larch.name for larch in layer.cpu_arch ):
+                    continue
+                try:
+                    config.LambdaConfigs.lookup_lambda_layer_asset( layer_name = layer.lambda_layer_id, cpu_arch_str = cpu_arch_str )
+                    continue    ### Already built (elsewhere)
+                except config.MyLambdaConfigException:
+                    pass
+                fingerprint = _gen_layer_fingerprint( layer, cpu_arch_str )
+                deployed_lyr = _lookup_deployed_layer( tier, layer.lambda_layer_id, cpu_arch_str )
+                if deployed_lyr and deployed_lyr.get('sha256_hex') == fingerprint:
+                    continue
+                if not layer.builder_cmd:
+                    ### Fail fast -- BEFORE spending any time building.
+                    FSUtils.assert_not_newer_than( myfile=pathlib.Path(f"{layer.lambda_layer_fldr}/Pipfile"),         newer_than_this=pathlib.Path(f"{layer.lambda_layer_fldr}/Pipfile.lock"),     ignore_missing_files=False )
+                    FSUtils.assert_not_newer_than( myfile=pathlib.Path(f"{layer.lambda_layer_fldr}/requirements.in"), newer_than_this=pathlib.Path(f"{layer.lambda_layer_fldr}/requirements.txt"), ignore_missing_files=True )
+                pending.append(( layer, cpu_arch_str, fingerprint ))
+
+        return LambdaLayerUtility.prebuild_lambda_layer_zips( pending )
+
     ### ---------------------------------------------------------------------------------------------------------------------
     def _create_lambda_layer(self,
         tier :str,
@@ -109,12 +167,7 @@ class LambdaLayersBuilderStacks(Stack):
         layer_sizing_option :LambdaLayerOption = layer.lambda_layer_sizing_option
         print( f"layer-id = '{layer_id}', layer_fldr_path='{layer_fldr_path}' sizing/cold-start-option='{layer_sizing_option}' .." )
 
-        lkp_str_key :str = aws_names.gen_lambdalayer_name( tier, layer_id, cpu_arch_str )
-        print( f"lkp_str_key = '{lkp_str_key}'" )
-        ### Since the file `backend/lambda_layer/lambda_layer_hashes.py` was updated -by- this CDK-synth-execution (happened within `cdk_lambda_layers_app.py`), we need to DYNAMICALLY reload it.
-        dyn_reloaded_module = importlib.reload(backend.lambda_layer.lambda_layer_hashes)
-        lkp_obj = dyn_reloaded_module.lambda_layer_hashes.get( tier )
-        lkp_lyr :dict[str, str] = lkp_obj.get( lkp_str_key ) if lkp_obj else None
+        lkp_lyr :dict[str, str] = _lookup_deployed_layer( tier, layer_id, cpu_arch_str )
         print( json.dumps(lkp_lyr, indent=4) )
         lkp_lyr_arn  = lkp_lyr.get('arn') if lkp_lyr else None
         lkp_lyr_hash = lkp_lyr.get('sha256_hex') if lkp_lyr else None
@@ -135,8 +188,8 @@ class LambdaLayersBuilderStacks(Stack):
 
         ### -------------------------------------
         if myasset_sha256_hash == None:
-            myasset_sha256_hash  = LambdaLayerUtility.gen_sha256_hash_for_layer( layer_fldr_path = layer_fldr_path )
-            print( f"Pipfile/requirements.txt sha256_hash = '{myasset_sha256_hash}' for layer_fldr_path = '{layer_fldr_path}'" )
+            myasset_sha256_hash  = _gen_layer_fingerprint( layer, cpu_arch_str )
+            print( f"Layer-fingerprint sha256_hash = '{myasset_sha256_hash}' for layer_fldr_path = '{layer_fldr_path}'" )
 
         ### Detect of anything has changed with this Lambda-Layer (by comparing HASH from deployed-layer with above `myasset_sha256_hash`)
         if lkp_lyr_hash and myasset_sha256_hash and lkp_lyr_hash == myasset_sha256_hash:
@@ -167,32 +220,22 @@ class LambdaLayersBuilderStacks(Stack):
             FSUtils.assert_not_newer_than( myfile=pathlib.Path(f"{layer_fldr_path}/requirements.in"), newer_than_this=pathlib.Path(f"{layer_fldr_path}/requirements.txt"), ignore_missing_files=True )
 
         if not my_lambdalayer_asset:
-            if layer.builder_cmd:
-                ### SCENARIO: if the `layer.lambda_layer_fldr` contains a `Makefile`, then simply run a shell to execute `make`, and then set my_lambdalayer_asset to the CDK-Asset pointed to the file "{layer.lambda_layer_fldr}/build/layer.zip" file
-                ###           or .. if the layer is built with a unique-shell command
-                process = subprocess.run(
-                    args = layer.builder_cmd,
-                    cwd = layer.lambda_layer_fldr,
-                    shell=True,
-                    check=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    universal_newlines=True
-                )
-                my_lambdalayer_asset = aws_lambda.AssetCode.from_asset( str(layer.lambda_layer_fldr / "build" / layer.lambda_layer_zipfilename) );
-            else:
-                ### SCENARIO: Else, we assume there's (instead) a `Pipfile` that will be used to create a Lambda-Layer Zip-file
+            ### The layer's ZIP-file comes from the content-addressed `LambdaLayerArtifactStore` (keyed by the layer-fingerprint).
+            ### ONLY on a miss, is the layer built -- either via `layer.builder_cmd` (example: `make`), or via Docker (using the `Pipfile`).
+            ### Either way, NO Docker-bundling by CDK.
+            ### Typically, the ZIP-file is ready .. from the pre-synth build-phase (See `_prebuild_pending_lambda_layers()`)
+            layer_zip_path = self._prebuilt_layer_zips.get(( layer_id, cpu_arch_str ))
+            if not layer_zip_path:
                 util = LambdaLayerUtility(
                     lambda_layer_id = layer.lambda_layer_id,
                     lambda_layer_builder_script = None ### was: layer.LAMBDA_LAYER_BUILDER_SCRIPT,
                 )
-                my_lambdalayer_asset = util.build_lambda_layer_using_docker(
-                    tier = tier,
+                layer_zip_path = util.get_or_build_lambda_layer_zip(
                     cpu_arch_str = cpu_arch_str,
-                    layer_fldr_path = layer_fldr_path,
-                    layer_opt = layer_sizing_option,
-                    # zipfile_simplename = layer_zipfilename,
+                    layer = layer,
+                    fingerprint = myasset_sha256_hash,
                 )
+            my_lambdalayer_asset = aws_lambda.Code.from_asset( str(layer_zip_path) )
             config.LambdaConfigs.cache_lambda_layer_asset(
                 layer_name = layer_id,
                 cpu_arch_str = cpu_arch_str,
@@ -1,7 +1,11 @@
 import os
+import json
+import time
+import fnmatch
 import pathlib
 import hashlib
-from typing import Union, TypeVar
+import threading
+from typing import Optional, Union, TypeVar
 
 PathLike = TypeVar('PathLike', str, pathlib.PurePath)
 
@@ -205,5 +209,112 @@ def getSHAHashForFile2(
 ### ..............................................................................................
 ### ==============================================================================================
 
-### EoF
+### Files & sub-folders that are OUTPUTS of a build (or just noise), and so, are NEVER hashed by `get_merkle_sha256_hex_hash_for_folder()`
+MERKLE_HASH_EXCLUDE_PATTERNS :list[str] = [
+    ".git", ".venv", "venv", "node_modules", "__pycache__", ".pytest_cache", "cdk.out",
+    "build", "python", "*.zip", "*.pyc", ".DS_Store",
+]
+
+class FileHashStatCache():
+    """
+    Memoizes the SHA256 of files, keyed by ( absolute-path, size, mtime ).
+    So, re-hashing a folder, never re-reads a file that is unchanged since it was last hashed.
+    Persisted (as JSON) into `cache_filepath` via `save()`.  Thread-safe.
+
+    Note: a file modified within the SAME mtime-tick as it was hashed would look unchanged.
+          So, a file whose mtime is within `RACY_MTIME_SECS` of "now", is hashed but NOT memoized.
+    """
+    RACY_MTIME_SECS = 2
+
+    def __init__(self, cache_filepath :Optional[PathLike] = None) -> None:
+        self.cache_filepath = pathlib.Path(cache_filepath) if cache_filepath else None
+        self._entries :dict[str, list] = {}     ### absolute-path -> [ size, mtime_ns, sha256-hex ]
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        if self.cache_filepath and self.cache_filepath.exists():
+            try:
+                with open(self.cache_filepath, 'r') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print( f"!! WARNING !! Ignoring the corrupt file-hash cache '{self.cache_filepath}': {e}" )
+
+    def get_sha256_hex(self, file_path :PathLike) -> str:
+        path_str = os.path.abspath(str(file_path))
+        st = os.stat(path_str)
+        with self._lock:
+            entry = self._entries.get( path_str )
+            if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+                self.hits += 1
+                return entry[2]
+        sha256_hex = get_sha_hash_for_binary_or_ginormous_file( path_str )
+        with self._lock:
+            self.misses += 1
+            if time.time() - st.st_mtime > self.RACY_MTIME_SECS:
+                self._entries[ path_str ] = [ st.st_size, st.st_mtime_ns, sha256_hex ]
+                self._dirty = True
+        return sha256_hex
+
+    def save(self) -> None:
+        """ Atomically (re)writes the cache-file .. ONLY if anything changed """
+        if not self.cache_filepath:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            self.cache_filepath.parent.mkdir( parents=True, exist_ok=True )
+            tmp_filepath = self.cache_filepath.with_name( f"{self.cache_filepath.name}.{os.getpid()}.{threading.get_ident()}.tmp" )
+            with open(tmp_filepath, 'w') as f:
+                json.dump( self._entries, f )
+            os.replace( tmp_filepath, self.cache_filepath )
+            self._dirty = False
+
+### ..............................................................................................
+
+def get_merkle_sha256_hex_hash_for_folder(
+    fldr_path :PathLike,
+    stat_cache :Optional[FileHashStatCache] = None,
+    exclude_patterns :list[str] = MERKLE_HASH_EXCLUDE_PATTERNS,
+) -> str:
+    """
+    Merkle-hash (SHA256, as hex) over EVERY file within the folder (recursively), EXCEPT those whose simple-name matches any of `exclude_patterns`.
+    Each file's leaf is the SHA256 of its contents (memoized via the OPTIONAL `stat_cache`) plus its executable-bit.
+    Each folder's node is the SHA256 of its children's ( type, name, hash ) -- sorted by name.  So, the result does NOT depend on the file-system's listing order.
+    Symlinks are hashed by their target-path (and are NOT followed).
 
+    Args:
+        fldr_path: Path to the folder
+        stat_cache: OPTIONAL memoization of the per-file hashes
+        exclude_patterns: glob-patterns (like "*.zip") matched against the simple-name of each file & sub-folder
+
+    Returns:
+        str: Hexadecimal representation of the SHA256 hash
+    """
+    if not is_valid_directory(fldr_path):
+        raise FileNotFoundError(f"!! ERROR !! folder '{fldr_path}' not found!")
+
+    def _node_hash( dir_path :str ) -> str:
+        node = hashlib.sha256()
+        with os.scandir(dir_path) as it:
+            children = sorted( it, key=lambda e: e.name )
+        for child in children:
+            if any( fnmatch.fnmatch( child.name, patt ) for patt in exclude_patterns ):
+                continue
+            if child.is_symlink():
+                kind, child_hash = "l", hashlib.sha256( os.readlink(child.path).encode() ).hexdigest()
+            elif child.is_dir():
+                kind, child_hash = "d", _node_hash( child.path )
+            else:
+                kind = "x" if os.access( child.path, os.X_OK ) else "f"
+                child_hash = stat_cache.get_sha256_hex( child.path ) if stat_cache else get_sha_hash_for_binary_or_ginormous_file( child.path )
+            node.update( f"{kind}\0{child.name}\0{child_hash}\n".encode() )
+        return node.hexdigest()
+
+    return _node_hash( str(fldr_path) )
+
+### ==============================================================================================
+### ..............................................................................................
+### ==============================================================================================
+
+### EoF
@@ -0,0 +1,230 @@
+"""
+Content-addressed store of Lambda-Layer ZIP-files, keyed by the layer's fingerprint (See `LambdaLayerUtility.gen_sha256_hash_for_layer()`).
+*   On a hit, the layer becomes `aws_lambda.Code.from_asset( <zip-file> )` -- with NO Docker-bundling at all.
+*   On a miss, the layer is built ONCE (See `LambdaLayerUtility.build_lambda_layer_zip_using_docker()`) and `put()` into this store.
+    So, an identical layer built an hour ago -- on this laptop, or within the (cached) CodeBuild-folder -- is simply re-used.
+
+Local-disk layout:   <store-root>/<fingerprint[:2]>/<fingerprint>.zip   (plus a "<fingerprint>.json" with its metadata)
+    Every hit "touches" the zip-file's mtime.  So, evicting the OLDEST mtime first, is LRU-eviction (atime is unreliable, with `noatime` mounts).
+    Whenever the total-size exceeds `max_bytes`, least-recently-used zip-files are evicted .. EXCEPT those used by this process (the current cdk-synth).
+
+OPTIONAL S3-mirror (like "s3://my-bucket/lambda-layer-artifacts"):
+    On a local miss, the S3-mirror is checked (and a hit is downloaded into the local-store).  Every `put()` is also uploaded.
+    Any failure re: the S3-mirror is just a WARNING (the layer is simply built locally).
+
+Environment-variables (See `LambdaLayerArtifactStore.from_env()`):
+    LAMBDA_LAYER_ARTIFACT_STORE         -- local-folder.   Default: ~/.cache/<CDK_APP_NAME>/lambda-layer-artifacts
+    LAMBDA_LAYER_ARTIFACT_STORE_MAX_GB  -- Default: 5
+    LAMBDA_LAYER_ARTIFACT_STORE_S3      -- Default: NO S3-mirror.
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+import zipfile
+from pathlib import Path
+from typing import Optional
+
+import constants
+
+### ==========================================================================================================
+
+DEFAULT_STORE_FLDR = Path.home() / ".cache" / constants.CDK_APP_NAME / "lambda-layer-artifacts"
+DEFAULT_MAX_GB = 5
+GB = 1024 ** 3
+
+### ==========================================================================================================
+
+class LambdaLayerArtifactStore():
+    """ Thread-safe.  See the top of this file for details. """
+
+    def __init__(self,
+        store_fldr :Path = DEFAULT_STORE_FLDR,
+        max_bytes :int = DEFAULT_MAX_GB * GB,
+        s3_mirror_uri :Optional[str] = None,
+    ) -> None:
+        self.store_fldr = Path(store_fldr)
+        self.max_bytes = max_bytes
+        self.s3_bucket, self.s3_prefix = self._parse_s3_uri( s3_mirror_uri ) if s3_mirror_uri else ( None, None )
+        self._lock = threading.Lock()
+        self._in_use :set[str] = set()     ### fingerprints got/put by this process.  NEVER evicted.
+        self._s3_client = None
+        self.store_fldr.mkdir( parents=True, exist_ok=True )
+
+    @staticmethod
+    def from_env() -> 'LambdaLayerArtifactStore':
+        return LambdaLayerArtifactStore(
+            store_fldr = Path( os.environ.get( "LAMBDA_LAYER_ARTIFACT_STORE", DEFAULT_STORE_FLDR ) ),
+            max_bytes = int( float( os.environ.get( "LAMBDA_LAYER_ARTIFACT_STORE_MAX_GB", DEFAULT_MAX_GB ) ) * GB ),
+            s3_mirror_uri = os.environ.get( "LAMBDA_LAYER_ARTIFACT_STORE_S3" ),
+        )
+
+    @staticmethod
+    def _parse_s3_uri( s3_uri :str ) -> tuple[str, str]:
+        if not s3_uri.startswith("s3://"):
+            raise ValueError(f"!! ERROR !! Invalid S3-mirror '{s3_uri}'.  Must be like 's3://my-bucket/some/prefix'")
+        bucket, _, prefix = s3_uri[len("s3://"):].partition("/")
+        return bucket, prefix.strip("/")
+
+    ### -----------------------------------------------
+
+    def zip_path_for(self, fingerprint :str) -> Path:
+        return self.store_fldr / fingerprint[:2] / f"{fingerprint}.zip"
+
+    def _metadata_path_for(self, fingerprint :str) -> Path:
+        return self.store_fldr / fingerprint[:2] / f"{fingerprint}.json"
+
+    def _s3_key_for(self, fingerprint :str, suffix :str) -> str:
+        return f"{self.s3_prefix}/{fingerprint}{suffix}" if self.s3_prefix else f"{fingerprint}{suffix}"
+
+    def _get_s3_client(self):
+        if self._s3_client is None:
+            import boto3
+            self._s3_client = boto3.client('s3')
+        return self._s3_client
+
+    ### -----------------------------------------------
+
+    def get(self, fingerprint :str) -> Optional[Path]:
+        """ Returns the path to the zip-file (within the local-store), or None if neither the local-store nor the S3-mirror has it. """
+        zip_path = self.zip_path_for( fingerprint )
+        if self._is_valid( fingerprint ):
+            os.utime( zip_path )    ### LRU
+            with self._lock:
+                self._in_use.add( fingerprint )
+            print( f"✅ Lambda-Layer artifact-store HIT: '{zip_path}'" )
+            return zip_path
+        if self.s3_bucket and self._download_from_s3_mirror( fingerprint ):
+            return zip_path
+        print( f"Lambda-Layer artifact-store MISS for '{fingerprint}'" )
+        return None
+
+    def put(self, fingerprint :str, src_zip_path :Path, metadata :dict = {}) -> Path:
+        """ COPIES the zip-file into the local-store (atomically), uploads to the S3-mirror, and then evicts (LRU) as needed.
+            Returns the path to the zip-file within the local-store.
+        """
+        zip_path = self.zip_path_for( fingerprint )
+        zip_path.parent.mkdir( parents=True, exist_ok=True )
+        tmp_path = zip_path.with_name( f"{zip_path.name}.{os.getpid()}.{threading.get_ident()}.partial" )
+        shutil.copyfile( src_zip_path, tmp_path )
+        os.replace( tmp_path, zip_path )
+        self._write_metadata( fingerprint, zip_path, metadata )
+        with self._lock:
+            self._in_use.add( fingerprint )
+        print( f"⟳ Lambda-Layer artifact-store PUT: '{zip_path}'" )
+        if self.s3_bucket:
+            self._upload_to_s3_mirror( fingerprint )
+        self.evict()
+        return zip_path
+
+    ### -----------------------------------------------
+
+    def _write_metadata(self, fingerprint :str, zip_path :Path, metadata :dict) -> None:
+        with open( zip_path, 'rb' ) as f:
+            zip_sha256 = hashlib.file_digest( f, "sha256" ).hexdigest()
+        meta = { **metadata, "fingerprint": fingerprint, "size": zip_path.stat().st_size, "zip_sha256": zip_sha256, "created": time.time() }
+        metadata_path = self._metadata_path_for( fingerprint )
+        tmp_path = metadata_path.with_name( f"{metadata_path.name}.{os.getpid()}.{threading.get_ident()}.partial" )
+        with open( tmp_path, 'w' ) as f:
+            json.dump( meta, f, indent=4 )
+        os.replace( tmp_path, metadata_path )
+
+    def _is_valid(self, fingerprint :str) -> bool:
+        """ A zip-file without metadata, or whose size differs from its metadata, is a left-over of an interrupted `put()` .. and is deleted. """
+        zip_path = self.zip_path_for( fingerprint )
+        metadata_path = self._metadata_path_for( fingerprint )
+        if not zip_path.exists():
+            return False
+        try:
+            with open( metadata_path, 'r' ) as f:
+                meta = json.load(f)
+            if meta.get("size") == zip_path.stat().st_size:
+                return True
+        except (OSError, ValueError):
+            pass
+        print( f"!! WARNING !! Deleting the INCOMPLETE/CORRUPT Lambda-Layer artifact '{zip_path}'" )
+        self._delete( fingerprint )
+        return False
+
+    def _delete(self, fingerprint :str) -> None:
+        for p in [ self.zip_path_for( fingerprint ), self._metadata_path_for( fingerprint ) ]:
+            p.unlink( missing_ok=True )
+
+    def evict(self) -> list[str]:
+        """ Deletes the least-recently-used zip-files, until the total-size is within `max_bytes`.  Returns the evicted fingerprints. """
+        with self._lock:
+            entries = []
+            for zip_path in self.store_fldr.glob("*/*.zip"):
+                try:
+                    st = zip_path.stat()
+                except FileNotFoundError:
+                    continue    ### evicted by another process
+                entries.append(( st.st_mtime, st.st_size, zip_path.stem ))
+            total_bytes = sum( e[1] for e in entries )
+            evicted = []
+            for _, size, fingerprint in sorted( entries ):
+                if total_bytes <= self.max_bytes:
+                    break
+                if fingerprint in self._in_use:
+                    continue
+                self._delete( fingerprint )
+                total_bytes -= size
+                evicted.append( fingerprint )
+        if evicted:
+            print( f"🗑️  Evicted {len(evicted)} Lambda-Layer artifacts (LRU) from '{self.store_fldr}'" )
+        return evicted
+
+    ### -----------------------------------------------
+
+    def _download_from_s3_mirror(self, fingerprint :str) -> bool:
+        zip_path = self.zip_path_for( fingerprint )
+        tmp_path = zip_path.with_name( f"{zip_path.name}.{os.getpid()}.{threading.get_ident()}.partial" )
+        try:
+            s3 = self._get_s3_client()
+            meta = json.loads( s3.get_object( Bucket=self.s3_bucket, Key=self._s3_key_for( fingerprint, ".json" ) )['Body'].read() )
+            zip_path.parent.mkdir( parents=True, exist_ok=True )
+            print( f"↓ Downloading Lambda-Layer artifact s3://{self.s3_bucket}/{self._s3_key_for( fingerprint, '.zip' )} .." )
+            s3.download_file( self.s3_bucket, self._s3_key_for( fingerprint, ".zip" ), str(tmp_path) )
+            with open( tmp_path, 'rb' ) as f:
+                if hashlib.file_digest( f, "sha256" ).hexdigest() != meta.get("zip_sha256"):
+                    raise ValueError(f"SHA256 mismatch for downloaded '{fingerprint}.zip'")
+            if not zipfile.is_zipfile( tmp_path ):
+                raise ValueError(f"NOT a valid zip-file: '{fingerprint}.zip'")
+            os.replace( tmp_path, zip_path )
+            self._write_metadata( fingerprint, zip_path, { k: v for k, v in meta.items() if k not in ["fingerprint", "size", "zip_sha256", "created"] } )
+        except Exception as e:
+            if "NoSuchKey" not in str(e) and "404" not in str(e):
+                print( f"!! WARNING !! Lambda-Layer artifact S3-mirror (s3://{self.s3_bucket}/{self.s3_prefix}) failed for '{fingerprint}': {e}" )
+            tmp_path.unlink( missing_ok=True )
+            return False
+        with self._lock:
+            self._in_use.add( fingerprint )
+        self.evict()
+        return True
+
+    def _upload_to_s3_mirror(self, fingerprint :str) -> None:
+        try:
+            s3 = self._get_s3_client()
+            ### zip-file 1st.  So, the metadata (which `_download_from_s3_mirror()` reads 1st) never points to a missing zip-file.
+            s3.upload_file( str(self.zip_path_for( fingerprint )), self.s3_bucket, self._s3_key_for( fingerprint, ".zip" ) )
+            s3.upload_file( str(self._metadata_path_for( fingerprint )), self.s3_bucket, self._s3_key_for( fingerprint, ".json" ) )
+        except Exception as e:
+            print( f"!! WARNING !! Lambda-Layer artifact S3-mirror (s3://{self.s3_bucket}/{self.s3_prefix}) upload failed for '{fingerprint}': {e}" )
+
+### ==========================================================================================================
+
+_default_store :Optional[LambdaLayerArtifactStore] = None
+_default_store_lock = threading.Lock()
+
+def get_default_artifact_store() -> LambdaLayerArtifactStore:
+    """ Process-wide singleton, configured via environment-variables.  See top of this file. """
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = LambdaLayerArtifactStore.from_env()
+        return _default_store
+
+### EoF
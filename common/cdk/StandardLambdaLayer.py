@@ -1,6 +1,7 @@
 import os
 import hashlib
 import time
+import tempfile
 from pathlib import Path, PurePath
 from typing import Optional, Union, TypeVar
 import traceback
@@ -9,7 +10,9 @@ PathLike = TypeVar('PathLike', str, PurePath)
 
 import docker
 import shutil
-import zipfile
+import subprocess
+import threading
+import concurrent.futures
 
 from subprocess import PIPE, STDOUT
 
@@ -25,10 +28,12 @@ from aws_cdk import (
 )
 
 import common.FSUtils as FSUtils
+import common.zip_utils as zip_utils
 import constants
 import common.cdk.constants_cdk as constants_cdk
 import common.cdk.aws_names as aws_names
 from common.cdk.standard_lambda import LambdaLayerOption
+from common.cdk.LambdaLayerArtifactStore import LambdaLayerArtifactStore, get_default_artifact_store
 from cdk_utils.CloudFormation_util import (
     get_docker_platform,
     get_python_runtime_containerimage_uri,
@@ -78,6 +83,33 @@ def _shrink_layer_zipfile(
     )
 
 
+### Where the per-file SHA256s (of ALL the files within ALL the layer-folders) are memoized, across cdk-synths.  See `FSUtils.FileHashStatCache`
+LAYER_FILE_HASHES_CACHE_FILEPATH = Path( os.environ.get( "LAMBDA_LAYER_FILE_HASHES_CACHE",
+                                         Path(tempfile.gettempdir()) / f"{constants.CDK_APP_NAME}-lambda-layer-file-hashes.json" ) )
+### Bump this, whenever the algorithm within `gen_sha256_hash_for_layer()` changes .. so that ALL layers get rebuilt.
+LAYER_FINGERPRINT_VERSION = "2"
+
+_layer_file_hashes_cache :Optional[FSUtils.FileHashStatCache] = None
+
+### Upper-limit on concurrent layer-builds (See `get_max_parallel_layer_builds()`).  Overridable via this env-var.
+LAYER_BUILD_MAX_WORKERS_ENVVAR = "LAMBDA_LAYER_BUILD_MAX_WORKERS"
+### Peak memory of ONE `pipenv sync` (of the larger layers, like pandas) inside Docker.  Used to size the worker-pool by Docker-daemon's memory.
+LAYER_BUILD_PEAK_MEM_BYTES = 2 * 1024**3
+
+### `builder_cmd` (example: `make`) writes into the layer-folder itself.  So, builds of the SAME folder must NOT overlap.
+_layer_fldr_locks :dict[str, threading.Lock] = {}
+_layer_fldr_locks_lock = threading.Lock()
+
+def _get_layer_fldr_lock( layer_fldr_path :Path ) -> threading.Lock:
+    with _layer_fldr_locks_lock:
+        return _layer_fldr_locks.setdefault( str(Path(layer_fldr_path).resolve()), threading.Lock() )
+
+def _get_layer_file_hashes_cache() -> FSUtils.FileHashStatCache:
+    global _layer_file_hashes_cache
+    if _layer_file_hashes_cache is None:
+        _layer_file_hashes_cache = FSUtils.FileHashStatCache( LAYER_FILE_HASHES_CACHE_FILEPATH )
+    return _layer_file_hashes_cache
+
 ### =================================================================================
 ### ---------------------------------------------------------------------------------
 ### =================================================================================
@@ -166,29 +198,91 @@ class LambdaLayerUtility():
     ### =================================================================================
 
     @staticmethod
-    def gen_sha256_hash_for_layer( layer_fldr_path :PathLike) -> str:
+    def gen_sha256_hash_for_layer(
+        layer_fldr_path :PathLike,
+        builder_cmd :Optional[str] = None,
+        docker_img_uri :Optional[str] = None,
+        cpu_arch_str :Optional[str] = None,
+    ) -> str:
         """
             param # 1: layer_fldr_path :Path -- pathlib.Path to the folder containing the Lambda-layer source code.
-            RETURNS: The SHA256 hash (of `Pipfile.lock`) which is then encoded as hex.  See the algorithm inside `FSUtils.get_sha256_hex_hash_for_file()`
+            param # 2: builder_cmd :str -- (OPTIONAL) the EXACT shell-command that builds the layer.  See `gen_docker_bundling_cmd()`
+            param # 3: docker_img_uri :str -- (OPTIONAL) the Docker-image within which `builder_cmd` runs.
+            param # 4: cpu_arch_str :str -- (OPTIONAL) 'arm64'|'x86_64'
+            RETURNS: The layer's fingerprint -- a SHA256 hash encoded as hex -- over ALL of the above.
+                The folder is Merkle-hashed (ALL its files: Pipfile.lock, Dockerfile, Makefile, *.sh, ..) -- see `FSUtils.get_merkle_sha256_hex_hash_for_folder()`.
+                So, editing ANY input of the layer (incl. the `_STD_BUILD_POST_CMDS` shrink-recipe, which is part of `builder_cmd`) changes the fingerprint.
+                The per-file hashes are memoized in `LAYER_FILE_HASHES_CACHE_FILEPATH`, so that re-synths never re-read unchanged files.
         """
-        ### Now calculate the SHA-256 hash and then convert it into HEX
         pipfile_lock = "Pipfile.lock"
         requirements_txt = "requirements.txt"
         HashingInputFile = "HashInput.txt"
-        if FSUtils.is_valid_file(FSUtils.join_path(layer_fldr_path, pipfile_lock)):
-            asset_hash = FSUtils.get_sha256_hex_hash_for_file( layer_fldr_path, pipfile_lock )
-        elif FSUtils.is_valid_file(FSUtils.join_path(layer_fldr_path, requirements_txt)):
-            asset_hash = FSUtils.get_sha256_hex_hash_for_file( layer_fldr_path, requirements_txt )
-        elif FSUtils.is_valid_file(FSUtils.join_path(layer_fldr_path, HashingInputFile)):
-            asset_hash = FSUtils.get_sha256_hex_hash_for_file( layer_fldr_path, HashingInputFile )
-        else:
-            raise FileNotFoundError(f"Neither {pipfile_lock} nor {requirements_txt} found in {layer_fldr_path}")
-        print( f"asset_hash = '{asset_hash}'" )
+        if not any( FSUtils.is_valid_file(FSUtils.join_path(layer_fldr_path, f)) for f in [ pipfile_lock, requirements_txt, HashingInputFile ] ):
+            raise FileNotFoundError(f"Neither {pipfile_lock} nor {requirements_txt} nor {HashingInputFile} found in {layer_fldr_path}")
+
+        stat_cache = _get_layer_file_hashes_cache()
+        tree_hash = FSUtils.get_merkle_sha256_hex_hash_for_folder( layer_fldr_path, stat_cache=stat_cache )
+        stat_cache.save()
+
+        fingerprint = hashlib.sha256()
+        for key, val in [ ( "version", LAYER_FINGERPRINT_VERSION ), ( "tree", tree_hash ),
+                          ( "builder_cmd", builder_cmd ), ( "docker_img_uri", docker_img_uri ), ( "cpu_arch", cpu_arch_str ) ]:
+            fingerprint.update( f"{key}\0{val or ''}\n".encode() )
+        asset_hash = fingerprint.hexdigest()
+        print( f"asset_hash = '{asset_hash}'  (folder's Merkle-hash = '{tree_hash}'; file-hashes memoized: {stat_cache.hits} hits, {stat_cache.misses} misses)" )
 
         return asset_hash
 
     ### =================================================================================
 
+    @staticmethod
+    def gen_docker_bundling_cmd(
+        layer_opt :LambdaLayerOption,
+        inside_docker_output_path :str = "/asset-output",
+    ) -> str:
+        """ The EXACT shell-command run inside Docker by `build_lambda_layer_using_docker()` -- incl. the `_STD_BUILD_POST_CMDS` shrink-recipe.
+            So, it's also an input to `gen_sha256_hash_for_layer()`
+        """
+        ### !! Attention !! pip's ERROR: Can not combine '--user' and '--target' (which is an ENV-VAR `PIP_TARGET` to this Docker)
+        cmd =  f"""
+            pip install pipenv &&
+            PYTHONPATH={inside_docker_output_path}/python PATH={inside_docker_output_path}/python/bin:$PATH pipenv sync --dev
+        """
+                ### !! Attention !! pip's ERROR: Can not combine '--user' and '--target' (which is an ENV-VAR `PIP_TARGET` to this Docker)
+                ### !! WARNING !! avoid use of pip3's cli-args "--platform {pip_platform}" !!! See switch/match above.
+                ### Note: Avoid `pipenv install`.  switch to `pipenv sync` which is More deterministic than `pipenv install`
+        cmd = ' '.join( cmd.split() ) ### split() and join() will replace \s+ with a single-whitespace-char!
+        return _shrink_layer_zipfile(
+            # cmd = f"pip install  --upgrade -r requirements.txt -t {inside_docker_output_path}/python --only-binary=:all:",
+            cmd = cmd,
+            install_dir = inside_docker_output_path,
+            layer_opt = layer_opt
+        )
+
+    @staticmethod
+    def gen_docker_bundling_env(
+        inside_docker_src_path :str = "/asset-input",
+        inside_docker_output_path :str = "/asset-output",
+    ) -> dict:
+        """ ENV-VARs passed onto the Docker-Container that runs `gen_docker_bundling_cmd()` """
+        # ### We are --FORCED-- to pass in ENV-VARs to Docker, for 2 very-wierd USE-CASES!
+        # ### USE-CASE #1 is still valid -- only-installing BINARIES and NOT-the-source-code (when installing PyPi-modules, either with `pip` or `pipenv`)
+        # ### USE-CASE #2 -- not working -- is to enable Docker-in-Docker (which --FAILS-- inside AWS-CodeBuild)
+        docker_env={} ### Passed onto Docker-Container when running
+        docker_env['PIP_ONLY_BINARY'] = ':all:'  ### use-case #1 mentioned above in comments
+                ### REF: https://pip.pypa.io/en/stable/cli/pip_install/
+        docker_env['PIP_TARGET'] = f"{inside_docker_output_path}/python"  ### use-case #1 mentioned above in comments
+                ### Attention: `pipenv` does -NOT- support `-t` a.k.a. `--target` CLI-arg, like plain `pip` cmd does.  Hence this env-var!!!
+        docker_env['PIPENV_VENV_IN_PROJECT'] = "1"   ### Keep virtualenv in project directory.  This is REQUIRED, since we are using `PIP_TARGET` (a.k.a. --target cli-arg for `pip` command)
+        docker_env['HOME']                   = f"{inside_docker_src_path}"
+        docker_env['PIPENV_HOME']            = "/tmp/pipenv"
+        ### Disable generating a new Pipenv's Pipfile.lock .. via environment variables
+        docker_env['PIPENV_NOSPIN']          = '1'
+        docker_env['PIPENV_SKIP_LOCK']       = '1'  # Prevents updating Pipfile.lock
+        return docker_env
+
+    ### =================================================================================
+
     def __init__(self,
         lambda_layer_id :str,
         lambda_layer_builder_script :Path,
@@ -340,7 +434,7 @@ class LambdaLayerUtility():
         layer_fldr_path :Path,
         layer_opt : LambdaLayerOption,
         # zipfile_simplename :str,
-        # reuse_if_exists :bool = False,  ### re-use does NOT work with `CodeAsset`.  So, unfortunately, we have to rebuild everytime!
+        # reuse_if_exists :bool = False,  ### re-use does NOT work with `CodeAsset`.  Instead, see `get_or_build_lambda_layer_zip()` (re-uses ZIP-files via `LambdaLayerArtifactStore`)
     ) -> aws_lambda.AssetCode:
         HDR = f" -- build_lambda_layer(tier={tier},cpu={cpu_arch_str}): within {__file__}"
 
@@ -385,17 +479,7 @@ class LambdaLayerUtility():
         # ###       >> Digest: sha256:04f633717595035419032727f8f28ac29cdd0400e6b3ca9a4cac23bea4bb0bb6
         # ###       >> Status: Image is up to date for public.ecr.aws/lambda/python:3.12-arm64
         # ###       >> docker: image with reference public.ecr.aws/lambda/python:3.12-arm64 was found but does not match the specified platform: wanted linux/amd64, actual: linux/arm64/v8.
-        docker_env={} ### Passed onto Docker-Container when running
-        docker_env['PIP_ONLY_BINARY'] = ':all:'  ### use-case #1 mentioned above in comments
-                ### REF: https://pip.pypa.io/en/stable/cli/pip_install/
-        docker_env['PIP_TARGET'] = f"{inside_docker_output_path}/python"  ### use-case #1 mentioned above in comments
-                ### Attention: `pipenv` does -NOT- support `-t` a.k.a. `--target` CLI-arg, like plain `pip` cmd does.  Hence this env-var!!!
-        docker_env['PIPENV_VENV_IN_PROJECT'] = "1"   ### Keep virtualenv in project directory.  This is REQUIRED, since we are using `PIP_TARGET` (a.k.a. --target cli-arg for `pip` command)
-        docker_env['HOME']                   = f"{inside_docker_src_path}"
-        docker_env['PIPENV_HOME']            = "/tmp/pipenv"
-        ### Disable generating a new Pipenv's Pipfile.lock .. via environment variables
-        docker_env['PIPENV_NOSPIN']          = '1'
-        docker_env['PIPENV_SKIP_LOCK']       = '1'  # Prevents updating Pipfile.lock
+        docker_env = LambdaLayerUtility.gen_docker_bundling_env( inside_docker_src_path, inside_docker_output_path )
 
         ### Following is re: use-case #2 mentioned above in comments (FYI: following does NOT work in AWS-CodeBuild)
         # docker_env['TARGETPLATFORM'] = get_docker_platform(cpu_arch_str)
@@ -421,15 +505,8 @@ class LambdaLayerUtility():
 
         ### ---------------------------------------------
         ### Following Docker-based approach will create a zipfile automatically, with the MUCH-simpler `/python/**` folder-heirarchy.
-        ### !! Attention !! pip's ERROR: Can not combine '--user' and '--target' (which is an ENV-VAR `PIP_TARGET` to this Docker)
-        cmd =  f"""
-            pip install pipenv &&
-            PYTHONPATH={inside_docker_output_path}/python PATH={inside_docker_output_path}/python/bin:$PATH pipenv sync --dev
-        """
-                ### !! Attention !! pip's ERROR: Can not combine '--user' and '--target' (which is an ENV-VAR `PIP_TARGET` to this Docker)
-                ### !! WARNING !! avoid use of pip3's cli-args "--platform {pip_platform}" !!! See switch/match above.
-                ### Note: Avoid `pipenv install`.  switch to `pipenv sync` which is More deterministic than `pipenv install`
-        cmd = ' '.join( cmd.split() ) ### split() and join() will replace \s+ with a single-whitespace-char!
+        ### See `gen_docker_bundling_cmd()`
+        cmd = LambdaLayerUtility.gen_docker_bundling_cmd( layer_opt=layer_opt, inside_docker_output_path=inside_docker_output_path )
 
         my_asset :aws_lambda.AssetCode = aws_lambda.Code.from_asset(
             ### https://docs.aws.amazon.com/cdk/api/v2/python/aws_cdk.aws_lambda/Code.html#aws_cdk.aws_lambda.Code.from_asset
@@ -454,12 +531,7 @@ class LambdaLayerUtility():
                 command = [
                     # "bash",
                     # "-c",
-                    _shrink_layer_zipfile(
-                        # cmd = f"pip install  --upgrade -r requirements.txt -t {inside_docker_output_path}/python --only-binary=:all:",
-                        cmd = cmd,
-                        install_dir = inside_docker_output_path,
-                        layer_opt = layer_opt
-                    )
+                    cmd,   ### incl. `_shrink_layer_zipfile()`
                 ],
                 ### docker run --rm -u "????:1360859114"
                 ###     -w "/asset-input"
@@ -547,6 +619,186 @@ class LambdaLayerUtility():
 
     ### -----------------------------------------------------------------------------------
 
+    """ Same as `build_lambda_layer_using_docker()` -- same Docker-image, same cmd (incl. the shrink-recipe), same env-vars -- but, run DIRECTLY via Docker (and NOT via CDK's bundling).
+        So, the result is a plain ZIP-file (that can be cached within `LambdaLayerArtifactStore`), instead of a CDK-asset.
+
+        param # 1 : cpu_arch_str :str -- 'arm64'|'x86_64'
+        param # 2 : layer_fldr_path :Path -- pathlib.Path to the folder containing the Lambda-layer source code.
+        param # 3 : layer_opt : LambdaLayerOption -- See `common.cdk.StandardLambdaLayer.py` for ENUM's details.
+        param # 4 : zip_path :Path -- where to create the ZIP-file
+        param # 5 : zip_max_workers :int -- (OPTIONAL) # of worker-processes to compress the ZIP-file.  See `zip_folder()`
+
+        Returns: pathlib.Path to the ZIP-file.
+    """
+    def build_lambda_layer_zip_using_docker(self,
+        cpu_arch_str :str,
+        layer_fldr_path :Path,
+        layer_opt : LambdaLayerOption,
+        zip_path :Path,
+        zip_max_workers :Optional[int] = None,
+    ) -> Path:
+        HDR = f" -- build_lambda_layer_zip_using_docker(layer={self._lambda_layer_id},cpu={cpu_arch_str}): within {__file__}"
+        layer_fldr_path = Path(layer_fldr_path).resolve().absolute()
+        inside_docker_src_path    = "/asset-input"
+        inside_docker_output_path = "/asset-output"
+        docker_img_uri = get_python_runtime_containerimage_uri(cpu_arch_str)
+        print( f"Building Lambda-layer ZIP-file '{zip_path}' via Docker-image '{docker_img_uri}' "+HDR )
+
+        client = _connect_to_docker_daemon()
+        with tempfile.TemporaryDirectory( prefix=f"{self._lambda_layer_id}-{cpu_arch_str}-" ) as tmpdir:
+            ### `pipenv` creates `.venv` within "/asset-input".  So, each build gets its OWN copy of the layer-folder (just the inputs) .. so that concurrent builds (See `prebuild_lambda_layer_zips()`) never collide.
+            host_src_path    = Path(tmpdir) / "asset-input"
+            host_output_path = Path(tmpdir) / "asset-output"
+            shutil.copytree( layer_fldr_path, host_src_path, symlinks=True, ignore=shutil.ignore_patterns( *FSUtils.MERKLE_HASH_EXCLUDE_PATTERNS ) )
+            host_output_path.mkdir()
+            ### docker run --rm -u "$(id -u):$(id -g)" --platform .. -v "{copy-of-layer_fldr}:/asset-input" -v "{tmp}:/asset-output" -w /asset-input --entrypoint bash {image} -c "{cmd}"
+            logs = client.containers.run(
+                image = docker_img_uri,
+                platform = get_docker_platform(cpu_arch_str),
+                entrypoint = [ "bash", "-c" ],
+                command = [ LambdaLayerUtility.gen_docker_bundling_cmd( layer_opt=layer_opt, inside_docker_output_path=inside_docker_output_path ) ],
+                environment = LambdaLayerUtility.gen_docker_bundling_env( inside_docker_src_path, inside_docker_output_path ),
+                volumes = {
+                    str(host_src_path):    { 'bind': inside_docker_src_path,    'mode': 'rw' },
+                    str(host_output_path): { 'bind': inside_docker_output_path, 'mode': 'rw' },
+                },
+                working_dir = inside_docker_src_path,
+                user = f"{os.getuid()}:{os.getgid()}",   ### Just like CDK's bundling.  So, the output is NOT owned by root.
+                remove = True,
+                detach = False,   ### Wait for the container to complete.  Raises `docker.errors.ContainerError` on a non-zero exit-code.
+                stdout = True,
+                stderr = True,
+            )
+            print( f"{'.'*40} {self._lambda_layer_id}-{cpu_arch_str} (last lines of Docker-output) {'.'*40}\n" + logs.decode(errors="replace")[-2000:] )
+            zip_folder( src_fldr_path = host_output_path, layer_zipfile_path = zip_path, layer_opt = layer_opt, max_workers = zip_max_workers )
+        return zip_path
+
+    ### -----------------------------------------------------------------------------------
+
+    """ Returns the path to the layer's ZIP-file, from the `LambdaLayerArtifactStore` (keyed by `fingerprint`).
+        ONLY if missing from the store, the layer is built (and then put into the store):
+            either via `layer.builder_cmd` (example: `make` .. which creates "{layer.lambda_layer_fldr}/build/{layer.lambda_layer_zipfilename}"),
+            or via `build_lambda_layer_zip_using_docker()`.
+
+        param # 1 : cpu_arch_str :str -- 'arm64'|'x86_64'
+        param # 2 : layer :LambdaLayerProps
+        param # 3 : fingerprint :str -- See `gen_sha256_hash_for_layer()`
+        param # 4 : store :LambdaLayerArtifactStore -- (OPTIONAL) Default: `get_default_artifact_store()`
+        param # 5 : zip_max_workers :int -- (OPTIONAL) # of worker-processes to compress the ZIP-file (Docker-builds only).  Default: # of CPUs
+    """
+    def get_or_build_lambda_layer_zip(self,
+        cpu_arch_str :str,
+        layer :LambdaLayerProps,
+        fingerprint :str,
+        store :Optional[LambdaLayerArtifactStore] = None,
+        zip_max_workers :Optional[int] = None,
+    ) -> Path:
+        store = store or get_default_artifact_store()
+        zip_path = store.get( fingerprint )
+        if zip_path:
+            return zip_path
+
+        metadata = { "lambda_layer_id": layer.lambda_layer_id, "cpu_arch": cpu_arch_str }
+        if layer.builder_cmd:
+            built_zip_path = layer.lambda_layer_fldr / "build" / layer.lambda_layer_zipfilename
+            with _get_layer_fldr_lock( layer.lambda_layer_fldr ):
+                ### The fingerprint covers inputs that `make` does NOT track (example: Dockerfile).  So, a left-over zip-file would be "up to date" for `make`,
+                ### and then get stored under the NEW fingerprint (and mirrored to S3).  Hence, delete it .. forcing a fresh build.
+                built_zip_path.unlink( missing_ok=True )
+                try:
+                    subprocess.run(
+                        args = layer.builder_cmd,
+                        cwd = layer.lambda_layer_fldr,
+                        shell=True,
+                        check=True,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE,
+                        universal_newlines=True
+                    )
+                except subprocess.CalledProcessError as e:
+                    print( f"!! ERROR !! `{layer.builder_cmd}` FAILED for Lambda-Layer '{layer.lambda_layer_id}-{cpu_arch_str}'\n{e.stdout}\n{e.stderr}" )
+                    raise
+                if not built_zip_path.exists():
+                    raise FileNotFoundError( f"!! ERROR !! `{layer.builder_cmd}` did NOT create '{built_zip_path}' for Lambda-Layer '{layer.lambda_layer_id}-{cpu_arch_str}'" )
+                return store.put( fingerprint, built_zip_path, metadata=metadata )
+
+        with tempfile.TemporaryDirectory( prefix=f"{layer.lambda_layer_id}-{cpu_arch_str}-zip-" ) as tmpdir:
+            built_zip_path = self.build_lambda_layer_zip_using_docker(
+                cpu_arch_str = cpu_arch_str,
+                layer_fldr_path = layer.lambda_layer_fldr,
+                layer_opt = layer.lambda_layer_sizing_option,
+                zip_path = Path(tmpdir) / f"{layer.lambda_layer_id}-{cpu_arch_str}.zip",
+                zip_max_workers = zip_max_workers,
+            )
+            return store.put( fingerprint, built_zip_path, metadata=metadata )
+
+    ### -----------------------------------------------------------------------------------
+
+    @staticmethod
+    def get_max_parallel_layer_builds() -> int:
+        """ How many layers can be built concurrently:  min( # of CPUs of this machine, # of CPUs of the Docker-daemon, Docker-daemon's memory / `LAYER_BUILD_PEAK_MEM_BYTES` )
+            The env-var `LAMBDA_LAYER_BUILD_MAX_WORKERS` overrides this.
+        """
+        if os.environ.get( LAYER_BUILD_MAX_WORKERS_ENVVAR ):
+            return max( 1, int( os.environ[ LAYER_BUILD_MAX_WORKERS_ENVVAR ] ) )
+        max_workers = os.cpu_count() or 1
+        try:
+            docker_info = _connect_to_docker_daemon().info()
+            max_workers = min( max_workers, docker_info.get('NCPU') or max_workers, ( docker_info.get('MemTotal') or 0 ) // LAYER_BUILD_PEAK_MEM_BYTES or 1 )
+        except Exception as e:
+            print( f"!! WARNING !! Unable to get the capacity of the Docker-daemon ({e}).  Sizing the layer-builds by this machine's CPUs only." )
+        return max( 1, max_workers )
+
+    """ The pre-synth build-phase:  builds ALL the pending layers (on a bounded pool of worker-threads) BEFORE any construct is created.
+        So, a cold build of the full set of layers takes about as long as the slowest layer (instead of the sum of all of them).
+        Every layer-build is `get_or_build_lambda_layer_zip()` (so, a layer already in the `LambdaLayerArtifactStore` is NOT rebuilt).
+
+        param # 1 : pending :list of ( LambdaLayerProps, cpu_arch_str, fingerprint )
+        param # 2 : max_workers :int -- (OPTIONAL) Default: `get_max_parallel_layer_builds()`
+        param # 3 : store :LambdaLayerArtifactStore -- (OPTIONAL) Default: `get_default_artifact_store()`
+
+        Returns: dict of ( lambda_layer_id, cpu_arch_str ) -> pathlib.Path to the ready ZIP-file.
+        If ANY layer fails to build, the exception is raised (AFTER the other in-flight builds complete).
+    """
+    @staticmethod
+    def prebuild_lambda_layer_zips(
+        pending :list[tuple[LambdaLayerProps, str, str]],
+        max_workers :Optional[int] = None,
+        store :Optional[LambdaLayerArtifactStore] = None,
+    ) -> dict[tuple[str, str], Path]:
+        if not pending:
+            return {}
+        store = store or get_default_artifact_store()
+        max_workers = min( len(pending), max_workers or LambdaLayerUtility.get_max_parallel_layer_builds() )
+        ### Each concurrent layer-build gets its SHARE of the CPUs, for compressing its ZIP-file.  Else, N builds x N worker-processes would over-subscribe the CPUs.
+        zip_max_workers = max( 1, ( os.cpu_count() or 1 ) // max_workers )
+        print( f"\n⏳ Pre-building {len(pending)} Lambda-Layers, {max_workers} at a time: {[ f'{lyr.lambda_layer_id}-{arch}' for lyr, arch, _ in pending ]}" )
+
+        def _build( layer :LambdaLayerProps, cpu_arch_str :str, fingerprint :str ) -> Path:
+            t0 = time.time()
+            util = LambdaLayerUtility( lambda_layer_id = layer.lambda_layer_id, lambda_layer_builder_script = None )
+            zip_path = util.get_or_build_lambda_layer_zip( cpu_arch_str=cpu_arch_str, layer=layer, fingerprint=fingerprint, store=store, zip_max_workers=zip_max_workers )
+            print( f"✅ Lambda-Layer '{layer.lambda_layer_id}-{cpu_arch_str}' ready in {time.time() - t0:.0f} secs: '{zip_path}'" )
+            return zip_path
+
+        t0 = time.time()
+        ready :dict[tuple[str, str], Path] = {}
+        failures :list[tuple[str, Exception]] = []
+        with concurrent.futures.ThreadPoolExecutor( max_workers=max_workers, thread_name_prefix="layer-build" ) as executor:
+            futures = { executor.submit( _build, *p ): ( p[0].lambda_layer_id, p[1] ) for p in pending }
+            for future in concurrent.futures.as_completed( futures ):
+                try:
+                    ready[ futures[future] ] = future.result()
+                except Exception as e:
+                    print( f"!! ERROR !! Lambda-Layer '{futures[future][0]}-{futures[future][1]}' FAILED to build: {e}" )
+                    failures.append(( f"{futures[future][0]}-{futures[future][1]}", e ))
+        print( f"⏳ Pre-built {len(ready)} of {len(pending)} Lambda-Layers in {time.time() - t0:.0f} secs" )
+        if failures:
+            raise failures[0][1]
+        return ready
+
+    ### -----------------------------------------------------------------------------------
+
 #     """ !! DOES NOT WORK !!
 
 # WARNING: The directory '/.cache/pip' or its parent directory is not owned or is not writable by the current user. The cache has been disabled. Check the permissions and owner of that directory. If executing pip with sudo, you should use sudo's -H flag.
@@ -700,6 +952,26 @@ class LambdaLayerUtility():
 #     # f"find {mount_path}/python " + " -name 'tests' -type d -exec rm -rf {} ",  ### String-concatenation! to prevent intepretation of 2nd {}
 # ]
 
+def _connect_to_docker_daemon(
+    max_retries :int = 3,
+    retry_delay :int = 5,
+) -> docker.DockerClient:
+    for attempt in range(max_retries):
+        try:
+            # Try different Docker socket configurations
+            if os.path.exists('/var/run/docker.sock'):
+                client = docker.from_env()
+            else:
+                client = docker.DockerClient(base_url='tcp://127.0.0.1:2375')
+            client.ping()
+            return client
+        except Exception as e:
+            print(f"Attempt {attempt + 1} to connect to Docker-daemon failed ({e}). Retrying in {retry_delay} seconds...")
+            time.sleep(retry_delay)
+    raise Exception(f"!! FAILURE !! to connect to Docker-daemon after {max_retries} attempts")
+
+### ---------------------------------------------------------------------------------
+
 def run_docker(
     cpu_arch_str :str,
     volumes :dict,
@@ -757,25 +1029,31 @@ def run_docker(
 ### ---------------------------------------------------------------------------------
 ### ---------------------------------------------------------------------------------
 
+def zip_folder(
+    src_fldr_path :Path,
+    layer_zipfile_path :Path,
+    layer_opt :LambdaLayerOption = LambdaLayerOption.SMALLEST_ZIP_FILE_SLOW_COLDSTART,
+    max_workers :Optional[int] = None,
+):
+    """ ZIPs the ENTIRE folder (example: the "/asset-output" of Docker, which contains `python/**`) -- with paths relative to the folder.
+        DETERMINISTIC (See `common/zip_utils.py`).  But, `LARGER_ZIP_FILE_FASTER_COLDSTART` keeps the `__pycache__/*.pyc` (whose bytes vary per build).
+        `max_workers` -- # of worker-processes to compress with.  Default: # of CPUs.  Concurrent callers should pass (# of CPUs // # of concurrent builds).
+    """
+    exclude_patterns = zip_utils.DETERMINISTIC_ZIP_EXCLUDE_PATTERNS
+    if layer_opt == LambdaLayerOption.LARGER_ZIP_FILE_FASTER_COLDSTART:
+        exclude_patterns = [ p for p in exclude_patterns if p not in [ "__pycache__", "*.pyc" ] ]
+    zip_utils.write_deterministic_zip( layer_zipfile_path, src_fldr_path, exclude_patterns = exclude_patterns, max_workers = max_workers )
+
+### ---------------------------------------------------------------------------------
+
 def create_zipfile(
     layer_zipfile_path :Path,
     layer_fldr_path :Path,
+    max_workers :Optional[int] = None,
 ):
-    ### Create zip file
-    file_patt_to_not_include = "tests"
-    with zipfile.ZipFile(layer_zipfile_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        src_root_fldr = layer_fldr_path / ".venv/lib"
-        for root, dirs, files in os.walk(src_root_fldr):
-            ### Remove directories matching file-patt from dirs list to prevent walking into them
-            dirs[:] = [d for d in dirs if d != file_patt_to_not_include]
-            ### Skip if current entry matches file-patt
-            if os.path.basename(root) == file_patt_to_not_include:
-                continue
-            for file in files:
-                if os.path.basename(file) == file_patt_to_not_include:
-                    continue
-                file_path = os.path.join(root, file)
-                arcname = os.path.relpath(file_path, layer_fldr_path)
-                zipf.write(file_path, arcname)
+    """ ZIPs "{layer_fldr_path}/.venv/lib" -- with paths relative to `layer_fldr_path` -- minus `tests/`, `__pycache__/` and `*.dist-info/RECORD`.
+        DETERMINISTIC (See `common/zip_utils.py`).  So, identical inputs ==> identical zip-file ==> identical asset-hash.
+    """
+    zip_utils.write_deterministic_zip( layer_zipfile_path, layer_fldr_path / ".venv/lib", arcname_root = layer_fldr_path, max_workers = max_workers )
 
 ### EoF
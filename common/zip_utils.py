@@ -0,0 +1,221 @@
+"""
+Deterministic ZIP-files:  byte-identical inputs  ==>  byte-identical zip-file  ==>  identical CDK asset-hash (and NO re-upload).
+
+Python's `zipfile` (and `zip -r`) record each file's mtime, and whatever order `os.walk()` returns.
+So, re-building the SAME Lambda-layer (even on the same laptop) produces a DIFFERENT zip-file.
+Instead, `write_deterministic_zip()` ..
+    *   sorts the entries by their (posix) path within the zip-file.  NO directory-entries.
+    *   sets every entry's timestamp to 1980-01-01 00:00:00  (the earliest that a zip-file can represent).
+    *   sets every entry's permissions to either 0644 or 0755 (if the file is executable by its owner).  NO uid/gid/extra-fields.
+    *   skips `__pycache__/`, `*.pyc`, `tests/` and `*.dist-info/RECORD` (whose contents vary per `pip install`).  See `DETERMINISTIC_ZIP_EXCLUDE_PATTERNS`.
+    *   DEFLATE-compresses the entries in PARALLEL, across worker-PROCESSES (batches of 1000s of tiny files spend most of their time in Python, holding the GIL).
+        Then, writes the compressed entries, in sorted order, into the zip-file.
+
+The worker-processes are started via `forkserver` (else `spawn`) -- NEVER `fork`, as the callers are themselves multi-threaded (See `prebuild_lambda_layer_zips()`).
+So, each worker-process re-imports this module .. AND the caller's `__main__` script (which must therefore be SAFE to import, i.e. have a `if __name__ == "__main__":` guard).
+This file deliberately does NOT import aws_cdk/docker.
+"""
+
+import os
+import sys
+import stat
+import struct
+import zlib
+import fnmatch
+import multiprocessing
+import concurrent.futures
+from pathlib import Path, PurePosixPath
+from typing import Optional, Sequence
+
+### ==========================================================================================================
+
+### Simple-names (like "tests") match ANY path-component.  Patterns with a "/" match the entire path within the zip-file.
+DETERMINISTIC_ZIP_EXCLUDE_PATTERNS = [ "__pycache__", "*.pyc", "tests", "*.dist-info/RECORD" ]
+
+DEFAULT_COMPRESSLEVEL = 6       ### Same as `zlib` default.  9 is ~5% smaller & a LOT slower.
+COMPRESSLEVEL_ENVVAR = "ZIP_COMPRESSLEVEL"
+
+### Each worker-task compresses a BATCH of files, to keep the inter-process overhead low (Lambda-layers have 1000s of tiny files).
+_BATCH_MAX_BYTES = 8 * 1024 * 1024
+_BATCH_MAX_FILES = 256
+
+### 1980-01-01 00:00:00 in MS-DOS date/time format.
+_DOS_TIME = 0
+_DOS_DATE = ( (1980 - 1980) << 9 ) | ( 1 << 5 ) | 1
+
+_ZIP_STORED   = 0
+_ZIP_DEFLATED = 8
+_VERSION_NEEDED  = 20                   ### 2.0 -- deflate
+_VERSION_MADE_BY = ( 3 << 8 ) | 20      ### 3 = Unix.  So, `unzip` applies the permissions in `external_attr`.
+_FLAG_UTF8 = 0x800
+
+### ==========================================================================================================
+
+def get_compresslevel() -> int:
+    """ From the environment-variable `ZIP_COMPRESSLEVEL` (0..9), else `DEFAULT_COMPRESSLEVEL`. """
+    level = int( os.environ.get( COMPRESSLEVEL_ENVVAR, DEFAULT_COMPRESSLEVEL ) )
+    if not 0 <= level <= 9:
+        raise ValueError(f"!! ERROR !! Invalid {COMPRESSLEVEL_ENVVAR}='{level}'.  Must be 0..9")
+    return level
+
+def get_mp_context() -> multiprocessing.context.BaseContext:
+    """ `forkserver` if this OS supports it (Linux), else `spawn` (MacOS, Windows).
+        `fork`-ing a multi-threaded process (like the parallel Lambda-layer builds) can deadlock the child on a lock held by another thread.
+    """
+    return multiprocessing.get_context( "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn" )
+
+### ..............................................................................................
+
+def _is_excluded( arcname :str, exclude_patterns :Sequence[str] ) -> bool:
+    parts = PurePosixPath(arcname).parts
+    for patt in exclude_patterns:
+        if "/" in patt:
+            if fnmatch.fnmatchcase( arcname, patt ) or fnmatch.fnmatchcase( arcname, "*/" + patt ):
+                return True
+        elif any( fnmatch.fnmatchcase( part, patt ) for part in parts ):
+            return True
+    return False
+
+def list_files_for_zip(
+    src_fldr_path :Path,
+    arcname_root :Optional[Path] = None,
+    exclude_patterns :Sequence[str] = DETERMINISTIC_ZIP_EXCLUDE_PATTERNS,
+) -> list[tuple[str, str]]:
+    """ Returns a SORTED list of `( arcname, filepath )` for all files under `src_fldr_path` (minus the excluded).
+        Each arcname is relative to `arcname_root` (Default: `src_fldr_path`).
+        Symlinks to files are followed (the zip-file contains a copy).  Symlinks to folders are NOT followed (just like `os.walk()`).
+    """
+    src_fldr_path = Path(src_fldr_path)
+    arcname_root = Path(arcname_root) if arcname_root else src_fldr_path
+    entries = []
+    for root, dirs, files in os.walk( src_fldr_path ):
+        rel_root = PurePosixPath( Path(root).relative_to(arcname_root).as_posix() )
+        ### prune, so that we never walk into `__pycache__` etc..
+        dirs[:] = [ d for d in dirs if not _is_excluded( str(rel_root / d), exclude_patterns ) ]
+        for file in files:
+            arcname = str( rel_root / file )
+            filepath = os.path.join( root, file )
+            if _is_excluded( arcname, exclude_patterns ) or not os.path.isfile( filepath ):
+                continue    ### excluded, or a dangling-symlink/socket/fifo
+            entries.append(( arcname, filepath ))
+    entries.sort()
+    return entries
+
+### ..............................................................................................
+
+def _compress_batch( filepaths :list[str], compresslevel :int ) -> list[tuple[int, int, int, bool, bytes]]:
+    """ Runs within a worker-process.
+        Returns, for each file: `( crc32, uncompressed-size, compress-type, is-executable, data )`.
+        If DEFLATE does NOT make a file smaller, it is STORED as-is.
+    """
+    results = []
+    for filepath in filepaths:
+        with open( filepath, 'rb' ) as f:
+            raw = f.read()
+        is_exec = bool( os.stat( filepath ).st_mode & stat.S_IXUSR )
+        compressor = zlib.compressobj( compresslevel, zlib.DEFLATED, -15 )    ### -15 = raw DEFLATE-stream, as zip-files require.
+        deflated = compressor.compress( raw ) + compressor.flush()
+        if len(deflated) < len(raw):
+            results.append(( zlib.crc32( raw ), len(raw), _ZIP_DEFLATED, is_exec, deflated ))
+        else:
+            results.append(( zlib.crc32( raw ), len(raw), _ZIP_STORED, is_exec, raw ))
+    return results
+
+def _gen_batches( entries :list[tuple[str, str]] ) -> list[list[str]]:
+    batches :list[list[str]] = []
+    curr :list[str] = []
+    curr_bytes = 0
+    for _, filepath in entries:
+        size = os.path.getsize( filepath )
+        if curr and ( curr_bytes + size > _BATCH_MAX_BYTES or len(curr) >= _BATCH_MAX_FILES ):
+            batches.append( curr )
+            curr, curr_bytes = [], 0
+        curr.append( filepath )
+        curr_bytes += size
+    if curr:
+        batches.append( curr )
+    return batches
+
+### ..............................................................................................
+
+def write_deterministic_zip(
+    zip_path :Path,
+    src_fldr_path :Path,
+    arcname_root :Optional[Path] = None,
+    exclude_patterns :Sequence[str] = DETERMINISTIC_ZIP_EXCLUDE_PATTERNS,
+    compresslevel :Optional[int] = None,
+    max_workers :Optional[int] = None,
+) -> Path:
+    """ Creates `zip_path` (atomically) with all the files under `src_fldr_path`.  See top of this file for details.
+
+        param # 1 : zip_path :Path
+        param # 2 : src_fldr_path :Path -- the folder to be zipped
+        param # 3 : arcname_root :Path -- (OPTIONAL) paths within the zip-file are relative to this.  Default: `src_fldr_path`
+        param # 4 : exclude_patterns -- (OPTIONAL) Default: `DETERMINISTIC_ZIP_EXCLUDE_PATTERNS`
+        param # 5 : compresslevel :int -- (OPTIONAL) 0..9.  Default: `get_compresslevel()`
+        param # 6 : max_workers :int -- (OPTIONAL) # of worker-processes.  Default: # of CPUs.  1 ==> NO worker-processes.
+    """
+    zip_path = Path(zip_path)
+    compresslevel = get_compresslevel() if compresslevel is None else compresslevel
+    max_workers = max_workers or os.cpu_count() or 1
+    entries = list_files_for_zip( src_fldr_path, arcname_root, exclude_patterns )
+    if len(entries) >= 0xFFFF:
+        raise ValueError(f"!! ERROR !! Too many files ({len(entries)}) for a (non-zip64) zip-file, under '{src_fldr_path}'")
+    batches = _gen_batches( entries )
+
+    tmp_path = zip_path.with_name( f"{zip_path.name}.{os.getpid()}.partial" )
+    central_dir = bytearray()
+    try:
+        with open( tmp_path, 'wb' ) as f:
+            if max_workers <= 1 or len(batches) <= 1:
+                results = ( _compress_batch( batch, compresslevel ) for batch in batches )
+                _write_entries( f, entries, results, central_dir )
+            else:
+                with concurrent.futures.ProcessPoolExecutor( max_workers=min( max_workers, len(batches) ), mp_context=get_mp_context() ) as executor:
+                    ### `map()` yields in the SAME (sorted) order.  So, each batch is written as soon as it (and all before it) are compressed.
+                    results = executor.map( _compress_batch, batches, [compresslevel] * len(batches) )
+                    _write_entries( f, entries, results, central_dir )
+            cd_offset = f.tell()
+            f.write( central_dir )
+            if cd_offset + len(central_dir) > 0xFFFFFFFF:
+                raise ValueError(f"!! ERROR !! zip-file '{zip_path}' is too large (> 4GB) for a (non-zip64) zip-file")
+            f.write( struct.pack( "<IHHHHIIH", 0x06054b50, 0, 0, len(entries), len(entries), len(central_dir), cd_offset, 0 ) )
+        os.replace( tmp_path, zip_path )
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return zip_path
+
+def _write_entries( f, entries :list[tuple[str, str]], results, central_dir :bytearray ) -> None:
+    """ Writes each entry's local-header + data into `f`, and appends its central-directory record to `central_dir`. """
+    idx = 0
+    for batch_results in results:
+        for crc, size, compress_type, is_exec, data in batch_results:
+            arcname, filepath = entries[idx]
+            idx += 1
+            if size > 0xFFFFFFFF or f.tell() > 0xFFFFFFFF:
+                raise ValueError(f"!! ERROR !! '{filepath}' is too large (> 4GB) for a (non-zip64) zip-file")
+            name = arcname.encode("utf-8")
+            flags = 0 if name.isascii() else _FLAG_UTF8
+            offset = f.tell()
+            f.write( struct.pack( "<IHHHHHIIIHH", 0x04034b50, _VERSION_NEEDED, flags, compress_type,
+                                  _DOS_TIME, _DOS_DATE, crc, len(data), size, len(name), 0 ) )
+            f.write( name )
+            f.write( data )
+            mode = stat.S_IFREG | ( 0o755 if is_exec else 0o644 )
+            central_dir += struct.pack( "<IHHHHHHIIIHHHHHII", 0x02014b50, _VERSION_MADE_BY, _VERSION_NEEDED, flags, compress_type,
+                                        _DOS_TIME, _DOS_DATE, crc, len(data), size, len(name), 0, 0, 0, 0, mode << 16, offset )
+            central_dir += name
+    assert idx == len(entries)
+
+### ==========================================================================================================
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print( f"Usage: {sys.argv[0]}  <zip-file>  <folder-to-zip>  [compresslevel]" )
+        print( f"EXAMPLE: PYTHONPATH=. {sys.argv[0]}  /tmp/layer.zip  ./api/lambda_layer/psycopg3/.venv/lib" )
+        sys.exit(1)
+    write_deterministic_zip( Path(sys.argv[1]), Path(sys.argv[2]), compresslevel = int(sys.argv[3]) if len(sys.argv) > 3 else None )
+    print( f"✅ Created '{sys.argv[1]}' ({os.path.getsize(sys.argv[1])} bytes)" )
+
+### EoF
@@ -0,0 +1,605 @@
+### This file has an ASYNCIO implementation of `InvokeAWSApi` (See ./aws_api_invoker.py)
+###
+### All the network round-trips of a multi-API script (list_functions, then get_function per Lambda, then list_versions_by_function, ..)
+### are issued concurrently on ONE event-loop, over SHARED connection-pools (one aiobotocore-client per AWS-service).
+###
+### AsyncInvokeAWSApi.*_async()  -- the coroutines.  Example:  `await invoker.get_all_lambdas_full_details_async( ... )`
+### AsyncInvokeAWSApi.*()        -- SYNC facade, with the exact same signature as `InvokeAWSApi`.  So existing scripts keep working, unchanged.
+###                                 Each call is run on a background event-loop (thread), that lives as long as the `AsyncInvokeAWSApi` object.
+###
+### Requires the OPTIONAL package 'aiobotocore'.  Run: pip install aiobotocore
+### To test against a local stub (like `moto_server`), pass `endpoint_url="http://127.0.0.1:5000"` to the constructor.
+
+from typing import Tuple, Optional
+import sys
+import boto3
+import pathlib
+import json
+import traceback
+import threading
+import asyncio
+import contextlib
+import contextvars
+
+### OPTIONAL dependency
+try:
+    import aiobotocore.session
+    from aiobotocore.config import AioConfig
+except ImportError:
+    aiobotocore = None
+
+from aws_api_invoker import (
+    InvokeAWSApi,
+    MyException,
+)
+from aws_api_cache_store import (
+    CacheRefreshLock,
+)
+
+### While ANOTHER process holds a `CacheRefreshLock`, how often to re-try (without blocking the event-loop)
+CACHE_REFRESH_LOCK_POLL_SECS = 0.5
+
+### The lock-files held by the CURRENT task (and the tasks it spawns).  So, `cache_refresh_lock_async()` is re-entrant per task (NOT per thread).
+_held_cache_refresh_locks :contextvars.ContextVar[frozenset] = contextvars.ContextVar( "held_cache_refresh_locks", default=frozenset() )
+
+### ----------------------------------------------------------------------
+
+class AsyncInvokeAWSApi(InvokeAWSApi):
+    """ Drop-in replacement for `InvokeAWSApi`.
+        `max_concurrency` is the max # of in-flight AWS-API calls made by the enrichers (like `get_all_lambdas_full_details_async()`).
+        `max_pool_connections` is the size of EACH aiobotocore-client's (shared) HTTP connection-pool.
+        `endpoint_url` is OPTIONAL; used for ALL AWS-services.  Example: a local stub-endpoint for testing.
+        `rate_limiting` -- the aiobotocore-clients share the SAME per-API token-buckets as `InvokeAWSApi.get_client()` (See `get_aio_client()`).
+    """
+
+    def __init__(self,
+        aws_profile :str = None,
+        aws_region :str = "us-east-1",
+        session: boto3.Session = None,
+        debug: bool = False,
+        cache_store = None,  ### OPTIONAL; See ./aws_api_cache_store.py.  Defaults to the original one-JSON-file-per-cache.
+        api_metrics_report :bool = True,
+        api_metrics_json_filepath :Optional[str] = None,
+        client_hooks :Optional[list] = None,
+        rate_limiting :bool = True,  ### Set to False, ONLY when NOT talking to AWS (example: replaying fixtures).
+        endpoint_url :Optional[str] = None,
+        max_concurrency :int = 16,
+        max_pool_connections :int = 32,
+    ) -> None:
+        if aiobotocore is None:
+            raise ImportError("!! ERROR !! AsyncInvokeAWSApi requires the OPTIONAL package 'aiobotocore'.  Run: pip install aiobotocore")
+        self.endpoint_url = endpoint_url
+        self.max_concurrency = max_concurrency
+        self.max_pool_connections = max_pool_connections
+        self._aio_session = None
+        self._aio_clients :dict[str, any] = {}
+        self._aio_exit_stack :Optional[contextlib.AsyncExitStack] = None
+        self._aio_clients_lock :Optional[asyncio.Lock] = None
+        self._cache_refresh_locks :dict[str, asyncio.Lock] = {}    ### lock-filepath -> asyncio.Lock.  See `cache_refresh_lock_async()`
+        self._loop :Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread :Optional[threading.Thread] = None
+        super().__init__(
+            aws_profile = aws_profile,
+            aws_region = aws_region,
+            session = session,
+            debug = debug,
+            cache_store = cache_store,
+            api_metrics_report = api_metrics_report,
+            api_metrics_json_filepath = api_metrics_json_filepath,
+            client_hooks = client_hooks,
+            rate_limiting = rate_limiting,
+        )
+
+    def sanity_check_awsprofile(self) -> boto3.Session:
+        """ Same as the parent's, EXCEPT that no STS-call is made against a stub-endpoint. """
+        if self.endpoint_url is None:
+            return super().sanity_check_awsprofile()
+        if self.session is None:
+            profile = self.aws_profile if self.aws_profile and self.aws_profile.strip().lower() not in [ "", "none", "n/a", "undefined" ] else None
+            self.session = boto3.Session(profile_name=profile, region_name=self.aws_region)
+        return self.session
+
+    ### @@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@
+    ### Shared aiobotocore-clients (one per AWS-service; each with its own connection-pool)
+
+    async def get_aio_client(self, aws_client_type :str):
+        if self._aio_clients_lock is None:
+            self._aio_clients_lock = asyncio.Lock()
+        async with self._aio_clients_lock:
+            if aws_client_type not in self._aio_clients:
+                if self._aio_session is None:
+                    profile = self.session.profile_name if self.aws_profile else None
+                    self._aio_session = aiobotocore.session.AioSession(profile=profile)
+                    self._aio_exit_stack = contextlib.AsyncExitStack()
+                self._aio_clients[aws_client_type] = await self._aio_exit_stack.enter_async_context(
+                    self._aio_session.create_client(
+                        aws_client_type,
+                        region_name = self.aws_region,
+                        endpoint_url = self.endpoint_url,
+                        ### aiobotocore does NOT support botocore's "adaptive" retry-mode.  Instead, the client-side rate-limiting is done by
+                        ### the SAME per-API token-buckets as `get_client()` (awaited, so the event-loop is NOT blocked).  See below.
+                        config = AioConfig(
+                            retries = { "mode": "standard", "max_attempts": self.MAX_RETRY_ATTEMPTS },
+                            max_pool_connections = self.max_pool_connections,
+                        ),
+                    )
+                )
+                ### Same order as `get_client()`:  so that latency excludes the time waiting for a token, and a replayed-response is still rate-limited.
+                if self.rate_limiter:
+                    self.rate_limiter.register_async( self._aio_clients[aws_client_type] )
+                self.api_metrics.register( self._aio_clients[aws_client_type] )
+                for hook in self.client_hooks:
+                    hook.register( self._aio_clients[aws_client_type] )
+            return self._aio_clients[aws_client_type]
+
+    async def aclose(self) -> None:
+        """ Closes all the aiobotocore-clients (and their connection-pools) """
+        if self._aio_exit_stack is not None:
+            await self._aio_exit_stack.aclose()
+        self._aio_exit_stack = None
+        self._aio_clients = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, tb) -> None:
+        await self.aclose()
+
+    ### ----------------------------------------------------------
+    ### The SYNC facade's background event-loop
+
+    def run_sync(self, coroutine) -> any:
+        """ Runs the coroutine on this object's background event-loop, and blocks until it completes.
+            A `sys.exit()` within the coroutine is re-raised HERE (in the caller's thread).  Else, it would kill the event-loop, and this would block forever.
+        """
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread( target=self._loop.run_forever, name="AsyncInvokeAWSApi-loop", daemon=True )
+            self._loop_thread.start()
+        async def _catching_system_exit() -> tuple[any, Optional[SystemExit]]:
+            try:
+                return await coroutine, None
+            except SystemExit as e:
+                return None, e
+        result, system_exit = asyncio.run_coroutine_threadsafe( _catching_system_exit(), self._loop ).result()
+        if system_exit is not None:
+            raise system_exit
+        return result
+
+    def close(self) -> None:
+        """ Closes the aiobotocore-clients AND stops the SYNC facade's background event-loop (if any). """
+        if self._loop is None:
+            return
+        self.run_sync( self.aclose() )
+        self._loop.call_soon_threadsafe( self._loop.stop )
+        self._loop_thread.join()
+        self._loop.close()
+        self._loop = None
+
+    ### ----------------------------------------------------------
+
+    @contextlib.asynccontextmanager
+    async def cache_refresh_lock_async(self, json_output_filepath :pathlib.Path, CTX :str):
+        """ Same as `CacheRefreshLock` (incl. `waited`), EXCEPT that the event-loop is NOT blocked while another process holds the lock.
+            Within this process, the coroutines for the same cache-file queue up on an `asyncio.Lock`.  Its holder is the ONE owner of the `flock`.
+            Re-entrant within the same task (example: `get_all_lambdas_full_details_async()` -> `list_lambdas_async()`).
+        """
+        lock_filepath = str(json_output_filepath) + ".lock"
+        if lock_filepath in _held_cache_refresh_locks.get():
+            yield CacheRefreshLock( json_output_filepath, CTX )     ### nested: NOT entered.  `waited` is False.
+            return
+        path_lock = self._cache_refresh_locks.setdefault( lock_filepath, asyncio.Lock() )
+        waited = path_lock.locked()
+        if waited:
+            print(f"⏳ Another task is refreshing the cache '{json_output_filepath}'.  Waiting for it.. {CTX}")
+        async with path_lock:
+            refresh_lock = CacheRefreshLock( json_output_filepath, CTX, blocking=False, reentrant=False )
+            refresh_lock.__enter__()
+            if not refresh_lock.acquired:
+                print(f"⏳ Another process is refreshing the cache '{json_output_filepath}'.  Waiting for it.. {CTX}")
+                while not refresh_lock.acquired:
+                    await asyncio.sleep( CACHE_REFRESH_LOCK_POLL_SECS )
+                    refresh_lock.__enter__()
+                waited = True
+            refresh_lock.waited = waited
+            token = _held_cache_refresh_locks.set( _held_cache_refresh_locks.get() | { lock_filepath } )
+            try:
+                yield refresh_lock
+            finally:
+                _held_cache_refresh_locks.reset( token )
+                refresh_lock.__exit__( None, None, None )
+
+    ### @@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@
+    ### SYNC facade -- same signatures as `InvokeAWSApi`
+
+    def list_lambdas( self, json_output_filepath: str, cache_no_older_than: int = 7, delta_refresh :bool = False ) -> any:
+        return self.run_sync( self.list_lambdas_async( json_output_filepath, cache_no_older_than, delta_refresh ) )
+
+    def list_stacks( self, json_output_filepath: str, cache_no_older_than: int = 7, delta_refresh :bool = False ) -> any:
+        return self.run_sync( self.list_stacks_async( json_output_filepath, cache_no_older_than, delta_refresh ) )
+
+    def list_iam_roles( self, json_output_filepath: str, cache_no_older_than: int = 7, delta_refresh :bool = False ) -> any:
+        return self.run_sync( self.list_iam_roles_async( json_output_filepath, cache_no_older_than, delta_refresh ) )
+
+    def get_all_lambdas_full_details( self,
+        json_output_filepath: str,
+        cache_no_older_than: int = 7,
+        max_workers :int = 1,   ### Ignored.  See `max_concurrency` constructor-param.
+        delta_refresh :bool = False,
+    ) -> any:
+        return self.run_sync( self.get_all_lambdas_full_details_async( json_output_filepath, cache_no_older_than, delta_refresh ) )
+
+    def get_all_stacks_full_details( self,
+        app_name :str,
+        json_output_filepath: str,
+        cache_no_older_than: int = 7,
+        max_workers :int = 1,   ### Ignored.  See `max_concurrency` constructor-param.
+        templates_dir :Optional[pathlib.Path] = None,
+        delta_refresh :bool = False,
+    ) -> any:
+        return self.run_sync( self.get_all_stacks_full_details_async( app_name, json_output_filepath, cache_no_older_than, templates_dir, delta_refresh ) )
+
+    def invoke_aws_GenericAWSApi_for_complete_response( self,
+        aws_client_type :str,
+        api_method_name: str,
+        additional_params :dict,
+        response_key :str,
+        json_output_filepath: str,
+        cache_no_older_than: int = 7,
+        delta_refresh :bool = False,
+    ) -> list[any]:
+        return self.run_sync( self.invoke_aws_GenericAWSApi_for_complete_response_async(
+            aws_client_type, api_method_name, additional_params, response_key, json_output_filepath, cache_no_older_than, delta_refresh ) )
+
+    ### @@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@
+    ### The coroutines.  Params are identical to the SYNC methods of `InvokeAWSApi`.
+
+    async def list_lambdas_async( self,
+        json_output_filepath: str,
+        cache_no_older_than: int = 7,
+        delta_refresh :bool = False,
+    ) -> any:
+        return await self.invoke_aws_GenericAWSApi_for_complete_response_async(
+            aws_client_type = 'lambda',
+            api_method_name = "list_functions",
+            additional_params = {},
+            response_key = 'Functions',
+            json_output_filepath = json_output_filepath,
+            cache_no_older_than = cache_no_older_than,
+            delta_refresh = delta_refresh,
+        )
+
+    async def list_stacks_async( self,
+        json_output_filepath: str,
+        cache_no_older_than: int = 7,
+        delta_refresh :bool = False,
+    ) -> any:
+        return await self.invoke_aws_GenericAWSApi_for_complete_response_async(
+            aws_client_type = 'cloudformation',
+            api_method_name = "list_stacks",
+            additional_params={
+                "StackStatusFilter": ['CREATE_IN_PROGRESS', 'CREATE_FAILED', 'CREATE_COMPLETE', 'ROLLBACK_IN_PROGRESS', 'ROLLBACK_FAILED', 'ROLLBACK_COMPLETE', 'DELETE_IN_PROGRESS', 'DELETE_FAILED',                     'UPDATE_IN_PROGRESS', 'UPDATE_COMPLETE_CLEANUP_IN_PROGRESS', 'UPDATE_COMPLETE', 'UPDATE_FAILED', 'UPDATE_ROLLBACK_IN_PROGRESS', 'UPDATE_ROLLBACK_FAILED', 'UPDATE_ROLLBACK_COMPLETE_CLEANUP_IN_PROGRESS', 'UPDATE_ROLLBACK_COMPLETE', 'REVIEW_IN_PROGRESS', 'IMPORT_IN_PROGRESS', 'IMPORT_COMPLETE', 'IMPORT_ROLLBACK_IN_PROGRESS', 'IMPORT_ROLLBACK_FAILED', 'IMPORT_ROLLBACK_COMPLETE'],
+            },
+            response_key = 'StackSummaries',
+            json_output_filepath = json_output_filepath,
+            cache_no_older_than = cache_no_older_than,
+            delta_refresh = delta_refresh,
+        )
+
+    async def list_iam_roles_async( self,
+        json_output_filepath: str,
+        cache_no_older_than: int = 7,
+        delta_refresh :bool = False,
+    ) -> any:
+        return await self.invoke_aws_GenericAWSApi_for_complete_response_async(
+            aws_client_type = 'iam',
+            api_method_name = "list_roles",
+            additional_params = {},
+            response_key = 'Roles',
+            json_output_filepath = json_output_filepath,
+            cache_no_older_than = cache_no_older_than,
+            delta_refresh = delta_refresh,
+        )
+
+    ### ----------------------------------------------------------
+
+    async def invoke_aws_GenericAWSApi_for_complete_response_async( self,
+        aws_client_type :str,
+        api_method_name: str,
+        additional_params :dict,
+        response_key :str,
+        json_output_filepath: str,
+        cache_no_older_than: int = 7,
+        delta_refresh :bool = False,
+    ) -> list[any]:
+        CTX = f"invoke_aws_GenericAWSApi_for_complete_response_async('{api_method_name}'): '{json_output_filepath}'"
+        json_output_filepath = pathlib.Path(json_output_filepath) ### convert a string into a Path object.
+        api_name = f"{aws_client_type}.{api_method_name}"
+
+        if not self.is_cache_too_old( json_output_filepath=json_output_filepath, cache_no_older_than=cache_no_older_than, api_name=api_name ):
+            # Use the cached response (previously invoked perhaps a few days back)
+            complete_results = self.cache_store.load( json_output_filepath )
+            print(f"File {json_output_filepath} is present. Context={CTX}.\nSo .. using {len(complete_results)} rows of cached AWS-SDK complete_response.. ..\n")
+            return complete_results
+
+        async with self.cache_refresh_lock_async( json_output_filepath, CTX ) as refresh_lock:
+            if refresh_lock.waited and not self.is_cache_too_old( json_output_filepath=json_output_filepath, cache_no_older_than=cache_no_older_than, api_name=api_name ):
+                return self.cache_store.load( json_output_filepath )   ### Refreshed by whoever held the lock.
+            return await self._refresh_complete_response_async(
+                aws_client_type, api_method_name, additional_params, response_key, json_output_filepath, delta_refresh, CTX )
+
+    async def _refresh_complete_response_async( self,
+        aws_client_type :str,
+        api_method_name: str,
+        additional_params :dict,
+        response_key :str,
+        json_output_filepath: pathlib.Path,
+        delta_refresh :bool,
+        CTX :str,
+    ) -> list[any]:
+        print(f"Invoking the massive AWS-SDK API to update the CACHE-file... {CTX} ")
+        client = await self.get_aio_client( aws_client_type )
+        if not hasattr(client, api_method_name):
+            raise MyException(f"Error: '{api_method_name}' is not a valid Method of AWS-API-SDK.")
+
+        complete_results = []
+        if client.can_paginate(api_method_name):
+            async for page in client.get_paginator(api_method_name).paginate( **additional_params ):
+                print("↓", end="", flush=True)
+                complete_results.extend( page.get(response_key) or [] )
+        else:
+            print("↓", end="", flush=True)
+            response = await getattr(client, api_method_name)( **additional_params )
+            complete_results.extend( response.get(response_key) or [] )
+
+        if delta_refresh and self.cache_store.exists( json_output_filepath ):
+            complete_results = self.merge_delta_refresh(
+                api_method_name = api_method_name,
+                stale_results = self.cache_store.load( json_output_filepath ),
+                fresh_results = complete_results,
+            )
+
+        self.cache_store.save( json_output_filepath, complete_results,
+            header={ "api": f"{aws_client_type}.{api_method_name}", "params": additional_params } )
+        if self.debug: print(f"Retrieved {len(complete_results)} in total. {CTX} ")
+        return complete_results
+
+    ### ----------------------------------------------------------
+
+    async def get_all_versions_of_lambda_async( self,
+        lambda_name :str,
+    ) -> Tuple[list,str]:
+        lambda_client = await self.get_aio_client('lambda')
+        all_versions = []
+        async for page in lambda_client.get_paginator('list_versions_by_function').paginate( FunctionName=lambda_name ):
+            print("↓", end="", flush=True)
+            all_versions.extend( page['Versions'] )
+
+        # Sort by LastModified to ensure we get the truly latest version
+        all_versions.sort(key=lambda x: x['LastModified'])
+        ### Same logic as `InvokeAWSApi.get_all_versions_of_lambda()`
+        latest_version_id :str = all_versions[-1]['Version']
+        if latest_version_id == "$LATEST" and len(all_versions) > 1:
+            latest_version_id = all_versions[-2]['Version']
+        else:
+            if self.debug: print(f"\n! No PROPER-NUMERICAL versionIds exist for {lambda_name} !  Very likely just DEFAULT-VERSION only for this lambda !")
+            return all_versions, None
+        if self.debug > 1: print(f"Latest out of {len(all_versions)} versions, LATEST-Version: {latest_version_id}")
+        return all_versions, latest_version_id
+
+    ### ----------------------------------------------------------
+    """ Same as `InvokeAWSApi.get_all_lambdas_full_details()`, except that up to `self.max_concurrency` Lambdas are enriched concurrently. """
+    async def get_all_lambdas_full_details_async( self,
+        json_output_filepath: str,
+        cache_no_older_than: int = 7,
+        delta_refresh :bool = False,
+    ) -> any:
+        CTX = f"get_all_lambdas_full_details_async('{json_output_filepath}'): "
+        ### Held across BOTH the listing and the enrichment, as both write to the same cache.  `list_lambdas_async()` re-checks the cache's age.
+        async with self.cache_refresh_lock_async( json_output_filepath, CTX ):
+            return await self._enrich_all_lambdas_async( json_output_filepath, cache_no_older_than, delta_refresh, CTX )
+
+    async def _enrich_all_lambdas_async( self,
+        json_output_filepath: str,
+        cache_no_older_than: int,
+        delta_refresh :bool,
+        CTX :str,
+    ) -> any:
+        all_lambdas_w_props = await self.list_lambdas_async(
+            json_output_filepath = json_output_filepath,
+            cache_no_older_than = cache_no_older_than,
+            delta_refresh = delta_refresh,
+        )
+        pending_indexes = [ indx for indx, lambda_details in enumerate(all_lambdas_w_props) if 'ProvisionedConcurrency' not in lambda_details ]
+        if self.debug: print(f"\nEnriching {len(pending_indexes)} Lambdas (max_concurrency={self.max_concurrency}) within {CTX}\n")
+
+        semaphore = asyncio.Semaphore( self.max_concurrency )
+        async def _bounded(indx :int) -> dict:
+            async with semaphore:
+                return await self._fetch_lambda_full_details_async( all_lambdas_w_props[indx], CTX )
+
+        ### `gather()` returns the results in the ORIGINAL order (and NOT in the order of completion), so the cache-file is deterministic.
+        results = await asyncio.gather( *[ _bounded(indx) for indx in pending_indexes ], return_exceptions=True )
+        failed_lambda_name = None
+        failed_exception :Exception = None
+        for indx, result in zip(pending_indexes, results):
+            if isinstance(result, BaseException):
+                if failed_lambda_name is None:
+                    failed_lambda_name = all_lambdas_w_props[indx]['FunctionName']
+                    failed_exception = result
+            else:
+                all_lambdas_w_props[indx] = result
+
+        ### Save whatever was enriched (even on failure), so that a re-run will skip those Lambdas.
+        self.update_diskfile_cache(
+            json_output_filepath = json_output_filepath,
+            inmemory_cache = all_lambdas_w_props,
+        )
+        if failed_lambda_name:
+            print(f"!! ERROR !! getting provisioned-concurrency for {failed_lambda_name}: {str(failed_exception)}")
+            traceback.print_exception(failed_exception, limit=None, file=sys.stderr)
+            sys.exit(71)
+        return all_lambdas_w_props
+
+    async def _fetch_lambda_full_details_async( self,
+        lambda_details :dict,
+        CTX :str,
+    ) -> dict:
+        lambda_client = await self.get_aio_client('lambda')
+        lambda_details = dict(lambda_details)
+        lambda_name = lambda_details['FunctionName']
+        lambda_details['ProvisionedConcurrency'] = None
+
+        print("↓", end="", flush=True)
+        ### `get_function()` and `list_versions_by_function()` are independent of each other.
+        ### Just like the SYNC `_fetch_lambda_full_details()`, ONLY a `get_function()` failure is fatal.  Without versions, there's simply NO provisioned-concurrency.
+        addl_details, versions_result = await asyncio.gather(
+            lambda_client.get_function( FunctionName=lambda_name ),
+            self.get_all_versions_of_lambda_async( lambda_name=lambda_name ),
+            return_exceptions = True,
+        )
+        if isinstance(addl_details, BaseException):
+            raise addl_details
+        lambda_details["Code"] = addl_details["Code"]
+        if "Tags" in addl_details:
+            lambda_details["Tags"] = addl_details["Tags"]
+        else:
+            print(f"\t! ⚠️{lambda_name}⚠️ ", end="", flush=True)
+        for k, v in addl_details['Configuration'].items():
+            if not k in lambda_details:
+                lambda_details[k] = v
+
+        latest_versionid = None
+        if isinstance(versions_result, BaseException):
+            if self.debug > 1: print(f" --NO-- versions (nor provisioned-concurrency) for {lambda_name}\n{str(versions_result)}\n")
+        else:
+            lambda_versions, latest_versionid = versions_result
+            lambda_details['Versions'] = lambda_versions
+
+        if latest_versionid:
+            try:
+                print("↓", end="", flush=True)
+                lambda_provisioned_concurrency :dict = await lambda_client.get_provisioned_concurrency_config(
+                    FunctionName=lambda_name,
+                    Qualifier=latest_versionid,
+                )
+                lambda_provisioned_concurrency.pop('ResponseMetadata', None) ### delete this entry from JSON.
+                lambda_details['ProvisionedConcurrency'] = lambda_provisioned_concurrency
+            except Exception as e:
+                if self.debug > 1: print(f" --NO-- provisioned-concurrency for {lambda_name} VersionId={latest_versionid}\n{str(e)}\n")
+
+        if self.debug > 2: print(json.dumps(lambda_details, indent=4, default=str))
+        print(".", end="", flush=True)
+        return lambda_details
+
+    ### ----------------------------------------------------------
+    """ Same as `InvokeAWSApi.get_all_stacks_full_details()`, except that up to `self.max_concurrency` Stacks are enriched concurrently. """
+    async def get_all_stacks_full_details_async( self,
+        app_name :str,
+        json_output_filepath: str,
+        cache_no_older_than: int = 7,
+        templates_dir :Optional[pathlib.Path] = None,
+        delta_refresh :bool = False,
+    ) -> any:
+        CTX = f"get_all_stacks_full_details_async('{app_name}'): '{json_output_filepath}'"
+        json_output_filepath = pathlib.Path(json_output_filepath) ### convert a string into a Path object.
+        api_name = "cloudformation.list_stacks"
+        if not self.is_cache_too_old( json_output_filepath=json_output_filepath, cache_no_older_than=cache_no_older_than, api_name=api_name ):
+            complete_results = self.cache_store.load( json_output_filepath )
+            print(f"File {json_output_filepath} is present. Context={CTX}.\nSo .. using {len(complete_results)} rows of cached AWS-SDK complete_response.. ..\n")
+            return complete_results
+
+        async with self.cache_refresh_lock_async( json_output_filepath, CTX ) as refresh_lock:
+            if refresh_lock.waited and not self.is_cache_too_old( json_output_filepath=json_output_filepath, cache_no_older_than=cache_no_older_than, api_name=api_name ):
+                return self.cache_store.load( json_output_filepath )   ### Refreshed by whoever held the lock.
+            return await self._enrich_all_stacks_async( app_name, json_output_filepath, cache_no_older_than, templates_dir, delta_refresh, CTX )
+
+    async def _enrich_all_stacks_async( self,
+        app_name :str,
+        json_output_filepath: pathlib.Path,
+        cache_no_older_than: int,
+        templates_dir :Optional[pathlib.Path],
+        delta_refresh :bool,
+        CTX :str,
+    ) -> any:
+        all_stk_list = await self.list_stacks_async(
+            json_output_filepath = json_output_filepath,
+            cache_no_older_than = cache_no_older_than,
+            delta_refresh = delta_refresh,
+        )
+        if templates_dir:
+            templates_dir = pathlib.Path(templates_dir)
+            templates_dir.mkdir( parents=True, exist_ok=True )
+
+        pending_indexes :list[int] = []
+        for indx, stk_props in enumerate(all_stk_list):
+            if not stk_props['StackName'].startswith( app_name ):
+                print("⏩", end="", flush=True)
+                continue
+            if delta_refresh and "Parameters" in stk_props:
+                continue
+            pending_indexes.append(indx)
+
+        semaphore = asyncio.Semaphore( self.max_concurrency )
+        async def _bounded(indx :int) -> dict:
+            async with semaphore:
+                return await self._fetch_stack_full_details_async( all_stk_list[indx], templates_dir, CTX )
+
+        results = await asyncio.gather( *[ _bounded(indx) for indx in pending_indexes ], return_exceptions=True )
+        for indx, result in zip(pending_indexes, results):
+            if isinstance(result, BaseException):
+                print(f"!! ERROR !! getting additional-details for Stack '{all_stk_list[indx]['StackName']}': {str(result)}")
+                traceback.print_exception(result, limit=None, file=sys.stderr)
+                sys.exit(71)
+            all_stk_list[indx] = result
+
+        self.update_diskfile_cache(
+            json_output_filepath = json_output_filepath,
+            inmemory_cache = all_stk_list,
+        )
+        return all_stk_list
+
+    async def _fetch_stack_full_details_async( self,
+        stk_props :dict,
+        templates_dir :Optional[pathlib.Path],
+        CTX :str,
+    ) -> dict:
+        cft_client = await self.get_aio_client('cloudformation')
+        stk_props = dict(stk_props)
+        stk_name :str = stk_props['StackName']
+
+        print("↓", end="", flush=True)
+        ### `describe_stacks()` and `get_template()` are independent of each other.
+        addl_details, resp = await asyncio.gather(
+            cft_client.describe_stacks( StackName = stk_name ),
+            cft_client.get_template( StackName = stk_name, TemplateStage = 'Original' ),
+        )
+        if len(addl_details['Stacks']) > 1:
+            raise MyException(f"!! ERROR !! More than 1 Stack returned for '{stk_name}' !")
+        addl_details = addl_details['Stacks'][0]
+
+        stk_props[ "Parameters" ] = addl_details[ "Parameters" ]
+        for key in [ "Outputs", "RoleARN" ]:
+            if key in addl_details:
+                stk_props[ key ] = addl_details[ key ]
+
+        key = "TemplateBody"
+        if templates_dir:
+            tmpl_path, tmpl_sha256 = self.save_stack_template( templates_dir=templates_dir, template_body=resp[ key ] )
+            stk_props.pop( key, None )
+            stk_props[ "TemplateBodyRef" ] = str(tmpl_path)
+            stk_props[ "TemplateBodySha256" ] = tmpl_sha256
+        else:
+            stk_props[ key ] = resp[ key ]
+        del resp ### Do NOT hold onto the TemplateBody any longer than necessary.
+
+        if "Tags" in addl_details:
+            stk_props["Tags"] = addl_details["Tags"]
+        else:
+            print(f"\t! ⚠️{stk_name}⚠️ ", end="", flush=True)
+
+        if self.debug > 2: print(json.dumps(stk_props, indent=4, default=str))
+        print(".", end="", flush=True)
+        return stk_props
+
+### EoScript
@@ -0,0 +1,149 @@
+### Per-AWS-API instrumentation of boto3-calls, to measure which AWS-APIs dominate the runtime of a script.
+### Used by `InvokeAWSApi.get_client()` within ./aws_api_invoker.py
+###
+### For every "<service>.<OperationName>" (example: "lambda.GetFunction") this records:
+###     call-count, errors, p50/p95/max latency, total-time, retries, throttles, and bytes received.
+### Wired into each boto3-client via botocore's events: "before-call", "after-call", "after-call-error" and "needs-retry".
+###
+### `report()` prints a summary-table (sorted by total-time) and OPTIONALLY dumps the same as a JSON-file.
+### `InvokeAWSApi` invokes `report()` automatically when the script exits.  Set the env-var `AWS_API_METRICS_JSON` to also get the JSON-file.
+
+from typing import Optional
+import threading
+import time
+import json
+import pathlib
+
+from aws_api_rate_limiter import (
+    THROTTLE_ERROR_CODES,
+)
+
+### ----------------------------------------------------------------------
+
+class ApiCallStats():
+    """ Stats for ONE AWS-API.  NOT thread-safe by itself; see `ApiCallMetrics`. """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.throttles = 0
+        self.bytes_received = 0
+        self.latencies :list[float] = []
+
+    @staticmethod
+    def _percentile( sorted_values :list[float], pct :float ) -> float:
+        """ nearest-rank percentile """
+        if not sorted_values:
+            return 0.0
+        indx = max( 0, min( len(sorted_values) - 1, int( round( pct / 100.0 * len(sorted_values) + 0.5 ) ) - 1 ) )
+        return sorted_values[indx]
+
+    def as_dict(self) -> dict:
+        lat = sorted(self.latencies)
+        return {
+            "count":     self.count,
+            "errors":    self.errors,
+            "p50_ms":    round( self._percentile(lat, 50) * 1000, 1 ),
+            "p95_ms":    round( self._percentile(lat, 95) * 1000, 1 ),
+            "max_ms":    round( (lat[-1] if lat else 0.0) * 1000, 1 ),
+            "total_secs": round( sum(lat), 3 ),
+            "retries":   self.retries,
+            "throttles": self.throttles,
+            "bytes_received": self.bytes_received,
+        }
+
+### ----------------------------------------------------------------------
+
+class ApiCallMetrics():
+    """ Registry of `ApiCallStats` (one per AWS-API), SHARED by all the boto3-clients that `register()` with it.  Thread-safe. """
+
+    def __init__(self, debug :bool = False) -> None:
+        self.debug = debug
+        self.started_at = time.time()
+        self._stats :dict[str, ApiCallStats] = {}
+        self._lock = threading.Lock()
+
+    def register(self, client) -> None:
+        """ Wires this into a boto3-client, via botocore's events. """
+        ### botocore's event-names use the HYPHENIZED service-id (example: "cloudwatch-logs"), and NOT the service-name ("logs").
+        service_id = client.meta.service_model.service_id.hyphenize()
+        client.meta.events.register( f"before-call.{service_id}",      self._before_call )
+        client.meta.events.register( f"after-call.{service_id}",       self._after_call )
+        client.meta.events.register( f"after-call-error.{service_id}", self._after_call_error )
+        client.meta.events.register( f"needs-retry.{service_id}",      self._needs_retry )
+
+    ### ------------------------------------------------
+
+    @staticmethod
+    def _api_name(model) -> str:
+        return f"{model.service_model.service_name}.{model.name}"
+
+    def _get_stats(self, api_name :str) -> ApiCallStats:
+        if api_name not in self._stats:
+            self._stats[api_name] = ApiCallStats()
+        return self._stats[api_name]
+
+    def _before_call(self, model, context :dict, **kwargs) -> None:
+        context["_aws_api_metrics_api"] = self._api_name(model)
+        context["_aws_api_metrics_start"] = time.perf_counter()
+        return None  ### MUST return None, else botocore will SKIP the actual HTTP-call.
+
+    def _after_call(self, http_response, parsed :dict, model, context :dict, **kwargs) -> None:
+        latency = time.perf_counter() - context.pop( "_aws_api_metrics_start", time.perf_counter() )
+        num_bytes = int( http_response.headers.get("content-length", 0) or 0 ) if http_response is not None else 0
+        retries = parsed.get("ResponseMetadata", {}).get("RetryAttempts", 0)
+        with self._lock:
+            stats = self._get_stats( self._api_name(model) )
+            stats.count += 1
+            if http_response is not None and http_response.status_code >= 300:
+                stats.errors += 1   ### AWS-API returned an error (botocore will raise a ClientError right after this event)
+            stats.retries += retries
+            stats.bytes_received += num_bytes
+            stats.latencies.append( latency )
+
+    def _after_call_error(self, exception, context :dict, **kwargs) -> None:
+        """ Invoked ONLY for exceptions like connection-errors & timeouts (a.k.a. NO response from AWS) """
+        latency = time.perf_counter() - context.pop( "_aws_api_metrics_start", time.perf_counter() )
+        with self._lock:
+            stats = self._get_stats( context.get( "_aws_api_metrics_api", "unknown" ) )
+            stats.count += 1
+            stats.errors += 1
+            stats.latencies.append( latency )
+
+    def _needs_retry(self, response=None, operation=None, **kwargs) -> None:
+        """ Invoked by botocore after EVERY attempt (including retries) """
+        if response is None or operation is None:
+            return None
+        _http_response, parsed = response
+        if parsed.get("Error", {}).get("Code") in THROTTLE_ERROR_CODES:
+            with self._lock:
+                self._get_stats( self._api_name(operation) ).throttles += 1
+        return None  ### MUST return None, so that botocore's own retry-handler decides whether to retry.
+
+    ### ------------------------------------------------
+
+    def summary(self) -> dict[str, dict]:
+        """ Returns { "<service>.<OperationName>": {..stats..} }, sorted by total-time (descending) """
+        with self._lock:
+            summary = { name: stats.as_dict() for name, stats in self._stats.items() }
+        return dict( sorted( summary.items(), key=lambda kv: kv[1]["total_secs"], reverse=True ) )
+
+    def report(self, json_filepath :Optional[str] = None) -> None:
+        """ Prints the summary-table.  If the OPTIONAL param is specified, also saves the summary as a JSON-file. """
+        summary = self.summary()
+        if not summary:
+            return
+        wallclock_secs = time.time() - self.started_at
+        print("\n\n" + "_"*132)
+        print(f"AWS-API calls (wall-clock {wallclock_secs:.1f} secs):")
+        print(f"{'service.operation':<52} {'count':>7} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'total s':>9} {'retries':>7} {'throttles':>9} {'KiB':>9}")
+        for name, s in summary.items():
+            print(f"{name:<52} {s['count']:>7} {s['errors']:>6} {s['p50_ms']:>9} {s['p95_ms']:>9} {s['max_ms']:>9} {s['total_secs']:>9} {s['retries']:>7} {s['throttles']:>9} {s['bytes_received']//1024:>9}")
+        print("_"*132 + "\n")
+        if json_filepath:
+            with open(str(pathlib.Path(json_filepath)), "w") as f:
+                json.dump({ "wallclock_secs": round(wallclock_secs, 3), "apis": summary }, f, indent=4)
+            print(f"Saved AWS-API call-metrics into '{json_filepath}'")
+
+### EoScript
@@ -0,0 +1,176 @@
+### Client-side rate-limiting of AWS-SDK/boto3 calls -- ONE token-bucket per AWS-API (like "lambda.GetFunction" or "logs.PutRetentionPolicy").
+### Used by `InvokeAWSApi.get_client()` within ./aws_api_invoker.py
+###
+### Each bucket's rate is adjusted via AIMD (Additive-Increase / Multiplicative-Decrease), just like TCP's congestion-control:
+###     every THROTTLED response   --> the rate is HALVED (down to `min_rate`)
+###     every successful response  --> the rate ramps UP by `rate_increment` (up to `max_rate`)
+### So, a script with many worker-threads backs off as soon as AWS starts throttling, and then ramps back up again.
+###
+### This is IN ADDITION to botocore's own "adaptive" retry-mode (which retries the throttled calls).
+### The buckets are wired into each boto3-client via botocore's events: "before-call" (acquire a token) and "needs-retry" (feedback).
+### aiobotocore-clients (See ./aws_api_invoker_async.py) share the SAME buckets, via `register_async()` -- whose "before-call" awaits (instead of blocking the event-loop).
+
+import asyncio
+import threading
+import time
+
+### ----------------------------------------------------------------------
+
+### Error-codes that AWS-APIs use to say "slow down".
+THROTTLE_ERROR_CODES :set[str] = {
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestThrottledException",
+    "TooManyRequestsException",
+    "ProvisionedThroughputExceededException",
+    "TransactionInProgressException",
+    "RequestLimitExceeded",
+    "BandwidthLimitExceeded",
+    "LimitExceededException",
+    "RequestThrottled",
+    "SlowDown",
+    "PriorRequestNotComplete",
+    "EC2ThrottledException",
+}
+
+### Default requests-per-second for every AWS-API (per boto3-client), unless overridden within `API_RATE_OVERRIDES`
+DEFAULT_INITIAL_RATE = 10.0
+DEFAULT_MIN_RATE     = 0.5
+DEFAULT_MAX_RATE     = 50.0
+DEFAULT_RATE_INCREMENT = 0.5
+
+### Known low-quota APIs.  Key is "<boto3-service-name>.<OperationName>".
+### Value is the (initial-rate, max-rate) in requests-per-second.
+API_RATE_OVERRIDES :dict[str, tuple[float, float]] = {
+    "logs.PutRetentionPolicy":      ( 3.0, 5.0 ),
+    "cloudformation.GetTemplate":   ( 5.0, 10.0 ),
+    "cloudformation.DescribeStacks": ( 5.0, 10.0 ),
+    "ecr.BatchDeleteImage":         ( 5.0, 20.0 ),
+    "logs.FilterLogEvents":         ( 5.0, 10.0 ),
+    "logs.StartQuery":              ( 3.0, 5.0 ),
+    "logs.GetQueryResults":         ( 3.0, 5.0 ),
+}
+
+### ----------------------------------------------------------------------
+
+class ApiTokenBucket():
+    """ Thread-safe token-bucket, whose refill-rate (tokens per second) is adjusted via AIMD.
+        `acquire()` blocks until a token is available.  `acquire_async()` awaits instead (the event-loop keeps running).
+    """
+
+    def __init__(self,
+        api_name :str,
+        initial_rate :float = DEFAULT_INITIAL_RATE,
+        min_rate :float = DEFAULT_MIN_RATE,
+        max_rate :float = DEFAULT_MAX_RATE,
+        rate_increment :float = DEFAULT_RATE_INCREMENT,
+        debug :bool = False,
+    ) -> None:
+        self.api_name = api_name
+        self.rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate_increment = rate_increment
+        self.debug = debug
+        self.throttle_count = 0
+        self._tokens = 1.0
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            wait_secs = self._try_take_token()
+            if wait_secs <= 0:
+                return
+            time.sleep( wait_secs )
+
+    async def acquire_async(self) -> None:
+        while True:
+            wait_secs = self._try_take_token()
+            if wait_secs <= 0:
+                return
+            await asyncio.sleep( wait_secs )
+
+    def _try_take_token(self) -> float:
+        """ Takes a token, and returns 0.  Else (NO token available), returns how many seconds until the next token. """
+        with self._lock:
+            now = time.monotonic()
+            ### Burst-capacity is ONE second's worth of tokens.
+            self._tokens = min( max(self.rate, 1.0), self._tokens + (now - self._last_refill) * self.rate )
+            self._last_refill = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return 0.0
+            return (1.0 - self._tokens) / self.rate
+
+    def on_throttle(self) -> None:
+        with self._lock:
+            self.throttle_count += 1
+            self.rate = max( self.min_rate, self.rate / 2 )
+        if self.debug: print(f"\n🐢 {self.api_name} throttled!  Reduced rate to {self.rate:.2f}/sec\n")
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.rate = min( self.max_rate, self.rate + self.rate_increment )
+
+### ----------------------------------------------------------------------
+
+class ApiRateLimiter():
+    """ Registry of `ApiTokenBucket`s (one per AWS-API), SHARED by all the boto3-clients that `register()` with it. """
+
+    def __init__(self, debug :bool = False) -> None:
+        self.debug = debug
+        self._buckets :dict[str, ApiTokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def get_bucket(self, api_name :str) -> ApiTokenBucket:
+        with self._lock:
+            if api_name not in self._buckets:
+                initial_rate, max_rate = API_RATE_OVERRIDES.get( api_name, (DEFAULT_INITIAL_RATE, DEFAULT_MAX_RATE) )
+                self._buckets[api_name] = ApiTokenBucket( api_name, initial_rate=initial_rate, max_rate=max_rate, debug=self.debug )
+            return self._buckets[api_name]
+
+    def register(self, client) -> None:
+        """ Wires this rate-limiter into a boto3-client, via botocore's events. """
+        ### botocore's event-names use the HYPHENIZED service-id (example: "cloudwatch-logs"), and NOT the service-name ("logs").
+        service_id = client.meta.service_model.service_id.hyphenize()
+        client.meta.events.register( f"before-call.{service_id}", self._before_call )
+        client.meta.events.register( f"needs-retry.{service_id}", self._needs_retry )
+
+    def register_async(self, client) -> None:
+        """ Same as `register()`, but for an aiobotocore-client.  Its event-emitter AWAITs the coroutine-handlers. """
+        service_id = client.meta.service_model.service_id.hyphenize()
+        client.meta.events.register( f"before-call.{service_id}", self._before_call_async )
+        client.meta.events.register( f"needs-retry.{service_id}", self._needs_retry )
+
+    ### ------------------------------------------------
+
+    @staticmethod
+    def _api_name(model) -> str:
+        return f"{model.service_model.service_name}.{model.name}"
+
+    def _before_call(self, model, **kwargs) -> None:
+        self.get_bucket( self._api_name(model) ).acquire()
+        return None  ### MUST return None, else botocore will SKIP the actual HTTP-call.
+
+    async def _before_call_async(self, model, **kwargs) -> None:
+        await self.get_bucket( self._api_name(model) ).acquire_async()
+        return None
+
+    def _needs_retry(self, response=None, operation=None, **kwargs) -> None:
+        """ Invoked by botocore after EVERY attempt (including retries) """
+        if response is None or operation is None:
+            return None  ### connection-errors etc.. are NOT throttling.
+        _http_response, parsed = response
+        bucket = self.get_bucket( self._api_name(operation) )
+        if parsed.get("Error", {}).get("Code") in THROTTLE_ERROR_CODES:
+            bucket.on_throttle()
+        else:
+            bucket.on_success()
+        return None  ### MUST return None, so that botocore's own retry-handler decides whether to retry.
+
+    def summary(self) -> dict[str, dict]:
+        return { name: { "rate": round(b.rate, 2), "throttles": b.throttle_count } for name, b in self._buckets.items() }
+
+### EoScript
@@ -0,0 +1,329 @@
+### PERSISTENT inverted-index over the IAM policy-documents within the IAM authorization-snapshot (See ./aws_iam_snapshot.py)
+### So that audits like ..
+###     "which Roles can `lambda:UpdateFunctionCode` on this ARN?"
+###     "which Roles trust codebuild.amazonaws.com?"
+### .. are answered via dict-lookups (in milliseconds), instead of re-walking every policy-document of every Role.
+###
+### The index has:
+###     action    -> statements     (exact actions, plus the wildcard-actions like "lambda:Update*" grouped by service-prefix)
+###     resource  -> statements     (exact ARNs, plus the wildcard-ARNs like "arn:aws:lambda:*:*:function:nccr-*" grouped by service)
+###     principal -> Roles          (from each Role's trust-policy, a.k.a. AssumeRolePolicyDocument)
+### Matching is wildcard-aware, in the same way as IAM:  `*` matches any sequence of chars, `?` matches any single char.  Actions are case-INsensitive.
+### Statements with `NotAction` / `NotResource` can NOT be indexed by value, so they are always checked (there are very few of them).
+### `Condition`s are NOT evaluated.  Statements with Conditions are flagged as "HasCondition" in the results.
+###
+### The index is saved as a JSON-file next to the snapshot's cache, and re-built ONLY when the snapshot's cache changes.
+###
+### Usage:   python aws_iam_policy_index.py <AWS_PROFILE> who-can    <action> [<resource-ARN>]
+###          python aws_iam_policy_index.py <AWS_PROFILE> who-trusts <principal>
+###          python aws_iam_policy_index.py <AWS_PROFILE> statements <action> [<resource-ARN>]
+### EXAMPLE: python aws_iam_policy_index.py DEVINT  who-can  lambda:UpdateFunctionCode  arn:aws:lambda:us-east-1:123456789012:function:nccr-backend-dev-fn
+###          python aws_iam_policy_index.py DEVINT  who-trusts  codebuild.amazonaws.com
+
+import sys
+import json
+import pathlib
+import time
+import functools
+import regex
+from typing import Optional
+
+from generic_aws_cli_script import (
+    GenericAWSCLIScript,
+)
+from aws_api_cache_store import (
+    atomic_write,
+)
+from aws_iam_snapshot import (
+    IamAuthorizationSnapshot,
+)
+
+APP_NAME = "nccr"
+THIS_SCRIPT_DATA = "iam-policy-index"
+DEBUG = False
+
+IAM_POLICY_INDEX_FORMAT_VERSION = 1
+
+### ----------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=None)
+def _compile_wildcard( pattern :str, ignore_case :bool ) -> regex.Pattern:
+    """ IAM-style wildcards:  `*` = any sequence of chars,  `?` = any single char.  Everything else is a literal (unlike fnmatch's `[..]`) """
+    regexp = "".join( ".*" if ch == "*" else "." if ch == "?" else regex.escape(ch) for ch in pattern )
+    return regex.compile( regexp, regex.IGNORECASE if ignore_case else 0 )
+
+def wildcard_match( pattern :str, value :str, ignore_case :bool = False ) -> bool:
+    if "*" not in pattern and "?" not in pattern:
+        return pattern.lower() == value.lower() if ignore_case else pattern == value
+    return _compile_wildcard( pattern, ignore_case ).fullmatch( value ) is not None
+
+def _as_list( value :any ) -> list:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [ value ]
+
+def _action_service( action :str ) -> str:
+    """ "lambda:UpdateFunctionCode" -> "lambda".  Returns "*" for "*" (or when the service-prefix itself has a wildcard) """
+    service = action.split(":", 1)[0].lower()
+    return "*" if ( "*" in service or "?" in service or ":" not in action ) else service
+
+def _resource_service( resource :str ) -> str:
+    """ "arn:aws:lambda:us-east-1:123:function:x" -> "lambda".  Returns "*" for "*" (or when the service-field itself has a wildcard) """
+    fields = resource.split(":")
+    if len(fields) < 3 or "*" in fields[2] or "?" in fields[2]:
+        return "*"
+    return fields[2]
+
+def get_trusted_principals( trust_policy :Optional[dict], principal_type :Optional[str] = None ) -> list[str]:
+    """ Returns ALL the principals (service-names, ARNs, account-ids, federated-providers, or "*") that a trust-policy ALLOWs.
+        OPTIONAL 2nd param (like "Service" or "AWS") returns ONLY the principals of that type.  A bare `"Principal": "*"` has NO type.
+    """
+    principals = []
+    for stmt in _as_list( (trust_policy or {}).get("Statement") ):
+        if stmt.get("Effect") != "Allow":
+            continue
+        principal = stmt.get("Principal")
+        if principal == "*":
+            if principal_type is None:
+                principals.append( "*" )
+        elif isinstance(principal, dict):
+            for ptype, values in principal.items():
+                if principal_type is None or ptype == principal_type:
+                    principals.extend( _as_list(values) )
+    return principals
+
+def trust_policy_allows( trust_policy :Optional[dict], principal :str, principal_type :Optional[str] = None ) -> bool:
+    """ Whether the trust-policy ALLOWs the principal (example: "codebuild.amazonaws.com").  Exact comparison (NOT a substring-match).
+        Without the OPTIONAL 3rd param, a "*" principal (like `{"AWS": "*"}`) allows ANY principal.
+        With the 3rd param (like "Service"), ONLY principals of that type are compared .. and wildcards are ignored.
+    """
+    if principal_type:
+        return principal in get_trusted_principals( trust_policy, principal_type )
+    return any( p == principal or p == "*" for p in get_trusted_principals( trust_policy ) )
+
+### ----------------------------------------------------------------------
+
+class IamPolicyIndex():
+    """ The inverted-index.  Build it via `build()`, persist it via `save()` / `load()`, or simply use `load_or_build()`.
+        Every statement is indexed ONCE per policy-document.  A managed-policy's statements list ALL the Roles it's attached to.
+    """
+
+    def __init__(self, index :dict) -> None:
+        self.index = index
+        self.statements :list[dict] = index["statements"]
+
+    ### ------------------------------------------------
+
+    @staticmethod
+    def build( snapshot :IamAuthorizationSnapshot, source_last_modified :Optional[float] = None ) -> "IamPolicyIndex":
+        index = {
+            "format_version": IAM_POLICY_INDEX_FORMAT_VERSION,
+            "source_last_modified": source_last_modified,
+            "statements": [],
+            "action_index": {},             ### exact lower-case action -> [statement-ids]
+            "action_wildcard_index": {},    ### service-prefix (or "*") -> { action-pattern: [statement-ids] }
+            "not_action_statements": [],
+            "resource_index": {},           ### exact ARN -> [statement-ids]
+            "resource_wildcard_index": {},  ### ARN's service (or "*") -> { ARN-pattern: [statement-ids] }
+            "not_resource_statements": [],
+            "principal_index": {},          ### principal -> [role-names]
+        }
+
+        def _add_document( role_names :list[str], source :str, document :Optional[dict] ) -> None:
+            for stmt in _as_list( (document or {}).get("Statement") ):
+                stmt_id = len(index["statements"])
+                index["statements"].append({
+                    "RoleNames": role_names,
+                    "Source": source,
+                    "Sid": stmt.get("Sid"),
+                    "Effect": stmt.get("Effect"),
+                    "Action": _as_list( stmt.get("Action") ),
+                    "NotAction": _as_list( stmt.get("NotAction") ),
+                    "Resource": _as_list( stmt.get("Resource") ),
+                    "NotResource": _as_list( stmt.get("NotResource") ),
+                    "HasCondition": bool( stmt.get("Condition") ),
+                })
+                if "NotAction" in stmt:
+                    index["not_action_statements"].append( stmt_id )
+                for action in _as_list( stmt.get("Action") ):
+                    if "*" in action or "?" in action:
+                        index["action_wildcard_index"].setdefault( _action_service(action), {} ).setdefault( action.lower(), [] ).append( stmt_id )
+                    else:
+                        index["action_index"].setdefault( action.lower(), [] ).append( stmt_id )
+                if "NotResource" in stmt:
+                    index["not_resource_statements"].append( stmt_id )
+                for resource in _as_list( stmt.get("Resource") ):
+                    if "*" in resource or "?" in resource:
+                        index["resource_wildcard_index"].setdefault( _resource_service(resource), {} ).setdefault( resource, [] ).append( stmt_id )
+                    else:
+                        index["resource_index"].setdefault( resource, [] ).append( stmt_id )
+
+        for role_name, role in snapshot.roles_by_name.items():
+            for policy_name, document in role.get("InlinePolicies", {}).items():
+                _add_document( [ role_name ], f"inline:{policy_name}", document )
+            for principal in get_trusted_principals( role.get("AssumeRolePolicyDocument") ):
+                index["principal_index"].setdefault( principal, [] ).append( role_name )
+        for policy_arn, policy in snapshot.policies_by_arn.items():
+            _add_document( snapshot.get_roles_attached_to( policy_arn ), f"managed:{policy_arn}", policy.get("DefaultPolicyDocument") )
+
+        return IamPolicyIndex( index )
+
+    def save(self, index_filepath :pathlib.Path) -> None:
+        with atomic_write( index_filepath ) as f:
+            json.dump( self.index, f, default=str )
+
+    @staticmethod
+    def load(index_filepath :pathlib.Path) -> "IamPolicyIndex":
+        with open(str(index_filepath)) as f:
+            return IamPolicyIndex( json.load(f) )
+
+    """ Loads the persisted index, if it was built from the CURRENT snapshot-cache.  Else, (re)builds it from the snapshot, and saves it.
+        1st param is a callable that returns the `IamAuthorizationSnapshot` (invoked ONLY if a re-build is needed).
+        2nd param is when the snapshot's cache was last saved (a.k.a. `cache_store.last_modified()`).
+        3rd param is the path of the index's JSON-file.
+    """
+    @staticmethod
+    def load_or_build(
+        load_snapshot :callable,
+        source_last_modified :float,
+        index_filepath :pathlib.Path,
+        debug :bool = False,
+    ) -> "IamPolicyIndex":
+        index_filepath = pathlib.Path(index_filepath)
+        if index_filepath.exists():
+            index = IamPolicyIndex.load( index_filepath )
+            if index.index.get("format_version") == IAM_POLICY_INDEX_FORMAT_VERSION and index.index.get("source_last_modified") == source_last_modified:
+                if debug: print(f"Using the IAM policy-index '{index_filepath}'")
+                return index
+        print(f"(Re)building the IAM policy-index '{index_filepath}' ..")
+        index = IamPolicyIndex.build( load_snapshot(), source_last_modified )
+        index.save( index_filepath )
+        return index
+
+    ### ------------------------------------------------
+
+    def _statement_ids_for_action(self, action :str) -> set[int]:
+        ids = set( self.index["action_index"].get( action.lower(), [] ) )
+        for service in [ _action_service(action), "*" ]:
+            for pattern, stmt_ids in self.index["action_wildcard_index"].get( service, {} ).items():
+                if wildcard_match( pattern, action, ignore_case=True ):
+                    ids.update( stmt_ids )
+        for stmt_id in self.index["not_action_statements"]:
+            if not any( wildcard_match( p, action, ignore_case=True ) for p in self.statements[stmt_id]["NotAction"] ):
+                ids.add( stmt_id )
+        return ids
+
+    def _statement_ids_for_resource(self, resource :str) -> set[int]:
+        ids = set( self.index["resource_index"].get( resource, [] ) )
+        for service in [ _resource_service(resource), "*" ]:
+            for pattern, stmt_ids in self.index["resource_wildcard_index"].get( service, {} ).items():
+                if wildcard_match( pattern, resource ):
+                    ids.update( stmt_ids )
+        for stmt_id in self.index["not_resource_statements"]:
+            if not any( wildcard_match( p, resource ) for p in self.statements[stmt_id]["NotResource"] ):
+                ids.add( stmt_id )
+        return ids
+
+    def find_statements(self,
+        action :str,
+        resource :Optional[str] = None,
+        effect :Optional[str] = None,
+    ) -> list[dict]:
+        """ Returns the statements that match the action (and the resource, if specified).  `effect` is OPTIONAL: "Allow" or "Deny" """
+        ids = self._statement_ids_for_action( action )
+        if resource is not None:
+            ids &= self._statement_ids_for_resource( resource )
+        return [ self.statements[i] for i in sorted(ids) if effect is None or self.statements[i]["Effect"] == effect ]
+
+    def who_can(self,
+        action :str,
+        resource :Optional[str] = None,
+    ) -> dict[str, list[dict]]:
+        """ Returns { role-name: [ the ALLOW-statements that grant it ] }.
+            Roles with an UNconditional explicit-Deny for the same action (and resource) are excluded.
+            Permission-boundaries, SCPs and resource-policies are NOT considered.
+        """
+        denied_roles = set()
+        for stmt in self.find_statements( action, resource, effect="Deny" ):
+            if not stmt["HasCondition"]:
+                denied_roles.update( stmt["RoleNames"] )
+        roles :dict[str, list[dict]] = {}
+        for stmt in self.find_statements( action, resource, effect="Allow" ):
+            for role_name in stmt["RoleNames"]:
+                if role_name not in denied_roles:
+                    roles.setdefault( role_name, [] ).append( stmt )
+        return dict( sorted( roles.items() ) )
+
+    def who_trusts(self, principal :str) -> list[str]:
+        """ Returns the names of the Roles whose trust-policy ALLOWs the principal (example: "codebuild.amazonaws.com", or an IAM-ARN, or an account-id) """
+        roles = set( self.index["principal_index"].get( principal, [] ) ) | set( self.index["principal_index"].get( "*", [] ) )
+        return sorted( roles )
+
+### ----------------------------------------------------------------------
+
+class QueryIamPolicyIndex(GenericAWSCLIScript):
+    """ CLI for the `IamPolicyIndex` of ONE AWS-account.  See top of this file for usage. """
+
+    def __init__(self,
+        appl_name :str,
+        aws_profile :str,
+        purpose :str = THIS_SCRIPT_DATA,
+        debug :bool = False,
+    ) -> None:
+        super().__init__(
+            appl_name=appl_name,
+            purpose=purpose,
+            aws_profile=aws_profile,
+            tier=None,  ### IAM is account-wide
+            debug=debug,
+        )
+
+    def load_index(self) -> IamPolicyIndex:
+        snapshot_filepath = self.gen_name_of_json_outp_file( "iam-authorization-snapshot" )
+        ### Just the cache's age (NO parsing).  ONLY a missing/expired snapshot is (re)fetched here .. which then invalidates the persisted index.
+        if self.awsapi_invoker.is_cache_too_old( json_output_filepath=snapshot_filepath, cache_no_older_than=self.cache_no_older_than, api_name="iam.get_account_authorization_details" ):
+            self.load_iam_snapshot()
+        return IamPolicyIndex.load_or_build(
+            load_snapshot = self.load_iam_snapshot,     ### ONLY if the persisted index is stale/missing.
+            source_last_modified = self.cache_store.last_modified( snapshot_filepath ),
+            index_filepath = self.json_output_filepath,
+            debug = self.debug,
+        )
+
+    def run(self, query :str, args :list[str]) -> any:
+        index = self.load_index()
+        start = time.perf_counter()
+        match query:
+            case "who-can":
+                resp = { role: [ f"{s['Source']}{' (conditional)' if s['HasCondition'] else ''}" for s in stmts ] for role, stmts in index.who_can( *args[:2] ).items() }
+            case "who-trusts":
+                resp = index.who_trusts( args[0] )
+            case "statements":
+                resp = index.find_statements( *args[:2] )
+            case _:
+                raise ValueError(f"!! ERROR !! Unknown query '{query}'. Must be one of: who-can, who-trusts, statements")
+        print(f"\nQuery took {(time.perf_counter() - start) * 1000:.2f} ms.\n")
+        return resp
+
+### ####################################################################################################
+
+# if invoked via cli
+if __name__ == "__main__":
+    if len(sys.argv) >= 4:
+        aws_profile = sys.argv[1]
+        o = QueryIamPolicyIndex(
+            appl_name=APP_NAME,
+            aws_profile=aws_profile,
+            purpose=THIS_SCRIPT_DATA,
+            debug=DEBUG,
+        )
+        resp = o.run( query=sys.argv[2], args=sys.argv[3:] )
+        print( json.dumps(resp, indent=4, default=str) )
+    else:
+        print( f"Usage:   python {sys.argv[0]} <AWS_PROFILE> who-can    <action> [<resource-ARN>]" )
+        print( f"         python {sys.argv[0]} <AWS_PROFILE> who-trusts <principal>" )
+        print( f"         python {sys.argv[0]} <AWS_PROFILE> statements <action> [<resource-ARN>]" )
+        print( f"EXAMPLE: python {sys.argv[0]} DEVINT    who-can    lambda:UpdateFunctionCode  arn:aws:lambda:us-east-1:123456789012:function:{APP_NAME}-backend-dev-fn" )
+        print( f"EXAMPLE: python {sys.argv[0]} DEVINT    who-trusts codebuild.amazonaws.com" )
+
+### EoScript
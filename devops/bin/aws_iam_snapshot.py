@@ -0,0 +1,107 @@
+### ONE-SHOT snapshot of the IAM-authorization of an AWS-account: Roles, their inline-policies, their attached managed-policies,
+### and the DEFAULT-version of every managed-policy.
+### Built from the paginated `iam.get_account_authorization_details()` API -- a.k.a. a handful of API-calls, instead of
+### `list_roles()` + `list_role_policies()` + `get_role_policy()` + `list_attached_role_policies()` + `get_policy_version()` PER role/policy.
+###
+### normalize_authorization_details_page() -- folds ONE page of the AWS-API's response into the (normalized, JSON-serializable) snapshot-dict.
+###                                           Used by `InvokeAWSApi.get_iam_authorization_snapshot()` within ./aws_api_invoker.py  (which also caches it)
+### IamAuthorizationSnapshot              -- wraps that snapshot-dict, with in-memory lookup-maps (by role-name, role-ARN, policy-ARN, ..)
+###
+### Normalized snapshot-dict:
+###     {
+###         "Roles":    [ { "RoleName", "Arn", .., "AssumeRolePolicyDocument": {..}, "InlinePolicies": { policy-name: {..document..} }, "AttachedPolicyArns": [..] } ],
+###         "Policies": [ { "PolicyName", "Arn", .., "DefaultVersionId", "DefaultPolicyDocument": {..} } ],
+###     }
+
+from typing import Optional
+import json
+import urllib.parse
+
+### What `get_account_authorization_details()` is asked for.  Users & Groups are NOT part of the snapshot.
+### Without "AWSManagedPolicy", the documents of AWS-managed policies (like AWSLambdaBasicExecutionRole) will be missing from the snapshot.
+IAM_SNAPSHOT_FILTERS :list[str] = [ "Role", "LocalManagedPolicy", "AWSManagedPolicy" ]
+
+### ----------------------------------------------------------------------
+
+def new_authorization_snapshot() -> dict:
+    return { "Roles": [], "Policies": [] }
+
+def decode_policy_document( document :any ) -> any:
+    """ botocore normally decodes the policy-documents into dicts.  But, if it's still the raw URL-encoded JSON-string, decode it here. """
+    if isinstance(document, str):
+        return json.loads( urllib.parse.unquote(document) )
+    return document
+
+def normalize_authorization_details_page( snapshot :dict, page :dict ) -> dict:
+    """ Appends the Roles & Policies within ONE page of `get_account_authorization_details()` to the 1st param.  Returns the 1st param. """
+    for role in page.get("RoleDetailList") or []:
+        snapshot["Roles"].append({
+            **{ k: v for k, v in role.items() if k not in [ "RolePolicyList", "AttachedManagedPolicies", "InstanceProfileList" ] },
+            "AssumeRolePolicyDocument": decode_policy_document( role.get("AssumeRolePolicyDocument") ),
+            "InlinePolicies": { p["PolicyName"]: decode_policy_document( p.get("PolicyDocument") ) for p in role.get("RolePolicyList") or [] },
+            "AttachedPolicyArns": [ p["PolicyArn"] for p in role.get("AttachedManagedPolicies") or [] ],
+            "InstanceProfileArns": [ ip["Arn"] for ip in role.get("InstanceProfileList") or [] ],
+        })
+    for policy in page.get("Policies") or []:
+        default_version = next( ( v for v in policy.get("PolicyVersionList") or [] if v.get("IsDefaultVersion") ), {} )
+        snapshot["Policies"].append({
+            **{ k: v for k, v in policy.items() if k != "PolicyVersionList" },
+            "DefaultPolicyDocument": decode_policy_document( default_version.get("Document") ),
+        })
+    return snapshot
+
+### ----------------------------------------------------------------------
+
+class IamAuthorizationSnapshot():
+    """ In-memory lookup-maps over a normalized snapshot-dict (as returned by `InvokeAWSApi.get_iam_authorization_snapshot()`).
+        All lookups are dict-lookups.  NONE of them invoke any AWS-API.
+    """
+
+    def __init__(self, snapshot :dict) -> None:
+        self.snapshot = snapshot
+        self.roles_by_name :dict[str, dict] = { r["RoleName"]: r for r in snapshot.get("Roles", []) }
+        self.roles_by_arn  :dict[str, dict] = { r["Arn"]: r for r in snapshot.get("Roles", []) }
+        self.policies_by_arn :dict[str, dict] = { p["Arn"]: p for p in snapshot.get("Policies", []) }
+        ### Policy-names are NOT unique (example: a customer-managed policy can have the same name as an AWS-managed one).
+        self.policies_by_name :dict[str, list[dict]] = {}
+        for p in snapshot.get("Policies", []):
+            self.policies_by_name.setdefault( p["PolicyName"], [] ).append( p )
+        ### policy-ARN -> names of the Roles it's attached to
+        self.roles_by_attached_policy_arn :dict[str, list[str]] = {}
+        for r in snapshot.get("Roles", []):
+            for policy_arn in r.get("AttachedPolicyArns", []):
+                self.roles_by_attached_policy_arn.setdefault( policy_arn, [] ).append( r["RoleName"] )
+
+    ### ------------------------------------------------
+
+    def get_role(self, role_name_or_arn :str) -> Optional[dict]:
+        return self.roles_by_name.get( role_name_or_arn ) or self.roles_by_arn.get( role_name_or_arn )
+
+    def get_trust_policy(self, role_name_or_arn :str) -> Optional[dict]:
+        role = self.get_role( role_name_or_arn )
+        return role.get("AssumeRolePolicyDocument") if role else None
+
+    def get_inline_policies(self, role_name_or_arn :str) -> dict[str, dict]:
+        """ Returns { inline-policy-name: document } """
+        role = self.get_role( role_name_or_arn )
+        return role.get("InlinePolicies", {}) if role else {}
+
+    def get_attached_policies(self, role_name_or_arn :str) -> dict[str, Optional[dict]]:
+        """ Returns { managed-policy-ARN: DEFAULT-version's document }.
+            The document is None, if that policy is NOT within the snapshot (example: AWS-managed, but "AWSManagedPolicy" was NOT in the filters).
+        """
+        role = self.get_role( role_name_or_arn )
+        if not role:
+            return {}
+        return { arn: self.policies_by_arn.get( arn, {} ).get("DefaultPolicyDocument") for arn in role.get("AttachedPolicyArns", []) }
+
+    def get_all_policy_documents(self, role_name_or_arn :str) -> list[dict]:
+        """ ALL the permission-policy documents of a role: its inline-policies, followed by its attached managed-policies.  The trust-policy is NOT included. """
+        return list( self.get_inline_policies( role_name_or_arn ).values() ) \
+            + [ doc for doc in self.get_attached_policies( role_name_or_arn ).values() if doc is not None ]
+
+    def get_roles_attached_to(self, policy_arn :str) -> list[str]:
+        """ Returns the names of the Roles, that the managed-policy is attached to """
+        return self.roles_by_attached_policy_arn.get( policy_arn, [] )
+
+### EoScript
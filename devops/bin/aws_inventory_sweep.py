@@ -0,0 +1,165 @@
+### Runs the SAME inventory-method of `InvokeAWSApi` (like `list_lambdas` or `get_all_stacks_full_details`)
+### across MULTIPLE (AWS-Profile, AWS-Region) targets -- CONCURRENTLY.
+### A full cross-account audit then takes as long as the SLOWEST account, instead of the SUM of all of them.
+###
+### Each target gets its own `GenericAWSCLIScript` (and therefore its own boto3-Session and its own per-target cache-file).
+### The results of all targets are then merged into ONE view, in which each item is annotated with "SweepTarget".
+###
+### Usage:   python aws_inventory_sweep.py <PROFILE:REGION,PROFILE:REGION,..> <tier> <InvokeAWSApi-method> [<merged-output.json>]
+### EXAMPLE: python aws_inventory_sweep.py DEVINT:us-east-1,UAT:us-east-1,PROD:us-east-1  dev  list_lambdas
+
+import sys
+import pathlib
+import traceback
+import concurrent.futures
+from typing import Optional
+
+from generic_aws_cli_script import (
+    GenericAWSCLIScript,
+)
+from aws_api_invoker import (
+    MyException,
+)
+from aws_api_cache_store import (
+    get_cache_store,
+)
+
+APP_NAME = "nccr"
+
+### ----------------------------------------------------------------------
+""" Parses a CLI-arg like "DEVINT:us-east-1,UAT:us-west-2,PROD" into a list of (profile, region) tuples.
+    If the region is missing, it's None (a.k.a. InvokeAWSApi's default region).
+    Use "none" as the profile, to use the default-credentials (example: inside GitHub-Actions).
+"""
+def parse_sweep_targets( targets_csv :str ) -> list[tuple[Optional[str], Optional[str]]]:
+    targets = []
+    for tgt in targets_csv.split(","):
+        tgt = tgt.strip()
+        if not tgt:
+            continue
+        profile, _, region = tgt.partition(":")
+        targets.append(( profile or None, region or None ))
+    if not targets:
+        raise MyException(f"!! ERROR !! No (profile:region) targets found within '{targets_csv}'")
+    return targets
+
+### ----------------------------------------------------------------------
+""" 1st param is your application-name (same as for `GenericAWSCLIScript`)
+    2nd param is typically "Lambdas" "Stacks" or "IAMRoles" (same as for `GenericAWSCLIScript`)
+    3rd param is the list of (profile, region) targets.  See `parse_sweep_targets()`
+    4th param is the tier.
+    5th param is the -NAME- of the method of the class "InvokeAWSApi" to invoke for each target.
+        Assumption: That☝🏾 method takes (at least) 2 parameters: (1) json_output_filepath (2) cache_no_older_than
+    6th param is OPTIONAL: additional keyword-params for that method (example: { "app_name": .. } for `get_all_stacks_full_details`)
+    7th param is OPTIONAL: # of targets to sweep concurrently.  Defaults to ALL of them.
+"""
+class InventorySweep():
+
+    def __init__(self,
+        appl_name :str,
+        purpose :str,
+        targets :list[tuple[Optional[str], Optional[str]]],
+        tier :str,
+        aws_api_name :str,
+        method_kwargs :Optional[dict] = None,
+        max_workers :Optional[int] = None,
+        cache_no_older_than :int = 1,
+        cache_backend :str = "json",
+        debug :bool = False,
+    ) -> None:
+        self.appl_name = appl_name
+        self.purpose = purpose
+        self.targets = targets
+        self.tier = tier
+        self.aws_api_name = aws_api_name
+        self.method_kwargs = method_kwargs or {}
+        self.max_workers = max_workers or len(targets)
+        self.cache_no_older_than = cache_no_older_than
+        self.cache_backend = cache_backend
+        self.debug = debug
+
+        self.per_target_results :dict[tuple, list] = {}
+        self.failed_targets :dict[tuple, Exception] = {}
+
+    ### ----------------------------------------------------------------------
+    """ Runs ONE target.  Invoked from a worker-thread; everything boto3 (Session, clients) is created within this thread. """
+    def _sweep_one_target(self,
+        target :tuple[Optional[str], Optional[str]],
+    ) -> list:
+        aws_profile, aws_region = target
+        scr = GenericAWSCLIScript(
+            appl_name = self.appl_name,
+            purpose = self.purpose,
+            aws_profile = aws_profile,
+            tier = self.tier,
+            _cache_no_older_than = self.cache_no_older_than,
+            debug = self.debug,
+            cache_backend = self.cache_backend,
+            aws_region = aws_region,
+        )
+        if not hasattr(scr.awsapi_invoker, self.aws_api_name):
+            raise MyException(f"Error: {self.aws_api_name} is not a valid Method of InvokeAWSApi custom-class.")
+        account_id = scr.awsapi_invoker.get_client('sts').get_caller_identity()["Account"]
+
+        results = getattr(scr.awsapi_invoker, self.aws_api_name)(
+            json_output_filepath = scr.json_output_filepath,
+            cache_no_older_than = self.cache_no_older_than,
+            **self.method_kwargs,
+        )
+        sweep_target = { "AwsProfile": aws_profile, "AwsRegion": scr.session.region_name, "AccountId": account_id }
+        ### Annotate COPIES, so that the per-target cache (and its in-memory list) is left untouched.
+        return [ { **item, "SweepTarget": sweep_target } for item in results ]
+
+    ### ----------------------------------------------------------------------
+    """ Sweeps all targets concurrently.
+        Returns the MERGED list (in the same order as `self.targets`, regardless of which target finished first).
+        Failed targets are reported (and saved within `self.failed_targets`), but do NOT stop the other targets.
+        If the OPTIONAL param is specified, the merged view is also saved into that cache-file.
+    """
+    def run(self,
+        merged_json_output_filepath :Optional[pathlib.Path] = None,
+    ) -> list:
+        print(f"Sweeping {len(self.targets)} targets with `{self.aws_api_name}()` (max_workers={self.max_workers}) ..")
+        with concurrent.futures.ThreadPoolExecutor( max_workers=self.max_workers ) as executor:
+            futures = { target: executor.submit( self._sweep_one_target, target ) for target in self.targets }
+            for target, future in futures.items():
+                try:
+                    self.per_target_results[target] = future.result()
+                    print(f"\n✅ {target}: {len(self.per_target_results[target])} items")
+                except Exception as e:
+                    self.failed_targets[target] = e
+                    print(f"\n❌ {target}: {str(e)}")
+                    if self.debug: traceback.print_exception(e, limit=None, file=sys.stderr)
+
+        merged_view = [ item for target in self.targets for item in self.per_target_results.get(target, []) ]
+        if merged_json_output_filepath:
+            get_cache_store( cache_backend=self.cache_backend, debug=self.debug ).save(
+                pathlib.Path(merged_json_output_filepath), merged_view,
+                header={ "api": self.aws_api_name, "params": { "targets": [ list(t) for t in self.targets ] } },
+            )
+            print(f"\nSaved the MERGED view ({len(merged_view)} items across {len(self.per_target_results)} targets) into '{merged_json_output_filepath}'")
+        return merged_view
+
+### ----------------------------------------------------------------------
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4:
+        print( f"Usage:   python {sys.argv[0]} <PROFILE:REGION,PROFILE:REGION,..> <tier> <InvokeAWSApi-method> [<merged-output.json>]" )
+        print( f"EXAMPLE: python {sys.argv[0]} DEVINT:us-east-1,UAT:us-east-1,PROD:us-east-1  dev  list_lambdas" )
+        sys.exit(1)
+    targets = parse_sweep_targets( sys.argv[1] )
+    tier = sys.argv[2]
+    aws_api_name = sys.argv[3]
+    merged_json_output_filepath = sys.argv[4] if len(sys.argv) > 4 else f"{GenericAWSCLIScript.TMPDIR}/sweep-{len(targets)}targets-all-{aws_api_name}.json"
+    sweep = InventorySweep(
+        appl_name = APP_NAME,
+        purpose = aws_api_name,
+        targets = targets,
+        tier = tier,
+        aws_api_name = aws_api_name,
+    )
+    sweep.run( merged_json_output_filepath = merged_json_output_filepath )
+    if sweep.failed_targets:
+        sys.exit(71)
+
+### EoScript
@@ -15,6 +15,13 @@ from aws_api_invoker import (
     InvokeAWSApi,
     MyException,
 )
+from aws_api_cache_store import (
+    get_cache_store,
+)
+from aws_iam_snapshot import (
+    IamAuthorizationSnapshot,
+)
+### NOTE: `aws_api_invoker_async` is imported ONLY if `use_asyncio=True`, as it requires the OPTIONAL package 'aiobotocore'.
 
 ### Manually configurable constants.
 
@@ -44,6 +51,13 @@ global__cache_no_older_than = 60
     2nd param is typically "iam-roles" "iam-policies" or .. "policies-for-role_abc_xyz"
     3rd param is OPTIONAL, defining how old the "cache" is, before re-invoking AWS-APIs to get latest data from AWS
     4th param is OPTIONAL, default FALSE.  Set it to true, for verbose debug-dumps.
+    5th param is OPTIONAL, default "json".  Set it to "sqlite" to store the cache as indexed-rows within a SQLite-file (See ./aws_api_cache_store.py)
+    6th param is OPTIONAL, default FALSE.  Set it to true, to use the asyncio-implementation `AsyncInvokeAWSApi` (See ./aws_api_invoker_async.py)
+    7th param is OPTIONAL, default None (a.k.a. InvokeAWSApi's default of "us-east-1").  The AWS-Region to use.
+        To sweep MULTIPLE (profile, region) targets concurrently, see ./aws_inventory_sweep.py
+    8th param is OPTIONAL, default None.  At exit, a per-AWS-API latency-report is printed; this ALSO saves it as a JSON-file.  See ./aws_api_metrics.py
+    9th param is OPTIONAL, default FALSE.  Set it to true, to serve an EXPIRED cache immediately while refreshing it in the background,
+        using per-resource TTLs (layers 1h, IAM 1d, stacks 15m) instead of the 3rd param.  See `InvokeAWSApi.serve_stale_while_revalidating()`
 """
 class GenericAWSCLIScript():
 
@@ -60,6 +74,9 @@ class GenericAWSCLIScript():
         if self.aws_profile:
             ### on developer-laptops
             return f"{self.TMPDIR}/{self.aws_profile}-{self.session.region_name}-all-{purpose}{suffix if suffix else ''}.json"
+        elif self.aws_region:
+            ### when running inside GitHub-Actions/Workflows, but for an EXPLICIT region (example: a multi-region sweep)
+            return f"{self.TMPDIR}/{self.aws_region}-all-{purpose}{suffix if suffix else ''}.json"
         else:
             ### when running inside GitHub-Actions/Workflows
             return f"{self.TMPDIR}/all-{purpose}{suffix if suffix else ''}.json"
@@ -73,8 +90,14 @@ class GenericAWSCLIScript():
         tier :str,
         _cache_no_older_than :int = global__cache_no_older_than,
         debug :bool = False,
+        cache_backend :str = "json",
+        use_asyncio :bool = False,
+        aws_region :str = None,
+        api_metrics_json_filepath :str = None,
+        stale_while_revalidate :bool = False,
     ):
         self.aws_profile = aws_profile
+        self.aws_region  = aws_region
         self.tier        = tier
         self.appl_name   = appl_name
         self.purpose     = purpose
@@ -86,14 +109,27 @@ class GenericAWSCLIScript():
 
         ### ------------------------------
         ### AWS APIs
-        self.awsapi_invoker = InvokeAWSApi(
+        self.cache_store = get_cache_store( cache_backend=cache_backend, debug=self.debug )
+        if use_asyncio:
+            if stale_while_revalidate:
+                raise MyException("!! ERROR !! stale_while_revalidate is NOT (yet) supported by the asyncio-implementation.  Use ONE or the other.")
+            from aws_api_invoker_async import AsyncInvokeAWSApi
+            invoker_class = AsyncInvokeAWSApi
+        else:
+            invoker_class = InvokeAWSApi
+        self.awsapi_invoker = invoker_class(
             aws_profile=self.aws_profile,
-            debug=self.debug
+            debug=self.debug,
+            cache_store=self.cache_store,
+            api_metrics_json_filepath=api_metrics_json_filepath,
+            **( { "aws_region": self.aws_region } if self.aws_region else {} ),
+            **( { "stale_while_revalidate": True } if stale_while_revalidate else {} ),
         )
 
         self.session = self.awsapi_invoker.sanity_check_awsprofile()
 
-        self.client = self.session.client('iam')
+        self.client = self.awsapi_invoker.get_client('iam')
+        self._iam_snapshot :IamAuthorizationSnapshot = None    ### See `load_iam_snapshot()`
 
         ### ------------------------------
         ### Section: Derived variables and constants
@@ -116,46 +152,29 @@ class GenericAWSCLIScript():
         else:
             raise MyException(f"Error: {aws_api_name} is not a valid Method of InvokeAWSApi custom-class.")
 
-        # print("Loading Cache for DERIVED-Info re: Policies-ASSOCIATED-with-Roles.. ..", end="")
-        # iam_Policy_lookup = {}
-        # iam_role_associated_inline_policy_lookup = self.awsapi_invoker.load_role_associated_inline_policy_cache(
-        #     json_output_filepath=json_output_filepath_RoleAssociatedPolicies,
-        # )
-        # print(".. Done")
-
+    ### ----------------------------------------------------------------------
+    """ Returns the IAM authorization-snapshot (ALL Roles, their inline & attached policies, ALL managed-policies' default-versions) with in-memory lookup-maps.
+        Loaded (a handful of paginated API-calls, else from its own cache-file) ONLY on the 1st invocation.  See `InvokeAWSApi.get_iam_authorization_snapshot()`
+    """
+    def load_iam_snapshot(self) -> IamAuthorizationSnapshot:
+        if self._iam_snapshot is None:
+            self._iam_snapshot = IamAuthorizationSnapshot( self.awsapi_invoker.get_iam_authorization_snapshot(
+                json_output_filepath = self.gen_name_of_json_outp_file( "iam-authorization-snapshot" ),
+                cache_no_older_than = self.cache_no_older_than,
+            ))
+        return self._iam_snapshot
 
     ### ----------------------------------------------------------------------
-    def invalid_code_snippets(self, iamrole_name :str):
-        # Get --ALL-- the Policy Statements associated with this IAM-Role
-        # Get inline policies
+    """ Returns --ALL-- the INLINE Policy-documents associated with this IAM-Role.
+        Looked up within the IAM authorization-snapshot, a.k.a. NO per-Role `list_role_policies()` + `get_role_policy()` API-calls.
+    """
+    def invalid_code_snippets(self, iamrole_name :str) -> list[dict]:
         inline_policies = []
-        try:
-            if iamrole_name in iam_role_associated_inline_policy_lookup:
-                response = iam_role_associated_inline_policy_lookup[iamrole_name]
-            else:
-                print(f"!!!!!! Policy IN-MEMORY Lookup = None.  Invoking AWS-API list_role_policies() for {iamrole_name} !!!!!!")
-                response = self.client.list_role_policies(RoleName=iamrole_name)
-                iam_role_associated_inline_policy_lookup[iamrole_name] = response
-                # print(response)
-
-            for policy_name in response['PolicyNames']:
-                print("!", end="")
-                if self.debug: print(f"DEBUG: Role:\t{iamrole_name}\thas a INLINE-Policy: {policy_name}")
-                policy_arn = f"arn:aws:iam::{iamrole_name}:policy/{policy_name}"
-                if policy_arn in iam_role_associated_inline_policy_lookup:
-                    policy_details = iam_role_associated_inline_policy_lookup[policy_arn]
-                else:
-                    print(f"!!!!!! Policy IN-MEMORY Lookup = None.  Invoking AWS-API get_role_policy() for {policy_arn} !!!!!!")
-                    policy = self.client.get_role_policy(RoleName=iamrole_name, PolicyName=policy_name)
-                    policy_details = policy['PolicyDocument']
-                    iam_role_associated_inline_policy_lookup[policy_arn] = policy_details
-                inline_policies.append( policy_details)
-
-        except Exception as e:
-            traceback.print_exc()
-            print(f"Error getting inline policies: {str(e)}")
-            print(f"Error getting inline-associated policies for\t{iamrole_name}")
-            time.sleep(2)
+        for policy_name, policy_details in self.load_iam_snapshot().get_inline_policies( iamrole_name ).items():
+            print("!", end="")
+            if self.debug: print(f"DEBUG: Role:\t{iamrole_name}\thas a INLINE-Policy: {policy_name}")
+            inline_policies.append( policy_details )
+        return inline_policies
 
     ### -----------------------------------------------------------------------------------------------------------
 
@@ -13,6 +13,7 @@ from urllib.parse import urlparse
 
 import constants
 from generic_aws_cli_script import ( GenericAWSCLIScript )
+from aws_iam_policy_index import ( trust_policy_allows )
 
 APP_NAME = "nccr"
 THIS_SCRIPT_DATA = "IAMRoles"
@@ -85,7 +86,7 @@ class Identify_CodeBuildIamRoles_usedByDevOpsPipeline(GenericAWSCLIScript):
             if self.debug: print( '\t'+ role_name +'/'+ json.dumps(princ) + ".. " )
             if pattern.match(role_name):
                 # Check if codebuild.amazonaws.com is in trust policy of this IAM-Role
-                if Identify_CodeBuildIamRoles_usedByDevOpsPipeline.check_trust_policy_for_codebuild(role_name):
+                if Identify_CodeBuildIamRoles_usedByDevOpsPipeline.check_trust_policy_for_codebuild( role['AssumeRolePolicyDocument'] ):
                     rolearn = role['Arn']
                     if self.debug: print(f"👉🏾 Role '{rolearn}' is a Trust-Policy for CodeBuild !'")
                     matching_role_arns.append(role['Arn'])
@@ -96,41 +97,14 @@ class Identify_CodeBuildIamRoles_usedByDevOpsPipeline(GenericAWSCLIScript):
 
     ### .........................................................
     @staticmethod
-    def check_trust_policy_for_codebuild(role_name: str) -> bool:
+    def check_trust_policy_for_codebuild(trust_policy: dict) -> bool:
         """
         Check if the role's trust policy includes codebuild.amazonaws.com
+        The only param is the role's `AssumeRolePolicyDocument` -- as ALREADY returned by `list_roles()`.  So, NO `get_role()` per role.
+        The principal is compared EXACTLY (NOT as a substring), and ONLY against `Service` principals (a `{"AWS": "*"}` trust is NOT CodeBuild).
+        See `trust_policy_allows()` in ./aws_iam_policy_index.py
         """
-        iam = boto3.client('iam')
-        try:
-            role_info = iam.get_role(RoleName=role_name)
-            trust_policy = role_info['Role']['AssumeRolePolicyDocument']
-
-            # Check if codebuild.amazonaws.com is in the trust policy
-            for statement in trust_policy.get('Statement', []):
-                principal = statement.get('Principal', {})
-                if 'Service' in principal:
-                    services_as_is = principal['Service']
-                    if isinstance(services_as_is, str):
-                        services_as_is = [services_as_is]
-                    ### Following lines has a SECURITY-Finding.
-                    ###     The string may be at an arbitrary position in the sanitized URL.
-                    ###     Tool: CodeQL
-                    ###     Rule ID: py/incomplete-url-substring-sanitization
-                    ###     Description: Sanitizing untrusted URLs is a common technique for preventing attacks such as request forgeries and malicious redirections. Usually, this is done by checking that the host of a URL is in a set of allowed hosts.
-                    services :list[str] = []
-                    s :str = None
-                    for s in services_as_is:
-                        services.append( s.encode())
-                    ### Stupid GitHub Code-scanner thinks following line is susceptible to string-based malicious input assuming `services` is a string, .. WHEN INSTEAD `services` is an ARRAY!!
-                    # if 'codebuild.amazonaws.com' in services:
-                    for s in services:
-                        if 'codebuild.amazonaws.com' == s.encode():
-                            return True
-            return False
-
-        except Exception as e:
-            print(f"Error checking trust policy for role {role_name}: {str(e)}")
-            return False
+        return trust_policy_allows( trust_policy, 'codebuild.amazonaws.com', principal_type='Service' )
 
 ### ####################################################################################################
 
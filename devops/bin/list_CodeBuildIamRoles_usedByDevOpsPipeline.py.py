@@ -11,6 +11,7 @@ import traceback
 
 import constants
 from generic_aws_cli_script import ( GenericAWSCLIScript )
+from aws_iam_policy_index import ( trust_policy_allows )
 
 APP_NAME = "nccr"
 THIS_SCRIPT_DATA = "IAMRoles"
@@ -82,7 +83,7 @@ class Identify_CodeBuildIamRoles_usedByDevOpsPipeline(GenericAWSCLIScript):
             if self.debug: print( '\t'+ role_name +'/'+ json.dumps(princ) + ".. " )
             if pattern.match(role_name):
                 # Check if codebuild.amazonaws.com is in trust policy of this IAM-Role
-                if Identify_CodeBuildIamRoles_usedByDevOpsPipeline.check_trust_policy_for_codebuild(role_name):
+                if Identify_CodeBuildIamRoles_usedByDevOpsPipeline.check_trust_policy_for_codebuild( role['AssumeRolePolicyDocument'] ):
                     rolearn = role['Arn']
                     if self.debug: print(f"👉🏾 Role '{rolearn}' is a Trust-Policy for CodeBuild !'")
                     matching_role_arns.append(role['Arn'])
@@ -93,29 +94,14 @@ class Identify_CodeBuildIamRoles_usedByDevOpsPipeline(GenericAWSCLIScript):
 
     ### .........................................................
     @staticmethod
-    def check_trust_policy_for_codebuild(role_name: str) -> bool:
+    def check_trust_policy_for_codebuild(trust_policy: dict) -> bool:
         """
         Check if the role's trust policy includes codebuild.amazonaws.com
+        The only param is the role's `AssumeRolePolicyDocument` -- as ALREADY returned by `list_roles()`.  So, NO `get_role()` per role.
+        The principal is compared EXACTLY (NOT as a substring), and ONLY against `Service` principals (a `{"AWS": "*"}` trust is NOT CodeBuild).
+        See `trust_policy_allows()` in ./aws_iam_policy_index.py
         """
-        iam = boto3.client('iam')
-        try:
-            role_info = iam.get_role(RoleName=role_name)
-            trust_policy = role_info['Role']['AssumeRolePolicyDocument']
-
-            # Check if codebuild.amazonaws.com is in the trust policy
-            for statement in trust_policy.get('Statement', []):
-                principal = statement.get('Principal', {})
-                if 'Service' in principal:
-                    services = principal['Service']
-                    if isinstance(services, str):
-                        services = [services]
-                    if 'codebuild.amazonaws.com' in services:
-                        return True
-            return False
-
-        except Exception as e:
-            print(f"Error checking trust policy for role {role_name}: {str(e)}")
-            return False
+        return trust_policy_allows( trust_policy, 'codebuild.amazonaws.com', principal_type='Service' )
 
 ### ####################################################################################################
 
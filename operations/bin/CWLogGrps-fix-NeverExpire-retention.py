@@ -1,6 +1,20 @@
 ### python-script that takes 3 CLI arguments (AWSPROFILE, AWSREGION and CWLogGrpRetentionPeriodInDays).
 ### Looks at all CW-LogGroups that have Retention set to "Never Expire".
-### If the name of the LogGroup contains "-CustomS3AutoDeleteObject-", then it sets the retention to the 3rd CLI argument.
+### If the name of the LogGroup matches ANY of the rules (example: contains "-CustomS3AutoDeleteObject-"), then it sets the retention to the 3rd CLI argument.
+###
+### The rules are in the data-file ./CWLogGrps-fix-NeverExpire-retention.rules.json  (or, the file specified via `--rules=<file>`)
+###     All rules' regexes are compiled ONCE, into a SINGLE alternation.
+###     A rule whose regex is prefix-anchored (like "^/aws/lambda/CTF-devops-...") is listed server-side via `logGroupNamePrefix`;
+###     any other rule with a long-enough literal (like "-CustomS3AutoDe") is listed server-side via `logGroupNamePattern` (a substring-match).
+###     ONLY if a rule has neither, are ALL the log-groups of the region listed.
+### The retention-updates are invoked via a pool of worker-threads, throttled by `awsapi_invoker.get_client()`'s rate-limiter.
+### `--dry-run` prints a diff of what WOULD change, without changing anything.
+###
+### `--report` changes NOTHING.  Instead, over the SAME cached inventory of ALL log-groups (`storedBytes`, `retentionInDays`, `logGroupClass`), it
+###     ranks the log-groups by stored-bytes, with each one's ingested-bytes (CloudWatch-metric `IncomingBytes`, for the last 30 days),
+###     estimates the monthly savings from setting retention (to the 3rd CLI argument) or from the `INFREQUENT_ACCESS` log-class (ONLY where that's the expected log-class),
+###     and flags the log-groups WITHOUT retention, or WITHOUT any subscription-filter (the latter, ONLY for the top `--top=N` log-groups).
+###     The expected log-class, is as per `get_loggrp_class()` within common/cdk/standard_logging.py  (the tier is inferred from the log-group's name)
 
 ### Re: APIGW's Execution Logs.
 ### https://docs.aws.amazon.com/apigateway/latest/developerguide/set-up-logging.html
@@ -13,19 +27,131 @@
 import sys
 import boto3
 import re
+import json
+import pathlib
+import time
+import concurrent.futures
+from typing import Optional
 
 from backend.lambda_layer.bin.generic_aws_cli_script import ( GenericAWSCLIScript )
+from backend.lambda_layer.bin.aws_api_cache_store import ( atomic_write )
 import constants
 import common.cdk.constants_cdk as constants_cdk
 import common.cdk.aws_names as aws_names
+from common.cdk.standard_logging import get_loggrp_class
 from cdk_utils.CloudFormation_util import add_tags, get_cpu_arch_as_str
 
 ### ==============================================================================================
 
 CDK_APP_NAME = "CTF"
-THIS_SCRIPT_DATA = "stacks"
+THIS_SCRIPT_DATA = "log-groups"
 DEBUG = False
 
+DEFAULT_RULES_FILEPATH = pathlib.Path(__file__).parent / "CWLogGrps-fix-NeverExpire-retention.rules.json"
+
+### How many `put_retention_policy` calls in flight.  The actual rate is throttled by the rate-limiter (See aws_api_rate_limiter.py)
+MAX_WORKERS = 8
+
+### The ONLY chars allowed by `logGroupNamePrefix` & `logGroupNamePattern`
+LISTING_FILTER_REGEX = re.compile( r"^[\.\-_/#A-Za-z0-9]+$" )
+### A server-side filter shorter than this, would hardly filter anything.
+MIN_LISTING_FILTER_LEN = 4
+
+### Pricing (USD per GB, us-east-1) .. used ONLY for the ESTIMATES within `--report`.  See https://aws.amazon.com/cloudwatch/pricing/
+PRICE_PER_GB_INGESTED = { "STANDARD": 0.50, "INFREQUENT_ACCESS": 0.25 }
+PRICE_PER_GB_MONTH_STORED = 0.03
+GB = 1024 ** 3
+INGESTION_WINDOW_DAYS = 30
+### Max `MetricDataQueries` per `get_metric_data()`
+GET_METRIC_DATA_MAX_QUERIES = 500
+### How many log-groups are listed (and looked-up for subscription-filters) within `--report`
+DEFAULT_REPORT_TOP_N = 50
+
+### ==============================================================================================
+
+""" Splits the regex (1st param) into its runs of LITERAL chars -- which EVERY matching string must contain.
+    The 1st element is the run starting at the very beginning of the regex ("" if the regex does NOT start with a literal).
+    Returns None, if the regex has alternation or groups (too complex to split).
+"""
+def literal_runs( regex_str :str ) -> Optional[list[str]]:
+    if '|' in regex_str or '(' in regex_str:
+        return None
+    runs = []
+    run = ""
+    i = 0
+    while i < len(regex_str):
+        c = regex_str[i]
+        if c == '\\':
+            if regex_str[i+1:i+2].isalnum():   ### \d \w \s \b .. are NOT literals
+                runs.append(run); run = ""
+                i += 2
+                continue
+            c = regex_str[i+1:i+2]              ### an escaped literal, like `\.` or `\/`
+            i += 1
+        elif c == '[':
+            runs.append(run); run = ""
+            i = regex_str.find(']', i + 2) + 1 or len(regex_str)
+            continue
+        elif c in "?*{":                        ### the PREVIOUS char is optional
+            runs.append(run[:-1]); run = ""
+            i = ( regex_str.find('}', i) + 1 or len(regex_str) ) if c == '{' else i + 1
+            continue
+        elif c in ".^$+}":
+            runs.append(run); run = ""
+            i += 1
+            continue
+        run += c
+        i += 1
+    runs.append(run)
+    return runs
+
+""" Returns the server-side filter for listing the log-groups that COULD match the regex (1st param):
+        { "logGroupNamePrefix": .. } if the regex is prefix-anchored, else { "logGroupNamePattern": .. } (its longest literal), else None.
+"""
+def listing_filter_for( regex_str :str ) -> Optional[dict]:
+    if regex_str.startswith('^'):
+        runs = literal_runs( regex_str[1:] )
+        if runs and len(runs[0]) >= MIN_LISTING_FILTER_LEN and LISTING_FILTER_REGEX.match(runs[0]):
+            return { "logGroupNamePrefix": runs[0] }
+    runs = [ r for r in literal_runs( regex_str ) or [] if len(r) >= MIN_LISTING_FILTER_LEN and LISTING_FILTER_REGEX.match(r) ]
+    if runs:
+        return { "logGroupNamePattern": max( runs, key=len ) }
+    return None
+
+""" Returns the MINIMAL list of server-side filters, to list every log-group that could match ANY of the rules.
+    [ {} ] means: list ALL the log-groups.
+"""
+def plan_listings( rules :list[dict] ) -> list[dict]:
+    filters = [ listing_filter_for( rule['regex'] ) for rule in rules ]
+    if None in filters:
+        return [ {} ]
+    prefixes = sorted({ f["logGroupNamePrefix"] for f in filters if "logGroupNamePrefix" in f })
+    ### A prefix that extends another prefix, is already covered by the shorter one.
+    prefixes = [ p for p in prefixes if not any( p != q and p.startswith(q) for q in prefixes ) ]
+    patterns = sorted({ f["logGroupNamePattern"] for f in filters if "logGroupNamePattern" in f })
+    return [ { "logGroupNamePrefix": p } for p in prefixes ] + [ { "logGroupNamePattern": p } for p in patterns ]
+
+""" 1st param is the JSON data-file.  Returns its list of rules, with `{CDK_APP_NAME}` substituted within each regex.
+    Exits, if any regex is invalid.
+"""
+def load_rules( rules_filepath :pathlib.Path ) -> list[dict]:
+    with open(rules_filepath) as f:
+        rules = json.load(f)["rules"]
+    for rule in rules:
+        rule['regex'] = rule['regex'].replace( "{CDK_APP_NAME}", CDK_APP_NAME )
+        try:
+            re.compile( rule['regex'] )
+        except re.error as e:
+            print(f"\n\n❌❌ Invalid regex for rule '{rule.get('name')}' in '{rules_filepath}': {e}")
+            sys.exit(1)
+    return rules
+
+""" Compiles ALL the rules (1st param) into ONE regex -- a SINGLE alternation of named-groups `rule0|rule1|..`.
+    So, `match.lastgroup` identifies which rule matched.
+"""
+def compile_rules( rules :list[dict] ) -> re.Pattern:
+    return re.compile( "|".join( f"(?P<rule{indx}>{rule['regex']})" for indx, rule in enumerate(rules) ) )
+
 ### ==============================================================================================
 
 class LogGrpRetentionSetter(GenericAWSCLIScript):
@@ -37,63 +163,261 @@ class LogGrpRetentionSetter(GenericAWSCLIScript):
         tier :str,
         retention_period_in_days :int,
         purpose :str,
+        rules_filepath :pathlib.Path = DEFAULT_RULES_FILEPATH,
+        dry_run :bool = False,
         debug :bool = False,
     ) -> None:
-        """ Use boto3 to lookup all Lambda-Layers that belong to this constants.CDK_APP_NAME.
-            Then get the description-field of each Lambda-Layer (which should be the HASH for the zip-file inside it)
-            Save all these SHA-256 HEX hashes into a file
+        """ Lists the CW-LogGroups that could match the rules (filtered server-side, wherever possible).
+            For each one with "Never Expire" retention that matches a rule, sets its retention (concurrently).
+            If `dry_run`, prints a diff instead.
         """
+        # Validate the value of "aws_region"
+        if not re.match(r'^[a-z]{2}-[a-z]+-\d$', aws_region):
+            print(f"\n\n❌❌ Invalid AWS region specified as CLI-arg #2: '{aws_region}'")
+            sys.exit(1)
+
         super().__init__(
             appl_name=appl_name,
             purpose=purpose,
             aws_profile=aws_profile,
             tier=tier,
+            aws_region=aws_region,  ### So that the log-groups are listed in the SAME region, as the retention is set in.
             debug=debug,
         )
 
-        # us_east_1_session = boto3.Session(profile_name=aws_profile, region_name="us-east-1")
-        # ec2_client = session.client('logs')
-        # Validate the value of "aws_region"
+        rules = load_rules( rules_filepath )
+        rules_regex = compile_rules( rules )
+        listings = plan_listings( rules )
+        if self.debug: print(f"Listing log-groups via: {listings}")
+
+        logs_client = self.awsapi_invoker.get_client( 'logs', region_name=aws_region, max_workers=MAX_WORKERS )
+
+        seen_log_group_names :set[str] = set()
+        matched_per_rule :dict[str, int] = { rule['name']: 0 for rule in rules }
+        futures :dict[str, concurrent.futures.Future] = {}
+        with concurrent.futures.ThreadPoolExecutor( max_workers=MAX_WORKERS ) as executor:
+            for listing_filter in listings:
+                # Get the list of log groups -- STREAMED page by page, so that fixes start as soon as the 1st page arrives.
+                log_groups = self.awsapi_invoker.iter_aws_GenericAWSApi_items(
+                    aws_client_type = 'logs',
+                    api_method_name = "describe_log_groups",
+                    response_key = 'logGroups',
+                    json_output_filepath = self.gen_name_of_json_outp_file( purpose, suffix="".join( f"-{v}" for v in listing_filter.values() ).replace('/', '_') ),
+                    additional_params = listing_filter,
+                    cache_no_older_than = 1, ### Override the value for 'self.cache_no_older_than' .. as log-groups frequently change every-day!
+                    page_size = 50,          ### max allowed by describe_log_groups
+                )
+
+                for log_group in log_groups:
+                    if self.debug > 1: print(log_group)
+                    log_group_name = log_group['logGroupName']
+                    if log_group_name in seen_log_group_names:  ### already seen via another listing
+                        continue
+                    seen_log_group_names.add( log_group_name )
+                    retention_in_days = log_group.get('retentionInDays', None)
+
+                    # Check if the log group has "Never Expire" retention and matches ANY of the rules
+                    if retention_in_days is None:
+                        match = rules_regex.search( log_group_name )
+                        if match:
+                            rule = rules[ int( match.lastgroup[ len("rule"): ] ) ]
+                            matched_per_rule[ rule['name'] ] += 1
+                            new_retention_in_days = int( rule.get('retentionInDays', retention_period_in_days) )
+                            if dry_run:
+                                print(f"  {log_group_name}\n-     retentionInDays: Never-Expire\n+     retentionInDays: {new_retention_in_days}\t\t(rule: '{rule['name']}')")
+                            else:
+                                print(f"\nSetting retention for log group: {log_group_name} to {new_retention_in_days} days")
+                                futures[log_group_name] = executor.submit(
+                                    logs_client.put_retention_policy,
+                                    logGroupName=log_group_name,
+                                    retentionInDays=new_retention_in_days,
+                                )
+                    else:
+                        # print(f"\n⚠️⚠️ NOT fixing NeverExpire retention for {log_group_name}")
+                        if self.debug: print(f"⚠️ {log_group_name}", end=" .. ")
+
+        failures = 0
+        for log_group_name, future in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                failures += 1
+                print(f"!! ERROR !! setting retention for log group: {log_group_name}: {str(e)}")
+
+        print('-'*80)
+        print(f"Scanned {len(seen_log_group_names)} log-groups via {len(listings)} listing(s): {listings}")
+        for rule_name, cnt in matched_per_rule.items():
+            print(f"\t{cnt:6d}  '{rule_name}'")
+        if dry_run:
+            print(f"DRY-RUN .. NOTHING changed.  {sum(matched_per_rule.values())} log-groups WOULD be changed.")
+        else:
+            print(f"Set retention for {len(futures) - failures} log-groups ({failures} failures).")
+        if failures:
+            sys.exit(1)
+
+### ==============================================================================================
+
+""" Returns the 1st of `constants.STD_TIERS` that appears as "-{tier}-" within the name of the log-group.  Else, the dev-tier. """
+def infer_tier( log_group_name :str ) -> str:
+    return next( ( t for t in constants.STD_TIERS if f"-{t}-" in log_group_name ), constants.DEV_TIER )
+
+""" Returns the estimated bytes that would be DELETED, if the log-group's retention were set to the 2nd param (days).
+    Assumes the log-group was ingesting at a uniform rate since it was created.
+"""
+def estimate_bytes_beyond_retention( log_group :dict, retention_in_days :int, now_millis :int ) -> int:
+    age_in_days = ( now_millis - log_group.get('creationTime', now_millis) ) / ( 86400 * 1000 )
+    current_retention = log_group.get('retentionInDays') or age_in_days   ### "Never Expire" a.k.a. everything since creation.
+    kept_days = min( age_in_days, current_retention )
+    if kept_days <= retention_in_days:
+        return 0
+    return int( log_group.get('storedBytes', 0) * ( 1 - retention_in_days / kept_days ) )
+
+""" Returns { log-group-name: bytes ingested during the last `days` } via the CloudWatch-metric `AWS/Logs IncomingBytes`.
+    Upto 500 log-groups per `get_metric_data()`.  Log-groups with NO ingestion are missing from the result.
+"""
+def get_ingested_bytes( cloudwatch_client, log_group_names :list[str], days :int ) -> dict[str, int]:
+    end_time = int( time.time() ) // 3600 * 3600
+    ingested = {}
+    for k in range( 0, len(log_group_names), GET_METRIC_DATA_MAX_QUERIES ):
+        batch = log_group_names[ k : k + GET_METRIC_DATA_MAX_QUERIES ]
+        queries = [ {
+            'Id': f"q{indx}",
+            'MetricStat': {
+                'Metric': { 'Namespace': 'AWS/Logs', 'MetricName': 'IncomingBytes', 'Dimensions': [ { 'Name': 'LogGroupName', 'Value': name } ] },
+                'Period': days * 86400,
+                'Stat': 'Sum',
+            },
+        } for indx, name in enumerate(batch) ]
+        paginator = cloudwatch_client.get_paginator('get_metric_data')
+        for page in paginator.paginate( MetricDataQueries=queries, StartTime=end_time - days * 86400, EndTime=end_time ):
+            for result in page['MetricDataResults']:
+                if result['Values']:
+                    name = batch[ int( result['Id'][1:] ) ]
+                    ingested[name] = ingested.get( name, 0 ) + int( sum( result['Values'] ) )
+        print("↓", end="", flush=True)
+    return ingested
+
+### ==============================================================================================
+
+class LogGrpStorageAnalyzer(GenericAWSCLIScript):
+
+    def __init__(self,
+        appl_name :str,
+        aws_profile :str,
+        aws_region :str,
+        tier :str,
+        retention_period_in_days :int,
+        purpose :str,
+        top_n :int = DEFAULT_REPORT_TOP_N,
+        debug :bool = False,
+    ) -> None:
+        """ Use `report()` to print (and save as JSON) the storage & ingestion report of ALL the log-groups in the region. """
         if not re.match(r'^[a-z]{2}-[a-z]+-\d$', aws_region):
             print(f"\n\n❌❌ Invalid AWS region specified as CLI-arg #2: '{aws_region}'")
             sys.exit(1)
+        super().__init__(
+            appl_name=appl_name,
+            purpose=purpose,
+            aws_profile=aws_profile,
+            tier=tier,
+            aws_region=aws_region,
+            debug=debug,
+        )
+        self.aws_region = aws_region
+        self.retention_period_in_days = int(retention_period_in_days)
+        self.top_n = top_n
 
-        logs_client = self.awsapi_invoker.session.client(service_name='logs', region_name=aws_region)
-
-        # Get the list of log groups
-        log_groups = self.awsapi_invoker.invoke_aws_GenericAWSApi_for_complete_response(
+    def report(self) -> dict:
+        """ Returns the report (also saved as a JSON-file).  Changes NOTHING. """
+        ### The SAME cache-file as the un-filtered listing of `LogGrpRetentionSetter`
+        log_groups = list( self.awsapi_invoker.iter_aws_GenericAWSApi_items(
             aws_client_type = 'logs',
             api_method_name = "describe_log_groups",
             response_key = 'logGroups',
-            json_output_filepath = self.json_output_filepath,
-            additional_params={},
-            # additional_params={ "StackStatusFilter": ALL_ACTIVE_STACK_STATUSES },
-            cache_no_older_than = 1, ### Override the value for 'self.cache_no_older_than' .. as stacks frequently change every-day!
-        )
-        if self.debug > 1: print(log_groups)
-
-        for log_group in log_groups:
-            log_group_name = log_group['logGroupName']
-            retention_in_days = log_group.get('retentionInDays', None)
-            # print( log_group_name, end=" .. ")
-
-            # Check if the log group has "Never Expire" retention and matches the specified regex
-            if retention_in_days is None:
-                if (re.search( r'-CustomS3AutoDel?e?t?e?O?b?j?e?c?t?s?C?-[a-zA-Z0-9]+$', log_group_name) or
-                    re.search( r'API-Gateway-Execution-Logs_[a-zA-Z0-9]+/[a-zA-Z]+$', log_group_name) or
-                    re.search( r'-BucketNotif?i?c?a?t?i?o?n?sH?a?n?d?l?-[a-zA-Z0-9]+$', log_group_name) or
-                    re.search( r'-Stateful-AuroraV2-PG-16-RDSAdminCredsRotation$', log_group_name) or
-                    re.search(fr'^/aws/lambda/{CDK_APP_NAME}-devops-[0-9a-zA-Z]+-CleanupOrphanResources$', log_group_name) or
-                    re.search(fr'^/aws/lambda/{CDK_APP_NAME}-backend-matt-Statefu-LogRe?t?e?n?t?i?o?n?', log_group_name)
-                ):
-                    print(f"\nSetting retention for log group: {log_group_name} to {retention_period_in_days} days")
-                    logs_client.put_retention_policy(
-                        logGroupName=log_group_name,
-                        retentionInDays=int(retention_period_in_days)
-                    )
-            else:
-                # print(f"\n⚠️⚠️ NOT fixing NeverExpire retention for {log_group_name}")
-                if self.debug: print(f"⚠️ {log_group_name}", end=" .. ")
+            json_output_filepath = self.gen_name_of_json_outp_file( self.purpose ),
+            additional_params = {},
+            cache_no_older_than = 1,
+            page_size = 50,
+        ))
+        log_groups.sort( key=lambda lg: lg.get('storedBytes', 0), reverse=True )
+        now_millis = int( time.time() * 1000 )
+
+        cloudwatch_client = self.awsapi_invoker.get_client( 'cloudwatch', region_name=self.aws_region )
+        ingested = get_ingested_bytes( cloudwatch_client, [ lg['logGroupName'] for lg in log_groups ], INGESTION_WINDOW_DAYS )
+
+        ### Subscription-filters need ONE AWS-API call per log-group.  So, ONLY for the top-N.
+        logs_client = self.awsapi_invoker.get_client( 'logs', region_name=self.aws_region, max_workers=MAX_WORKERS )
+        def _count_subscription_filters( log_group_name :str ) -> int:
+            paginator = logs_client.get_paginator('describe_subscription_filters')
+            return sum( len(page['subscriptionFilters']) for page in paginator.paginate( logGroupName=log_group_name ) )
+        top_log_groups = log_groups[ : self.top_n ]
+        with concurrent.futures.ThreadPoolExecutor( max_workers=MAX_WORKERS ) as executor:
+            subscription_counts = dict( zip(
+                [ lg['logGroupName'] for lg in top_log_groups ],
+                executor.map( _count_subscription_filters, [ lg['logGroupName'] for lg in top_log_groups ] ),
+            ))
+
+        rows = []
+        for lg in log_groups:
+            name = lg['logGroupName']
+            log_group_class = lg.get('logGroupClass', "STANDARD")
+            expected_class = get_loggrp_class( construct=None, tier=infer_tier(name) ).value
+            ingested_bytes = ingested.get( name, 0 )
+            num_subscriptions = subscription_counts.get( name )     ### None, if NOT looked-up
+            bytes_beyond_retention = estimate_bytes_beyond_retention( lg, self.retention_period_in_days, now_millis )
+            ### ONLY where `get_loggrp_class()` expects `INFREQUENT_ACCESS` (as of now, it returns STANDARD for every tier .. so, this is 0 everywhere).
+            ### `INFREQUENT_ACCESS` does NOT allow subscription-filters.  So, only if it has none (or, if NOT looked-up).
+            infreq_access_savings = ingested_bytes / GB * ( PRICE_PER_GB_INGESTED["STANDARD"] - PRICE_PER_GB_INGESTED["INFREQUENT_ACCESS"] ) \
+                                        if log_group_class == "STANDARD" and expected_class == "INFREQUENT_ACCESS" and not num_subscriptions else 0.0
+            flags = []
+            if lg.get('retentionInDays') is None: flags.append("NO-RETENTION")
+            if num_subscriptions == 0:            flags.append("NO-SUBSCRIPTION")
+            if log_group_class != expected_class: flags.append(f"CLASS!={expected_class}")
+            rows.append({
+                "logGroupName": name,
+                "storedBytes": lg.get('storedBytes', 0),
+                "ingestedBytes": ingested_bytes,
+                "retentionInDays": lg.get('retentionInDays'),
+                "logGroupClass": log_group_class,
+                "expectedLogGroupClass": expected_class,
+                "subscriptionFilters": num_subscriptions,
+                "monthlyStorageCost": lg.get('storedBytes', 0) / GB * PRICE_PER_GB_MONTH_STORED,
+                "monthlyRetentionSavings": bytes_beyond_retention / GB * PRICE_PER_GB_MONTH_STORED,
+                "monthlyInfrequentAccessSavings": infreq_access_savings * 30 / INGESTION_WINDOW_DAYS,
+                "flags": flags,
+            })
+
+        summary = {
+            "logGroupCount": len(rows),
+            "storedBytes": sum( r["storedBytes"] for r in rows ),
+            f"ingestedBytesLast{INGESTION_WINDOW_DAYS}Days": sum( r["ingestedBytes"] for r in rows ),
+            "noRetentionCount": sum( 1 for r in rows if r["retentionInDays"] is None ),
+            "noRetentionStoredBytes": sum( r["storedBytes"] for r in rows if r["retentionInDays"] is None ),
+            "storedBytesPerClass": { c: sum( r["storedBytes"] for r in rows if r["logGroupClass"] == c ) for c in sorted({ r["logGroupClass"] for r in rows }) },
+            "monthlyStorageCost": sum( r["monthlyStorageCost"] for r in rows ),
+            f"monthlyRetentionSavings(retention={self.retention_period_in_days}days)": sum( r["monthlyRetentionSavings"] for r in rows ),
+            "monthlyInfrequentAccessSavings": sum( r["monthlyInfrequentAccessSavings"] for r in rows ),
+        }
+
+        print('\n' + '-'*140)
+        print(f"{'storedBytes':>14} {'ingested/30d':>14} {'retention':>10} {'class':>10} {'subs':>5} {'$/month':>9} {'$ saved(ret)':>12} {'$ saved(IA)':>11}  log-group  [flags]")
+        for r in rows[ : self.top_n ]:
+            print(f"{r['storedBytes']:>14,} {r['ingestedBytes']:>14,} {str(r['retentionInDays'] or 'Never'):>10} {r['logGroupClass'][:10]:>10} "
+                  f"{'?' if r['subscriptionFilters'] is None else r['subscriptionFilters']:>5} {r['monthlyStorageCost']:>9.2f} "
+                  f"{r['monthlyRetentionSavings']:>12.2f} {r['monthlyInfrequentAccessSavings']:>11.2f}  {r['logGroupName']}  {' '.join(r['flags'])}")
+        print('-'*140)
+        for k, v in summary.items():
+            print(f"{k:>60} = {v:,.2f}" if isinstance(v, float) else f"{k:>60} = {v:,}" if isinstance(v, int) else f"{k:>60} = {v}")
+        print("NOTE: All $ are ESTIMATES at us-east-1 prices.  IA-savings are ONLY for log-groups whose expected class is INFREQUENT_ACCESS; they assume the SAME ingestion, and lose Live-Tail / metric-filters / subscription-filters.")
+
+        report = { "summary": summary, "logGroups": rows }
+        report_filepath = self.gen_name_of_json_outp_file( self.purpose, suffix="-storage-report" )
+        with atomic_write( report_filepath ) as f:
+            json.dump( report, f, indent=4 )
+        print(f"\nReport saved to: {report_filepath}")
+        return report
+
+### ==============================================================================================
 
 if __name__ == "__main__":
 
@@ -103,13 +427,34 @@ if __name__ == "__main__":
     # else:
     #     print("False")
 
-    if len(sys.argv) != 4:
-        print(f"Usage: python {sys.argv[0]} <AWSPROFILE> <AWSREGION> <CWLogGrpRetentionPeriodInDays>")
+    options = [ arg for arg in sys.argv[1:] if arg.startswith('--') ]
+    args    = [ arg for arg in sys.argv[1:] if not arg.startswith('--') ]
+    if len(args) != 3 or any( not ( o in [ '--dry-run', '--report' ] or o.startswith('--rules=') or re.match(r'^--top=\d+$', o) ) for o in options ):
+        print(f"Usage: python {sys.argv[0]} <AWSPROFILE> <AWSREGION> <CWLogGrpRetentionPeriodInDays>   [--dry-run]   [--rules=<JSON-file>]")
+        print(f"Usage: python {sys.argv[0]} <AWSPROFILE> <AWSREGION> <CWLogGrpRetentionPeriodInDays>   --report   [--top=N]")
+        print(f"EXAMPLE: python {sys.argv[0]} DEVINT us-east-1 30 --dry-run")
+        print(f"EXAMPLE: python {sys.argv[0]} DEVINT us-east-1 30 --report --top=100")
+        print(f"Default rules-file: {DEFAULT_RULES_FILEPATH}")
         sys.exit(1)
 
-    aws_profile = sys.argv[1]
-    aws_region = sys.argv[2]
-    retention_period_in_days = sys.argv[3]
+    aws_profile = args[0]
+    aws_region = args[1]
+    retention_period_in_days = args[2]
+    rules_filepath = next( ( pathlib.Path( o[ len('--rules='): ] ) for o in options if o.startswith('--rules=') ), DEFAULT_RULES_FILEPATH )
+
+    if '--report' in options:
+        scr = LogGrpStorageAnalyzer(
+            appl_name = constants.CDK_APP_NAME,
+            aws_profile = aws_profile,
+            aws_region = aws_region,
+            tier = "tier-N/A",
+            retention_period_in_days = retention_period_in_days,
+            purpose = THIS_SCRIPT_DATA,
+            top_n = next( ( int( o[ len('--top='): ] ) for o in options if o.startswith('--top=') ), DEFAULT_REPORT_TOP_N ),
+            debug = DEBUG,
+        )
+        scr.report()
+        sys.exit(0)
 
     scr = LogGrpRetentionSetter(
         appl_name = constants.CDK_APP_NAME,
@@ -118,6 +463,8 @@ if __name__ == "__main__":
         tier = "tier-N/A",
         retention_period_in_days = retention_period_in_days,
         purpose = THIS_SCRIPT_DATA,
+        rules_filepath = rules_filepath,
+        dry_run = '--dry-run' in options,
         debug = DEBUG,
     )
 
@@ -0,0 +1,277 @@
+### python-script that downloads ALL the log-events of one or more CW-LogGroups, within a time-range [START, END), into compressed NDJSON-files.
+### Replaces the single sequential `aws logs start-query` within ./CWLogs-InfreqAccess-download.sh (which is now just a wrapper around this script).
+###
+### The time-range is split into time-slices (`--slice=1h`), and each time-slice is fetched concurrently:
+###     STANDARD log-class -- the log-streams that overlap the time-slice are split into shards (of `STREAMS_PER_SHARD` log-streams each),
+###             and each shard is fetched via its own `filter_log_events` paginator.
+###     INFREQUENT_ACCESS log-class -- `filter_log_events` is NOT supported!  The ONLY way is Logs-Insights.
+###             So, ONE Logs-Insights query per time-slice.  If a query hits the max-rows of Logs-Insights, that time-slice is bisected & re-queried.
+### The time-slices are written -- IN ORDER -- as they complete (within a time-slice, the shards are merge-sorted by timestamp).
+### So, memory is bounded by the # of time-slices in flight, and NOT by the size of the log-group.
+###
+### Each output-file is "<LogGroupName>_<START>_<END>.ndjson.gz" (or ".ndjson.zst", if `--zstd`).
+###     1st line is a header { logGroupName, logGroupClass, start, end }.
+###     Every other line is ONE log-event { timestamp (millisecs since epoch), logStreamName, message }.
+###     To read it:   gzcat <file> | jq -r 'select(.timestamp) | "\(.timestamp)\t\(.message)"'
+###
+### Warning: `lastEventTimestamp` of a log-stream is updated by AWS on an "eventual consistency basis" (typically within an hour).
+###     So, log-streams are NOT skipped unless their `lastEventTimestamp` is older than START by more than `LAST_EVENT_TIMESTAMP_LAG_MS`.
+
+import sys
+import re
+import time
+import heapq
+import pathlib
+import datetime
+import zoneinfo
+import collections
+import concurrent.futures
+import threading
+from typing import Optional
+
+from backend.lambda_layer.bin.aws_api_invoker import ( InvokeAWSApi, MyException )
+from backend.lambda_layer.bin.aws_api_cache_store import ( NdjsonAppender, NDJSON_COMPRESSION_SUFFIXES )
+
+### ==============================================================================================
+
+AWS_REGION = "us-east-1"
+DEBUG = False
+
+### When NO START is provided: midnight (today) in this time-zone.  So, when working late beyond 7pm ET, we avoid the problem that UTC is already in "tomorrow".
+DEFAULT_START_TIMEZONE = "America/New_York"
+DEFAULT_SLICE = "1h"
+
+### How many shards/queries in flight.  The actual rate is throttled by the rate-limiter (See aws_api_rate_limiter.py)
+MAX_WORKERS = 16
+### How many time-slices (beyond the one being written) are fetched ahead.  Bounds the memory used.
+SLICES_IN_FLIGHT = 2 * MAX_WORKERS
+
+### `filter_log_events` accepts up to 100 `logStreamNames`
+STREAMS_PER_SHARD = 20
+### Max `limit` of `filter_log_events`
+FILTER_LOG_EVENTS_PAGE_SIZE = 10000
+LAST_EVENT_TIMESTAMP_LAG_MS = 60 * 60 * 1000
+
+### Logs-Insights returns at most 10,000 rows per query.  Account-wide, only a few queries can run concurrently.
+INSIGHTS_MAX_ROWS = 10000
+INSIGHTS_MAX_CONCURRENT_QUERIES = 10
+INSIGHTS_QUERY = f"fields @timestamp, @message, @logStream | sort @timestamp asc | limit {INSIGHTS_MAX_ROWS}"
+INSIGHTS_POLL_SECS_MIN = 0.5
+INSIGHTS_POLL_SECS_MAX = 5.0
+INSIGHTS_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+### ==============================================================================================
+
+""" 1st param is one of:  "now",  a relative time like "-6h" / "-90m" / "-2d" (see `InvokeAWSApi.cache_ttl_in_secs()`),  or an ISO-8601 timestamp (UTC, unless it has a time-zone).
+    Returns a time-zone-aware datetime.
+"""
+def parse_time_arg( arg :str, now :datetime.datetime ) -> datetime.datetime:
+    if arg.lower() == "now":
+        return now
+    if arg.startswith("-"):
+        return now - datetime.timedelta( seconds=InvokeAWSApi.cache_ttl_in_secs( arg[1:] ) )
+    try:
+        dt = datetime.datetime.fromisoformat( arg )
+    except ValueError:
+        raise MyException(f"!! ERROR !! Invalid timestamp '{arg}'.  Must be 'now', like '-6h', or ISO-8601 like '2024-07-09T05:00:00'")
+    return dt if dt.tzinfo else dt.replace( tzinfo=datetime.timezone.utc )
+
+def default_start_time( now :datetime.datetime ) -> datetime.datetime:
+    local_now = now.astimezone( zoneinfo.ZoneInfo( DEFAULT_START_TIMEZONE ) )
+    return local_now.replace( hour=0, minute=0, second=0, microsecond=0 )
+
+def to_millis( dt :datetime.datetime ) -> int:
+    return int( dt.timestamp() * 1000 )
+
+""" Splits [start_ms, end_ms) into consecutive half-open time-slices of `slice_ms` each (the last one could be shorter) """
+def time_slices( start_ms :int, end_ms :int, slice_ms :int ) -> list[tuple[int, int]]:
+    return [ ( s, min( s + slice_ms, end_ms ) ) for s in range( start_ms, end_ms, slice_ms ) ]
+
+def output_filepath( out_dir :pathlib.Path, log_group_name :str, start_ms :int, end_ms :int, compression :str ) -> pathlib.Path:
+    def _ts( ms :int ) -> str:
+        return datetime.datetime.fromtimestamp( ms / 1000, tz=datetime.timezone.utc ).strftime("%Y%m%dT%H%M%SZ")
+    sanitized = re.sub( r"[^A-Za-z0-9\.\-_]+", "_", log_group_name ).strip("_")
+    return out_dir / f"{sanitized}_{_ts(start_ms)}_{_ts(end_ms)}{NDJSON_COMPRESSION_SUFFIXES[compression]}"
+
+### ----------------------------------------------------------------------
+def get_log_group_class( logs_client, log_group_name :str ) -> str:
+    paginator = logs_client.get_paginator('describe_log_groups')
+    for page in paginator.paginate( logGroupNamePrefix=log_group_name ):
+        for grp in page['logGroups']:
+            if grp['logGroupName'] == log_group_name:
+                return grp.get('logGroupClass', "STANDARD")
+    raise MyException(f"!! ERROR !! Log-group '{log_group_name}' NOT found!")
+
+""" ALL the log-streams (of a STANDARD log-group) that could have log-events within [start_ms, end_ms).
+    Listed in descending order of `lastEventTimestamp`, so that the listing stops at the 1st log-stream that is entirely older than `start_ms`.
+"""
+def list_overlapping_log_streams( logs_client, log_group_name :str, start_ms :int, end_ms :int ) -> list[dict]:
+    streams = []
+    paginator = logs_client.get_paginator('describe_log_streams')
+    for page in paginator.paginate( logGroupName=log_group_name, orderBy='LastEventTime', descending=True ):
+        print("↓", end="", flush=True)
+        for stream in page['logStreams']:
+            if 'firstEventTimestamp' not in stream:
+                continue    ### empty log-stream
+            if stream.get('lastEventTimestamp', stream['firstEventTimestamp']) + LAST_EVENT_TIMESTAMP_LAG_MS < start_ms:
+                return streams
+            if stream['firstEventTimestamp'] < end_ms:
+                streams.append( stream )
+    return streams
+
+""" Shards of log-stream-names, for the time-slice [start_ms, end_ms) """
+def shards_for_slice( streams :list[dict], start_ms :int, end_ms :int ) -> list[list[str]]:
+    names = [ s['logStreamName'] for s in streams
+                if s['firstEventTimestamp'] < end_ms and s.get('lastEventTimestamp', s['firstEventTimestamp']) + LAST_EVENT_TIMESTAMP_LAG_MS >= start_ms ]
+    return [ names[i : i + STREAMS_PER_SHARD] for i in range( 0, len(names), STREAMS_PER_SHARD ) ]
+
+### ----------------------------------------------------------------------
+""" Returns the log-events (sorted by timestamp) of the log-streams (3rd param), within [start_ms, end_ms) """
+def fetch_shard( logs_client, log_group_name :str, log_stream_names :list[str], start_ms :int, end_ms :int ) -> list[dict]:
+    events = []
+    paginator = logs_client.get_paginator('filter_log_events')
+    for page in paginator.paginate( logGroupName=log_group_name, logStreamNames=log_stream_names,
+                                    startTime=start_ms, endTime=end_ms - 1,      ### `endTime` is inclusive
+                                    PaginationConfig={ 'PageSize': FILTER_LOG_EVENTS_PAGE_SIZE } ):
+        events.extend( { "timestamp": e['timestamp'], "logStreamName": e['logStreamName'], "message": e['message'] } for e in page['events'] )
+    events.sort( key=lambda e: e["timestamp"] )
+    return events
+
+""" Returns the log-events (sorted by timestamp) within [start_ms, end_ms), via Logs-Insights.
+    The ONLY way to read an INFREQUENT_ACCESS log-group.
+    If the query hits `INSIGHTS_MAX_ROWS`, the time-range is bisected, and each half re-queried.
+"""
+def fetch_via_insights( logs_client, insights_semaphore :threading.Semaphore, log_group_name :str, start_ms :int, end_ms :int ) -> list[dict]:
+    with insights_semaphore:
+        query_id = logs_client.start_query( logGroupName=log_group_name,
+                                            startTime=start_ms // 1000, endTime=(end_ms - 1) // 1000,   ### Secs (inclusive)
+                                            queryString=INSIGHTS_QUERY, limit=INSIGHTS_MAX_ROWS )['queryId']
+        poll_secs = INSIGHTS_POLL_SECS_MIN
+        while True:
+            response = logs_client.get_query_results( queryId=query_id )
+            if response['status'] == 'Complete':
+                break
+            if response['status'] not in [ 'Scheduled', 'Running' ]:
+                raise MyException(f"!! ERROR !! Logs-Insights query '{query_id}' (for '{log_group_name}') is '{response['status']}'")
+            time.sleep( poll_secs )
+            poll_secs = min( poll_secs * 2, INSIGHTS_POLL_SECS_MAX )
+
+    rows = response['results']
+    mid_ms = ( (start_ms + end_ms) // 2 ) // 1000 * 1000     ### Logs-Insights' time-range is in secs.
+    if len(rows) >= INSIGHTS_MAX_ROWS:
+        if start_ms < mid_ms < end_ms:
+            if DEBUG: print(f"\n⟳ bisecting [{start_ms}, {end_ms}) of '{log_group_name}' ..")
+            return fetch_via_insights( logs_client, insights_semaphore, log_group_name, start_ms, mid_ms ) \
+                 + fetch_via_insights( logs_client, insights_semaphore, log_group_name, mid_ms, end_ms )
+        print(f"\n⚠️  WARNING: more than {INSIGHTS_MAX_ROWS} log-events within the SAME second {start_ms // 1000} of '{log_group_name}' .. some are MISSING!")
+
+    events = []
+    for row in rows:
+        fields = { f['field']: f['value'] for f in row }
+        ts = datetime.datetime.strptime( fields['@timestamp'], INSIGHTS_TIMESTAMP_FORMAT ).replace( tzinfo=datetime.timezone.utc )
+        ts_ms = to_millis( ts )
+        if start_ms <= ts_ms < end_ms:
+            events.append({ "timestamp": ts_ms, "logStreamName": fields.get('@logStream'), "message": fields.get('@message') })
+    events.sort( key=lambda e: e["timestamp"] )
+    return events
+
+### ----------------------------------------------------------------------
+""" Downloads [start_ms, end_ms) of ONE log-group into `out_filepath`.   Returns the # of log-events written. """
+def download_log_group(
+    awsapi_invoker :InvokeAWSApi,
+    log_group_name :str,
+    start_ms :int,
+    end_ms :int,
+    slice_ms :int,
+    out_filepath :pathlib.Path,
+    compression :str,
+    force_insights :bool = False,
+) -> int:
+    logs_client = awsapi_invoker.get_client( 'logs', region_name=AWS_REGION, max_workers=MAX_WORKERS )
+    log_group_class = get_log_group_class( logs_client, log_group_name )
+    use_insights = force_insights or log_group_class == "INFREQUENT_ACCESS"
+    print(f"\n'{log_group_name}' is {log_group_class} .. via {'Logs-Insights' if use_insights else 'filter_log_events'}")
+
+    slices = time_slices( start_ms, end_ms, slice_ms )
+    insights_semaphore = threading.Semaphore( INSIGHTS_MAX_CONCURRENT_QUERIES )
+    streams = [] if use_insights else list_overlapping_log_streams( logs_client, log_group_name, start_ms, end_ms )
+    if not use_insights:
+        print(f"\n{len(streams)} log-streams overlap the time-range, split into {len(slices)} time-slices")
+
+    header = { "logGroupName": log_group_name, "logGroupClass": log_group_class, "start": start_ms, "end": end_ms }
+    with concurrent.futures.ThreadPoolExecutor( max_workers=MAX_WORKERS ) as executor, \
+         NdjsonAppender( out_filepath, header=header, compression=compression ) as out:
+
+        def _submit( slice_start :int, slice_end :int ) -> list[concurrent.futures.Future]:
+            if use_insights:
+                return [ executor.submit( fetch_via_insights, logs_client, insights_semaphore, log_group_name, slice_start, slice_end ) ]
+            return [ executor.submit( fetch_shard, logs_client, log_group_name, shard, slice_start, slice_end )
+                        for shard in shards_for_slice( streams, slice_start, slice_end ) ]
+
+        remaining = collections.deque( slices )
+        in_flight :collections.deque[list[concurrent.futures.Future]] = collections.deque()
+        while remaining or in_flight:
+            while remaining and len(in_flight) < SLICES_IN_FLIGHT:
+                in_flight.append( _submit( *remaining.popleft() ) )
+            shard_futures = in_flight.popleft()
+            ### Within a time-slice, each shard is already sorted. So, a k-way merge.
+            out.append( list( heapq.merge( *[ f.result() for f in shard_futures ], key=lambda e: e["timestamp"] ) ) )
+            print("⏩", end="", flush=True)
+
+        out.commit()
+    return out.item_count
+
+### ----------------------------------------------------------------------
+def main():
+
+    args = [ a for a in sys.argv[1:] if not a.startswith("--") ]
+    opts = { a.split("=", 1)[0].lower(): ( a.split("=", 1)[1] if "=" in a else True ) for a in sys.argv[1:] if a.startswith("--") }
+
+    if len(args) < 2:
+        print(f"Usage:  python3 {sys.argv[0]}    <AWSPROFILE>  <LogGroupName> [<LogGroupName> ..]  [START [END]]  [--slice=1h] [--out=DIR] [--zstd] [--insights] [--debug]")
+        print(f"        START & END are:  'now',  relative like '-6h',  or ISO-8601 like '2024-07-09T05:00:00' (UTC, unless it has a time-zone).")
+        print(f"        Default START is midnight today ({DEFAULT_START_TIMEZONE}).  Default END is 'now'.")
+        print(f"EXAMPLE: python3 {sys.argv[0]}     DEVINT   '/aws/codebuild/FACT-backend-pipeline-uat-FACT-backend-uat_Appln_CDKSynthDeploy'")
+        print(f"EXAMPLE: python3 {sys.argv[0]}     DEVINT   '/aws/lambda/FACT-backend-dev-Stateless-apireportLambda'   -6h  now   --slice=5m  --out=/tmp/logs")
+        sys.exit(1)
+
+    global DEBUG
+    DEBUG = bool( opts.get("--debug") )
+
+    aws_profile = args[0]
+    ### Trailing args that are timestamps (NOT log-group-names) are START and END.
+    def _is_time_arg( a :str ) -> bool:
+        return a.lower() == "now" or a.startswith("-") or bool( re.match( r"^\d{4}-\d{2}-\d{2}", a ) )
+    time_args = []
+    log_group_names = args[1:]
+    while log_group_names and _is_time_arg( log_group_names[-1] ) and len(time_args) < 2:
+        time_args.insert( 0, log_group_names.pop() )
+    if not log_group_names:
+        print("!! ERROR !! No LogGroupName provided !!"); sys.exit(2)
+
+    now = datetime.datetime.now( tz=datetime.timezone.utc )
+    start = parse_time_arg( time_args[0], now ) if len(time_args) >= 1 else default_start_time( now )
+    end   = parse_time_arg( time_args[1], now ) if len(time_args) >= 2 else now
+    start_ms, end_ms = to_millis( start ), to_millis( end )
+    if start_ms >= end_ms:
+        print(f"!! ERROR !! START ({start.isoformat()}) must be BEFORE END ({end.isoformat()})"); sys.exit(3)
+    slice_ms = int( InvokeAWSApi.cache_ttl_in_secs( opts.get("--slice", DEFAULT_SLICE) ) * 1000 )
+    out_dir = pathlib.Path( opts.get("--out", ".") )
+    out_dir.mkdir( parents=True, exist_ok=True )
+    compression = "zstd" if opts.get("--zstd") else "gzip"
+
+    print(f"START = {start.isoformat()}   END = {end.isoformat()}   ({start_ms} .. {end_ms})")
+
+    awsapi_invoker = InvokeAWSApi( aws_profile=aws_profile, aws_region=AWS_REGION, debug=DEBUG )
+    for log_group_name in log_group_names:
+        t0 = time.time()
+        out_filepath = output_filepath( out_dir, log_group_name, start_ms, end_ms, compression )
+        num_events = download_log_group( awsapi_invoker, log_group_name, start_ms, end_ms, slice_ms, out_filepath, compression,
+                                         force_insights=bool( opts.get("--insights") ) )
+        print(f"\n✅ {num_events:,} log-events in {time.time() - t0:.1f} secs -->  {out_filepath}")
+
+### ----------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
+
+### EoScript
@@ -1,9 +1,15 @@
 ### HOW-TO:
 ###     AWS_PROFILE={DEVINT | UAT | PROD}
 ###     Applications/FACTrial-CRRI/delete-ECRRepo-Images-Not-In-Use.py     ${AWS_PROFILE}"
+###     Applications/FACTrial-CRRI/delete-ECRRepo-Images-Not-In-Use.py     ${AWS_PROFILE}"   --all-cdk-repos
+###     Applications/FACTrial-CRRI/delete-ECRRepo-Images-Not-In-Use.py     ${AWS_PROFILE}"   --all-cdk-repos   --execute
+###
+### By default, this is a DRY-RUN: it ONLY writes the JSON plan-file (what WOULD be deleted, and the bytes reclaimed).
+### `--execute` actually deletes those images (after a final confirmation), and writes the same JSON-file with the results.
+### `--all-cdk-repos` covers EVERY `cdk-*-container-assets-*` ECR-repo in the account (instead of just the default CDK-bootstrap's repo).
 ###
 ### This is a utilityto retrieve information about Lambda functions and ECR repositories, as well as to check if a Lambda function is using an ECR image.
-### Finally, it lists ALL the ECR-images -NOT- in use by any Lambda.
+### Finally, it lists ALL the ECR-images -NOT- in use by any Lambda, and how many bytes deleting them would reclaim.
 ### Warning: The image may be in use by ECS, or other AWS-Services.
 ###
 ### This Python code is designed to interact with AWS services, specifically AWS Lambda and Amazon Elastic Container Registry (ECR), using the Boto3 library. Here's a summary of the code: [1]
@@ -12,18 +18,40 @@
 ###
 ### The `get_all_lambdas()` function retrieves a list of all Lambda functions and their details from the AWS account, using pagination to ensure all functions are obtained.
 ###
-### The `get_all_images_in()` function retrieves a list of all images in a specified ECR repository. It includes a sample response object for reference.
+### The `get_all_images_in()` function retrieves a list of ALL images in a specified ECR repository, across ALL pages of `describe_images`.
+###
+### The `EcrImageIndex` class is an in-memory index of those images, keyed by BOTH image-tag and image-digest.
+###           So, whether a Lambda's image-URI is `repo:tag` (`ImageUri`) or `repo@sha256:digest` (`ResolvedImageUri`), finding the image is a dict-lookup.
 ###
-### The `check_if_func_uses_ECR_image()` function checks if a given Lambda function uses an ECR image. If it does, it prints the full details of the function configuration. The function returns the full URL to the ECR image if the Lambda function uses one, or None otherwise.
+### The `check_if_func_uses_ECR_image()` function checks if a given Lambda function (version) uses an ECR image. If it does, it prints the full details of the function configuration. The function returns ( ECR-repo-name, image-digest ) if the Lambda function uses one, or None otherwise.
 ###           It includes a sample response object for a Lambda function using an ECR image and another sample response for a non-ECR Lambda function. [2]
+###
+### The `get_all_images_used_by_func()` function does the same for `$LATEST` AND every published version of a Lambda (plus its aliases, which point to those versions).
+###           Older versions still PIN their image, so those images are NOT deletable.
+###           It is invoked ONLY for `PackageType == 'Image'` Lambdas (zip-packaged Lambdas can NOT reference ECR), concurrently across Lambdas.
+###
+### The `add_child_manifests_in_use()` function adds the child-manifests (per-platform images, attestations) of every in-use image-index / manifest-list.
+###           Those children are UNTAGGED, and NO Lambda references them directly .. but deleting them BREAKS the (still deployed) image.
+###
+### The `print_reclaimable_report()` function prints the images NOT in use (largest 1st), with the total reclaimable bytes (as per `imageSizeInBytes`).
+###
+### The `plan_deletions()` + `execute_deletion_plan()` functions group those unused images into `batch_delete_image` calls (upto 100 images each),
+###           which are invoked concurrently across ALL the batches of ALL the ECR-repos (throttled by `awsapi_invoker.get_client()`'s rate-limiter).
 
 
 
 import sys
 import boto3
-import datetime
-import tzlocal
 import json
+import re
+import datetime
+import pathlib
+import threading
+import concurrent.futures
+from typing import Optional, Callable
+
+from backend.lambda_layer.bin.aws_api_invoker import ( InvokeAWSApi )
+from backend.lambda_layer.bin.aws_api_cache_store import ( atomic_write )
 
 ### ----------------------------------------------------------------------
 
@@ -34,6 +62,22 @@ AWS_REGION     = "us-east-1"
 
 CDK_REPO_UUID_PREFIX = "hnb659fds"
 
+### Matches EVERY CDK-bootstrap's container-assets ECR-repo (whatever its qualifier), like `cdk-hnb659fds-container-assets-123456789012-us-east-1`
+CDK_CONTAINER_ASSETS_REPO_REGEX = re.compile( r"^cdk-[a-z0-9]+-container-assets-\d{12}-[a-z0-9-]+$" )
+
+### Max image-IDs allowed per `ecr_client.batch_delete_image()` and `ecr_client.batch_get_image()`
+BATCH_DELETE_IMAGE_MAX_IDS = 100
+BATCH_GET_IMAGE_MAX_IDS = 100
+
+### An image with either of these `imageManifestMediaType` is a LIST of child-manifests (multi-arch images, and buildx's attestation-manifests)
+MANIFEST_LIST_MEDIA_TYPES = [
+    "application/vnd.oci.image.index.v1+json",
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+]
+
+### How many Lambdas (or ECR-deletion batches) to process concurrently.  The AWS-API calls are throttled (with adaptive-retries) by `awsapi_invoker.get_client()`
+MAX_WORKERS = 16
+
 def get_DEFAULT_ECR_REPOSITORY_NAME(
     cdk_repo_uuid_prefix :str,
     aws_account_id :str = None,
@@ -42,8 +86,12 @@ def get_DEFAULT_ECR_REPOSITORY_NAME(
     return f"cdk-{cdk_repo_uuid_prefix}-container-assets-{acct}-us-east-1"
 
 ### ----------------------------------------------------------------------
-
-ECR_REPO_DETAILS_CACHE = {}
+def human_readable_bytes( num_bytes :int ) -> str:
+    for unit in [ "B", "KiB", "MiB", "GiB" ]:
+        if abs(num_bytes) < 1024:
+            return f"{num_bytes:,.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:,.1f} TiB"
 
 ### ----------------------------------------------------------------------
 def get_all_lambdas(lambda_client, DEBUG :bool) -> list:
@@ -81,60 +129,114 @@ def get_all_lambdas(lambda_client, DEBUG :bool) -> list:
     return functions
 
 ### ----------------------------------------------------------------------
-def get_all_images_in( ecr_client, ecr_repository_name :str, DEBUG :bool ) -> list:
-    all_images = ecr_client.describe_images(repositoryName=ecr_repository_name)
-    sample_response = {
-        "repositories": [
-            {
-                "repositoryArn": "arn:aws:ecr:us-east-1:123456789012:repository/cdk-cdkUUIDcdk-container-assets-123456789012-us-east-1",
-                "registryId": "123456789012",
-                "repositoryName": "cdk-cdkUUIDcdk-container-assets-123456789012-us-east-1",
-                "repositoryUri": "123456789012.dkr.ecr.us-east-1.amazonaws.com/cdk-cdkUUIDcdk-container-assets-123456789012-us-east-1",
-                "createdAt": datetime.datetime(2024, 2, 1, 15, 0, 8, 782000, tzinfo=tzlocal.get_localzone()),
-                "imageTagMutability": "IMMUTABLE",
-                "imageScanningConfiguration": { "scanOnPush": False },
-                "encryptionConfiguration": { "encryptionType": "AES256" }
-            },
-            # ...
-            # ...
-            # ...
-            # ...
-        ],  ### repositories
-        "ResponseMetadata": {
-            "RequestId": "c59f559a-02cd-4a30-84c5-4d9e763f1a12",
-            "HTTPStatusCode": 200,
-            "HTTPHeaders": {
-                "x-amzn-requestid": "c59f559a-02cd-4a30-84c5-4d9e763f1a12",
-                "date": "Wed, 17 Jul 2024 21:39:02 GMT",
-                "content-type": "application/x-amz-json-1.1",
-                "content-length": "522",
-                "connection": "keep-alive"
-            },
-            "RetryAttempts": 0
-        } ### ResponseMetaData
+def get_all_images_in( ecr_client, ecr_repository_name :str, DEBUG :bool ) -> list[dict]:
+    """
+    ALL the images within the ECR-repo (the `imageDetails` of EVERY page of `describe_images`).
+    Without pagination, only the 1st 100 images are returned .. and the rest are silently ignored!
+    """
+    sample_image_detail = {
+        "registryId": "123456789012",
+        "repositoryName": "cdk-cdkUUIDcdk-container-assets-123456789012-us-east-1",
+        "imageDigest": "sha256:53019dbc2657d8e6dc4741c901b49d29db8c8e7c4b827c3fd652fc96554e3b2d",
+        "imageTags": [
+            "fb7d886887e5ea473cf2fed3e8d141babec4efc42d5089f15ebcf11884405839"
+        ],
+        "imageSizeInBytes": 471725494,
+        "imagePushedAt": "2024-07-09T20:35:10-04:00",
+        "imageManifestMediaType": "application/vnd.docker.distribution.manifest.v2+json",
+        "artifactMediaType": "application/vnd.docker.container.image.v1+json",
+        "lastRecordedPullTime": "2024-07-09T20:35:15.496000-04:00"
     }
+    all_images = []
+    paginator = ecr_client.get_paginator('describe_images')
+    for page in paginator.paginate( repositoryName=ecr_repository_name, PaginationConfig={ 'PageSize': 1000 } ):  ### 1000 is the max allowed by describe_images
+        all_images.extend( page['imageDetails'] )
+        print("↓", end="", flush=True)
     if DEBUG:
         print('-'*80);print(f"all_images=")
         ## WARNING: TypeError: Object of type datetime is not JSON serializable
         print(json.dumps(all_images, indent=4, default=str))
-        # print(json.dumps(all_images, indent=4))
-        # json_response = json.loads(response['Payload'].read().decode('utf-8'))
-        # print('-'*80);print(json.dumps(json_response, indent=4));print('-'*80)
     return all_images
 
+### ----------------------------------------------------------------------
+def parse_image_uri( image_uri :str ) -> tuple[str, str]:
+    """
+    1st param is either `<registry>/<repo>:<tag>` (Lambda's `ImageUri`) or `<registry>/<repo>@sha256:<digest>` (Lambda's `ResolvedImageUri`).
+    Returns ( ECR-repo-name, tag-or-digest )
+    """
+    repo_and_ref = image_uri.split('/', 1)[1]
+    if '@' in repo_and_ref:
+        return tuple( repo_and_ref.split('@', 1) )
+    ecr_repository_name, _, tag = repo_and_ref.rpartition(':')
+    return ecr_repository_name, tag
+
+class EcrImageIndex():
+    """
+    In-memory index over the image-inventory of one or more ECR-repos.
+    Every image is keyed by its digest, AND by each of its tags.  So, every lookup is a dict-lookup (instead of a scan of every image's `imageTags`).
+    """
+
+    def __init__(self) -> None:
+        ### ECR-repo-name -> ALL its images (a.k.a. the `imageDetails` of `describe_images`)
+        self.images_by_repo :dict[str, list[dict]] = {}
+        ### ( ECR-repo-name, image-digest ) -> imageDetail
+        self.images_by_digest :dict[tuple[str, str], dict] = {}
+        ### ( ECR-repo-name, image-tag ) -> image-digest
+        self.digests_by_tag :dict[tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+
+    def ensure_repo(self, ecr_repository_name :str, load_images :Callable[[], list[dict]]) -> None:
+        """ Thread-safe.  Indexes the ECR-repo ONLY the 1st time it's seen (via the 2nd param, which returns ALL its images). """
+        with self._lock:
+            if not self.has_repo( ecr_repository_name ):
+                self.add_repo( ecr_repository_name, load_images() )
+
+    def add_repo(self, ecr_repository_name :str, images :list[dict]) -> None:
+        self.images_by_repo[ecr_repository_name] = images
+        for img in images:
+            self.images_by_digest[ (ecr_repository_name, img['imageDigest']) ] = img
+            for tag in img.get('imageTags') or []:   ### untagged images have NO 'imageTags'
+                self.digests_by_tag[ (ecr_repository_name, tag) ] = img['imageDigest']
+
+    def has_repo(self, ecr_repository_name :str) -> bool:
+        return ecr_repository_name in self.images_by_repo
+
+    def resolve(self, image_uri :str) -> Optional[tuple[str, str]]:
+        """
+        1st param is either a Lambda's `ImageUri` (by tag) or its `ResolvedImageUri` (by digest).
+        Returns ( ECR-repo-name, image-digest ), or None if that image is NOT in the index.
+        """
+        ecr_repository_name, tag_or_digest = parse_image_uri( image_uri )
+        if tag_or_digest.startswith('sha256:'):
+            key = ( ecr_repository_name, tag_or_digest )
+            return key if key in self.images_by_digest else None
+        digest = self.digests_by_tag.get( (ecr_repository_name, tag_or_digest) )
+        return ( ecr_repository_name, digest ) if digest else None
+
+    def get_image(self, key :tuple[str, str]) -> Optional[dict]:
+        """ 1st param is ( ECR-repo-name, image-digest ) """
+        return self.images_by_digest.get( key )
+
+    def unused_images(self, ecr_repository_name :str, images_in_use :set[tuple[str, str]]) -> list[dict]:
+        """ 2nd param is a set of ( ECR-repo-name, image-digest ).  Returns the images of the ECR-repo that are NOT in that set. """
+        return [ img for img in self.images_by_repo.get( ecr_repository_name, [] )
+                    if (ecr_repository_name, img['imageDigest']) not in images_in_use ]
+
 ### ----------------------------------------------------------------------
 def check_if_func_uses_ECR_image(
         lambda_client,
         ecr_client,
+        image_index :EcrImageIndex,
         function_name,
-        DEBUG :bool) -> str:
+        DEBUG :bool,
+        qualifier :str = "$LATEST") -> Optional[tuple[str, str]]:
     """
-    Check if the Lambda function uses an ECR image.
+    Check if the Lambda function (its version, per the OPTIONAL param `qualifier`) uses an ECR image.
     If YES .. print full details.
-    Returns the FULL URL to image, or None.
+    Returns ( ECR-repo-name, image-digest ), or None.
     """
     # Get the function configuration
-    function_config = lambda_client.get_function(FunctionName=function_name)
+    function_config = lambda_client.get_function(FunctionName=function_name, Qualifier=qualifier)
     if DEBUG:
         print('-'*80);print(f"(boto3-get) function's details=")
         print(json.dumps(function_config, indent=4))
@@ -272,69 +374,41 @@ def check_if_func_uses_ECR_image(
             if DEBUG:
                 RepositoryType=func_code_details['RepositoryType']
                 print(f"RepositoryType='{json.dumps(RepositoryType, indent=4)}'")
-            if 'ImageUri' in func_code_details:
-                image_uri = func_code_details['ImageUri']
-            else:
+            ### `ResolvedImageUri` pins the image by its DIGEST.  `ImageUri` is by TAG (and that tag could have been re-pointed since).
+            image_uri = func_code_details.get('ResolvedImageUri') or func_code_details.get('ImageUri')
+            if not image_uri:
                 if DEBUG:
                     print(f"Function '{function_name}' does --NOT-- have ImageUri !!")
                     print("function_config=")
                     print(json.dumps(function_config, indent=4))
                     print(f"func_code_details=")
                     print(json.dumps(func_code_details, indent=4))
-                return
+                return None
 
-            # Parse the ECR repository URI from the image URI
-            ecr_repository_uri = image_uri.split('/')[1]
-            if DEBUG: print(f"ecr_repository_uri='{ecr_repository_uri}'")
-            ecr_repository_name = ecr_repository_uri.split(':')[0]
+            # Parse the ECR repository name from the image URI
+            ecr_repository_name, ecr_repository_image_id = parse_image_uri( image_uri )
             if DEBUG: print(f"ecr_repository_name='{ecr_repository_name}'")
-            ecr_repository_image_id = ecr_repository_uri.split(':')[1]
             if DEBUG: print(f"ecr_repository_image_id='{ecr_repository_image_id}'")
 
-            # Check if the ECR repository exists
+            # Check if the ECR repository exists .. and index ALL its images, the 1st time it's seen.
             try:
-                if ecr_repository_name != get_DEFAULT_ECR_REPOSITORY_NAME(CDK_REPO_UUID_PREFIX):
-                    all_images = get_all_images_in(ecr_client=ecr_client, ecr_repository_name=ecr_repository_name, DEBUG=DEBUG)
-                else:
-                    all_images = ECR_REPO_DETAILS_CACHE[get_DEFAULT_ECR_REPOSITORY_NAME(CDK_REPO_UUID_PREFIX)]
-                for img in all_images['imageDetails']:
-                    if DEBUG: print(f"img='{img}'")
-                    sample_value = {
-                        "imageDetails": [
-                            {
-                                "registryId": "123456789012",
-                                "repositoryName": "cdk-cdkUUIDcdk-container-assets-123456789012-us-east-1",
-                                "imageDigest": "sha256:53019dbc2657d8e6dc4741c901b49d29db8c8e7c4b827c3fd652fc96554e3b2d",
-                                "imageTags": [
-                                    "fb7d886887e5ea473cf2fed3e8d141babec4efc42d5089f15ebcf11884405839"
-                                ],
-                                "imageSizeInBytes": 471725494,
-                                "imagePushedAt": "2024-07-09T20:35:10-04:00",
-                                "imageManifestMediaType": "application/vnd.docker.distribution.manifest.v2+json",
-                                "artifactMediaType": "application/vnd.docker.container.image.v1+json",
-                                "lastRecordedPullTime": "2024-07-09T20:35:15.496000-04:00"
-                            },
-                            # ..
-                            # ..
-                            # ..
-                            # ..
-                        ]
-                    }
-                    if ecr_repository_image_id in img['imageTags']:
-                        print(f"\n🛑🛑🛑 Function '{function_name}' uses container image:\n\t{ecr_repository_image_id}\nfrom ECR repository\n\t{ecr_repository_name}\nFull URL =\n\t{image_uri}")
-                        print(img); print("\n")
-                        if DEBUG: print(f"ImageTags='{img['imageTags']}'")
-                        return image_uri
+                image_index.ensure_repo( ecr_repository_name, lambda: get_all_images_in(ecr_client=ecr_client, ecr_repository_name=ecr_repository_name, DEBUG=DEBUG) )
             except ecr_client.exceptions.RepositoryNotFoundException as e2:
-                if DEBUG: print(f"Function '{function_name}' uses a container image, but the ECR repository '{ecr_repository_uri}' does not exist or you don't have access to it.")
+                if DEBUG: print(f"Function '{function_name}' uses a container image, but the ECR repository '{ecr_repository_name}' does not exist or you don't have access to it.")
                 if DEBUG:
                     ANS = input("To abort.. Press Enter to continue...")
                     if not ANS:
                         raise e2
                     else:
                         print("\nContinuing .. ..\n")
-                else:
-                    return None
+                return None
+
+            image_key = image_index.resolve( image_uri )
+            if image_key:
+                print(f"\n🛑🛑🛑 Function '{function_name}:{qualifier}' uses container image:\n\t{ecr_repository_image_id}\nfrom ECR repository\n\t{ecr_repository_name}\nFull URL =\n\t{image_uri}")
+                print(image_index.get_image( image_key )); print("\n")
+                return image_key
+            if DEBUG: print(f"Function '{function_name}' uses a container image '{image_uri}' that is --NOT-- within ECR repository '{ecr_repository_name}'")
         else:
             if DEBUG: print(f"Function '{function_name}' does --NOT-- use a container image.✅")
     except Exception as e:
@@ -346,107 +420,298 @@ def check_if_func_uses_ECR_image(
 
     return None
 
+### ----------------------------------------------------------------------
+def get_all_images_used_by_func(
+        lambda_client,
+        ecr_client,
+        image_index :EcrImageIndex,
+        function_name,
+        DEBUG :bool) -> dict[str, tuple[str, str]]:
+    """
+    Checks `$LATEST` and EVERY published version of the Lambda function.
+    Returns { qualifier: ( ECR-repo-name, image-digest ) } .. where qualifier is a version (like "$LATEST" or "3") or an alias (like "live").
+    Aliases do NOT need any additional `get_function()`; they simply point to (upto 2) published versions.
+    """
+    versions = []
+    for page in lambda_client.get_paginator('list_versions_by_function').paginate( FunctionName=function_name ):
+        versions.extend( v['Version'] for v in page['Versions'] )   ### includes "$LATEST"
+    images_used = {}
+    for version in versions:
+        image_key = check_if_func_uses_ECR_image(lambda_client=lambda_client, ecr_client=ecr_client, image_index=image_index, function_name=function_name, qualifier=version, DEBUG=DEBUG)
+        if image_key:
+            images_used[version] = image_key
+
+    for page in lambda_client.get_paginator('list_aliases').paginate( FunctionName=function_name ):
+        for alias in page['Aliases']:
+            ### A weighted-alias routes traffic to a 2nd version too.
+            alias_versions = [ alias['FunctionVersion'] ] + list( alias.get('RoutingConfig', {}).get('AdditionalVersionWeights', {}).keys() )
+            for version in alias_versions:
+                if version in images_used:
+                    if DEBUG: print(f"Alias '{function_name}:{alias['Name']}' -> version '{version}' uses {images_used[version]}")
+                    images_used.setdefault( alias['Name'], images_used[version] )
+    return images_used
+
+### ----------------------------------------------------------------------
+def add_child_manifests_in_use(
+        ecr_client,
+        image_index :EcrImageIndex,
+        images_in_use :set[tuple[str, str]],
+        DEBUG :bool) -> int:
+    """
+    For every image in the 3rd param (a set of ( ECR-repo-name, image-digest )) that is an image-index / manifest-list,
+    fetches its manifest (via `batch_get_image`) and adds EVERY `manifests[].digest` to the 3rd param .. repeatedly, as a child could be an index too.
+    Returns the # of child-manifests added.
+    Aborts (sys.exit) if ANY manifest can NOT be fetched, as its children would otherwise be planned for deletion.
+    """
+    added = 0
+    pending = set( images_in_use )
+    checked :set[tuple[str, str]] = set()
+    while pending:
+        by_repo :dict[str, list[str]] = {}
+        for key in pending:
+            img = image_index.get_image( key )
+            if key not in checked and img and img.get('imageManifestMediaType') in MANIFEST_LIST_MEDIA_TYPES:
+                by_repo.setdefault( key[0], [] ).append( key[1] )
+        checked |= pending
+        pending = set()
+        for ecr_repository_name, digests in by_repo.items():
+            for k in range( 0, len(digests), BATCH_GET_IMAGE_MAX_IDS ):
+                response = ecr_client.batch_get_image(
+                    repositoryName = ecr_repository_name,
+                    imageIds = [ { 'imageDigest': digest } for digest in digests[ k : k + BATCH_GET_IMAGE_MAX_IDS ] ],
+                    acceptedMediaTypes = MANIFEST_LIST_MEDIA_TYPES,
+                )
+                if response.get('failures'):
+                    print(f"!! ERROR !! Could NOT fetch the manifests of in-use image-indexes within ECR-repo '{ecr_repository_name}': {response['failures']}")
+                    print("Aborting .. as their child-manifests would otherwise be deleted!")
+                    sys.exit(71)
+                for image in response.get('images', []):
+                    for child in json.loads( image['imageManifest'] ).get('manifests', []):
+                        child_key = ( ecr_repository_name, child['digest'] )
+                        if child_key not in images_in_use:
+                            if DEBUG: print(f"Image-index {image['imageId']['imageDigest']} within '{ecr_repository_name}' -> child-manifest {child['digest']}")
+                            images_in_use.add( child_key )
+                            pending.add( child_key )
+                            added += 1
+                print("↓", end="", flush=True)
+    return added
+
+### ----------------------------------------------------------------------
+def print_reclaimable_report(
+        image_index :EcrImageIndex,
+        ecr_repository_name :str,
+        images_in_use :set[tuple[str, str]],
+        DEBUG :bool) -> int:
+    """
+    Prints the images of the ECR-repo that are NOT in use (largest 1st), each with the CLI-command to delete it.
+    Returns the total reclaimable bytes.
+    Note: `imageSizeInBytes` counts ALL the layers of an image, but ECR stores a layer shared by multiple images ONLY once.
+          So, the storage actually reclaimed could be LESS than this total.
+    """
+    all_images = image_index.images_by_repo.get( ecr_repository_name, [] )
+    unused_images = sorted( image_index.unused_images( ecr_repository_name, images_in_use ), key=lambda img: img.get('imageSizeInBytes', 0), reverse=True )
+    in_use_bytes      = sum( ( image_index.get_image(key) or {} ).get('imageSizeInBytes', 0) for key in images_in_use if key[0] == ecr_repository_name )
+    reclaimable_bytes = sum( img.get('imageSizeInBytes', 0) for img in unused_images )
+
+    for img in unused_images:
+        if DEBUG: print(f"img='{img}'")
+        tags = ",".join( img.get('imageTags') or [] ) or "<untagged>"
+        print(f"# {human_readable_bytes(img.get('imageSizeInBytes', 0)):>12}  pushed {img.get('imagePushedAt')}  tags={tags}")
+        print(f"aws ecr batch-delete-image --repository-name {ecr_repository_name} --image-ids imageDigest={img['imageDigest']}" + " --profile ${AWSPROFILE} --region ${AWSREGION}")
+
+    print('-'*80)
+    print(f"# ✅ IN USE!!! {len(all_images) - len(unused_images)} container images ({human_readable_bytes(in_use_bytes)}) within ECR repository = '{ecr_repository_name}'")
+    print(f"# 🗑️  NOT in use: {len(unused_images)} of {len(all_images)} container images .. reclaimable = {human_readable_bytes(reclaimable_bytes)} ({reclaimable_bytes:,} bytes)")
+    return reclaimable_bytes
+
+### ----------------------------------------------------------------------
+def get_all_cdk_container_asset_repos( ecr_client, DEBUG :bool ) -> list[str]:
+    """ Names of EVERY `cdk-*-container-assets-*` ECR-repo in this AWS-account & region """
+    repo_names = []
+    for page in ecr_client.get_paginator('describe_repositories').paginate():
+        repo_names.extend( r['repositoryName'] for r in page['repositories'] if CDK_CONTAINER_ASSETS_REPO_REGEX.match( r['repositoryName'] ) )
+    if DEBUG: print(f"cdk-container-assets repos = {repo_names}")
+    return repo_names
+
+### ----------------------------------------------------------------------
+def plan_deletions(
+        image_index :EcrImageIndex,
+        ecr_repository_names :list[str],
+        images_in_use :set[tuple[str, str]]) -> dict:
+    """
+    Returns the (JSON-serializable) plan:
+        { "repositories": { ECR-repo-name: { "images": [ {imageDigest, imageTags, imageSizeInBytes, imagePushedAt}, .. ], "reclaimableBytes": .. } },
+          "imageCount": .., "reclaimableBytes": .. }
+    """
+    plan = { "repositories": {}, "imageCount": 0, "reclaimableBytes": 0 }
+    for ecr_repository_name in ecr_repository_names:
+        unused_images = image_index.unused_images( ecr_repository_name, images_in_use )
+        images = [ { k: img.get(k) for k in [ 'imageDigest', 'imageTags', 'imageSizeInBytes', 'imagePushedAt' ] } for img in unused_images ]
+        reclaimable_bytes = sum( img.get('imageSizeInBytes') or 0 for img in unused_images )
+        plan["repositories"][ecr_repository_name] = { "images": images, "reclaimableBytes": reclaimable_bytes }
+        plan["imageCount"] += len(images)
+        plan["reclaimableBytes"] += reclaimable_bytes
+    return plan
+
+def _delete_batch( ecr_client, ecr_repository_name :str, image_digests :list[str] ) -> dict:
+    return ecr_client.batch_delete_image(
+        repositoryName = ecr_repository_name,
+        imageIds = [ { 'imageDigest': digest } for digest in image_digests ],   ### by DIGEST .. which deletes ALL of its tags too.
+    )
+
+def execute_deletion_plan(
+        ecr_client,
+        plan :dict,
+        dry_run :bool,
+        DEBUG :bool) -> dict:
+    """
+    Splits each ECR-repo's images (per the 2nd param) into batches of upto 100, and invokes `batch_delete_image` for ALL batches concurrently.
+    If 3rd param is True, NOTHING is deleted; every batch is simply marked "planned".
+    Returns the 2nd param, with results added: per ECR-repo "batches", "deletedImageCount", "reclaimedBytes", "failures" (plus totals).
+    """
+    result = { **plan, "dryRun": dry_run, "deletedImageCount": 0, "reclaimedBytes": 0, "failureCount": 0 }
+    batches :list[tuple[str, list[str]]] = []
+    for ecr_repository_name, details in plan["repositories"].items():
+        digests = [ img['imageDigest'] for img in details["images"] ]
+        details.update({ "batches": [], "deletedImageCount": 0, "reclaimedBytes": 0, "failures": [] })
+        for k in range( 0, len(digests), BATCH_DELETE_IMAGE_MAX_IDS ):
+            batches.append( ( ecr_repository_name, digests[ k : k + BATCH_DELETE_IMAGE_MAX_IDS ] ) )
+
+    if dry_run:
+        for ecr_repository_name, batch in batches:
+            plan["repositories"][ecr_repository_name]["batches"].append({ "imageDigests": batch, "status": "planned" })
+        return result
+
+    with concurrent.futures.ThreadPoolExecutor( max_workers=MAX_WORKERS ) as executor:
+        futures = [ ( ecr_repository_name, batch, executor.submit( _delete_batch, ecr_client, ecr_repository_name, batch ) ) for ecr_repository_name, batch in batches ]
+        for ecr_repository_name, batch, future in futures:
+            details = plan["repositories"][ecr_repository_name]
+            try:
+                response = future.result()
+            except Exception as e:
+                print(f"!! ERROR !! batch_delete_image() of {len(batch)} images within ECR-repo '{ecr_repository_name}': {str(e)}")
+                details["batches"].append({ "imageDigests": batch, "status": "error", "error": str(e) })
+                details["failures"].extend( { "imageDigest": digest, "failureCode": "BatchError", "failureReason": str(e) } for digest in batch )
+                continue
+            if DEBUG: print(json.dumps(response, indent=4, default=str))
+            sizes = { img['imageDigest']: img.get('imageSizeInBytes') or 0 for img in details["images"] }
+            deleted = { image_id['imageDigest'] for image_id in response.get('imageIds', []) if 'imageDigest' in image_id }
+            failures = [ { **f.get('imageId', {}), "failureCode": f.get('failureCode'), "failureReason": f.get('failureReason') } for f in response.get('failures', []) ]
+            details["batches"].append({ "imageDigests": batch, "status": "deleted" if not failures else "partial", "deletedImageCount": len(deleted) })
+            details["failures"].extend( failures )
+            details["deletedImageCount"] += len(deleted)
+            details["reclaimedBytes"] += sum( sizes.get( digest, 0 ) for digest in deleted )
+            print("✗", end="", flush=True)
+
+    for details in plan["repositories"].values():
+        result["deletedImageCount"] += details["deletedImageCount"]
+        result["reclaimedBytes"] += details["reclaimedBytes"]
+        result["failureCount"] += len( details["failures"] )
+    return result
+
 ### ----------------------------------------------------------------------
 def main():
 
     # Check if the AWS profile name is provided as a command-line argument
-    if len(sys.argv) < 2:
-        print(f"Usage:  python3 {sys.argv[0]}    <aws_profile_name>     [--Debug]")
+    flags = [ arg.lower() for arg in sys.argv[2:] ]
+    if len(sys.argv) < 2 or any( f not in [ '--debug', '--all-cdk-repos', '--execute' ] for f in flags ):
+        print(f"Usage:  python3 {sys.argv[0]}    <aws_profile_name>     [--all-cdk-repos]   [--execute]   [--Debug]")
         print(f"Example: python3 {sys.argv[0]}     DEVINT   --debug")
+        print(f"Example: python3 {sys.argv[0]}     DEVINT   --all-cdk-repos")
+        print(f"Example: python3 {sys.argv[0]}     DEVINT   --all-cdk-repos   --execute")
         sys.exit(1)
 
-    DEBUG = False
-    if len(sys.argv) == 3:
-        DEBUG = (sys.argv[2].lower() == '--debug')
-        if DEBUG:
-            print("\nDebug mode enabled !!!\n")
+    DEBUG = '--debug' in flags
+    if DEBUG:
+        print("\nDebug mode enabled !!!\n")
+    ALL_CDK_REPOS = '--all-cdk-repos' in flags
+    DRY_RUN = '--execute' not in flags
 
     # Get the AWS profile name from the command-line argument
     aws_profile_name = sys.argv[1]
     if DEBUG: print(f"aws_profile_name='{aws_profile_name}'")
 
     ### ----------------------
-    # Set up the AWS session with the provided profile
-    session = boto3.Session(profile_name=aws_profile_name)
+    # Set up the AWS session with the provided profile.  All boto3-clients come from `awsapi_invoker.get_client()` (adaptive retries + rate-limiting)
+    awsapi_invoker = InvokeAWSApi( aws_profile=aws_profile_name, aws_region=AWS_REGION, debug=DEBUG )
     # get AWS_ACCOUNT_ID from the session
     global AWS_ACCOUNT_ID
-    sts_client = session.client('sts')
+    sts_client = awsapi_invoker.get_client('sts')
     AWS_ACCOUNT_ID = sts_client.get_caller_identity().get('Account')
     print(f"AWS_ACCOUNT_ID='{AWS_ACCOUNT_ID}'")
     print(f"AWS_REGION='{AWS_REGION}'")
 
     # Create the Lambda and ECR clients
-    lambda_client = session.client(service_name='lambda', region_name=AWS_REGION)
+    lambda_client = awsapi_invoker.get_client( 'lambda', region_name=AWS_REGION, max_workers=MAX_WORKERS )
 
-    ecr_client = session.client(service_name='ecr', region_name=AWS_REGION)
+    ecr_client = awsapi_invoker.get_client( 'ecr', region_name=AWS_REGION, max_workers=MAX_WORKERS )
 
     ### ----------------------
 
-    default_ecr_repository_name = get_DEFAULT_ECR_REPOSITORY_NAME(aws_account_id=AWS_ACCOUNT_ID, cdk_repo_uuid_prefix=CDK_REPO_UUID_PREFIX)
-    input(f"Is this ECR-Repo \033[31m{default_ecr_repository_name}\033[0m correct/accurate? 1-of-2  >>")
-    input(f"Is this ECR-Repo \033[31m{default_ecr_repository_name}\033[0m correct/accurate? 2-of-2  >>")
+    if ALL_CDK_REPOS:
+        ecr_repository_names = get_all_cdk_container_asset_repos( ecr_client=ecr_client, DEBUG=DEBUG )
+    else:
+        ecr_repository_names = [ get_DEFAULT_ECR_REPOSITORY_NAME(aws_account_id=AWS_ACCOUNT_ID, cdk_repo_uuid_prefix=CDK_REPO_UUID_PREFIX) ]
+    input(f"Are these ECR-Repos \033[31m{ecr_repository_names}\033[0m correct/accurate? 1-of-2  >>")
+    input(f"Are these ECR-Repos \033[31m{ecr_repository_names}\033[0m correct/accurate? 2-of-2  >>")
     ### Ask user for input ans store in variable RESP
 
     ### ----------------------
 
-    all_images = get_all_images_in( ecr_client=ecr_client, ecr_repository_name=default_ecr_repository_name, DEBUG=DEBUG )
-    ECR_REPO_DETAILS_CACHE[default_ecr_repository_name] = all_images
+    image_index = EcrImageIndex()
+    for ecr_repository_name in ecr_repository_names:
+        image_index.add_repo( ecr_repository_name, get_all_images_in( ecr_client=ecr_client, ecr_repository_name=ecr_repository_name, DEBUG=DEBUG ) )
 
     functions = get_all_lambdas(lambda_client=lambda_client, DEBUG=DEBUG)
-    functions_using_dockerimages = []
-    ecr_image_uri_list = []
-    ecr_image_id_list = []
-    ### Loop through each Lambda function
-    for function in functions:
-        function_name = function['FunctionName']
-        if DEBUG:
-            print(f"{function_name} .. ", end="", flush=True)
-        else:
-            print(".", end="", flush=True)
-        img_uri = check_if_func_uses_ECR_image(lambda_client=lambda_client, ecr_client=ecr_client, function_name=function_name, DEBUG=DEBUG)
-        if img_uri:
-            functions_using_dockerimages.append(function_name)
-            ecr_image_uri_list.append(img_uri)
-            image_id = img_uri.split(':')[1]
-            ecr_image_id_list.append(image_id)
+    ### Only container-image Lambdas can reference ECR.  `list_functions` already returns `PackageType`; so, NO `get_function()` for zip-packaged Lambdas.
+    image_functions = [ f for f in functions if f.get('PackageType') == 'Image' ]
+    print(f"\n{len(image_functions)} of {len(functions)} Lambdas are container-images.\n")
+
+    functions_using_dockerimages :dict[str, tuple[str, str]] = {}   ### "function-name:qualifier" -> ( ECR-repo-name, image-digest )
+    images_in_use :set[tuple[str, str]] = set()                    ### ( ECR-repo-name, image-digest )
+    ### Lookup ALL versions & aliases of each Lambda .. concurrently across Lambdas.  Then, ONE pass over the results.
+    with concurrent.futures.ThreadPoolExecutor( max_workers=MAX_WORKERS ) as executor:
+        futures = {
+            function['FunctionName']: executor.submit( get_all_images_used_by_func, lambda_client=lambda_client, ecr_client=ecr_client, image_index=image_index, function_name=function['FunctionName'], DEBUG=DEBUG )
+            for function in image_functions
+        }
+        for function_name, future in futures.items():
+            if not DEBUG: print(".", end="", flush=True)
+            for qualifier, image_key in future.result().items():
+                functions_using_dockerimages[f"{function_name}:{qualifier}"] = image_key
+                images_in_use.add( image_key )
+
+    ### Multi-arch images (and attestations) are referenced ONLY via their image-index.  So, keep their child-manifests too.
+    num_children = add_child_manifests_in_use( ecr_client=ecr_client, image_index=image_index, images_in_use=images_in_use, DEBUG=DEBUG )
+    print(f"\n{num_children} child-manifests of in-use image-indexes are also in use.\n")
 
     # function_name = "FACT-backend-dev-Stateless-apireportLambda9DEC88B6-Y9sVvuZuvJL9"
-    # check_if_func_uses_ECR_image(lambda_client=lambda_client, ecr_client=ecr_client, function_name=function_name, DEBUG=DEBUG)
+    # check_if_func_uses_ECR_image(lambda_client=lambda_client, ecr_client=ecr_client, image_index=image_index, function_name=function_name, DEBUG=DEBUG)
 
     ### ----------------------
     print("\n\n\n\n")
-    print(f"ecr_image_uri_list={ecr_image_uri_list}\n\n")
-    for img in ECR_REPO_DETAILS_CACHE[default_ecr_repository_name]:
-        if DEBUG: print(f"img='{img}'")
-        for img in all_images['imageDetails']:
-            if DEBUG: print(f"img='{img}'")
-            sample_value = {
-                "imageDetails": [
-                    {
-                        "registryId": "123456789012",
-                        "repositoryName": "cdk-cdkUUIDcdk-container-assets-123456789012-us-east-1",
-                        "imageDigest": "sha256:53019dbc2657d8e6dc4741c901b49d29db8c8e7c4b827c3fd652fc96554e3b2d",
-                        "imageTags": [
-                            "fb7d886887e5ea473cf2fed3e8d141babec4efc42d5089f15ebcf11884405839"
-                        ],
-                        "imageSizeInBytes": 471725494,
-                        "imagePushedAt": "2024-07-09T20:35:10-04:00",
-                        "imageManifestMediaType": "application/vnd.docker.distribution.manifest.v2+json",
-                        "artifactMediaType": "application/vnd.docker.container.image.v1+json",
-                        "lastRecordedPullTime": "2024-07-09T20:35:15.496000-04:00"
-                    },
-                    # ...
-                    # ...
-                    # ...
-                ]
-            }
-            if DEBUG: print(f"ImageTags='{img['imageTags']}'")
-            for img_id in img['imageTags']:
-                if DEBUG: print(f"img_id='{img_id}'")
-                if img_id in ecr_image_id_list:
-                    print(f"\n# ✅ IN USE!!! Container image: '{img_id}' within ECR repository = '{default_ecr_repository_name}'\n")
-                else:
-                    print(f"aws ecr batch-delete-image --repository-name {default_ecr_repository_name} --image-ids imageTag={img_id}" + " --profile ${AWSPROFILE} --region ${AWSREGION}")
+    if DEBUG: print(f"functions_using_dockerimages={json.dumps(functions_using_dockerimages, indent=4)}\n\n")
+    for ecr_repository_name in ecr_repository_names:
+        print_reclaimable_report( image_index=image_index, ecr_repository_name=ecr_repository_name, images_in_use=images_in_use, DEBUG=DEBUG )
+
+    ### ----------------------
+    plan = plan_deletions( image_index=image_index, ecr_repository_names=ecr_repository_names, images_in_use=images_in_use )
+    if not DRY_RUN and plan["imageCount"] > 0:
+        ANS = input(f"\nAbout to \033[31mDELETE {plan['imageCount']} images ({human_readable_bytes(plan['reclaimableBytes'])})\033[0m from {len(ecr_repository_names)} ECR-Repos.  Type DELETE to continue >>")
+        if ANS != "DELETE":
+            print("\nNOT confirmed.  Switching to DRY-RUN !!\n")
+            DRY_RUN = True
+    result = execute_deletion_plan( ecr_client=ecr_client, plan=plan, dry_run=DRY_RUN, DEBUG=DEBUG )
+
+    plan_filepath = pathlib.Path( f"ECR-image-cleanup-{AWS_ACCOUNT_ID}-{datetime.datetime.now():%Y%m%d-%H%M%S}.json" )
+    with atomic_write( plan_filepath ) as f:
+        json.dump( result, f, indent=4, default=str )
+    print("\n" + '-'*80)
+    if DRY_RUN:
+        print(f"# DRY-RUN .. NOTHING deleted.  Plan to delete {result['imageCount']} images ({human_readable_bytes(result['reclaimableBytes'])}) written to: {plan_filepath.absolute()}")
+        print(f"# To actually delete them, re-run with `--execute`")
+    else:
+        print(f"# 🗑️  Deleted {result['deletedImageCount']} of {result['imageCount']} images .. reclaimed {human_readable_bytes(result['reclaimedBytes'])} ({result['failureCount']} failures).  Results written to: {plan_filepath.absolute()}")
 
 ### ----------------------------------------------------------------------
 if __name__ == "__main__":
@@ -24,6 +24,8 @@ import boto3
 import json
 from botocore.config import Config
 
+from backend.lambda_layer.bin.aws_api_invoker import ( InvokeAWSApi )
+
 ### ----------------------------------------------------------------------
 
 global AWS_ACCOUNT_ID
@@ -62,19 +64,22 @@ def main():
 
     ### ----------------------
     # Create a custom configuration with increased read timeout
-    config = Config(read_timeout=900)  # Timeout in seconds.  Max-RUNTIME for Lambda is 15-minutes.
+    # NO retries: `invoke()` is NOT idempotent.  A retry (of a read-timeout, or a transient error) would RE-RUN the Lambda .. upto `MAX_RETRY_ATTEMPTS` times.
+    # `get_client()` merges this config over its own (adaptive-retries) config.  So, this overrides the retries too.
+    invoke_config = Config( read_timeout=900, retries={ "total_max_attempts": 1 } )  # Timeout in seconds.  Max-RUNTIME for Lambda is 15-minutes.
 
-    # Set up the AWS session with the provided profile
-    session = boto3.Session(profile_name=aws_profile_name)
+    # Set up the AWS session with the provided profile.  All boto3-clients come from `awsapi_invoker.get_client()` (adaptive retries + rate-limiting)
+    awsapi_invoker = InvokeAWSApi( aws_profile=aws_profile_name, aws_region=AWS_REGION )
     # get AWS_ACCOUNT_ID from the session
     global AWS_ACCOUNT_ID
-    sts_client = session.client('sts')
+    sts_client = awsapi_invoker.get_client('sts')
     AWS_ACCOUNT_ID = sts_client.get_caller_identity().get('Account')
     print(f"AWS_ACCOUNT_ID='{AWS_ACCOUNT_ID}'")
     print(f"AWS_REGION='{AWS_REGION}'")
 
-    # Create the Lambda and ECR clients
-    lambda_client = session.client(service_name='lambda', region_name=AWS_REGION, config=config)
+    # Create the Lambda clients.  The 2nd one is ONLY for `invoke()`
+    lambda_client = awsapi_invoker.get_client( 'lambda', region_name=AWS_REGION )
+    lambda_invoke_client = awsapi_invoker.get_client( 'lambda', region_name=AWS_REGION, config=invoke_config )
 
     ### ----------------------
     # Get the tags for the Lambda function
@@ -103,7 +108,7 @@ def main():
 
     # Invoke the Lambda function
     print(f"Invoking Lambda function: {function_name} .. ..")
-    response = lambda_client.invoke(
+    response = lambda_invoke_client.invoke(
         FunctionName=function_name,
         InvocationType='RequestResponse',
         Payload=b'{"Dummykey": "DummyValue"}'  # Payload for the Lambda function